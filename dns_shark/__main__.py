@@ -1,10 +1,17 @@
-from dns_shark.command_line_parsing import create_parser
+from dns_shark.command_line_parsing import create_bulk_parser, create_parser, create_serve_parser
+import asyncio
 import sys
+import time
 from argparse import ArgumentParser, Namespace
 from dns_shark.resource_record import ResourceRecord
-from typing import List
+from dns_shark.resolution_result import ResolutionResult
+from dns_shark.record_writer import RecordWriter
+from dns_shark.metrics import MetricsRegistry
+from typing import Iterable, Iterator, List, Optional
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.dns_resolver import Resolver
+from dns_shark.async_resolver import AsyncResolver
+from dns_shark.dns_server import DNSServer
 from dns_shark.errors.dns_format_error import DNSFormatError
 from dns_shark.errors.dns_name_error import DNSNameError
 from dns_shark.errors.dns_not_implemented_error import DNSNotImplementedError
@@ -12,21 +19,147 @@ from dns_shark.errors.dns_server_failure_error import DNSServerFailureError
 from dns_shark.errors.dns_refused_error import DNSRefusedError
 from dns_shark.errors.dns_no_matching_resource_record_error import DNSNoMatchingResourceRecordError
 from dns_shark.errors.dns_zero_counter_error import DNSZeroCounterError
+from dns_shark.errors.dns_timeout_error import DNSTimeoutError
+
+METRICS_WRITE_RESULTS: int = 1000  # a bulk run rewrites its metrics file every this many results
+METRICS_WRITE_SECONDS: float = 10.0  # and at least this often, while results keep coming in
 
 
 def main():
+    if sys.argv[1:2] == ['serve']:
+        serve(sys.argv[2:])
+        exit(0)
+
+    if any(argument == '--input' or argument.startswith('--input=') for argument in sys.argv[1:]):
+        resolve_bulk(sys.argv[1:])
+        exit(0)
+
     parser: ArgumentParser = create_parser()
     args: Namespace = parser.parse_args(sys.argv[1:])
 
     dns_server_ip: str = args.dns_server_ip.pop()
     domain_name: str = args.domain_name.pop()
 
-    main_helper(Resolver(), domain_name, dns_server_ip, args.ipv6 is not None, args.verbose is not None)
+    record_writer: Optional[RecordWriter] = None
+
+    if args.format != 'text':
+        record_writer = RecordWriter.create(args.format, sys.stdout.buffer)
+
+    with Resolver() as resolver:
+        main_helper(resolver, domain_name, dns_server_ip, args.ipv6 is not None, args.verbose is not None,
+                    record_writer)
 
     exit(0)
 
 
-def main_helper(resolver: Resolver, domain_name: str, dns_server_ip: str, ipv6: bool, verbose: bool):
+def serve(arguments: List[str]) -> None:
+    """
+    Runs dns shark as a caching recursive dns server, until interrupted.
+
+    :param arguments: the command line arguments following the serve command
+    :return: None
+    """
+    args: Namespace = create_serve_parser().parse_args(arguments)
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    metrics: Optional[MetricsRegistry] = MetricsRegistry() if args.metrics_port is not None else None
+    server: DNSServer = DNSServer(AsyncResolver(args.dns_server_ip, metrics=metrics))
+
+    loop.run_until_complete(server.start(args.address, args.port, tcp=not args.no_tcp))
+    print('Listening for queries on ' + args.address + ' port ' + str(server.address[1]) + '.')
+
+    if metrics is not None:
+        metrics.serve(args.address, args.metrics_port)
+        print('Serving metrics on http://' + args.address + ':' + str(args.metrics_port) + '/metrics.')
+
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+def resolve_bulk(arguments: List[str]) -> None:
+    """
+    Resolves every domain name of a file, or of stdin, writing the result of every name resolution to stdout in the
+    chosen output format, in the order the name resolutions complete.
+
+    The metrics file, if any, is rewritten periodically during the run, and once more when the run ends or is
+    interrupted.
+
+    :param arguments: the command line arguments
+    :return: None
+    """
+    args: Namespace = create_bulk_parser().parse_args(arguments)
+    record_writer: RecordWriter = RecordWriter.create(args.format, sys.stdout.buffer)
+    metrics: Optional[MetricsRegistry] = MetricsRegistry() if args.metrics_file is not None else None
+
+    try:
+        with Resolver(metrics=metrics) as resolver:
+            if args.input == '-':
+                write_results(resolver, read_domain_names(sys.stdin), args.dns_server_ip, args.ipv6, args.concurrency,
+                              record_writer, metrics, args.metrics_file)
+            else:
+                with open(args.input) as lines:
+                    write_results(resolver, read_domain_names(lines), args.dns_server_ip, args.ipv6,
+                                  args.concurrency, record_writer, metrics, args.metrics_file)
+    finally:
+        if metrics is not None:
+            metrics.write(args.metrics_file)
+
+
+def read_domain_names(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Reads domain names lazily, one per line. Blank lines, and comments starting with #, are skipped.
+
+    :param lines: the lines to read the domain names from
+    :return: an iterator over the domain names
+    """
+    for line in lines:
+        domain_name: str = line.split('#', 1)[0].strip()
+
+        if domain_name:
+            yield domain_name
+
+
+def write_results(resolver: Resolver, domain_names: Iterable[str], dns_server_ip: str, ipv6: bool, concurrency: int,
+                  record_writer: RecordWriter, metrics: Optional[MetricsRegistry] = None,
+                  metrics_file: Optional[str] = None) -> None:
+    """
+    Resolves domain names concurrently, writing the result of every name resolution as soon as it completes.
+
+    At most concurrency domain names are read ahead of the results written, so memory use does not grow with the number
+    of domain names. The metrics are written to the metrics file every METRICS_WRITE_RESULTS results, or sooner once
+    METRICS_WRITE_SECONDS have passed since they were last written, so that a long or endless run can be monitored.
+
+    :param resolver: the resolver every name resolution shares
+    :param domain_names: the domain names to resolve
+    :param dns_server_ip: the dns server every name resolution begins with
+    :param ipv6: a boolean flag indicating whether to resolve the domain names to ipv6 addresses
+    :param concurrency: the number of name resolutions in progress at once
+    :param record_writer: the record writer the results are written with
+    :param metrics: the metrics registry the resolver updates, if any
+    :param metrics_file: the path of the file the metrics are written to, if any
+    :return: None
+    """
+    results: Iterator[ResolutionResult] = resolver.ask_many(domain_names, [28 if ipv6 else 1], concurrency,
+                                                            dns_server_ip)
+    last_written: float = time.monotonic()
+
+    for count, result in enumerate(results, 1):
+        record_writer.write_result(result)
+
+        if metrics is not None and metrics_file is not None and \
+                (count % METRICS_WRITE_RESULTS == 0 or time.monotonic() - last_written >= METRICS_WRITE_SECONDS):
+            metrics.write(metrics_file)
+            last_written = time.monotonic()
+
+    record_writer.flush()
+
+
+def main_helper(resolver: Resolver, domain_name: str, dns_server_ip: str, ipv6: bool, verbose: bool,
+                record_writer: Optional[RecordWriter] = None):
 
     try:
         answers: List[ResourceRecord] = resolver.ask(domain_name, dns_server_ip, ipv6, verbose)
@@ -36,11 +169,20 @@ def main_helper(resolver: Resolver, domain_name: str, dns_server_ip: str, ipv6:
             DNSServerFailureError,
             DNSRefusedError,
             DNSNoMatchingResourceRecordError,
-            DNSZeroCounterError) as e:
-        print("")
-        print(e)
+            DNSZeroCounterError,
+            DNSTimeoutError) as e:
+        if record_writer is None:
+            print("")
+            print(e)
+        else:
+            record_writer.write_result(ResolutionResult(domain_name, 28 if ipv6 else 1, error=e))
+            record_writer.flush()
     else:
-        ResolverCore.print_answers(domain_name, answers)
+        if record_writer is None:
+            ResolverCore.print_answers(domain_name, answers)
+        else:
+            record_writer.write_result(ResolutionResult(domain_name, 28 if ipv6 else 1, answers=answers))
+            record_writer.flush()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,172 @@
+import asyncio
+from dns_shark.async_resolver_core import AsyncResolverCore
+from dns_shark.dns_client_protocol import DNSClientProtocol
+from dns_shark.async_tcp_connection_pool import AsyncTCPConnectionPool
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.dns_cache import DNSCache
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.tracer import Tracer
+from dns_shark.metrics import MetricsRegistry
+from typing import List, Optional, Tuple
+from random import Random
+
+
+class AsyncResolver:
+    """
+    This class contains the asyncio API for dns shark.
+
+    Every name resolution of an async resolver shares a single udp socket, and a tcp connection per dns server for the
+    dns queries whose udp response was truncated, so thousands of name resolutions may be in
+    progress at once within a single event loop. An async resolver should be closed when it is no longer needed,
+    either explicitly or by using it as an asynchronous context manager:
+
+        async with AsyncResolver('199.7.83.42') as resolver:
+            records = await resolver.ask('www.google.com')
+
+    Instance Attributes:
+
+        dns_server: the default dns server ipv4 address that name resolutions begin with
+        counter: the maximum number of requests allowed for a single domain name resolution
+        cache: the resource record cache shared by every name resolution of this resolver
+        random: a random number generator used for choosing query ids
+        local_address: the (ip address, port) the udp socket of the resolver is bound to
+        timeout: the number of seconds to wait for a response to the first transmission of a dns query
+        retries: the number of rounds of retransmissions of a dns query, with the timeout doubling every round
+        hedge: a boolean flag indicating whether a slow dns query is also sent to the next candidate dns server, after
+               an adaptive delay, instead of only once the timeout elapses
+        round_trip_times: the estimate of dns server round trip times shared by every name resolution of this resolver
+        infrastructure_cache: the name server round trip times, timeouts and errors shared by every name resolution of
+                              this resolver, used to query the fastest name servers first
+        udp_payload_size: the largest udp response the resolver accepts, advertised to dns servers with EDNS0, or None
+                          to send dns queries without EDNS0, whose udp responses are limited to 512 bytes
+        tracer: the tracer that receives the events of every name resolution of this resolver, if any
+        metrics: the metrics registry updated by every name resolution of this resolver, if any
+        transport: the datagram transport of the resolver, once opened
+        protocol: the datagram protocol of the resolver, once opened
+        tcp_connections: the tcp connections shared by every name resolution of this resolver
+    """
+
+    def __init__(self, dns_server: Optional[str] = None,
+                 counter: int = 30,
+                 cache: Optional[DNSCache] = None,
+                 random: Optional[Random] = None,
+                 local_address: Tuple[str, int] = ('0.0.0.0', 0),
+                 timeout: float = 2.0,
+                 retries: int = 2,
+                 hedge: bool = False,
+                 infrastructure_cache: Optional[InfrastructureCache] = None,
+                 udp_payload_size: Optional[int] = 1232,
+                 tracer: Optional[Tracer] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.dns_server: Optional[str] = dns_server
+        self.counter: int = counter
+        self.cache: DNSCache = cache if cache is not None else DNSCache()
+        self.random: Random = random if random is not None else Random()
+        self.local_address: Tuple[str, int] = local_address
+        self.timeout: float = timeout
+        self.retries: int = retries
+        self.hedge: bool = hedge
+        self.round_trip_times: RoundTripTimeEstimator = RoundTripTimeEstimator()
+        self.infrastructure_cache: InfrastructureCache = infrastructure_cache if infrastructure_cache is not None \
+            else InfrastructureCache()
+        self.udp_payload_size: Optional[int] = udp_payload_size
+        self.tracer: Optional[Tracer] = tracer
+        self.metrics: Optional[MetricsRegistry] = metrics
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.protocol: Optional[DNSClientProtocol] = None
+        self.tcp_connections: AsyncTCPConnectionPool = AsyncTCPConnectionPool()
+        self._opening: Optional[asyncio.Future] = None
+
+    async def __aenter__(self) -> 'AsyncResolver':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    async def open(self) -> None:
+        """
+        Opens the udp socket of the resolver, if it is not open already.
+
+        :return: None
+        """
+        if self._opening is None:
+            self._opening = asyncio.ensure_future(asyncio.get_event_loop().create_datagram_endpoint(
+                DNSClientProtocol, local_addr=self.local_address))
+
+        self.transport, self.protocol = await self._opening
+
+    async def ask(self, domain_name: str,
+                  dns_server: Optional[str] = None,
+                  ipv6: bool = False,
+                  verbose: bool = False) -> List[ResourceRecord]:
+        """
+        Resolves a domain name by starting the name resolution at the specified dns server ip.
+
+        Can optionally specify whether an ipv6 address or verbose output is desired.
+
+        :param domain_name: the domain name that will be resolved
+        :param dns_server: the dns server ipv4 address that the name resolution process will begin with. Defaults to
+                           the dns server the resolver was created with.
+        :param ipv6: a boolean flag indicating whether you want to find an ipv6 address for the domain name
+        :param verbose: a boolean flag indicating whether you want verbose output for the name resolution process. A
+                        resolver with a tracer traces the name resolution with its tracer instead.
+        :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError,
+                 DNSZeroCounterError, DNSNoMatchingResourceRecordError, DNSTimeoutError
+        :return: a list of the resource records the domain name resolved to
+        """
+        return await self.resolve(domain_name, 28 if ipv6 else 1, dns_server, verbose)
+
+    async def resolve(self, domain_name: str,
+                      type: int,
+                      dns_server: Optional[str] = None,
+                      verbose: bool = False) -> List[ResourceRecord]:
+        """
+        Resolves a domain name to the resource records of any type, by starting the name resolution at the specified
+        dns server ip.
+
+        :param domain_name: the domain name that will be resolved
+        :param type: the resource record type the domain name will be resolved to
+        :param dns_server: the dns server ipv4 address that the name resolution process will begin with. Defaults to
+                           the dns server the resolver was created with.
+        :param verbose: a boolean flag indicating whether you want verbose output for the name resolution process. A
+                        resolver with a tracer traces the name resolution with its tracer instead.
+        :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError,
+                 DNSZeroCounterError, DNSNoMatchingResourceRecordError, DNSTimeoutError
+        :return: a list of the resource records the domain name resolved to
+        """
+        starting_dns_server: Optional[str] = dns_server if dns_server is not None else self.dns_server
+
+        if starting_dns_server is None:
+            raise ValueError('No dns server was supplied to begin the name resolution with.')
+
+        if self.protocol is None:
+            await self.open()
+
+        assert self.protocol is not None
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, verbose, starting_dns_server, self.random,
+                                                        counter=self.counter, cache=self.cache,
+                                                        timeout=self.timeout, retries=self.retries, hedge=self.hedge,
+                                                        round_trip_times=self.round_trip_times,
+                                                        infrastructure_cache=self.infrastructure_cache,
+                                                        tcp_connections=self.tcp_connections,
+                                                        udp_payload_size=self.udp_payload_size,
+                                                        tracer=self.tracer, metrics=self.metrics)
+
+        return await resolver.resolve_domain_name(domain_name, starting_dns_server, type)
+
+    def close(self) -> None:
+        """
+        Closes the udp socket and tcp connections of the resolver. Name resolutions still in progress fail with a
+        ConnectionError.
+
+        :return: None
+        """
+        if self.transport is not None:
+            self.transport.close()
+
+        self.tcp_connections.close()
+        self.transport = None
+        self.protocol = None
+        self._opening = None
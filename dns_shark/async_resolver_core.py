@@ -0,0 +1,264 @@
+import asyncio
+from dns_shark.dns_message_utilities import DNSMessageUtilities
+from dns_shark.dns_message import DNSMessage
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.dns_cache import DNSCache
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.dns_client_protocol import DNSClientProtocol
+from dns_shark.dns_stream_client_protocol import DNSStreamClientProtocol
+from dns_shark.async_tcp_connection_pool import AsyncTCPConnectionPool
+from dns_shark.resolver_core_base import ResolverCoreBase
+from dns_shark.resolution_state import ResolutionState
+from dns_shark.resolution_task import ResolutionTask
+from dns_shark.tracer import Tracer
+from dns_shark.metrics import MetricsRegistry
+from dns_shark.errors.dns_shark_error import DNSSharkError
+from typing import Dict, Hashable, List, Optional, Tuple
+from random import Random
+import struct
+import time
+
+
+class AsyncResolverCore(ResolverCoreBase):
+    """
+    Top-level class in charge of resolving domain names on an asyncio event loop.
+
+    Instead of blocking on a socket, every dns query awaits its response from a DNSClientProtocol, so that any number of
+    name resolutions can share a single udp socket and be in progress at once.
+
+    Instance Attributes:
+
+        protocol: the datagram protocol used for communication with the dns servers
+        tcp_connections: the tcp connections used to retry dns queries whose udp response was truncated. May be shared
+                         between resolvers.
+
+        see ResolverCoreBase for the remaining instance attributes
+    """
+
+    def __init__(self, protocol: DNSClientProtocol, verbose: bool, starting_dns_server: str, random: Random,
+                 counter: int = 30, cache: Optional[DNSCache] = None, timeout: float = 2.0, retries: int = 2,
+                 hedge: bool = False, round_trip_times: Optional[RoundTripTimeEstimator] = None,
+                 infrastructure_cache: Optional[InfrastructureCache] = None,
+                 tcp_connections: Optional[AsyncTCPConnectionPool] = None,
+                 udp_payload_size: Optional[int] = 1232,
+                 tracer: Optional[Tracer] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        super().__init__(verbose, starting_dns_server, random, counter, cache, timeout, retries, hedge,
+                         round_trip_times, infrastructure_cache, udp_payload_size, tracer, metrics)
+        self.protocol: DNSClientProtocol = protocol
+        self.tcp_connections: AsyncTCPConnectionPool = tcp_connections if tcp_connections is not None \
+            else AsyncTCPConnectionPool()
+
+    async def resolve_domain_name(self, requested_domain_name: str,
+                                  next_dns_server_ip: str,
+                                  requested_type: int) -> List[ResourceRecord]:
+        """
+        Resolves a requested domain name of the requested type. Begins the name resolution process via sending a dns
+        query to the next_dns_server_ip, unless the answer is already cached.
+
+        See ResolverCore.resolve_domain_name, which this mirrors.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param next_dns_server_ip: the starting dns server which we use in the name resolution process.
+        :param requested_type: the desired resource record type we seek to resolve the domain name to.
+        :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError,
+                 DNSZeroCounterError, DNSNoMatchingResourceRecordError, DNSTimeoutError
+        :return: a list of the answer records that match the desired domain name and type, if present.
+        """
+        started: float = time.monotonic()
+
+        try:
+            state: ResolutionState = self.begin_resolution(requested_domain_name, next_dns_server_ip, requested_type)
+
+            while not state.done:
+                task: ResolutionTask = state.current_task
+                assert task.dns_server_ips is not None
+
+                dns_response: DNSMessage = await self._request_domain_name(task.domain_name, task.dns_server_ips,
+                                                                           task.type)
+                self.continue_resolution(state, dns_response)
+
+            assert state.answers is not None
+
+        except DNSSharkError as error:
+            self._observe_resolution(requested_domain_name, started, error)
+            raise
+
+        if self.tracer is not None or self.metrics is not None:
+            self._observe_resolution(requested_domain_name, started, None)
+
+        return state.answers
+
+    async def _request_domain_name(self,
+                                   requested_domain_name: str,
+                                   next_dns_server_ips: List[str],
+                                   requested_type: int) -> DNSMessage:
+        """
+        Sends a dns query for the requested domain name and type to the next dns servers and awaits the first response.
+
+        Transmissions, retransmissions, hedging, timeouts, the recording of round trip times, the retrying of dns
+        queries whose EDNS0 OPT record was rejected and the retrying of truncated responses over tcp follow
+        ResolverCore._request_domain_name. Every transmission that is still outstanding once a response arrives, or once
+        the retries are exhausted, is abandoned, so that its late response is discarded by the protocol.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param next_dns_server_ips: the dns servers we wish to send the next dns query to, in the order they are tried.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :raises: DNSTimeoutError
+        :return: the first dns response received from any of the next_dns_server_ips.
+        """
+        self.counter = self.counter - 1  # decrement the counter by one, since we are about to send a request
+
+        sent: Dict[asyncio.Future, Tuple[str, float]] = {}  # the dns server and send time of every transmission
+        unanswered: Dict[Hashable, str] = {}  # the dns server of every transmission whose timeout is yet to be recorded
+        timeout: float = self.timeout
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+
+        try:
+            for round_index in range(self.retries + 1):
+                for index, next_dns_server_ip in enumerate(next_dns_server_ips):
+                    response: asyncio.Future = self._send_query(requested_domain_name, next_dns_server_ip,
+                                                                requested_type, round_index > 0 or index > 0)
+                    sent[response] = (next_dns_server_ip, loop.time())
+                    unanswered[response] = next_dns_server_ip
+
+                    wait: float = self._get_response_wait(next_dns_server_ip, index, len(next_dns_server_ips), timeout)
+                    done, _ = await asyncio.wait(list(sent), timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+
+                    for response in done:
+                        udp_response: DNSMessage = response.result()
+                        responder_ip, sent_at = sent.pop(response)
+                        unanswered.pop(response, None)
+                        self._record_response(responder_ip, udp_response, loop.time() - sent_at)
+
+                        if self._rejects_edns(udp_response):
+                            retried_response: Optional[DNSMessage] = await self._request_without_edns(
+                                requested_domain_name, responder_ip, requested_type, timeout)
+
+                            if retried_response is None:
+                                continue
+
+                            udp_response = retried_response
+
+                        dns_response: Optional[DNSMessage] = udp_response
+
+                        if udp_response.is_truncated:
+                            dns_response = await self._request_over_tcp(requested_domain_name, responder_ip,
+                                                                        requested_type, timeout)
+
+                        if dns_response is not None:
+                            return dns_response
+
+                        self.infrastructure_cache.add_error(responder_ip)
+
+                    if not done and wait >= timeout:
+                        self._record_timeouts(unanswered, timeout)
+
+                timeout = timeout * 2
+
+            raise self._timeout_error(requested_domain_name, next_dns_server_ips)
+
+        finally:
+            for response in sent:
+                response.cancel()
+
+    def _send_query(self, requested_domain_name: str, next_dns_server_ip: str, requested_type: int,
+                    retransmission: bool = False) -> asyncio.Future:
+        """
+        Sends a single transmission of a dns query to a dns server.
+
+        The query id is chosen so that it is not shared with any other query outstanding to the same dns server.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param next_dns_server_ip: the dns server we wish to send the dns query to.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :param retransmission: a boolean flag indicating whether the dns query was sent before, to any dns server.
+        :return: a future that resolves to the dns response of the dns server.
+        """
+        address = (next_dns_server_ip, 53)
+        random_query_id: int = self.random.randint(0, 65535)
+
+        while self.protocol.is_pending(random_query_id, address):
+            random_query_id = self.random.randint(0, 65535)
+
+        domain_name_query: bytearray = DNSMessageUtilities.create_query(
+            requested_domain_name, random_query_id, requested_type, self._get_udp_payload_size(next_dns_server_ip))
+        response: asyncio.Future = self.protocol.query(domain_name_query, address, random_query_id)
+
+        if self.tracer is not None or self.metrics is not None:
+            self._observe_query_sent(requested_domain_name, requested_type, random_query_id, next_dns_server_ip,
+                                     retransmission=retransmission)
+
+        return response
+
+    async def _request_without_edns(self,
+                                    requested_domain_name: str,
+                                    dns_server_ip: str,
+                                    requested_type: int,
+                                    timeout: float) -> Optional[DNSMessage]:
+        """
+        Retries a dns query without EDNS0 to a dns server that rejected its OPT record, and awaits its response. The dns
+        server is remembered in the infrastructure cache, so that later dns queries to it are sent without EDNS0.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param dns_server_ip: the dns server we wish to send the dns query to.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :param timeout: the number of seconds to wait for the dns response.
+        :return: the dns response, or None if the dns server did not respond in time.
+        """
+        self.infrastructure_cache.add_edns_rejection(dns_server_ip)
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        sent_at: float = loop.time()
+
+        try:
+            dns_response: DNSMessage = await asyncio.wait_for(
+                self._send_query(requested_domain_name, dns_server_ip, requested_type, True), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        self._record_response(dns_server_ip, dns_response, loop.time() - sent_at)
+
+        return dns_response
+
+    async def _request_over_tcp(self,
+                                requested_domain_name: str,
+                                dns_server_ip: str,
+                                requested_type: int,
+                                timeout: float) -> Optional[DNSMessage]:
+        """
+        Sends a dns query to a dns server over tcp and awaits its response. The dns query is pipelined over the open
+        connection to the dns server if there is one, alongside the dns queries of other name resolutions.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param dns_server_ip: the dns server we wish to send the dns query to.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :param timeout: the number of seconds to wait for the connection, and then for the dns response.
+        :return: the dns response, or None if no well formed response to the dns query was received.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+
+        try:
+            connection: DNSStreamClientProtocol = await self.tcp_connections.connection(dns_server_ip, timeout)
+            random_query_id: int = self.random.randint(0, 65535)
+
+            while connection.is_pending(random_query_id):
+                random_query_id = self.random.randint(0, 65535)
+
+            domain_name_query: bytearray = DNSMessageUtilities.create_query(
+                requested_domain_name, random_query_id, requested_type, self._get_udp_payload_size(dns_server_ip))
+            response: asyncio.Future = connection.query(domain_name_query, random_query_id)
+            sent_at: float = loop.time()
+
+            if self.tracer is not None or self.metrics is not None:
+                self._observe_query_sent(requested_domain_name, requested_type, random_query_id, dns_server_ip, True)
+
+            dns_response: DNSMessage = await asyncio.wait_for(response, timeout)
+            dns_response.decode_sections()
+
+            self._observe_response(dns_server_ip, dns_response, loop.time() - sent_at)
+
+            return dns_response
+
+        except (OSError, asyncio.TimeoutError, IndexError, ValueError, struct.error):
+            return None
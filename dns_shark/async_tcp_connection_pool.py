@@ -0,0 +1,72 @@
+import asyncio
+from dns_shark.dns_stream_client_protocol import DNSStreamClientProtocol
+from typing import Dict, Optional
+
+
+class AsyncTCPConnectionPool:
+    """
+    The tcp connections of an async resolver, one per dns server, kept open so that they are reused by every dns query
+    retried over tcp. The dns queries sent to the same dns server at once are pipelined over its connection.
+
+    A connection that the dns server closed, e.g. because it was idle for too long, is replaced by a new one the next
+    time a dns query is sent to that dns server.
+
+    Instance Attributes:
+
+        port: the port dns servers accept tcp connections on
+        connections: the connection to every dns server, by ip address. The connections that are still being
+                     established are futures shared by every dns query waiting for them.
+    """
+
+    def __init__(self, port: int = 53):
+        self.port: int = port
+        self.connections: Dict[str, asyncio.Future] = {}
+
+    async def connection(self, dns_server_ip: str, timeout: float) -> DNSStreamClientProtocol:
+        """
+        Retrieves the open connection to a dns server, or opens a new one if there is none.
+
+        :param dns_server_ip: the ip address of the dns server
+        :param timeout: the number of seconds to wait for a new connection to be established
+        :raises: OSError if no connection could be established, asyncio.TimeoutError if it took too long
+        :return: the protocol of the connection
+        """
+        connecting: Optional[asyncio.Future] = self.connections.get(dns_server_ip)
+
+        if connecting is not None and connecting.done() and \
+                (connecting.cancelled() or connecting.exception() is not None or not connecting.result().is_open):
+            connecting = None
+
+        if connecting is None:
+            connecting = asyncio.ensure_future(self._open(dns_server_ip, timeout))
+            self.connections[dns_server_ip] = connecting
+
+        return await asyncio.shield(connecting)
+
+    def close(self) -> None:
+        """
+        Closes every connection. Dns queries still awaiting their response fail with a ConnectionError.
+
+        :return: None
+        """
+        for connecting in self.connections.values():
+            if not connecting.done():
+                connecting.cancel()
+            elif not connecting.cancelled() and connecting.exception() is None:
+                connecting.result().close()
+
+        self.connections = {}
+
+    async def _open(self, dns_server_ip: str, timeout: float) -> DNSStreamClientProtocol:
+        """
+        Opens a new connection to a dns server.
+
+        :param dns_server_ip: the ip address of the dns server
+        :param timeout: the number of seconds to wait for the connection to be established
+        :raises: OSError if no connection could be established, asyncio.TimeoutError if it took too long
+        :return: the protocol of the connection
+        """
+        _, protocol = await asyncio.wait_for(
+            asyncio.get_event_loop().create_connection(DNSStreamClientProtocol, dns_server_ip, self.port), timeout)
+
+        return protocol
@@ -0,0 +1,4 @@
+"""
+Benchmarks of dns shark, each runnable as a module, e.g. python -m dns_shark.bench.memory. The microbenchmarks of the
+codec and resolver hot paths run with python -m dns_shark.bench
+"""
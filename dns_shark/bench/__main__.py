@@ -0,0 +1,4 @@
+from dns_shark.bench.suite import main
+import sys
+
+sys.exit(main())
@@ -0,0 +1,83 @@
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.dns_question import DNSQuestion
+from typing import Any, Callable, List
+import sys
+import tracemalloc
+
+
+class _DictResourceRecord:
+    """
+    A resource record laid out the way ResourceRecord was before it had __slots__, as the baseline of the benchmark.
+    """
+
+    def __init__(self, name: str, type: int, response_class: int, ttl: int, rdlength: int, rdata: str):
+        self.name: str = name
+        self.type: int = type
+        self.response_class: int = response_class
+        self.ttl: int = ttl
+        self.rdlength: int = rdlength
+        self.rdata: str = rdata
+
+
+class _DictDNSQuestion:
+    """
+    A dns question laid out the way DNSQuestion was before it had __slots__, as the baseline of the benchmark.
+    """
+
+    def __init__(self, name: str, type: int, response_class: int):
+        self.name: str = name
+        self.type: int = type
+        self.response_class: int = response_class
+
+
+def measure_bytes_per_object(create: Callable[[], Any], count: int) -> float:
+    """
+    Measures the memory held by each of many objects, excluding the memory of the values they refer to.
+
+    :param create: a function creating one object, with every object referring to the same values
+    :param count: the number of objects to create
+    :return: the average number of bytes allocated per object
+    """
+    tracemalloc.start()
+
+    try:
+        before: int = tracemalloc.get_traced_memory()[0]
+        objects: List[Any] = [create() for _ in range(count)]
+        after: int = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return (after - before - sys.getsizeof(objects)) / len(objects)
+
+
+def main(count: int = 100000) -> None:
+    """
+    Prints the memory held by each resource record and dns question, compared to the same objects with an instance
+    __dict__.
+
+    :param count: the number of objects created for each measurement
+    :return: None
+    """
+    name: str = 'www.cs.ubc.ca'
+    rdata: str = '142.103.6.5'
+
+    comparisons = [('resource record',
+                    lambda: _DictResourceRecord(name, 1, 1, 3600, 4, rdata),
+                    lambda: ResourceRecord(name, 1, 1, 3600, 4, rdata)),
+                   ('dns question',
+                    lambda: _DictDNSQuestion(name, 1, 1),
+                    lambda: DNSQuestion(name, 1, 1))]
+
+    print('bytes per object, over ' + str(count) + ' objects:')
+
+    for description, create_baseline, create_slotted in comparisons:
+        baseline: float = measure_bytes_per_object(create_baseline, count)
+        slotted: float = measure_bytes_per_object(create_slotted, count)
+
+        print('  ' + description + ': ' + str(round(slotted)) + ' with __slots__, ' + str(round(baseline)) +
+              ' with __dict__, ' + str(round(baseline - slotted)) + ' saved (' +
+              str(round(100 * (baseline - slotted) / baseline)) + '%)')
+
+
+if __name__ == '__main__':
+    main()
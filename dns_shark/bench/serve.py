@@ -0,0 +1,165 @@
+import asyncio
+from dns_shark.async_resolver import AsyncResolver
+from dns_shark.dns_cache import DNSCache
+from dns_shark.dns_server import DNSServer
+from dns_shark.query_builder import QueryBuilder
+from dns_shark.resource_record import ResourceRecord
+from multiprocessing import Process, Queue
+from typing import List, Optional, Tuple
+import argparse
+import time
+
+
+def run_server(names: int, ready: Queue) -> None:
+    """
+    Runs a dns server on an ephemeral local port, with an answer cached for every domain name of the benchmark, until
+    the process is terminated.
+
+    :param names: the number of domain names with a cached answer
+    :param ready: the queue the (ip address, port) of the dns server is put on once it listens for queries
+    :return: None
+    """
+    cache: DNSCache = DNSCache()
+
+    for index in range(names):
+        domain_name: str = 'host' + str(index) + '.example.com'
+        cache.add_answers(domain_name, 1, [ResourceRecord(domain_name, 1, 1, 86400, 4, '192.0.2.' + str(index % 256))])
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    server: DNSServer = DNSServer(AsyncResolver('127.0.0.1', cache=cache))
+
+    loop.run_until_complete(server.start('127.0.0.1', 0, tcp=False))
+    ready.put(server.address)
+    loop.run_forever()
+
+
+class LoadGeneratorProtocol(asyncio.DatagramProtocol):
+    """
+    Sends queries for cached domain names to a dns server, keeping a fixed number of queries outstanding, and counts the
+    responses. Queries that are still outstanding once no response has arrived for a while are counted as lost, and
+    replaced.
+
+    Instance Attributes:
+
+        queries: the number of queries to send in total
+        outstanding: the number of queries kept outstanding at once
+        names: the number of domain names the queries cycle through
+        builder: the builder of the queries
+        sent: the number of queries sent so far
+        received: the number of responses received so far
+        lost: the number of queries counted as lost so far
+        done: a future that is resolved once every query has been answered
+    """
+
+    def __init__(self, queries: int, outstanding: int, names: int, done: asyncio.Future) -> None:
+        self.queries: int = queries
+        self.outstanding: int = outstanding
+        self.names: int = names
+        self.builder: QueryBuilder = QueryBuilder(max_entries=names)
+        self.sent: int = 0
+        self.received: int = 0
+        self.lost: int = 0
+        self._checked_received: int = 0
+        self.done: asyncio.Future = done
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+        self._send_queries()
+        asyncio.get_event_loop().call_later(0.2, self._check_progress)
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.received = self.received + 1
+
+        if self.sent < self.queries:
+            self._send_query()
+        elif self.received + self.lost >= self.queries and not self.done.done():
+            self.done.set_result(None)
+
+    def _check_progress(self) -> None:
+        if self.done.done() or self.transport is None:
+            return
+
+        if self.received == self._checked_received:
+            self.lost = self.sent - self.received  # no response for a while, so the outstanding queries were dropped
+
+            if self.sent >= self.queries:
+                self.done.set_result(None)
+                return
+
+            self._send_queries()
+
+        self._checked_received = self.received
+        asyncio.get_event_loop().call_later(0.2, self._check_progress)
+
+    def _send_queries(self) -> None:
+        for _ in range(min(self.outstanding, self.queries - self.sent)):
+            self._send_query()
+
+    def _send_query(self) -> None:
+        assert self.transport is not None
+        domain_name: str = 'host' + str(self.sent % self.names) + '.example.com'
+
+        self.transport.sendto(self.builder.build_query(domain_name, self.sent & 0xffff, 1))
+        self.sent = self.sent + 1
+
+
+async def generate_load(address: Tuple[str, int], queries: int, outstanding: int, names: int) -> Tuple[float, int]:
+    """
+    Sends queries to a dns server as fast as it answers them.
+
+    :param address: the (ip address, port) of the dns server
+    :param queries: the number of queries to send
+    :param outstanding: the number of queries kept outstanding at once
+    :param names: the number of domain names the queries cycle through
+    :return: the number of seconds it took for every query to be answered or lost, and the number of queries lost
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    done: asyncio.Future = loop.create_future()
+    started_at: float = time.monotonic()
+
+    protocol: LoadGeneratorProtocol = LoadGeneratorProtocol(queries, outstanding, names, done)
+    transport, _ = await loop.create_datagram_endpoint(lambda: protocol, remote_addr=address)
+
+    try:
+        await done
+    finally:
+        transport.close()
+
+    return time.monotonic() - started_at, protocol.lost
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    """
+    Measures the queries per second a dns server answers from its cache, using a load generator in this process and the
+    dns server in another.
+
+    :param arguments: the command line arguments, defaulting to those of the process
+    :return: None
+    """
+    parser = argparse.ArgumentParser(prog='python -m dns_shark.bench.serve',
+                                     description='Cache hit throughput of dns shark serve.')
+    parser.add_argument('--queries', type=int, default=100000, help='The number of queries to send.')
+    parser.add_argument('--outstanding', type=int, default=200, help='The number of queries outstanding at once.')
+    parser.add_argument('--names', type=int, default=1000, help='The number of distinct domain names queried.')
+    args = parser.parse_args(arguments)
+
+    ready: Queue = Queue()
+    server: Process = Process(target=run_server, args=(args.names, ready), daemon=True)
+    server.start()
+
+    try:
+        address: Tuple[str, int] = ready.get(timeout=30)
+        elapsed, lost = asyncio.get_event_loop().run_until_complete(
+            generate_load(address, args.queries, args.outstanding, args.names))
+    finally:
+        server.terminate()
+
+    answered: int = args.queries - lost
+    print(str(answered) + ' cache hits answered in ' + str(round(elapsed, 2)) + ' seconds (' + str(lost) +
+          ' queries lost): ' + str(round(answered / elapsed)) + ' queries per second')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,348 @@
+from dns_shark.dns_cache import DNSCache
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_message_utilities import DNSMessageUtilities
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.domain_name_handling import DomainNameDecoder, DomainNameEncoder
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.resource_record import ResourceRecord
+from collections import deque
+from random import Random
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import argparse
+import json
+import platform
+import socket
+import statistics
+import struct
+import sys
+import timeit
+
+# the referral to the ca name servers sent by a root server for www.cs.ubc.ca, as in the tests
+referral_response: bytes = b'\x00\x01\x80\x80\x00\x01\x00\x00\x00\x04\x00\x08\x03www\x02cs\x03ubc' \
+                           b'\x02ca\x00\x00\x01\x00\x01\x02ca\x00\x00\x02\x00\x01\x00\x02MY\x00\x0f' \
+                           b'\x01x\nca-servers\xc0\x1f\xc0\x1f\x00\x02\x00\x01\x00\x02MY\x00\x04' \
+                           b'\x01c\xc0/\xc0\x1f\x00\x02\x00\x01\x00\x02MY\x00\x04\x01j\xc0/\xc0\x1f' \
+                           b'\x00\x02\x00\x01\x00\x02MY\x00\x06\x03any\xc0/\xc0-\x00\x01\x00\x01\x00' \
+                           b'\x02MY\x00\x04\xc7\xfd\xfaD\xc0-\x00\x1c\x00\x01\x00\x02MY\x00\x10& \x01' \
+                           b'\n\x80\xba\x00\x00\x00\x00\x00\x00\x00\x00\x00h\xc0H\x00\x01\x00\x01\x00' \
+                           b'\x02MY\x00\x04\xb9\x9f\xc4\x02\xc0H\x00\x1c\x00\x01\x00\x02MY\x00\x10& \x01' \
+                           b'\n\x80S\x00\x00\x00\x00\x00\x00\x00\x00\x00\x02\xc0X\x00\x01\x00\x01\x00\x02MY' \
+                           b'\x00\x04\xc6\xb6\xa7\x01\xc0X\x00\x1c\x00\x01\x00\x02MY\x00\x10 \x01' \
+                           b'\x05\x00\x00\x83\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\xc0h\x00\x01\x00' \
+                           b'\x01\x00\x02MY\x00\x04\xc7\x04\x90\x02\xc0h\x00\x1c\x00\x01\x00\x02MY\x00' \
+                           b'\x10 \x01\x05\x00\x00\xa7\x00\x00\x00\x00\x00\x00\x00\x00\x00\x02'
+
+
+class SimulatedHierarchy:
+    """
+    A stand-in for the udp socket of a resolver, answering every dns query sent to it from a simulated hierarchy of
+    name servers, in the same process and without any network. Name resolutions through it are thus benchmarked without
+    the noise of real round trips, although the cost of the simulated name servers is included.
+
+    Every response is encoded once, when it is added, and sent with the query id of the dns query it answers.
+
+    Instance Attributes:
+
+        responses: the encoded response of every (dns server ip, domain name, type) queried, with a query id of 0
+    """
+
+    _type: struct.Struct = struct.Struct('!H')
+
+    def __init__(self):
+        self.responses: Dict[Tuple[str, str, int], bytes] = {}
+        self._received: Deque[Tuple[bytes, Tuple[str, int]]] = deque()
+
+    def add_response(self, dns_server_ip: str, domain_name: str, type: int, authoritative: bool,
+                     answer_records: List[ResourceRecord], name_server_records: List[ResourceRecord],
+                     additional_records: List[ResourceRecord]) -> None:
+        """
+        Adds the response of a dns server to the dns queries for a domain name and type.
+
+        :param dns_server_ip: the dns server that sends the response
+        :param domain_name: the domain name queried
+        :param type: the type queried
+        :param authoritative: a boolean flag indicating whether the response is authoritative
+        :param answer_records: the answer section of the response
+        :param name_server_records: the authority section of the response
+        :param additional_records: the additional section of the response
+        :return: None
+        """
+        response: DNSMessage = DNSMessage(0, True, 0, authoritative, False, False, False, 0, 1, len(answer_records),
+                                          len(name_server_records), len(additional_records),
+                                          [DNSQuestion(domain_name, type, 1)], answer_records, name_server_records,
+                                          additional_records)
+
+        self.responses[(dns_server_ip, domain_name, type)] = response.encode()
+
+    def sendto(self, query: bytes, address: Tuple[str, int]) -> int:
+        domain_name, offset = DomainNameDecoder.decode_domain_name_at(query, 12)
+        type: int = SimulatedHierarchy._type.unpack_from(query, offset)[0]
+
+        self._received.append((bytes(query[:2]) + self.responses[(address[0], domain_name, type)][2:], address))
+        return len(query)
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        pass
+
+    def recvfrom_into(self, buffer: bytearray, nbytes: int = 0) -> Tuple[int, Tuple[str, int]]:
+        if not self._received:
+            raise socket.timeout()
+
+        response, address = self._received.popleft()
+        buffer[:len(response)] = response
+
+        return len(response), address
+
+
+def create_hierarchy() -> SimulatedHierarchy:
+    """
+    Creates a hierarchy of a root server, the name server of the bench zone, and the name server of the
+    www.bench zone, which aliases www.bench to a host of the bench zone:
+
+        root (198.41.0.4) --> ns.bench (192.0.2.1) --> ns.www.bench (192.0.2.2)
+
+    Resolving www.bench takes three dns queries, and resolving the canonical name host.bench one more, since the
+    resolver begins at the deepest cached zone cut enclosing it.
+
+    :return: the hierarchy
+    """
+    hierarchy: SimulatedHierarchy = SimulatedHierarchy()
+
+    bench_referral: Tuple[List[ResourceRecord], List[ResourceRecord]] = (
+        [ResourceRecord('bench', 2, 1, 86400, 0, 'ns.bench')],
+        [ResourceRecord('ns.bench', 1, 1, 86400, 4, '192.0.2.1')])
+    www_bench_referral: Tuple[List[ResourceRecord], List[ResourceRecord]] = (
+        [ResourceRecord('www.bench', 2, 1, 86400, 0, 'ns.www.bench')],
+        [ResourceRecord('ns.www.bench', 1, 1, 86400, 4, '192.0.2.2')])
+
+    hierarchy.add_response('198.41.0.4', 'www.bench', 1, False, [], *bench_referral)
+
+    hierarchy.add_response('192.0.2.1', 'www.bench', 1, False, [], *www_bench_referral)
+    hierarchy.add_response('192.0.2.1', 'host.bench', 1, True,
+                           [ResourceRecord('host.bench', 1, 1, 86400, 4, '192.0.2.80')], [], [])
+    hierarchy.add_response('192.0.2.2', 'www.bench', 1, True,
+                           [ResourceRecord('www.bench', 5, 1, 86400, 0, 'host.bench')], [], [])
+
+    return hierarchy
+
+
+def create_pointer_chain(depth: int) -> Tuple[bytes, int]:
+    """
+    Creates a dns message holding a chain of domain names, each of a single label followed by a pointer to the previous
+    domain name, the worst case of compression for a decoder.
+
+    :param depth: the number of domain names pointing at the previous one
+    :return: the dns message, and the offset of its last domain name, which has depth + 2 labels
+    """
+    message: bytearray = bytearray(12)  # an empty header
+    previous: int = len(message)
+    message.extend(DomainNameEncoder.encode_domain_name('example.com'))
+
+    for index in range(depth):
+        label: bytes = ('label' + str(index)).encode('ascii')
+        offset: int = len(message)
+
+        message.append(len(label))
+        message.extend(label)
+        message.extend(struct.pack('!H', 0xc000 | previous))
+        previous = offset
+
+    return bytes(message), previous
+
+
+def create_resolver(hierarchy: SimulatedHierarchy, cache: DNSCache) -> ResolverCore:
+    """
+    :param hierarchy: the hierarchy the resolver sends its dns queries to
+    :param cache: the cache of the resolver
+    :return: a resolver beginning its name resolutions at the root server of the hierarchy
+    """
+    return ResolverCore(hierarchy, False, '198.41.0.4', Random(0), cache=cache,
+                        infrastructure_cache=InfrastructureCache())
+
+
+def bench_decode_referral_header() -> Callable[[], Any]:
+    """
+    Decoding the header of a referral, as the resolver does for every udp response it receives.
+    """
+    message: bytes = referral_response
+    return lambda: DNSMessage.decode_dns_message(message)
+
+
+def bench_decode_referral() -> Callable[[], Any]:
+    """
+    Decoding every section of a referral.
+    """
+    message: bytes = referral_response
+    return lambda: DNSMessage.decode_dns_message_at(message, 0)
+
+
+def bench_decode_pointer_chain() -> Callable[[], Any]:
+    """
+    Decoding a domain name of 18 labels through 16 compression pointers.
+    """
+    message, offset = create_pointer_chain(16)
+    return lambda: DomainNameDecoder.decode_domain_name_at(message, offset)
+
+
+def bench_encode_domain_name() -> Callable[[], Any]:
+    """
+    Encoding a domain name without compression.
+    """
+    return lambda: DomainNameEncoder.encode_domain_name('www.cs.ubc.ca')
+
+
+def bench_create_domain_name_query() -> Callable[[], Any]:
+    """
+    Creating a dns query, whose template is cached after the first call.
+    """
+    return lambda: DNSMessageUtilities.create_domain_name_query('www.cs.ubc.ca', 0x1234, 1)
+
+
+def bench_resolve_uncached() -> Callable[[], Any]:
+    """
+    Resolving a domain name through the simulated hierarchy, with an empty cache.
+    """
+    hierarchy: SimulatedHierarchy = create_hierarchy()
+    return lambda: create_resolver(hierarchy, DNSCache()).resolve_domain_name('www.bench', '198.41.0.4', 1)
+
+
+def bench_resolve_cached() -> Callable[[], Any]:
+    """
+    Resolving a domain name whose answer is cached.
+    """
+    resolver: ResolverCore = create_resolver(create_hierarchy(), DNSCache())
+    resolver.resolve_domain_name('www.bench', '198.41.0.4', 1)
+
+    return lambda: resolver.resolve_domain_name('www.bench', '198.41.0.4', 1)
+
+
+# the name of every benchmark, and the function setting it up, which returns the function to time
+BENCHMARKS: List[Tuple[str, Callable[[], Callable[[], Any]]]] = [
+    ('decode_referral_header', bench_decode_referral_header),
+    ('decode_referral', bench_decode_referral),
+    ('decode_pointer_chain', bench_decode_pointer_chain),
+    ('encode_domain_name', bench_encode_domain_name),
+    ('create_domain_name_query', bench_create_domain_name_query),
+    ('resolve_uncached', bench_resolve_uncached),
+    ('resolve_cached', bench_resolve_cached)
+]
+
+
+def run_benchmark(setup: Callable[[], Callable[[], Any]], repeat: int, number: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Times a benchmark.
+
+    :param setup: the function setting up the benchmark, which returns the function to time
+    :param repeat: the number of times the function is timed
+    :param number: the number of calls to the function each time it is timed, or None for as many calls as take at
+                   least 0.2 seconds
+    :return: the number of calls, and the best and median of the seconds taken per call
+    """
+    timer: timeit.Timer = timeit.Timer(setup())
+
+    if number is None:
+        number = timer.autorange()[0]
+
+    seconds_per_call: List[float] = [seconds / number for seconds in timer.repeat(repeat, number)]
+
+    return {'number': number, 'best': min(seconds_per_call), 'median': statistics.median(seconds_per_call)}
+
+
+def run_benchmarks(names: List[str], repeat: int, number: Optional[int] = None) -> Dict[str, Any]:
+    """
+    :param names: the names of the benchmarks to run
+    :param repeat: the number of times each benchmark is timed
+    :param number: the number of calls of each benchmark each time it is timed, or None to calibrate it
+    :return: the results of the benchmarks, along with the python they ran on
+    """
+    return {'python': platform.python_implementation() + ' ' + platform.python_version(),
+            'benchmarks': {name: run_benchmark(setup, repeat, number) for name, setup in BENCHMARKS if name in names}}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compares the best time of every benchmark to that of a baseline.
+
+    :param results: the results of the benchmarks
+    :param baseline: the results of an earlier run of the benchmarks
+    :param threshold: the fraction a benchmark may be slower than its baseline before it counts as a regression
+    :return: the names of the benchmarks that regressed
+    """
+    regressions: List[str] = []
+
+    for name, result in results['benchmarks'].items():
+        if name in baseline['benchmarks'] and result['best'] > baseline['benchmarks'][name]['best'] * (1 + threshold):
+            regressions.append(name)
+
+    return regressions
+
+
+def format_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """
+    :param results: the results of the benchmarks
+    :param baseline: the results of an earlier run of the benchmarks, if any
+    :return: a table of the best and median microseconds per call of every benchmark, and their change from the
+             baseline
+    """
+    lines: List[str] = [results['python'] + ', microseconds per call:']
+
+    for name, result in results['benchmarks'].items():
+        line: str = '  ' + name.ljust(26) + ('%.3f' % (result['best'] * 1e6)).rjust(12) + ' best' + \
+                    ('%.3f' % (result['median'] * 1e6)).rjust(12) + ' median'
+
+        if baseline is not None and name in baseline['benchmarks']:
+            change: float = result['best'] / baseline['benchmarks'][name]['best'] - 1
+            line = line + ('%+.1f%%' % (100 * change)).rjust(10) + ' vs baseline'
+
+        lines.append(line)
+
+    return '\n'.join(lines) + '\n'
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    """
+    Runs the benchmarks, prints their results, and optionally saves them or compares them to a saved baseline.
+
+    :param arguments: the command line arguments, defaulting to those of the process
+    :return: the exit status, which is 1 if a benchmark regressed from the baseline
+    """
+    names: List[str] = [name for name, _ in BENCHMARKS]
+
+    parser = argparse.ArgumentParser(prog='python -m dns_shark.bench',
+                                     description='Microbenchmarks of the codec and resolver hot paths of dns shark.')
+    parser.add_argument('--only', nargs='+', choices=names, default=names, help='The benchmarks to run.')
+    parser.add_argument('--repeat', type=int, default=5, help='The number of times each benchmark is timed.')
+    parser.add_argument('--number', type=int, default=None,
+                        help='The number of calls each time a benchmark is timed. Calibrated by default.')
+    parser.add_argument('--output', help='The json file to save the results in.')
+    parser.add_argument('--baseline', help='The json file of earlier results to compare the results to.')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='The fraction a benchmark may be slower than its baseline before it counts as a '
+                             'regression.')
+    args = parser.parse_args(arguments)
+
+    results: Dict[str, Any] = run_benchmarks(args.only, args.repeat, args.number)
+    baseline: Optional[Dict[str, Any]] = None
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    sys.stdout.write(format_results(results, baseline))
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is None:
+        return 0
+
+    regressions: List[str] = compare(results, baseline, args.threshold)
+
+    if regressions:
+        sys.stdout.write('regressed by more than ' + str(round(100 * args.threshold)) + '%: ' +
+                         ', '.join(regressions) + '\n')
+        return 1
+
+    return 0
@@ -3,18 +3,20 @@ Contains functions that handles command line parsing logic.
 """
 
 import argparse
+from dns_shark.record_writer import OUTPUT_FORMATS
 
 
 def create_parser():
     """
     Creates a command line parser.
 
-    There are four arguments allowed for this parser:
+    There are five arguments allowed for this parser:
 
     (1) the dns server ip (required)
     (2) the domain name to be resolved (resolved)
     (3) a verbose option, to print tracing information (optional)
     (4) an ipv6 option, to return the ipv6 address for a domain name (optional)
+    (5) the output format of the answers (optional)
 
     :return: the command line argument parser
     """
@@ -28,5 +30,74 @@ def create_parser():
                         help='If enabled, prints a trace of the resolution. (Input any value to set to true.')
     parser.add_argument("--ipv6", type=bool, nargs=1,
                         help='If enabled, retrieves the IPv6 of the domain name. (Input any value to set to true).')
+    parser.add_argument("--format", type=str, choices=OUTPUT_FORMATS, default='text',
+                        help='The output format of the answers. Defaults to text.')
 
-    return parser
\ No newline at end of file
+    return parser
+
+
+def create_bulk_parser():
+    """
+    Creates the command line parser of bulk mode, which resolves every domain name read from a file or stdin.
+
+    There are six arguments allowed for this parser:
+
+    (1) the dns server ip (required)
+    (2) the file of domain names to be resolved, one per line, or - for stdin (required)
+    (3) the number of name resolutions in progress at once (optional)
+    (4) an ipv6 option, to return the ipv6 addresses of the domain names (optional)
+    (5) the output format of the results (optional)
+    (6) the file to write metrics to once every domain name is resolved (optional)
+
+    :return: the command line argument parser
+    """
+    parser = argparse.ArgumentParser(prog='dns_shark', description='Resolves a list of domain names, writing every '
+                                                                   'result as soon as it is known.')
+
+    parser.add_argument("dns_server_ip", type=str,
+                        help='Consumes the IP address (IPv4 only) of a DNS Server.')
+    parser.add_argument("--input", type=str, required=True,
+                        help='The file of domain names to resolve, one per line, or - to read them from stdin.')
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help='The number of domain names resolved at once. Defaults to 64.')
+    parser.add_argument("--ipv6", action='store_true',
+                        help='If enabled, retrieves the IPv6 addresses of the domain names.')
+    parser.add_argument("--format", type=str, choices=OUTPUT_FORMATS, default='json',
+                        help='The output format of the results. Defaults to json, a line of JSON per domain name.')
+    parser.add_argument("--metrics-file", type=str, default=None,
+                        help='If given, writes metrics in the Prometheus text format to this file periodically, and '
+                             'once the run ends.')
+
+    return parser
+
+
+def create_serve_parser():
+    """
+    Creates the command line parser of the serve command, which runs dns shark as a caching recursive dns server.
+
+    There are five arguments allowed for this parser:
+
+    (1) the ip address to listen on (optional)
+    (2) the port to listen on (optional)
+    (3) the dns server ip that every name resolution begins with (optional)
+    (4) a no tcp option, to only listen for queries over udp (optional)
+    (5) the port to serve metrics on over http (optional)
+
+    :return: the command line argument parser
+    """
+    parser = argparse.ArgumentParser(prog='dns_shark serve', description='Caching recursive DNS server.')
+
+    parser.add_argument("--address", type=str, default='127.0.0.1',
+                        help='The IP address to listen on for queries. Defaults to 127.0.0.1.')
+    parser.add_argument("--port", type=int, default=53,
+                        help='The UDP and TCP port to listen on for queries. Defaults to 53.')
+    parser.add_argument("--dns-server-ip", type=str, default='198.41.0.4',
+                        help='The IP address (IPv4 only) of the DNS Server that every resolution begins with. '
+                             'Defaults to a.root-servers.net.')
+    parser.add_argument("--no-tcp", action='store_true',
+                        help='If enabled, only listens for queries over UDP.')
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help='If given, serves metrics in the Prometheus text format over HTTP on this port of the '
+                             'listening address.')
+
+    return parser
@@ -0,0 +1,349 @@
+from dns_shark.resource_record import ResourceRecord
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+from threading import RLock
+import time
+
+
+class DNSCache:
+    """
+    An in-memory cache of resource records that outlives a single domain name resolution.
+
+    Positive answers are keyed by (domain name, type, class) and expire once the smallest ttl among the cached
+    resource records has elapsed. Resource records handed out by the cache have their ttl reduced by the amount of time
+    they have spent in the cache.
+
+    Delegations (zone cuts) are keyed by zone and hold the name server names and glue addresses of the zone, so that a
+    name resolution can begin at the deepest known zone cut instead of the root.
+
+    Negative answers (name errors and responses without data of the requested type) are cached along with the SOA record
+    that accompanied them, for the smaller of the SOA record's ttl and minimum field. A cached name error also covers
+    every domain name below it. See https://tools.ietf.org/rfc/rfc2308.txt and https://tools.ietf.org/rfc/rfc8020.txt.
+
+    The cache is thread safe, so a single cache may serve name resolutions running on many threads.
+
+    Instance Attributes:
+
+        clock: a function returning the current time in seconds, used to compute expiry times
+        max_entries: the maximum number of entries of each kind held by the cache before the least recently used ones
+                     are evicted
+        max_delegation_ttl: the maximum number of seconds a delegation is cached for, whatever the ttl of its records
+        answers: maps (domain name, type, class) keys to (insertion time, expiry time, resource records) entries
+        delegations: maps zones to (insertion time, expiry time, name server names, glue addresses) entries
+        name_errors: maps domain names that do not exist to (insertion time, expiry time, SOA record) entries
+        no_data: maps (domain name, type, class) keys without any records to (insertion time, expiry time, SOA record)
+                 entries
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, max_entries: int = 100000,
+                 max_delegation_ttl: int = 86400):
+        self.clock: Callable[[], float] = clock
+        self.max_entries: int = max_entries
+        self.max_delegation_ttl: int = max_delegation_ttl
+        self.answers: 'OrderedDict[Tuple[str, int, int], Tuple[float, float, List[ResourceRecord]]]' = OrderedDict()
+        self.delegations: 'OrderedDict[str, Tuple[float, float, List[str], List[str]]]' = OrderedDict()
+        self.name_errors: 'OrderedDict[str, Tuple[float, float, ResourceRecord]]' = OrderedDict()
+        self.no_data: 'OrderedDict[Tuple[str, int, int], Tuple[float, float, ResourceRecord]]' = OrderedDict()
+        self._lock: RLock = RLock()
+
+    def get_answers(self, domain_name: str, type: int, response_class: int = 1) -> Optional[List[ResourceRecord]]:
+        """
+        Retrieves the unexpired answer records cached for the domain name, type and class.
+
+        :param domain_name: the domain name whose answer records are being looked up
+        :param type: the resource record type being looked up
+        :param response_class: the resource record class being looked up (1 for Internet)
+        :return: copies of the cached answer records with their ttl aged, if present. Otherwise, return None.
+        """
+        with self._lock:
+            key: Tuple[str, int, int] = (domain_name.lower(), type, response_class)
+            entry: Optional[Tuple[float, float, List[ResourceRecord]]] = self.answers.get(key)
+
+            if entry is None:
+                return None
+
+            inserted_at, expires_at, records = entry
+            now: float = self.clock()
+
+            if now >= expires_at:
+                del self.answers[key]
+                return None
+
+            self.answers.move_to_end(key)
+
+            elapsed: int = int(now - inserted_at)
+            return [record.copy_with_ttl(max(record.ttl - elapsed, 0)) for record in records]
+
+    def add_answers(self, domain_name: str,
+                    type: int,
+                    records: List[ResourceRecord],
+                    response_class: int = 1,
+                    ttl: Optional[int] = None) -> None:
+        """
+        Caches the answer records for the domain name, type and class.
+
+        Nothing is cached if there are no records or the ttl is zero, since such answers may only be used for the
+        transaction in progress.
+
+        :param domain_name: the domain name the answer records were resolved for
+        :param type: the resource record type the answer records were resolved for
+        :param records: the answer records to cache
+        :param response_class: the resource record class the answer records were resolved for (1 for Internet)
+        :param ttl: the number of seconds the answer records may be cached for. Defaults to the smallest record ttl.
+        :return: None
+        """
+        with self._lock:
+            if not records:
+                return
+
+            if ttl is None:
+                ttl = min(record.ttl for record in records)
+
+            if ttl <= 0:
+                return
+
+            key: Tuple[str, int, int] = (domain_name.lower(), type, response_class)
+            now: float = self.clock()
+
+            self.answers.pop(key, None)
+            self.answers[key] = (now, now + ttl, list(records))
+            self._evict(self.answers)
+
+    def add_delegation(self, zone: str,
+                       name_server_records: List[ResourceRecord],
+                       additional_records: List[ResourceRecord]) -> None:
+        """
+        Caches the delegation of a zone to its name servers, as found in the authority and additional sections of a
+        referral.
+
+        Only glue records of name servers inside the delegated zone are used, since glue for any other domain name
+        would let the referral supply the address of a domain name the zone has no authority over. The delegation is
+        cached for the smallest ttl among the name server records and the glue records used, but no longer than the
+        maximum delegation ttl.
+
+        The caller is responsible for only passing referrals from dns servers whose bailiwick encloses the zone.
+
+        :param zone: the zone that is delegated by the referral
+        :param name_server_records: the name server records of the referral
+        :param additional_records: the additional records of the referral, possibly containing glue addresses
+        :return: None
+        """
+        with self._lock:
+            zone = zone.lower()
+            name_server_names: List[str] = []
+            addresses: List[str] = []
+            ttls: List[int] = []
+
+            for name_server_record in name_server_records:
+                if name_server_record.type != 2 or name_server_record.name.lower() != zone:
+                    continue
+
+                name_server_names.append(name_server_record.rdata.lower())
+                ttls.append(name_server_record.ttl)
+
+                if not DNSCache.is_in_zone(name_server_record.rdata.lower(), zone):
+                    continue
+
+                for additional_record in additional_records:
+                    if additional_record.type == 1 and \
+                            additional_record.name.lower() == name_server_record.rdata.lower() and \
+                            additional_record.rdata not in addresses:
+                        addresses.append(additional_record.rdata)
+                        ttls.append(additional_record.ttl)
+
+            if not name_server_names or min(ttls) <= 0:
+                return
+
+            now: float = self.clock()
+
+            self.delegations.pop(zone, None)
+            self.delegations[zone] = (now, now + min(min(ttls), self.max_delegation_ttl), name_server_names, addresses)
+            self._evict(self.delegations)
+
+    def get_closest_name_server_addresses(self, domain_name: str) -> Optional[List[str]]:
+        """
+        Retrieves the name server addresses of the deepest cached zone cut that encloses the domain name.
+
+        :param domain_name: the domain name about to be resolved
+        :return: the name server addresses of the closest enclosing zone, if any are cached. Otherwise, return None.
+        """
+        zone_cut: Optional[Tuple[str, List[str]]] = self.get_closest_zone_cut(domain_name)
+
+        return zone_cut[1] if zone_cut is not None else None
+
+    def get_closest_zone_cut(self, domain_name: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Retrieves the deepest cached zone cut that encloses the domain name, and its name server addresses.
+
+        Name servers without glue addresses are looked up amongst the cached answers. Zones whose name server addresses
+        are all unknown are skipped in favour of their enclosing zone.
+
+        :param domain_name: the domain name about to be resolved
+        :return: the closest enclosing zone and its name server addresses, if any are cached. Otherwise, return None.
+        """
+        with self._lock:
+            labels: List[str] = domain_name.lower().split('.')
+            now: float = self.clock()
+
+            for i in range(len(labels)):
+                zone: str = '.'.join(labels[i:])
+                entry: Optional[Tuple[float, float, List[str], List[str]]] = self.delegations.get(zone)
+
+                if entry is None:
+                    continue
+
+                _, expires_at, name_server_names, glue_addresses = entry
+
+                if now >= expires_at:
+                    del self.delegations[zone]
+                    continue
+
+                addresses: List[str] = list(glue_addresses)
+
+                for name_server_name in name_server_names:
+                    for record in self.get_answers(name_server_name, 1) or []:
+                        if record.rdata not in addresses:
+                            addresses.append(record.rdata)
+
+                if addresses:
+                    self.delegations.move_to_end(zone)
+                    return zone, addresses
+
+            return None
+
+    def add_name_error(self, domain_name: str, authority_records: List[ResourceRecord]) -> None:
+        """
+        Caches that a domain name, and thus every domain name below it, does not exist.
+
+        Nothing is cached if the authority records lack an SOA record, since the negative answer has no ttl.
+
+        :param domain_name: the domain name that the name error was received for
+        :param authority_records: the authority records of the response containing the name error
+        :return: None
+        """
+        self._add_negative_entry(self.name_errors, domain_name.lower(), authority_records)
+
+    def add_no_data(self, domain_name: str,
+                    type: int,
+                    authority_records: List[ResourceRecord],
+                    response_class: int = 1) -> None:
+        """
+        Caches that a domain name exists but has no resource records of the type and class.
+
+        Nothing is cached if the authority records lack an SOA record, since the negative answer has no ttl.
+
+        :param domain_name: the domain name that the empty response was received for
+        :param type: the resource record type that the empty response was received for
+        :param authority_records: the authority records of the empty response
+        :param response_class: the resource record class that the empty response was received for (1 for Internet)
+        :return: None
+        """
+        self._add_negative_entry(self.no_data, (domain_name.lower(), type, response_class), authority_records)
+
+    def get_name_error(self, domain_name: str) -> Optional[ResourceRecord]:
+        """
+        Checks whether the domain name, or any domain name above it, is cached as not existing.
+
+        :param domain_name: the domain name about to be resolved
+        :return: the aged SOA record of the cached name error, if present. Otherwise, return None.
+        """
+        labels: List[str] = domain_name.lower().split('.')
+
+        for i in range(len(labels)):
+            soa_record: Optional[ResourceRecord] = self._get_negative_entry(self.name_errors, '.'.join(labels[i:]))
+
+            if soa_record is not None:
+                return soa_record
+
+        return None
+
+    def get_no_data(self, domain_name: str, type: int, response_class: int = 1) -> Optional[ResourceRecord]:
+        """
+        Checks whether the domain name is cached as having no resource records of the type and class.
+
+        :param domain_name: the domain name about to be resolved
+        :param type: the resource record type about to be resolved
+        :param response_class: the resource record class about to be resolved (1 for Internet)
+        :return: the aged SOA record of the cached empty response, if present. Otherwise, return None.
+        """
+        return self._get_negative_entry(self.no_data, (domain_name.lower(), type, response_class))
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+
+        :return: None
+        """
+        with self._lock:
+            self.answers.clear()
+            self.delegations.clear()
+            self.name_errors.clear()
+            self.no_data.clear()
+
+    def _add_negative_entry(self, entries: 'OrderedDict', key: Hashable, authority_records: List[ResourceRecord]) -> None:
+        """
+        Caches a negative answer under the key, for the smaller of the SOA record's ttl and minimum field.
+
+        :param entries: the negative cache entries to add to
+        :param key: the key of the negative answer
+        :param authority_records: the authority records that accompanied the negative answer
+        :return: None
+        """
+        with self._lock:
+            for record in authority_records:
+                if record.type == 6:
+                    ttl: int = min(record.ttl, record.get_soa_minimum())
+
+                    if ttl > 0:
+                        now: float = self.clock()
+                        entries.pop(key, None)
+                        entries[key] = (now, now + ttl, record)
+                        self._evict(entries)
+
+                    return
+
+    def _get_negative_entry(self, entries: 'OrderedDict', key: Hashable) -> Optional[ResourceRecord]:
+        """
+        Retrieves an unexpired negative answer.
+
+        :param entries: the negative cache entries to search
+        :param key: the key of the negative answer
+        :return: the SOA record of the negative answer with its ttl aged, if present. Otherwise, return None.
+        """
+        with self._lock:
+            entry: Optional[Tuple[float, float, ResourceRecord]] = entries.get(key)
+
+            if entry is None:
+                return None
+
+            inserted_at, expires_at, soa_record = entry
+            now: float = self.clock()
+
+            if now >= expires_at:
+                del entries[key]
+                return None
+
+            entries.move_to_end(key)
+            return soa_record.copy_with_ttl(int(expires_at - now))
+
+    @staticmethod
+    def is_in_zone(domain_name: str, zone: str) -> bool:
+        """
+        :param domain_name: a domain name, in lower case
+        :param zone: a zone, in lower case, or the empty string for the root
+        :return: True if the domain name is the zone itself or lies below it. Otherwise, return False.
+        """
+        return zone == '' or domain_name == zone or domain_name.endswith('.' + zone)
+
+    def _evict(self, entries: 'OrderedDict') -> None:
+        """
+        If the entries exceed the maximum size of the cache, drop the least recently used ones, which are kept first.
+
+        Expired entries are not searched for, since that would scan every entry of a full cache on every insert. They
+        are dropped by the lookups that find them instead, and otherwise soon become the least recently used.
+
+        :param entries: the cache entries to bound
+        :return: None
+        """
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
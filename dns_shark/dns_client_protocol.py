@@ -0,0 +1,95 @@
+import asyncio
+from dns_shark.dns_message import DNSMessage
+from dns_shark.domain_name_handling import WireData
+from typing import Dict, Optional, Tuple
+
+
+class DNSClientProtocol(asyncio.DatagramProtocol):
+    """
+    An asyncio datagram protocol that multiplexes any number of outstanding dns queries over a single udp socket.
+
+    Every query is registered under its query id and the address of the dns server it was sent to. An incoming response
+    is handed to the query waiting for that query id from that address; every other datagram is discarded.
+
+    Instance Attributes:
+
+        transport: the datagram transport of the protocol, once the connection has been made
+        pending: maps (query id, dns server address) keys to the futures awaiting the matching response
+    """
+
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.pending: Dict[Tuple[int, Tuple[str, int]], asyncio.Future] = {}
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        error: Exception = exc if exc is not None else ConnectionError('The dns client socket was closed.')
+
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+        self.pending.clear()
+        self.transport = None
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            dns_message: DNSMessage = DNSMessage.decode_dns_message(data)
+        except Exception:
+            return  # a datagram that cannot be decoded cannot be a response to any of our queries
+
+        if not dns_message.is_response:
+            return
+
+        future: Optional[asyncio.Future] = self.pending.pop((dns_message.query_id, (addr[0], addr[1])), None)
+
+        if future is not None and not future.done():
+            future.set_result(dns_message)
+
+    def error_received(self, exc: Exception) -> None:
+        pass  # an icmp error cannot be attributed to a single query. The affected query is left to time out.
+
+    def is_pending(self, query_id: int, addr: Tuple[str, int]) -> bool:
+        """
+        Checks whether a query with the query id is already awaiting a response from the address.
+
+        :param query_id: the query id of the dns query
+        :param addr: the address of the dns server
+        :return: true if such a query is outstanding, false otherwise
+        """
+        return (query_id, addr) in self.pending
+
+    def query(self, data: WireData, addr: Tuple[str, int], query_id: int) -> asyncio.Future:
+        """
+        Sends a dns query to a dns server and registers interest in its response.
+
+        :param data: the encoded dns query
+        :param addr: the (ip address, port) of the dns server
+        :param query_id: the query id of the encoded dns query
+        :raises: ConnectionError if the protocol is not connected
+        :return: a future that resolves to the decoded dns response
+        """
+        if self.transport is None:
+            raise ConnectionError('The dns client socket is not open.')
+
+        key: Tuple[int, Tuple[str, int]] = (query_id, addr)
+        future: asyncio.Future = asyncio.get_event_loop().create_future()
+        future.add_done_callback(lambda _: self._forget(key, future))
+
+        self.pending[key] = future
+        self.transport.sendto(data, addr)
+
+        return future
+
+    def _forget(self, key: Tuple[int, Tuple[str, int]], future: asyncio.Future) -> None:
+        """
+        Stops waiting for the response to a query, e.g. once its future has been cancelled.
+
+        :param key: the (query id, dns server address) key of the query
+        :param future: the future that was awaiting the response
+        :return: None
+        """
+        if self.pending.get(key) is future:
+            del self.pending[key]
@@ -1,7 +1,10 @@
 from dns_shark.dns_question import DNSQuestion
 from dns_shark.resource_record import ResourceRecord
-from typing import List, Optional
+from dns_shark.domain_name_handling import DomainNameDecoder, WireData
+from typing import Dict, List, Optional, Tuple, Union
 from io import BytesIO
+import struct
+import sys
 
 
 class DNSMessage:
@@ -31,8 +34,18 @@ class DNSMessage:
         additional records: a list of the additional resource records in the dns message
 
         see https://tools.ietf.org/rfc/rfc1035.txt for more description on the meaning of these fields
+
+    The sections of a dns message decoded from bytes are decoded from those bytes when first accessed, see
+    decode_dns_message.
     """
 
+    __slots__ = ('query_id', 'is_response', 'opcode', 'authoritative', 'is_truncated', 'recursion_desired',
+                 'recursion_available', 'rcode', 'question_count', 'answer_count', 'nameserver_count', 'additional_count',
+                 '_dns_questions', '_answer_records', '_name_server_records', '_additional_records', '_message',
+                 '_section_offsets', '_suffixes')
+
+    _header_fields: struct.Struct = struct.Struct('!HHHHHH')  # query id, flags, and the four counts
+
     def __init__(self,
                  query_id: int,
                  is_response: bool,
@@ -68,18 +81,196 @@ class DNSMessage:
         self.nameserver_count: int = name_server_count
         self.additional_count: int = additional_count
 
-        # resource records and dns questions
-        self.dns_questions: List[DNSQuestion] = dns_questions
-        self.answer_records: List[ResourceRecord] = answer_records
-        self.name_server_records: List[ResourceRecord] = name_server_records
-        self.additional_records: List[ResourceRecord] = additional_records
+        # resource records and dns questions, or None for the sections of a decoded dns message yet to be decoded
+        self._dns_questions: Optional[List[DNSQuestion]] = dns_questions
+        self._answer_records: Optional[List[ResourceRecord]] = answer_records
+        self._name_server_records: Optional[List[ResourceRecord]] = name_server_records
+        self._additional_records: Optional[List[ResourceRecord]] = additional_records
+
+        # the encoded dns message the sections are decoded from, the offsets of the sections found so far, and the
+        # domain name suffixes decoded so far
+        self._message: Optional[WireData] = None
+        self._section_offsets: List[int] = []
+        self._suffixes: Dict[int, str] = {}
+
+    @property
+    def dns_questions(self) -> List[DNSQuestion]:
+        if self._dns_questions is None:
+            self._dns_questions = DNSMessage._read_dns_questions(self._get_message(), self._get_section_offset(0),
+                                                                 self.question_count, self._suffixes)[0]
+
+        return self._dns_questions
+
+    @dns_questions.setter
+    def dns_questions(self, dns_questions: List[DNSQuestion]) -> None:
+        self._dns_questions = dns_questions
+
+    @property
+    def answer_records(self) -> List[ResourceRecord]:
+        if self._answer_records is None:
+            self._answer_records = DNSMessage._read_resource_records(self._get_message(), self._get_section_offset(1),
+                                                             self.answer_count, self._suffixes)[0]
+
+        return self._answer_records
+
+    @answer_records.setter
+    def answer_records(self, answer_records: List[ResourceRecord]) -> None:
+        self._answer_records = answer_records
+
+    @property
+    def name_server_records(self) -> List[ResourceRecord]:
+        if self._name_server_records is None:
+            self._name_server_records = DNSMessage._read_resource_records(self._get_message(), self._get_section_offset(2),
+                                                             self.nameserver_count, self._suffixes)[0]
+
+        return self._name_server_records
+
+    @name_server_records.setter
+    def name_server_records(self, name_server_records: List[ResourceRecord]) -> None:
+        self._name_server_records = name_server_records
+
+    @property
+    def additional_records(self) -> List[ResourceRecord]:
+        if self._additional_records is None:
+            self._additional_records = DNSMessage._read_resource_records(self._get_message(), self._get_section_offset(3),
+                                                             self.additional_count, self._suffixes)[0]
+
+        return self._additional_records
+
+    @additional_records.setter
+    def additional_records(self, additional_records: List[ResourceRecord]) -> None:
+        self._additional_records = additional_records
+
+    @property
+    def opt_record(self) -> Optional[ResourceRecord]:
+        """
+        :return: the EDNS0 OPT pseudo resource record of the additional section, or None for a dns message without EDNS0
+        """
+        if self.additional_count == 0 and self._additional_records is None:
+            return None  # spare decoding the other sections of a dns message without additional records
+
+        for additional_record in self.additional_records:
+            if additional_record.type == 41:
+                return additional_record
+
+        return None
+
+    @property
+    def udp_payload_size(self) -> Optional[int]:
+        """
+        :return: the udp payload size advertised by the OPT record of the dns message, at least 512 as per RFC 6891
+                 section 6.2.5, or None for a dns message without EDNS0
+        """
+        opt_record: Optional[ResourceRecord] = self.opt_record
+
+        return max(opt_record.response_class, 512) if opt_record is not None else None
+
+    def decode_sections(self) -> None:
+        """
+        Decodes every section of the dns message that was not decoded yet, so that a malformed dns message is detected
+        up front rather than once its sections are accessed.
+
+        :raises: IndexError, ValueError or struct.error if a section cannot be decoded
+        :return: None
+        """
+        self.dns_questions
+        self.answer_records
+        self.name_server_records
+        self.additional_records
+
+    def encode(self) -> bytes:
+        """
+        Encode the dns message, compressing its domain names.
+
+        The counts of the encoded dns message are those of its sections, rather than the count attributes.
+
+        :raises: ValueError if the rdata of a resource record cannot be encoded
+        :return: the encoded dns message
+        """
+        flags: int = (self.is_response << 15) | (self.opcode << 11) | (self.authoritative << 10) | \
+            (self.is_truncated << 9) | (self.recursion_desired << 8) | (self.recursion_available << 7) | self.rcode
+
+        message: bytearray = bytearray(DNSMessage._header_fields.pack(self.query_id, flags, len(self.dns_questions),
+                                                                      len(self.answer_records),
+                                                                      len(self.name_server_records),
+                                                                      len(self.additional_records)))
+        suffixes: Dict[str, int] = {}  # the domain name suffixes written out so far, for compression
+
+        for dns_question in self.dns_questions:
+            dns_question.encode_into(message, suffixes)
+
+        for records in [self.answer_records, self.name_server_records, self.additional_records]:
+            for record in records:
+                record.encode_into(message, suffixes)
+
+        return bytes(message)
 
     @staticmethod
-    def decode_dns_message(data: BytesIO):
-        query_id: int = int.from_bytes(data.read(2), 'big')
+    def decode_dns_message(data: Union[BytesIO, WireData]) -> 'DNSMessage':
+        """
+        Decode a dns message.
 
-        # retrieve flag values from data
-        flags: int = int.from_bytes(data.read(2), 'big')
+        A dns message decoded from bytes is decoded lazily: only its header is decoded up front, and each of its
+        sections is decoded when it is first accessed. Thus a dns message that is discarded after a look at its header,
+        such as a response to some other query, costs next to nothing, and sections that are never accessed are never
+        decoded. A memoryview or bytearray is copied, so that the buffer it refers to may be reused.
+
+        :param data: the bytes of the entire dns message, or a BytesIO holding them positioned at the start of the dns
+                     message, which is decoded entirely and advanced past the dns message
+        :raises: struct.error if the data is too short to hold a dns message header
+        :return: the decoded dns message
+        """
+        if isinstance(data, BytesIO):
+            with data.getbuffer() as message:
+                dns_message, offset = DNSMessage.decode_dns_message_at(message, data.tell())
+
+            data.seek(offset)
+            return dns_message
+
+        return DNSMessage._decode_header_at(bytes(data), 0)
+
+    @staticmethod
+    def decode_dns_message_at(message: WireData, offset: int) -> Tuple['DNSMessage', int]:
+        """
+        Decode the entire dns message at an offset of the message bytes, without copying them.
+
+        :param message: the bytes holding the dns message
+        :param offset: the offset of the start of the dns message
+        :return: the decoded dns message, and the offset just past the dns message
+        """
+        dns_message: DNSMessage = DNSMessage._decode_header_at(message, offset)
+        offset = dns_message._section_offsets[0]
+
+        # decode every section straight away, so that the decoded dns message no longer refers to the message bytes
+        suffixes: Dict[int, str] = {}
+        dns_message.dns_questions, offset = DNSMessage._read_dns_questions(message, offset,
+                                                                           dns_message.question_count, suffixes)
+        dns_message.answer_records, offset = DNSMessage._read_resource_records(message, offset,
+                                                                               dns_message.answer_count, suffixes)
+        dns_message.name_server_records, offset = DNSMessage._read_resource_records(message, offset,
+                                                                                    dns_message.nameserver_count,
+                                                                                    suffixes)
+        dns_message.additional_records, offset = DNSMessage._read_resource_records(message, offset,
+                                                                                   dns_message.additional_count,
+                                                                                   suffixes)
+        dns_message._message = None
+
+        return dns_message, offset
+
+    @staticmethod
+    def _decode_header_at(message: WireData, offset: int) -> 'DNSMessage':
+        """
+        Decode the header of the dns message at an offset of the message bytes, leaving its sections to be decoded from
+        the message bytes when they are first accessed.
+
+        :param message: the bytes holding the dns message, which must not change while the dns message is in use
+        :param offset: the offset of the start of the dns message
+        :return: the dns message, with only its header decoded
+        """
+        query_id, flags, question_count, answer_count, name_server_count, additional_count = \
+            DNSMessage._header_fields.unpack_from(message, offset)
+
+        # retrieve flag values from the flags
         is_response: bool = DNSMessage._get_response_value_from_flags(flags)
         opcode: int = DNSMessage._get_opcode_value_from_flags(flags)
         authoritative: bool = DNSMessage._get_authoritative_value_from_flags(flags)
@@ -88,34 +279,67 @@ class DNSMessage:
         recursion_available: bool = DNSMessage._get_recursion_available_value_from_flags(flags)
         rcode: int = DNSMessage._get_rcode_value_from_flags(flags)
 
-        # retrieve counts from data
-        question_count: int = int.from_bytes(data.read(2), 'big')
-        answer_count: int = int.from_bytes(data.read(2), 'big')
-        name_server_count: int = int.from_bytes(data.read(2), 'big')
-        additional_count: int = int.from_bytes(data.read(2), 'big')
-
-        dns_questions: List[DNSQuestion] = DNSMessage._read_dns_questions(data, data, question_count)
-        answer_records: List[ResourceRecord] = DNSMessage._read_resource_records(data, data, answer_count)
-        name_server_records: List[ResourceRecord] = DNSMessage._read_resource_records(data, data, name_server_count)
-        additional_records: List[ResourceRecord] = DNSMessage._read_resource_records(data, data, additional_count)
-
-        return DNSMessage(query_id,
-                          is_response,
-                          opcode,
-                          authoritative,
-                          is_truncated,
-                          recursion_desired,
-                          recursion_available,
-                          rcode,
-                          question_count,
-                          answer_count,
-                          name_server_count,
-                          additional_count,
-                          dns_questions,
-                          answer_records,
-                          name_server_records,
-                          additional_records)
+        dns_message: DNSMessage = DNSMessage(query_id,
+                                             is_response,
+                                             opcode,
+                                             authoritative,
+                                             is_truncated,
+                                             recursion_desired,
+                                             recursion_available,
+                                             rcode,
+                                             question_count,
+                                             answer_count,
+                                             name_server_count,
+                                             additional_count,
+                                             [], [], [], [])
+
+        # leave every section to be decoded once it is accessed
+        dns_message._dns_questions = None
+        dns_message._answer_records = None
+        dns_message._name_server_records = None
+        dns_message._additional_records = None
+        dns_message._message = message
+        dns_message._section_offsets = [offset + DNSMessage._header_fields.size]
+
+        return dns_message
+
+    def _get_message(self) -> WireData:
+        """
+        :raises: ValueError if the dns message was not decoded, and thus lacks a section that it was built without
+        :return: the bytes the sections of the dns message are decoded from
+        """
+        if self._message is None:
+            raise ValueError('The dns message has no bytes to decode its sections from.')
+
+        return self._message
+
+    def _get_section_offset(self, section: int) -> int:
+        """
+        Find the offset of a section of the dns message, skipping over the sections before it without decoding them.
+
+        :param section: the index of the section (0 for questions, 1 for answers, 2 for authority, 3 for additional),
+                        or 4 for the offset just past the dns message
+        :return: the offset of the start of the section within the message bytes
+        """
+        message: WireData = self._get_message()
+        counts: List[int] = [self.question_count, self.answer_count, self.nameserver_count, self.additional_count]
+
+        while len(self._section_offsets) <= section:
+            skipped: int = len(self._section_offsets) - 1
+            offset: int = self._section_offsets[-1]
 
+            for _ in range(counts[skipped]):
+                offset = DomainNameDecoder.skip_domain_name_at(message, offset)
+
+                if skipped == 0:
+                    offset = offset + DNSQuestion._fixed_fields.size
+                else:
+                    rdlength: int = ResourceRecord._fixed_fields.unpack_from(message, offset)[3]
+                    offset = offset + ResourceRecord._fixed_fields.size + rdlength
+
+            self._section_offsets.append(offset)
+
+        return self._section_offsets[section]
 
     @staticmethod
     def _get_response_value_from_flags(flags: int) -> bool:
@@ -188,36 +412,42 @@ class DNSMessage:
         return flags & int.from_bytes(b'\x00\x00\x00\x0f', 'big')
 
     @staticmethod
-    def _read_dns_questions(data: BytesIO, copy_of_message: BytesIO, num_of_questions: int) -> List[DNSQuestion]:
+    def _read_dns_questions(message: WireData, offset: int, num_of_questions: int,
+                            suffixes: Optional[Dict[int, str]] = None) -> Tuple[List[DNSQuestion], int]:
         """
-        Read the dns questions from the remaining dns message data.
+        Read the dns questions at an offset of the dns message.
 
-        :param data: the remaining data of the dns message to be processed
-        :param copy_of_message: a copy of the entire dns message, used for handling pointers in domain names
+        :param message: the entire dns message, used for handling pointers in domain names
+        :param offset: the offset of the first dns question within the dns message
         :param num_of_questions: number of questions to decode
-        :return: list of the dns questions decoded
+        :param suffixes: the domain name suffixes already decoded from the dns message
+        :return: list of the dns questions decoded, and the offset just past the last of them
         """
         list_of_questions = []
         for _ in range(num_of_questions):
-            list_of_questions.append(DNSQuestion.decode_dns_question(data, copy_of_message))
+            dns_question, offset = DNSQuestion.decode_dns_question_at(message, offset, suffixes)
+            list_of_questions.append(dns_question)
 
-        return list_of_questions
+        return list_of_questions, offset
 
     @staticmethod
-    def _read_resource_records(data: BytesIO, copy_of_message: BytesIO, num_of_records: int) -> List[ResourceRecord]:
+    def _read_resource_records(message: WireData, offset: int, num_of_records: int,
+                               suffixes: Optional[Dict[int, str]] = None) -> Tuple[List[ResourceRecord], int]:
         """
-        Read the resource records from the remaining dns message data.
+        Read the resource records at an offset of the dns message.
 
-        :param data: the remaining data of the dns message to be processed
-        :param copy_of_message: a copy of the entire dns message, used for handling pointers in domain names
+        :param message: the entire dns message, used for handling pointers in domain names
+        :param offset: the offset of the first resource record within the dns message
         :param num_of_records: number of records to decode
-        :return: list of the resource records decoded
+        :param suffixes: the domain name suffixes already decoded from the dns message
+        :return: list of the resource records decoded, and the offset just past the last of them
         """
         list_of_records = []
         for _ in range(num_of_records):
-            list_of_records.append(ResourceRecord.decode_resource_record(data, copy_of_message))
+            resource_record, offset = ResourceRecord.decode_resource_record_at(message, offset, suffixes)
+            list_of_records.append(resource_record)
 
-        return list_of_records
+        return list_of_records, offset
 
     def print_dns_query(self, dns_server_ip: str) -> None:
         """
@@ -241,16 +471,13 @@ class DNSMessage:
 
         :return: None
         """
-        print('Response ID: ' + str(self.query_id) + ' Authoritative = ' + str(self.authoritative))
-
-        print('  Answers (' + str(self.answer_count) + ')')
-        DNSMessage.print_resource_records_trace(self.answer_records)
-
-        print('  Name Servers (' + str(self.nameserver_count) + ')')
-        DNSMessage.print_resource_records_trace(self.name_server_records)
-
-        print('  Additional Information (' + str(self.additional_count) + ')')
-        DNSMessage.print_resource_records_trace(self.additional_records)
+        sys.stdout.write('Response ID: ' + str(self.query_id) + ' Authoritative = ' + str(self.authoritative) + '\n' +
+                         '  Answers (' + str(self.answer_count) + ')\n' +
+                         DNSMessage.format_resource_records_trace(self.answer_records) +
+                         '  Name Servers (' + str(self.nameserver_count) + ')\n' +
+                         DNSMessage.format_resource_records_trace(self.name_server_records) +
+                         '  Additional Information (' + str(self.additional_count) + ')\n' +
+                         DNSMessage.format_resource_records_trace(self.additional_records))
 
     @staticmethod
     def print_resource_records_trace(records: List[ResourceRecord]) -> None:
@@ -260,8 +487,17 @@ class DNSMessage:
         :param records: a list of resource records
         :return: None
         """
-        for record in records:
-            record.print_record_for_trace()
+        sys.stdout.write(DNSMessage.format_resource_records_trace(records))
+
+    @staticmethod
+    def format_resource_records_trace(records: List[ResourceRecord]) -> str:
+        """
+        Format a list of resource records, one per line, as print_resource_records_trace prints them.
+
+        :param records: a list of resource records
+        :return: the formatted resource records
+        """
+        return ''.join(record.format_record_for_trace() + '\n' for record in records)
 
     @staticmethod
     def get_matching_answer_records(records: List[ResourceRecord], domain_name: str, type: int) -> List[ResourceRecord]:
@@ -298,6 +534,27 @@ class DNSMessage:
 
         return None
 
+    @staticmethod
+    def get_name_server_ip_addresses(name_server_records: List[ResourceRecord],
+                                     additional_records: List[ResourceRecord]) -> List[str]:
+        """
+        Retrieves every available name server ip address, in the order the name server records are listed.
+
+        :param name_server_records: the name server records whose ip addresses are being searched for
+        :param additional_records: the records we are searching for the ip addresses in
+        :return: the name server ip addresses as strings, without duplicates
+        """
+        name_server_ips: List[str] = []
+
+        for name_server_record in name_server_records:
+            for additional_record in additional_records:
+                if additional_record.name.lower() == name_server_record.rdata.lower() and \
+                        additional_record.type == 1 and \
+                        additional_record.rdata not in name_server_ips:
+                    name_server_ips.append(additional_record.rdata)
+
+        return name_server_ips
+
     @staticmethod
     def get_name_server_ip_address_helper(name_server_record: ResourceRecord,
                                           additional_records: List[ResourceRecord]) -> Optional[str]:
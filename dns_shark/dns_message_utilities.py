@@ -1,5 +1,7 @@
-from dns_shark.domain_name_handling import DomainNameEncoder
-from io import BytesIO
+from dns_shark.query_builder import QueryBuilder
+from dns_shark.resource_record import ResourceRecord
+from io import BytesIO, SEEK_END
+from typing import Optional
 
 
 class DNSMessageUtilities:
@@ -10,57 +12,96 @@ class DNSMessageUtilities:
     a specified domain name.
     """
 
+    query_builder: QueryBuilder = QueryBuilder()  # shared by every name resolution, see create_query
+
     @staticmethod
-    def create_domain_name_query(domain_name: str, query_id: int, type_requested: int) -> BytesIO:
+    def create_query(domain_name: str, query_id: int, type_requested: int,
+                     udp_payload_size: Optional[int] = None) -> bytearray:
         """
+        Creates a dns query, from the recently created dns queries for the same domain name and type if possible.
 
         :param domain_name: the domain name to be looked up
         :param query_id: the unique id of this dns query
         :param type_requested: the type of resource requested (ipv4 or ipv6)
+        :param udp_payload_size: the largest udp response we are able to receive, advertised in an EDNS0 OPT record.
+                                 None for a plain dns query, whose udp response is limited to 512 bytes.
         :return: a bytearray that contains a dns query that will request a particular domain name
         """
-        query = BytesIO()
-        DNSMessageUtilities.encode_header(query, query_id)
-        query.write(DomainNameEncoder.encode_domain_name(domain_name))
-        DNSMessageUtilities.encode_query_type(query, type_requested)
-        DNSMessageUtilities.encode_query_class(query, 1)
+        return DNSMessageUtilities.query_builder.build_query(domain_name, query_id, type_requested,
+                                                             udp_payload_size=udp_payload_size)
+
+    @staticmethod
+    def create_opt_record(udp_payload_size: int) -> ResourceRecord:
+        """
+        Creates an EDNS0 OPT pseudo resource record, see RFC 6891 section 6.1.2. Its class holds the udp payload size,
+        and its ttl the extended rcode, version and flags, which are all zero here.
+
+        :param udp_payload_size: the largest udp message the sender of the OPT record is able to receive
+        :return: the OPT record, without any options
+        """
+        return ResourceRecord('', 41, udp_payload_size, 0, 0, raw_rdata=b'')
+
+    @staticmethod
+    def encode_opt_record(udp_payload_size: int) -> bytes:
+        """
+        Encodes an EDNS0 OPT pseudo resource record, to be appended to the additional section of a dns message.
+
+        :param udp_payload_size: the largest udp message the sender of the OPT record is able to receive
+        :return: the encoded OPT record
+        """
+        message: bytearray = bytearray()
+        DNSMessageUtilities.create_opt_record(udp_payload_size).encode_into(message, {})
+
+        return bytes(message)
+
+    @staticmethod
+    def create_domain_name_query(domain_name: str, query_id: int, type_requested: int) -> BytesIO:
+        """
+
+        :param domain_name: the domain name to be looked up
+        :param query_id: the unique id of this dns query
+        :param type_requested: the type of resource requested (ipv4 or ipv6)
+        :return: a BytesIO that contains a dns query that will request a particular domain name, positioned at its end
+        """
+        query = BytesIO(DNSMessageUtilities.create_query(domain_name, query_id, type_requested))
+        query.seek(0, SEEK_END)
         return query
 
     @staticmethod
     def encode_header(query: BytesIO, query_id: int) -> None:
         """
-        Encodes the header of the dns query.
+        Encodes the header of the dns query, as the headers of the dns queries built by create_query are encoded.
+
+        Kept for backwards compatibility; dns queries are built from the templates of create_query.
 
         :param query: the byte array that is accumulating the dns query
         :param query_id: the unique id of the dns query
-        :return: the query with an updated header
+        :return: None
         """
-
-        query.write(query_id.to_bytes(2, 'big'))  # add query id
-        query.write(b'\x00\x00')                  # add flags
-        query.write(b'\x00\x01')                  # add dns question count
-        query.write(b'\x00\x00')                  # add answer record count
-        query.write(b'\x00\x00')                  # add name server count
-        query.write(b'\x00\x00')                  # add additional record count
+        query.write(QueryBuilder._header_fields.pack(query_id, 0, 1, 0, 0, 0))
 
     @staticmethod
     def encode_query_type(query: BytesIO, type: int) -> None:
         """
         Encodes the query type of a dns query.
 
+        Kept for backwards compatibility; dns queries are built from the templates of create_query.
+
         :param query: the byte array that is accumulating the dns query
         :param type: the type of the query
         :return: None
         """
-        query.write(type.to_bytes(2, 'big'))
+        query.write(QueryBuilder._query_id.pack(type))
 
     @staticmethod
     def encode_query_class(query: BytesIO, query_class: int) -> None:
         """
         Encode the query class of a dns query.
 
+        Kept for backwards compatibility; dns queries are built from the templates of create_query.
+
         :param query: the byte array that is accumulating the dns query
         :param query_class: the class of the dns message (1 for Internet)
         :return: None
         """
-        query.write(query_class.to_bytes(2, 'big'))
+        query.write(QueryBuilder._query_id.pack(query_class))
@@ -1,5 +1,7 @@
 from io import BytesIO
-from dns_shark.domain_name_handling import DomainNameDecoder
+from dns_shark.domain_name_handling import DomainNameDecoder, DomainNameEncoder, WireData
+from typing import Dict, Optional, Tuple
+import struct
 
 
 class DNSQuestion:
@@ -15,15 +17,61 @@ class DNSQuestion:
         see https://tools.ietf.org/rfc/rfc1035.txt for more description on the meaning of these fields
     """
 
+    __slots__ = ('name', 'type', 'response_class')
+
+    _fixed_fields: struct.Struct = struct.Struct('!HH')  # type, class
+
     def __init__(self, name: str, type: int, response_class: int):
         self.name: str = name
         self.type: int = type
         self.response_class: int = response_class
 
+    def __eq__(self, other: object):
+        if not isinstance(other, DNSQuestion):
+            return False
+        else:
+            return self.name == other.name and \
+                   self.type == other.type and \
+                   self.response_class == other.response_class
+
+    def __repr__(self):
+        return 'DNSQuestion(name: ' + str(self.name) + ', type: ' + str(self.type) + ', class: ' + \
+               str(self.response_class) + ')'
+
+    def encode_into(self, message: bytearray, suffixes: Dict[str, int]) -> None:
+        """
+        Encode the dns question at the end of a dns message.
+
+        :param message: the dns message encoded so far, which the dns question is appended to
+        :param suffixes: the domain name suffixes already written out in the dns message, see
+                         DomainNameEncoder.encode_domain_name_into
+        :return: None
+        """
+        DomainNameEncoder.encode_domain_name_into(self.name, message, suffixes)
+        message.extend(DNSQuestion._fixed_fields.pack(self.type, self.response_class))
+
     @staticmethod
     def decode_dns_question(data: BytesIO, copy_of_message: BytesIO) -> 'DNSQuestion':
-        name: str = DomainNameDecoder.decode_domain_name(data, copy_of_message)
-        type: int = int.from_bytes(data.read(2), 'big')
-        response_class: int = int.from_bytes(data.read(2), 'big')
+        with data.getbuffer() as message:
+            dns_question, offset = DNSQuestion.decode_dns_question_at(message, data.tell())
+
+        data.seek(offset)
+
+        return dns_question
+
+    @staticmethod
+    def decode_dns_question_at(message: WireData, offset: int,
+                               suffixes: Optional[Dict[int, str]] = None) -> Tuple['DNSQuestion', int]:
+        """
+        Decode the dns question at an offset of a dns message.
+
+        :param message: the entire dns message, used for handling pointers in domain names
+        :param offset: the offset of the start of the dns question within the dns message
+        :param suffixes: the domain name suffixes already decoded from the dns message, see
+                         DomainNameDecoder.decode_domain_name_at
+        :return: the decoded dns question, and the offset just past the dns question
+        """
+        name, offset = DomainNameDecoder.decode_domain_name_at(message, offset, suffixes)
+        type, response_class = DNSQuestion._fixed_fields.unpack_from(message, offset)
 
-        return DNSQuestion(name, type, response_class)
\ No newline at end of file
+        return DNSQuestion(name, type, response_class), offset + DNSQuestion._fixed_fields.size
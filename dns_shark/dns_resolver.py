@@ -1,8 +1,21 @@
-import socket
 from dns_shark.resolver_core import ResolverCore
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Set
 from dns_shark.resource_record import ResourceRecord
+from dns_shark.resolution_result import ResolutionResult
+from dns_shark.dns_cache import DNSCache
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.socket_pool import SocketPool
+from dns_shark.tcp_connection_pool import TCPConnectionPool
+from dns_shark.tracer import Tracer
+from dns_shark.metrics import MetricsRegistry
+from dns_shark.errors.dns_shark_error import DNSSharkError
+from dns_shark.errors.dns_format_error import DNSFormatError
+from dns_shark.errors.dns_network_error import DNSNetworkError
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from random import Random
+import socket
+import struct
 
 
 class Resolver:
@@ -10,29 +23,220 @@ class Resolver:
     This class contains the API for dns shark.
 
     These are the methods that should be used by any other developer seeking to leverage dns shark in their application.
+
+    A resolver is meant to be long-lived: its sockets, cache and configuration are kept across calls to ask, so that
+    repeated lookups are answered from memory and no socket is created per lookup. A resolver should be closed when it
+    is no longer needed, either explicitly or by using it as a context manager:
+
+        with Resolver('199.7.83.42') as resolver:
+            records = resolver.ask('www.google.com')
+
+    Instance Attributes:
+
+        dns_server: the default dns server ipv4 address that name resolutions begin with
+        counter: the maximum number of requests allowed for a single domain name resolution
+        cache: the resource record cache shared by every name resolution of this resolver
+        socket_pool: the pool of udp sockets used to communicate with dns servers
+        tcp_connections: the pool of tcp connections used to retry dns queries whose udp response was truncated
+        random: a random number generator used for choosing query ids
+        timeout: the number of seconds to wait for a response to the first transmission of a dns query
+        retries: the number of rounds of retransmissions of a dns query, with the timeout doubling every round
+        hedge: a boolean flag indicating whether a slow dns query is also sent to the next candidate dns server, after
+               an adaptive delay, instead of only once the timeout elapses
+        round_trip_times: the estimate of dns server round trip times shared by every name resolution of this resolver
+        infrastructure_cache: the name server round trip times, timeouts and errors shared by every name resolution of
+                              this resolver, used to query the fastest name servers first
+        udp_payload_size: the largest udp response the resolver accepts, advertised to dns servers with EDNS0, or None
+                          to send dns queries without EDNS0, whose udp responses are limited to 512 bytes
+        tracer: the tracer that receives the events of every name resolution of this resolver, if any
+        metrics: the metrics registry updated by every name resolution of this resolver, if any
     """
 
-    @staticmethod
-    def ask(domain_name: str, dns_server: str, ipv6: bool = False, verbose: bool = False) -> List[ResourceRecord]:
+    def __init__(self, dns_server: Optional[str] = None,
+                 counter: int = 30,
+                 cache: Optional[DNSCache] = None,
+                 socket_pool: Optional[SocketPool] = None,
+                 random: Optional[Random] = None,
+                 timeout: float = 2.0,
+                 retries: int = 2,
+                 hedge: bool = False,
+                 infrastructure_cache: Optional[InfrastructureCache] = None,
+                 tcp_connections: Optional[TCPConnectionPool] = None,
+                 udp_payload_size: Optional[int] = 1232,
+                 tracer: Optional[Tracer] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.dns_server: Optional[str] = dns_server
+        self.counter: int = counter
+        self.cache: DNSCache = cache if cache is not None else DNSCache()
+        self.socket_pool: SocketPool = socket_pool if socket_pool is not None else SocketPool()
+        self.tcp_connections: TCPConnectionPool = tcp_connections if tcp_connections is not None \
+            else TCPConnectionPool()
+        self.random: Random = random if random is not None else Random()
+        self.timeout: float = timeout
+        self.retries: int = retries
+        self.hedge: bool = hedge
+        self.round_trip_times: RoundTripTimeEstimator = RoundTripTimeEstimator()
+        self.infrastructure_cache: InfrastructureCache = infrastructure_cache if infrastructure_cache is not None \
+            else InfrastructureCache()
+        self.udp_payload_size: Optional[int] = udp_payload_size
+        self.tracer: Optional[Tracer] = tracer
+        self.metrics: Optional[MetricsRegistry] = metrics
+
+    def __enter__(self) -> 'Resolver':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def ask(self, domain_name: str,
+            dns_server: Optional[str] = None,
+            ipv6: bool = False,
+            verbose: bool = False) -> List[ResourceRecord]:
         """
         Resolves a domain name by starting the name resolution at the specified dns server ip.
 
         Can optionally specify whether an ipv6 address or verbose output is desired.
 
+        Answers that were resolved previously are returned from the resolver's cache while their ttl has not expired.
+
         :param domain_name: the domain name that will be resolved
-        :param dns_server: the dns server ipv4 address that the name resolution process will begin with
+        :param dns_server: the dns server ipv4 address that the name resolution process will begin with. Defaults to
+                           the dns server the resolver was created with.
         :param ipv6: a boolean flag indicating whether you want to find an ipv6 address for the domain name
-        :param verbose: a boolean flag indicating whether you want verbose output for the name resolution process
+        :param verbose: a boolean flag indicating whether you want verbose output for the name resolution process. A
+                        resolver with a tracer traces the name resolution with its tracer instead.
         :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError,
-                 DNSZeroCounterError, DNSNoMatchingResourceRecordError
+                 DNSZeroCounterError, DNSNoMatchingResourceRecordError, DNSTimeoutError
         :return: a list of the resource records the domain name resolved to
         """
+        starting_dns_server: str = self._get_starting_dns_server(dns_server)
 
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp_socket:
+        with self.socket_pool.socket() as udp_socket:
 
-            resolver: ResolverCore = ResolverCore(udp_socket, verbose, dns_server, Random())
+            resolver: ResolverCore = ResolverCore(udp_socket, verbose, starting_dns_server, self.random,
+                                                  counter=self.counter, cache=self.cache,
+                                                  timeout=self.timeout, retries=self.retries, hedge=self.hedge,
+                                                  round_trip_times=self.round_trip_times,
+                                                  infrastructure_cache=self.infrastructure_cache,
+                                                  tcp_connections=self.tcp_connections,
+                                                  udp_payload_size=self.udp_payload_size,
+                                                  receive_buffer=self._get_receive_buffer(udp_socket),
+                                                  tracer=self.tracer, metrics=self.metrics)
             type = 28 if ipv6 else 1
 
-            answers: List[ResourceRecord] = resolver.resolve_domain_name(domain_name, dns_server, type)
+            answers: List[ResourceRecord] = resolver.resolve_domain_name(domain_name, starting_dns_server, type)
             return answers
 
+    def ask_many(self, domain_names: Iterable[str],
+                 types: Iterable[int] = (1,),
+                 concurrency: int = 10,
+                 dns_server: Optional[str] = None) -> Iterator[ResolutionResult]:
+        """
+        Resolves many domain names concurrently, each to every one of the requested resource record types.
+
+        Results are yielded in the order the name resolutions complete. A name resolution that fails with a dns shark
+        error, a dns response that cannot be decoded or a socket error is reported as a failed result, without stopping
+        the rest of the batch. At most concurrency name
+        resolutions are in progress at once, and the domain names are consumed lazily, so the domain names may be an
+        arbitrarily long iterator.
+
+        :param domain_names: the domain names that will be resolved
+        :param types: the resource record types each domain name will be resolved to (1 for ipv4, 28 for ipv6)
+        :param concurrency: the maximum number of name resolutions in progress at once
+        :param dns_server: the dns server ipv4 address that the name resolutions will begin with. Defaults to the dns
+                           server the resolver was created with.
+        :return: an iterator over the result of every name resolution, in completion order
+        """
+        starting_dns_server: str = self._get_starting_dns_server(dns_server)
+        requested_types: List[int] = list(types)
+
+        # keep a socket per worker thread, instead of closing sockets that exceed the pool's usual size
+        self.socket_pool.max_idle_sockets = max(self.socket_pool.max_idle_sockets, concurrency)
+
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=concurrency)
+        in_progress: Set[Future] = set()
+
+        try:
+            for domain_name in domain_names:
+                for type in requested_types:
+                    if len(in_progress) >= concurrency:
+                        done, in_progress = wait(in_progress, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+
+                    in_progress.add(executor.submit(self._ask_for_result, domain_name, starting_dns_server, type))
+
+            while in_progress:
+                done, in_progress = wait(in_progress, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        finally:
+            for future in in_progress:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    def _ask_for_result(self, domain_name: str, dns_server: str, type: int) -> ResolutionResult:
+        """
+        Resolves a domain name, capturing any dns shark error in the result instead of raising it. A dns response that
+        cannot be decoded is captured as a format error, and a socket error as a network error.
+
+        :param domain_name: the domain name that will be resolved
+        :param dns_server: the dns server ipv4 address that the name resolution process will begin with
+        :param type: the resource record type the domain name will be resolved to
+        :return: the result of the name resolution
+        """
+        with self.socket_pool.socket() as udp_socket:
+            resolver: ResolverCore = ResolverCore(udp_socket, False, dns_server, self.random,
+                                                  counter=self.counter, cache=self.cache,
+                                                  timeout=self.timeout, retries=self.retries, hedge=self.hedge,
+                                                  round_trip_times=self.round_trip_times,
+                                                  infrastructure_cache=self.infrastructure_cache,
+                                                  tcp_connections=self.tcp_connections,
+                                                  udp_payload_size=self.udp_payload_size,
+                                                  receive_buffer=self._get_receive_buffer(udp_socket),
+                                                  tracer=self.tracer, metrics=self.metrics)
+            try:
+                return ResolutionResult(domain_name, type,
+                                        answers=resolver.resolve_domain_name(domain_name, dns_server, type))
+            except DNSSharkError as e:
+                return ResolutionResult(domain_name, type, error=e)
+            except (IndexError, ValueError, struct.error) as e:
+                return ResolutionResult(domain_name, type,
+                                        error=DNSFormatError("Format error: a dns response could not be decoded: " +
+                                                             str(e)))
+            except OSError as e:
+                return ResolutionResult(domain_name, type, error=DNSNetworkError("Network error: " + str(e)))
+
+    def close(self) -> None:
+        """
+        Closes the sockets and tcp connections of the resolver.
+
+        :return: None
+        """
+        self.socket_pool.close()
+        self.tcp_connections.close()
+
+    def _get_receive_buffer(self, udp_socket: socket.socket) -> bytearray:
+        """
+        :param udp_socket: a socket acquired from the socket pool
+        :return: the receive buffer of the socket, large enough for any udp response to the dns queries of the resolver
+        """
+        return self.socket_pool.receive_buffer(udp_socket, ResolverCore.get_receive_buffer_size(self.udp_payload_size))
+
+    def _get_starting_dns_server(self, dns_server: Optional[str]) -> str:
+        """
+        Determines the dns server a name resolution begins with.
+
+        :param dns_server: the dns server supplied for a single name resolution, if any
+        :raises: ValueError if neither a dns server was supplied nor a default dns server configured
+        :return: the supplied dns server, otherwise the resolver's default dns server
+        """
+        if dns_server is not None:
+            return dns_server
+
+        if self.dns_server is not None:
+            return self.dns_server
+
+        raise ValueError('No dns server was supplied to begin the name resolution with.')
@@ -0,0 +1,350 @@
+import asyncio
+from dns_shark.async_resolver import AsyncResolver
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_message_utilities import DNSMessageUtilities
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_no_matching_resource_record_error import DNSNoMatchingResourceRecordError
+from typing import Dict, List, Optional, Tuple, Type
+import struct
+
+
+class DNSServer:
+    """
+    A caching recursive dns server, answering the queries of clients over udp and tcp on an asyncio event loop.
+
+    A query whose answer is cached, positively or negatively, is answered straight away, without leaving the callback
+    that received it. Every other query is resolved by the async resolver of the server, and concurrent queries for the
+    same question share a single name resolution. Answers that were reached through a CNAME record are flattened, i.e.
+    returned under the domain name that was asked for.
+
+    A udp response that exceeds max_udp_size is truncated, so that the client retries over tcp. A client that
+    advertises a larger udp payload size with EDNS0 receives udp responses of up to that size instead, but no larger
+    than udp_payload_size, and its responses carry an OPT record advertising udp_payload_size in turn.
+
+    Instance Attributes:
+
+        resolver: the async resolver used to resolve queries that are not answered from its cache
+        max_udp_size: the maximum size of a udp response to a query without EDNS0, in bytes
+        udp_payload_size: the maximum size of a udp response to a query with EDNS0, in bytes
+        udp_transport: the datagram transport of the server, once started
+        tcp_server: the tcp server of the server, once started, if tcp is enabled
+    """
+
+    _length: struct.Struct = struct.Struct('!H')  # the length prefix of a dns message sent over tcp
+
+    # the errors raised by decoding the sections of a malformed dns message received from a client
+    _decode_errors: Tuple[Type[Exception], ...] = (IndexError, ValueError, struct.error)
+
+    def __init__(self, resolver: AsyncResolver, max_udp_size: int = 512, udp_payload_size: int = 1232):
+        self.resolver: AsyncResolver = resolver
+        self.max_udp_size: int = max_udp_size
+        self.udp_payload_size: int = udp_payload_size
+        self.udp_transport: Optional[asyncio.DatagramTransport] = None
+        self.tcp_server: Optional[asyncio.AbstractServer] = None
+        self._in_progress: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def start(self, host: str = '127.0.0.1', port: int = 53, tcp: bool = True) -> None:
+        """
+        Starts listening for queries over udp and, optionally, tcp.
+
+        :param host: the ip address to listen on
+        :param port: the port to listen on, or 0 for a port chosen by the operating system
+        :param tcp: a boolean flag indicating whether to also listen for queries over tcp, on the same port
+        :return: None
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+
+        self.udp_transport, _ = await loop.create_datagram_endpoint(lambda: DNSServerProtocol(self),
+                                                                    local_addr=(host, port))
+
+        if tcp:
+            self.tcp_server = await asyncio.start_server(self._serve_tcp_client, host, self.address[1])
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """
+        :return: the (ip address, port) the server listens on
+        """
+        if self.udp_transport is None:
+            raise ValueError('The dns server has not been started.')
+
+        sockname = self.udp_transport.get_extra_info('sockname')
+        return sockname[0], sockname[1]
+
+    def close(self) -> None:
+        """
+        Stops listening for queries, and closes the resolver of the server.
+
+        :return: None
+        """
+        if self.udp_transport is not None:
+            self.udp_transport.close()
+
+        if self.tcp_server is not None:
+            self.tcp_server.close()
+
+        self.udp_transport = None
+        self.tcp_server = None
+        self.resolver.close()
+
+    @staticmethod
+    def decode_query(data: bytes) -> Optional[DNSMessage]:
+        """
+        Decodes the header of a query received from a client.
+
+        :param data: the received dns message
+        :return: the query, unless the dns message is too short to hold a header or is a response, which are not
+                 answered at all
+        """
+        try:
+            query: DNSMessage = DNSMessage.decode_dns_message(data)
+        except struct.error:
+            return None
+
+        return None if query.is_response else query
+
+    def get_max_udp_size(self, query: DNSMessage) -> int:
+        """
+        Determines the maximum size of the udp response to a query.
+
+        :param query: the query received from a client
+        :return: the udp payload size advertised by the client, capped at that of the server, or the maximum size of a
+                 udp response without EDNS0 if the client advertised none
+        """
+        opt_record: Optional[ResourceRecord] = DNSServer._get_opt_record(query)
+
+        if opt_record is None:
+            return self.max_udp_size
+
+        return max(self.max_udp_size, min(opt_record.response_class, self.udp_payload_size))
+
+    def answer_from_cache(self, query: DNSMessage, max_size: Optional[int] = None) -> Optional[bytes]:
+        """
+        Answers a query without resolving it: from the cache, or with an error if the query cannot be answered.
+
+        :param query: the query received from a client
+        :param max_size: the maximum size of the response in bytes, if any
+        :return: the encoded response, or None if the query must be resolved
+        """
+        rcode: int = DNSServer._check_query(query)
+
+        if rcode != 0:
+            return self._build_response(query, rcode, [], [], max_size)
+
+        question: DNSQuestion = query.dns_questions[0]
+        answers: Optional[List[ResourceRecord]] = self.resolver.cache.get_answers(question.name, question.type)
+
+        if answers is not None:
+            return self._build_response(query, 0, answers, [], max_size)
+
+        soa_record: Optional[ResourceRecord] = self.resolver.cache.get_name_error(question.name)
+
+        if soa_record is not None:
+            return self._build_response(query, 3, [], [soa_record], max_size)
+
+        soa_record = self.resolver.cache.get_no_data(question.name, question.type)
+
+        if soa_record is not None:
+            return self._build_response(query, 0, [], [soa_record], max_size)
+
+        return None
+
+    async def resolve(self, query: DNSMessage, max_size: Optional[int] = None) -> bytes:
+        """
+        Answers a query by resolving its question.
+
+        Name resolutions that fail for any reason other than the domain name or records not existing are answered with
+        a server failure.
+
+        :param query: the query received from a client, which answer_from_cache did not answer
+        :param max_size: the maximum size of the response in bytes, if any
+        :return: the encoded response
+        """
+        question: DNSQuestion = query.dns_questions[0]
+
+        try:
+            answers: List[ResourceRecord] = await self._resolve_question(question.name.lower(), question.type)
+        except DNSNameError:
+            soa_record: Optional[ResourceRecord] = self.resolver.cache.get_name_error(question.name)
+            return self._build_response(query, 3, [], [soa_record] if soa_record is not None else [], max_size)
+        except DNSNoMatchingResourceRecordError:
+            soa_record = self.resolver.cache.get_no_data(question.name, question.type)
+            return self._build_response(query, 0, [], [soa_record] if soa_record is not None else [], max_size)
+        except Exception:
+            # a timeout, a refusal or a malformed response from a name server must not go unanswered
+            return self._build_response(query, 2, [], [], max_size)
+
+        return self._build_response(query, 0, answers, [], max_size)
+
+    async def _resolve_question(self, domain_name: str, type: int) -> List[ResourceRecord]:
+        """
+        Resolves a question, joining the name resolution of the same question already in progress, if any.
+
+        :param domain_name: the domain name of the question, in lower case
+        :param type: the resource record type of the question
+        :raises: see AsyncResolver.resolve
+        :return: the answer records of the question
+        """
+        key: Tuple[str, int] = (domain_name, type)
+        resolution: Optional[asyncio.Future] = self._in_progress.get(key)
+
+        if resolution is None:
+            resolution = asyncio.ensure_future(self.resolver.resolve(domain_name, type))
+            self._in_progress[key] = resolution
+            resolution.add_done_callback(lambda _: self._in_progress.pop(key, None))
+
+        return await asyncio.shield(resolution)
+
+    def _build_response(self, query: DNSMessage,
+                        rcode: int,
+                        answers: List[ResourceRecord],
+                        authority: List[ResourceRecord],
+                        max_size: Optional[int]) -> bytes:
+        """
+        Builds the response to a query.
+
+        :param query: the query received from a client
+        :param rcode: the rcode of the response
+        :param answers: the answer records of the response
+        :param authority: the authority records of the response
+        :param max_size: the maximum size of the response in bytes, if any. A larger response is truncated to its
+                         header, question and OPT record.
+        :return: the encoded response
+        """
+        questions: List[DNSQuestion] = query.dns_questions[:1] if rcode != 1 else []
+
+        if questions:
+            domain_name: str = questions[0].name
+            answers = [answer if answer.name.lower() == domain_name.lower() else answer.copy_with_name(domain_name)
+                       for answer in answers]
+
+        additional: List[ResourceRecord] = []
+
+        if DNSServer._get_opt_record(query) is not None:
+            additional.append(DNSMessageUtilities.create_opt_record(self.udp_payload_size))
+
+        response: DNSMessage = DNSMessage(query.query_id, True, query.opcode, False, False, query.recursion_desired,
+                                          True, rcode, len(questions), len(answers), len(authority), len(additional),
+                                          questions, answers, authority, additional)
+        encoded: bytes = response.encode()
+
+        if max_size is not None and len(encoded) > max_size:
+            response.is_truncated = True
+            response.answer_records = []
+            response.name_server_records = []
+            encoded = response.encode()
+
+        return encoded
+
+    @staticmethod
+    def _check_query(query: DNSMessage) -> int:
+        """
+        Checks whether a query is one the server is able to answer.
+
+        Every section the server reads is decoded here, so that a malformed query is answered with a format error, and
+        its sections never fail to decode later on.
+
+        :param query: the query received from a client
+        :return: 0 if the query can be answered, 1 (format error) if it does not hold exactly one well formed question
+                 or its additional section cannot be decoded, or 4 (not implemented) if it is not a standard query of
+                 the Internet class
+        """
+        if query.question_count != 1:
+            return 1
+
+        try:
+            question: DNSQuestion = query.dns_questions[0]
+            query.opt_record  # decodes the additional section
+        except DNSServer._decode_errors:
+            return 1
+
+        return 0 if query.opcode == 0 and question.response_class == 1 else 4
+
+    @staticmethod
+    def _get_opt_record(query: DNSMessage) -> Optional[ResourceRecord]:
+        """
+        :param query: the query received from a client
+        :return: the EDNS0 OPT record of the query, or None if it has none, or its sections cannot be decoded
+        """
+        try:
+            return query.opt_record
+        except DNSServer._decode_errors:
+            return None
+
+    async def _serve_tcp_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answers the queries of a single tcp connection, one after the other, until the client closes it.
+
+        :param reader: the stream of length prefixed queries from the client
+        :param writer: the stream of length prefixed responses to the client
+        :return: None
+        """
+        try:
+            while True:
+                length: int = DNSServer._length.unpack(await reader.readexactly(DNSServer._length.size))[0]
+                query: Optional[DNSMessage] = DNSServer.decode_query(await reader.readexactly(length))
+
+                if query is None:
+                    break
+
+                response: Optional[bytes] = self.answer_from_cache(query)
+
+                if response is None:
+                    response = await self.resolve(query)
+
+                writer.write(DNSServer._length.pack(len(response)) + response)
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # the client closed the connection
+
+        finally:
+            writer.close()
+
+
+class DNSServerProtocol(asyncio.DatagramProtocol):
+    """
+    The asyncio datagram protocol receiving the udp queries of a dns server.
+
+    Instance Attributes:
+
+        server: the dns server that answers the queries
+        transport: the datagram transport of the protocol, once the connection has been made
+    """
+
+    def __init__(self, server: DNSServer) -> None:
+        self.server: DNSServer = server
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.transport = None
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        query: Optional[DNSMessage] = DNSServer.decode_query(data)
+
+        if query is None or self.transport is None:
+            return
+
+        response: Optional[bytes] = self.server.answer_from_cache(query, self.server.get_max_udp_size(query))
+
+        if response is not None:
+            self.transport.sendto(response, addr)
+        else:
+            asyncio.ensure_future(self._resolve_and_respond(query, addr))
+
+    async def _resolve_and_respond(self, query: DNSMessage, addr: Tuple[str, int]) -> None:
+        """
+        Resolves a query, then sends the response to the client that sent the query.
+
+        :param query: the query received from the client
+        :param addr: the address of the client
+        :return: None
+        """
+        response: bytes = await self.server.resolve(query, self.server.get_max_udp_size(query))
+
+        if self.transport is not None:
+            self.transport.sendto(response, addr)
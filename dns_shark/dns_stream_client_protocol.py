@@ -0,0 +1,133 @@
+import asyncio
+import struct
+from dns_shark.dns_message import DNSMessage
+from dns_shark.domain_name_handling import WireData
+from typing import Dict, Optional
+
+
+class DNSStreamClientProtocol(asyncio.Protocol):
+    """
+    An asyncio protocol that pipelines any number of outstanding dns queries over a single tcp connection to a dns
+    server, as RFC 7766 section 6.2.1 allows.
+
+    Dns messages are prefixed with their length as a 2 byte integer, as per RFC 1035 section 4.2.2. Queries are sent
+    without waiting for the responses to earlier queries, and the dns server may respond in any order, so every response
+    is handed to the query waiting for its query id.
+
+    Instance Attributes:
+
+        transport: the transport of the protocol, once the connection has been made
+        pending: maps query ids to the futures awaiting the matching response
+    """
+
+    _length: struct.Struct = struct.Struct('!H')  # the length prefix of a dns message sent over tcp
+
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.Transport] = None
+        self.pending: Dict[int, asyncio.Future] = {}
+        self._buffer: bytearray = bytearray()
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        error: Exception = exc if exc is not None else ConnectionError('The dns server closed the tcp connection.')
+
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+        self.pending.clear()
+        self.transport = None
+
+    def data_received(self, data: bytes) -> None:
+        self._buffer.extend(data)
+        start: int = 0
+
+        while len(self._buffer) - start >= DNSStreamClientProtocol._length.size:
+            length: int = DNSStreamClientProtocol._length.unpack_from(self._buffer, start)[0]
+            end: int = start + DNSStreamClientProtocol._length.size + length
+
+            if len(self._buffer) < end:
+                break
+
+            self._response_received(bytes(self._buffer[start + DNSStreamClientProtocol._length.size:end]))
+            start = end
+
+        del self._buffer[:start]
+
+    @property
+    def is_open(self) -> bool:
+        """
+        :return: true if the connection is open and queries may be sent over it, false otherwise
+        """
+        return self.transport is not None and not self.transport.is_closing()
+
+    def is_pending(self, query_id: int) -> bool:
+        """
+        Checks whether a query with the query id is already awaiting a response over this connection.
+
+        :param query_id: the query id of the dns query
+        :return: true if such a query is outstanding, false otherwise
+        """
+        return query_id in self.pending
+
+    def query(self, data: WireData, query_id: int) -> asyncio.Future:
+        """
+        Sends a dns query over the connection and registers interest in its response.
+
+        :param data: the encoded dns query
+        :param query_id: the query id of the encoded dns query
+        :raises: ConnectionError if the connection is not open
+        :return: a future that resolves to the decoded dns response
+        """
+        if self.transport is None or self.transport.is_closing():
+            raise ConnectionError('The tcp connection to the dns server is not open.')
+
+        future: asyncio.Future = asyncio.get_event_loop().create_future()
+        future.add_done_callback(lambda _: self._forget(query_id, future))
+
+        self.pending[query_id] = future
+        self.transport.write(DNSStreamClientProtocol._length.pack(len(data)) + bytes(data))
+
+        return future
+
+    def close(self) -> None:
+        """
+        Closes the connection. Queries still awaiting their response fail with a ConnectionError.
+
+        :return: None
+        """
+        if self.transport is not None:
+            self.transport.close()
+
+    def _response_received(self, data: bytes) -> None:
+        """
+        Hands a dns message received over the connection to the query waiting for it, if any.
+
+        :param data: the dns message, without its length prefix
+        :return: None
+        """
+        try:
+            dns_message: DNSMessage = DNSMessage.decode_dns_message(data)
+        except Exception:
+            return  # a dns message that cannot be decoded cannot be a response to any of our queries
+
+        if not dns_message.is_response:
+            return
+
+        future: Optional[asyncio.Future] = self.pending.pop(dns_message.query_id, None)
+
+        if future is not None and not future.done():
+            future.set_result(dns_message)
+
+    def _forget(self, query_id: int, future: asyncio.Future) -> None:
+        """
+        Stops waiting for the response to a query, e.g. once its future has been cancelled.
+
+        :param query_id: the query id of the query
+        :param future: the future that was awaiting the response
+        :return: None
+        """
+        if self.pending.get(query_id) is future:
+            del self.pending[query_id]
@@ -1,5 +1,9 @@
-from typing import List
-from io import StringIO, BytesIO
+from typing import Dict, List, Optional, Tuple, Union
+from io import BytesIO
+import struct
+
+
+WireData = Union[bytes, bytearray, memoryview]  # the bytes of an entire dns message
 
 
 class DomainNameEncoder:
@@ -7,6 +11,8 @@ class DomainNameEncoder:
     Provides the ability to encode a domain name string to the appropriate dns compression/encoding format.
     """
 
+    _pointer: struct.Struct = struct.Struct('!H')
+
     @staticmethod
     def encode_domain_name(domain_name: str) -> bytes:
         """
@@ -25,6 +31,40 @@ class DomainNameEncoder:
 
         return writer.getvalue()
 
+    @staticmethod
+    def encode_domain_name_into(domain_name: str, message: bytearray, suffixes: Dict[str, int]) -> None:
+        """
+        Encode a domain name at the end of a dns message, compressing it with a pointer to an earlier occurrence of its
+        longest possible suffix.
+
+        Every suffix of the domain name that is written out is remembered in the suffixes under the offset it begins at,
+        so that later domain names of the dns message may point to it. See https://tools.ietf.org/rfc/rfc1035.txt,
+        section 4.1.4.
+
+        :param domain_name: the domain name that needs to be compressed and encoded
+        :param message: the dns message encoded so far, which the encoded domain name is appended to
+        :param suffixes: maps the domain name suffixes already written out in the dns message to their offsets
+        :return: None
+        """
+        labels: List[str] = domain_name.split('.') if domain_name else []
+
+        for i in range(len(labels)):
+            suffix: str = '.'.join(labels[i:])
+            offset: Optional[int] = suffixes.get(suffix)
+
+            if offset is not None:
+                message.extend(DomainNameEncoder._pointer.pack(0xc000 | offset))
+                return
+
+            if len(message) < 0x4000:  # a pointer only has 14 bits for the offset
+                suffixes[suffix] = len(message)
+
+            encoded_label: bytes = labels[i].encode('ascii')
+            message.append(len(encoded_label))
+            message.extend(encoded_label)
+
+        message.append(0)  # Must add a 0x00 to the end to terminate the compressed domain name.
+
     @staticmethod
     def _encode_label(label: str, writer: BytesIO) -> None:
         """
@@ -33,111 +73,128 @@ class DomainNameEncoder:
         :param label: the domain name label that needs to be compressed and encoded
         :return: None
         """
-        writer.write(len(label).to_bytes(1, 'big'))
-        for char in label:
-            writer.write(char.encode('ascii'))
+        encoded_label: bytes = label.encode('ascii')
+
+        writer.write(len(encoded_label).to_bytes(1, 'big'))
+        writer.write(encoded_label)
 
 
 class DomainNameDecoder:
     """
     Provides the ability to decode a domain name string to the appropriate dns compression/encoding format.
+
+    Domain names are decoded straight from the bytes of the entire dns message, by offset, so that compression pointers
+    are followed without copying any part of the message.
     """
 
     @staticmethod
     def decode_domain_name(data: BytesIO, copy_of_message: BytesIO) -> str:
         """
-        Decode the domain name that was provided when the object was initially created.
+        Decode the domain name at the current position of the data, advancing the data past the domain name.
 
-        :param data: the remaining data to be decoded of the dns message, the domain name should be at the start
-        :param copy_of_message: a copy of the entire dns message, used for handling pointers in domain names.
+        :param data: the entire dns message, positioned at the start of the domain name
+        :param copy_of_message: a copy of the entire dns message. Unused, since the data already holds the entire dns
+                                message; kept for backwards compatibility.
         :return: the decoded domain name as a str
         """
-        string_builder: StringIO = StringIO()
+        with data.getbuffer() as message:
+            domain_name, offset = DomainNameDecoder.decode_domain_name_at(message, data.tell())
 
-        DomainNameDecoder._decode_domain_name_helper(data, copy_of_message, string_builder)
+        data.seek(offset)
 
-        return string_builder.getvalue()[1:]  # we remove the first char, since it is an extra '.'.
+        return domain_name
 
     @staticmethod
-    def _decode_domain_name_helper(data: BytesIO, copy_of_message: BytesIO, string_builder: StringIO) -> None:
+    def decode_domain_name_at(message: WireData, offset: int,
+                              suffixes: Optional[Dict[int, str]] = None) -> Tuple[str, int]:
         """
-        Helper function to decode domain names. (Used to allow for a mutually recursive solution).
+        Decode the domain name at an offset of a dns message.
 
-        :param data: the remaining data to be decoded of the dns message, the domain name should be at the start
-        :param copy_of_message: a copy of the entire dns message, used for handling pointers in domain names.
-        :param string_builder: the currently decoded domain name
-        :return: None
-        """
-        label_length: bytes = data.read(1)
-
-        if label_length != b'\x00':
-            if DomainNameDecoder._is_pointer(label_length):
-                pointer: int = int.from_bytes(DomainNameDecoder._get_last_six_bits_of_pointer(label_length), 'big')
-                pointer = pointer << 8
-                pointer = pointer + int.from_bytes(data.read(1), 'big')
-                DomainNameDecoder._decode_pointer(pointer, copy_of_message, string_builder)
-            else:
-                DomainNameDecoder._decode_label(data, copy_of_message, string_builder, int.from_bytes(label_length, 'big'))
+        Every domain name suffix that is decoded is remembered in the suffixes under the offset it begins at, so that a
+        later domain name pointing at the same suffix of the same dns message is completed with a single lookup, instead
+        of decoding the suffix label by label again.
 
-    @staticmethod
-    def _decode_label(data: BytesIO, copy_of_message: BytesIO, string_builder: StringIO, label_length: int) -> None:
+        :param message: the entire dns message, used for handling pointers in domain names
+        :param offset: the offset of the start of the domain name within the dns message
+        :param suffixes: maps offsets within this dns message to the domain name suffixes decoded from them, shared by
+                         every domain name decoded from the dns message. Must not be shared between dns messages.
+        :raises: ValueError if a pointer does not point before every part of the domain name decoded so far, which would
+                 allow a loop, or if the domain name is longer than 255 bytes, see RFC 1035 section 3.1
+        :return: the decoded domain name as a str, and the offset just past the domain name
         """
-        Decodes a single label of a encoded domain name.
+        if suffixes is None:
+            suffixes = {}
 
-        :param data: the remaining data to be decoded of the dns message, the domain name should be at the start
-        :param copy_of_message: a copy of the entire dns message, used for handling pointers in domain names.
-        :param string_builder: the currently decoded domain name
-        :param label_length: the length of the label to be decoded
-        :return: None
-        """
-        string_builder.write('.')
+        labels: List[str] = []
+        label_offsets: List[int] = []
+        end: Optional[int] = None  # the offset just past the domain name, once the first pointer has been followed
+        suffix: Optional[str] = None
+        lowest_offset: int = offset  # every pointer must point below every offset visited so far
+        length: int = 1  # the length of the domain name in bytes, including its terminating zero
 
-        for _ in range(label_length):
-            char: str = data.read(1).decode('ascii')
-            string_builder.write(char)
+        while suffix is None:
+            label_length: int = message[offset]
 
-        DomainNameDecoder._decode_domain_name_helper(data, copy_of_message, string_builder)
+            if label_length & 0xc0 == 0xc0:
+                pointer: int = ((label_length & 0x3f) << 8) | message[offset + 1]
 
-    @staticmethod
-    def _decode_pointer(pointer: int, copy_of_message: BytesIO, string_builder: StringIO) -> None:
-        """
-        Decodes a pointer in a domain name.
+                if pointer >= lowest_offset:
+                    raise ValueError('Invalid compression pointer ' + str(pointer) + ' at offset ' + str(offset) + '.')
 
-        :param pointer: the pointer value
-        :param copy_of_message: a copy of the entire dns message, used for handling pointers in domain names.
-        :param string_builder: the currently decoded domain name string
-        :return: None
-        """
-        new_data = BytesIO(copy_of_message.getvalue())
-        new_data.seek(pointer)  # set the new data to point to the pointer specified location
-        DomainNameDecoder._decode_domain_name_helper(new_data, copy_of_message, string_builder)
+                if end is None:
+                    end = offset + 2
 
-    @staticmethod
-    def _is_pointer(label_length: bytes) -> bool:
-        """
-        Returns true if the label_length byte is a pointer.
+                offset = pointer
+                lowest_offset = pointer
+                suffix = suffixes.get(offset)
 
-        :param label_length: The label_length byte from a dns encoded domain name
-        :return: true if pointer, false otherwise
-        """
-        bitmask: int = int.from_bytes(b'\xc0', 'big')
-        label_length_as_int: int = int.from_bytes(label_length, 'big')
-        return (label_length_as_int & bitmask) == bitmask
+            elif label_length == 0:
+                if end is None:
+                    end = offset + 1
 
-    @staticmethod
-    def _get_last_six_bits_of_pointer(label_length: bytes) -> bytes:
-        """
-        Retrieves the last six bits of the label_length bytes, to be used in decoding the pointer.
+                suffix = ''
 
-        :param label_length: the label_length bytes that contain the pointer.
-        :return: the last six bits of the label_length bytes
-        """
-        bitmask: int = int.from_bytes(b'\x3f', 'big')
-        label_length_as_int: int = int.from_bytes(label_length, 'big')
-        return (label_length_as_int & bitmask).to_bytes(1, 'big')
+            else:
+                length = length + 1 + label_length
+
+                if length > 255:
+                    raise ValueError('Domain name at offset ' + str(lowest_offset) + ' is longer than 255 bytes.')
+
+                labels.append(str(message[offset + 1:offset + 1 + label_length], 'ascii'))
+                label_offsets.append(offset)
+                offset = offset + 1 + label_length
+
+                if end is not None:
+                    suffix = suffixes.get(offset)  # only once a pointer has fixed where the domain name ends
 
+        assert end is not None
 
+        if suffix and length + len(suffix) + 1 > 255:
+            raise ValueError('Domain name at offset ' + str(lowest_offset) + ' is longer than 255 bytes.')
 
+        # remember the domain name suffix beginning at every label, from the last label to the first
+        domain_name: str = suffix
+        for label, label_offset in zip(reversed(labels), reversed(label_offsets)):
+            domain_name = label + '.' + domain_name if domain_name else label
+            suffixes[label_offset] = domain_name
 
+        return domain_name, end
 
+    @staticmethod
+    def skip_domain_name_at(message: WireData, offset: int) -> int:
+        """
+        Find the end of the domain name at an offset of a dns message, without decoding it.
 
+        :param message: the entire dns message
+        :param offset: the offset of the start of the domain name within the dns message
+        :return: the offset just past the domain name
+        """
+        while True:
+            label_length: int = message[offset]
+
+            if label_length & 0xc0 == 0xc0:
+                return offset + 2  # a pointer always ends a domain name
+            elif label_length == 0:
+                return offset + 1
+            else:
+                offset = offset + 1 + label_length
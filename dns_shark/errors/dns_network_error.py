@@ -0,0 +1,8 @@
+from dns_shark.errors.dns_shark_error import DNSSharkError
+
+
+class DNSNetworkError(DNSSharkError):
+    """
+    An error that occurs when a dns query could not be sent to a dns server, or its response could not be received,
+    e.g. because the network is unreachable.
+    """
@@ -0,0 +1,8 @@
+from dns_shark.errors.dns_shark_error import DNSSharkError
+
+
+class DNSTimeoutError(DNSSharkError):
+    """
+    An error that occurs when none of the dns servers that a dns query was sent to responded in time, even after the
+    dns query was retransmitted to each of them.
+    """
@@ -0,0 +1,194 @@
+from dns_shark.name_server_statistics import NameServerStatistics
+from collections import OrderedDict
+from typing import Callable, List, Optional
+from random import Random
+from threading import Lock
+import time
+
+
+class InfrastructureCache:
+    """
+    An in-memory cache of how quickly and reliably name servers have responded, used to choose which of the name
+    servers of a zone to query first.
+
+    The expected latency of a name server is its smoothed round trip time plus a penalty for every recent timeout or
+    error. Name servers that were never queried are assumed to have an average round trip time, so they are tried
+    eventually. What is known about a name server decays with a half life, so that a name server that was slow or
+    unresponsive for a while is given another chance later. Every so often, a name server other than the fastest is
+    queried first regardless, so that the estimates of the other name servers are kept up to date.
+
+    The cache is thread safe, so a single cache may serve name resolutions running on many threads.
+
+    Instance Attributes:
+
+        clock: a function returning the current time in seconds, used to decay the statistics
+        random: a random number generator used to decide when to explore
+        unknown_round_trip_time: the round trip time in seconds assumed for name servers that were never queried
+        failure_penalty: the number of seconds added to the expected latency for every timeout or error
+        half_life: the number of seconds after which the knowledge about a name server counts for half as much
+        exploration: the probability of querying a name server other than the fastest first
+        max_entries: the maximum number of name servers held by the cache before the least recently updated are evicted
+        servers: maps name server ip addresses to their statistics
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 random: Optional[Random] = None,
+                 unknown_round_trip_time: float = 0.4,
+                 failure_penalty: float = 1.0,
+                 half_life: float = 600.0,
+                 exploration: float = 0.05,
+                 max_entries: int = 10000):
+        self.clock: Callable[[], float] = clock
+        self.random: Random = random if random is not None else Random()
+        self.unknown_round_trip_time: float = unknown_round_trip_time
+        self.failure_penalty: float = failure_penalty
+        self.half_life: float = half_life
+        self.exploration: float = exploration
+        self.max_entries: int = max_entries
+        self.servers: 'OrderedDict[str, NameServerStatistics]' = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def add_round_trip_time(self, name_server_ip: str, round_trip_time: float) -> None:
+        """
+        Records that a name server responded to a dns query.
+
+        :param name_server_ip: the ip address of the name server
+        :param round_trip_time: the number of seconds between sending the dns query and receiving its response
+        :return: None
+        """
+        with self._lock:
+            self._get_statistics(name_server_ip).round_trip_times.add_sample(round_trip_time)
+
+    def add_timeout(self, name_server_ip: str, waited: float) -> None:
+        """
+        Records that a name server did not respond to a dns query in time.
+
+        Since the round trip time of the name server is at least the time waited, that time is also added to its
+        estimate.
+
+        :param name_server_ip: the ip address of the name server
+        :param waited: the number of seconds waited for the response
+        :return: None
+        """
+        with self._lock:
+            statistics: NameServerStatistics = self._get_statistics(name_server_ip)
+            statistics.timeouts += 1
+            statistics.round_trip_times.add_sample(waited)
+
+    def add_error(self, name_server_ip: str) -> None:
+        """
+        Records that a name server responded to a dns query with a server-side error.
+
+        :param name_server_ip: the ip address of the name server
+        :return: None
+        """
+        with self._lock:
+            self._get_statistics(name_server_ip).errors += 1
+
+    def add_edns_rejection(self, name_server_ip: str) -> None:
+        """
+        Records that a name server rejected a dns query for its EDNS0 OPT record, so that later dns queries to the name
+        server are sent without EDNS0. See https://tools.ietf.org/rfc/rfc6891.txt section 7.
+
+        :param name_server_ip: the ip address of the name server
+        :return: None
+        """
+        with self._lock:
+            self._get_statistics(name_server_ip).rejects_edns = True
+
+    def supports_edns(self, name_server_ip: str) -> bool:
+        """
+        :param name_server_ip: the ip address of the name server
+        :return: false if the name server rejected a dns query for its EDNS0 OPT record, true otherwise
+        """
+        with self._lock:
+            statistics: Optional[NameServerStatistics] = self.servers.get(name_server_ip)
+
+            return statistics is None or not statistics.rejects_edns
+
+    def get_expected_latency(self, name_server_ip: str) -> float:
+        """
+        Estimates how long a name server will take to respond to a dns query, including the cost of its failures.
+
+        :param name_server_ip: the ip address of the name server
+        :return: the expected latency of the name server in seconds
+        """
+        with self._lock:
+            statistics: Optional[NameServerStatistics] = self.servers.get(name_server_ip)
+
+            if statistics is None or statistics.round_trip_times.smoothed_round_trip_time is None:
+                return self.unknown_round_trip_time
+
+            weight: float = 0.5 ** ((self.clock() - statistics.updated_at) / self.half_life)
+            round_trip_time: float = self.unknown_round_trip_time + \
+                weight * (statistics.round_trip_times.smoothed_round_trip_time - self.unknown_round_trip_time)
+
+            return round_trip_time + weight * self.failure_penalty * (statistics.timeouts + statistics.errors)
+
+    def get_hedge_delay(self, name_server_ip: str) -> Optional[float]:
+        """
+        Computes how long to wait for a response from a name server before hedging against it.
+
+        :param name_server_ip: the ip address of the name server
+        :return: the hedge delay in seconds, if the round trip time of the name server is known. Otherwise, return None.
+        """
+        with self._lock:
+            statistics: Optional[NameServerStatistics] = self.servers.get(name_server_ip)
+
+            if statistics is None or statistics.round_trip_times.smoothed_round_trip_time is None:
+                return None
+
+        return statistics.round_trip_times.hedge_delay()
+
+    def sort_name_servers(self, name_server_ips: List[str]) -> List[str]:
+        """
+        Orders name servers by their expected latency, fastest first. Name servers with equal expected latency keep
+        their relative order.
+
+        With the exploration probability, a randomly chosen name server other than the fastest is moved to the front.
+
+        :param name_server_ips: the ip addresses of the name servers
+        :return: a new list of the name server ip addresses, in the order they should be queried
+        """
+        sorted_ips: List[str] = sorted(name_server_ips, key=self.get_expected_latency)
+
+        if len(sorted_ips) > 1 and self.random.random() < self.exploration:
+            sorted_ips.insert(0, sorted_ips.pop(self.random.randint(1, len(sorted_ips) - 1)))
+
+        return sorted_ips
+
+    def clear(self) -> None:
+        """
+        Removes every name server from the cache.
+
+        :return: None
+        """
+        with self._lock:
+            self.servers.clear()
+
+    def _get_statistics(self, name_server_ip: str) -> NameServerStatistics:
+        """
+        Retrieves the statistics of a name server for updating, creating them if necessary.
+
+        The timeouts and errors of the name server are decayed up to the present first.
+
+        :param name_server_ip: the ip address of the name server
+        :return: the statistics of the name server
+        """
+        now: float = self.clock()
+        statistics: Optional[NameServerStatistics] = self.servers.pop(name_server_ip, None)
+
+        if statistics is None:
+            statistics = NameServerStatistics(now)
+        else:
+            weight: float = 0.5 ** ((now - statistics.updated_at) / self.half_life)
+            statistics.timeouts *= weight
+            statistics.errors *= weight
+            statistics.updated_at = now
+
+        self.servers[name_server_ip] = statistics
+
+        while len(self.servers) > self.max_entries:
+            self.servers.popitem(last=False)
+
+        return statistics
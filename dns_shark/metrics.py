@@ -0,0 +1,231 @@
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Lock, Thread
+from typing import Dict, List, Sequence, Tuple, Union
+import os
+
+
+class Counter:
+    """
+    A metric that counts events, separately for every combination of the values of its labels.
+
+    Instance Attributes:
+
+        name: the name of the metric
+        help: the description of the metric
+        label_names: the names of the labels of the metric, if any
+        values: the count of every combination of label values that occurred so far
+    """
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...] = ()):
+        self.name: str = name
+        self.help: str = help
+        self.label_names: Tuple[str, ...] = label_names
+        self.values: Dict[Tuple[str, ...], int] = {}
+        self._lock: Lock = Lock()
+
+    def inc(self, *label_values: str) -> None:
+        """
+        Counts an event.
+
+        :param label_values: the value of every label of the metric, in the order of the label names
+        :return: None
+        """
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0) + 1
+
+    def get(self, *label_values: str) -> int:
+        """
+        :param label_values: the value of every label of the metric, in the order of the label names
+        :return: the number of events counted with these label values
+        """
+        return self.values.get(label_values, 0)
+
+    def exposition(self) -> List[str]:
+        """
+        :return: the lines of the metric in the Prometheus text format
+        """
+        with self._lock:
+            values: List[Tuple[Tuple[str, ...], int]] = sorted(self.values.items())
+
+        return ['# HELP ' + self.name + ' ' + self.help, '# TYPE ' + self.name + ' counter'] + \
+               [self.name + _format_labels(self.label_names, label_values) + ' ' + str(value)
+                for label_values, value in values]
+
+
+class Histogram:
+    """
+    A metric that counts observed values, e.g. latencies, in buckets of increasing upper bounds.
+
+    Instance Attributes:
+
+        name: the name of the metric
+        help: the description of the metric
+        buckets: the upper bounds of the buckets, in increasing order, without the final +Inf bucket
+        counts: the number of observed values of every bucket, including the +Inf bucket. Unlike the buckets of the
+                Prometheus text format, every value is only counted in the first bucket it fits in.
+        sum: the sum of the observed values
+    """
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name: str = name
+        self.help: str = help
+        self.buckets: List[float] = list(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.sum: float = 0.0
+        self._lock: Lock = Lock()
+
+    @property
+    def count(self) -> int:
+        """
+        :return: the number of observed values
+        """
+        return sum(self.counts)
+
+    def observe(self, value: float) -> None:
+        """
+        Counts an observed value in its bucket.
+
+        :param value: the observed value
+        :return: None
+        """
+        index: int = bisect_left(self.buckets, value)
+
+        with self._lock:
+            self.counts[index] = self.counts[index] + 1
+            self.sum = self.sum + value
+
+    def exposition(self) -> List[str]:
+        """
+        :return: the lines of the metric in the Prometheus text format
+        """
+        with self._lock:
+            counts: List[int] = list(self.counts)
+            total: float = self.sum
+
+        lines: List[str] = ['# HELP ' + self.name + ' ' + self.help, '# TYPE ' + self.name + ' histogram']
+        cumulative_count: int = 0
+
+        for bound, count in zip([_format_value(bound) for bound in self.buckets] + ['+Inf'], counts):
+            cumulative_count = cumulative_count + count
+            lines.append(self.name + '_bucket' + _format_labels(('le',), (bound,)) + ' ' + str(cumulative_count))
+
+        return lines + [self.name + '_sum ' + _format_value(total), self.name + '_count ' + str(cumulative_count)]
+
+
+class MetricsRegistry:
+    """
+    The metrics of the name resolutions of dns shark, exported in the Prometheus text format. A registry is thread safe,
+    so it may be shared by every resolver of a process, and updated by name resolutions running on many threads.
+
+    Resolvers only update a registry that was passed to them, so name resolutions without one pay nothing for metrics.
+
+        see https://prometheus.io/docs/instrumenting/exposition_formats/ for the text format
+
+    Instance Attributes:
+
+        queries_sent: the dns queries sent, by dns server and transport (udp or tcp)
+        retransmissions: the transmissions of dns queries after their first one, whether to the same or another dns
+                         server
+        responses: the dns responses received, by rcode
+        errors: the name resolutions that failed, by the class name of the dns shark error raised
+        cache_hits: the lookups of the cache that found answer records, or found the domain name or its records cached
+                    as not existing
+        cache_misses: the lookups of the cache that found nothing
+        hop_latency: the round trip times of dns queries that were answered, in seconds
+        resolution_latency: the durations of name resolutions, whether they succeeded or failed, in seconds
+    """
+
+    latency_buckets: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.queries_sent: Counter = Counter('dns_shark_queries_sent_total', 'DNS queries sent, by dns server.',
+                                             ('server', 'transport'))
+        self.retransmissions: Counter = Counter('dns_shark_retransmissions_total',
+                                                'Transmissions of dns queries after their first one.')
+        self.responses: Counter = Counter('dns_shark_responses_total', 'DNS responses received, by rcode.',
+                                          ('rcode',))
+        self.errors: Counter = Counter('dns_shark_errors_total', 'Failed name resolutions, by error.', ('error',))
+        self.cache_hits: Counter = Counter('dns_shark_cache_hits_total', 'Cache lookups that found an answer.')
+        self.cache_misses: Counter = Counter('dns_shark_cache_misses_total', 'Cache lookups that found nothing.')
+        self.hop_latency: Histogram = Histogram('dns_shark_hop_latency_seconds',
+                                                'Round trip times of answered dns queries.',
+                                                MetricsRegistry.latency_buckets)
+        self.resolution_latency: Histogram = Histogram('dns_shark_resolution_latency_seconds',
+                                                       'Durations of name resolutions.',
+                                                       MetricsRegistry.latency_buckets)
+
+    def exposition(self) -> str:
+        """
+        :return: every metric in the Prometheus text format
+        """
+        metrics: List[Union[Counter, Histogram]] = [self.queries_sent, self.retransmissions, self.responses,
+                                                    self.errors, self.cache_hits, self.cache_misses, self.hop_latency,
+                                                    self.resolution_latency]
+
+        return ''.join(line + '\n' for metric in metrics for line in metric.exposition())
+
+    def write(self, path: str) -> None:
+        """
+        Writes every metric to a file in the Prometheus text format, e.g. for the textfile collector of the node
+        exporter. The file is replaced at once, so it is never read half written.
+
+        :param path: the path of the file
+        :return: None
+        """
+        temporary_path: str = path + '.tmp'
+
+        with open(temporary_path, 'w') as file:
+            file.write(self.exposition())
+
+        os.replace(temporary_path, path)
+
+    def serve(self, address: str = '127.0.0.1', port: int = 9153) -> HTTPServer:
+        """
+        Serves every metric in the Prometheus text format over http, on a daemon thread, to every GET request.
+
+        :param address: the ip address to listen on
+        :param port: the port to listen on, or 0 for any free port
+        :return: the http server, to be shut down once the metrics are no longer needed
+        """
+        registry: MetricsRegistry = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self) -> None:
+                body: bytes = registry.exposition().encode()
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass  # scrapes are too frequent to log
+
+        server: HTTPServer = HTTPServer((address, port), MetricsRequestHandler)
+        Thread(target=server.serve_forever, daemon=True).start()
+
+        return server
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...]) -> str:
+    """
+    :param label_names: the names of the labels
+    :param label_values: the values of the labels
+    :return: the labels in the Prometheus text format, or an empty string if there are none
+    """
+    if not label_names:
+        return ''
+
+    return '{' + ','.join(name + '="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+                          for name, value in zip(label_names, label_values)) + '}'
+
+
+def _format_value(value: float) -> str:
+    """
+    :param value: a number
+    :return: the number in the Prometheus text format
+    """
+    return repr(float(value))
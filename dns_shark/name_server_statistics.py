@@ -0,0 +1,22 @@
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+
+
+class NameServerStatistics:
+    """
+    Everything the resolver has learned about how a single name server responds to dns queries.
+
+    Instance Attributes:
+
+        round_trip_times: the estimate of the name server's round trip time
+        timeouts: the number of dns queries the name server did not respond to in time, decayed over time
+        errors: the number of dns queries the name server responded to with a server-side error, decayed over time
+        rejects_edns: a boolean flag indicating whether the name server rejected a dns query for its EDNS0 OPT record
+        updated_at: the time the statistics were last updated
+    """
+
+    def __init__(self, updated_at: float):
+        self.round_trip_times: RoundTripTimeEstimator = RoundTripTimeEstimator()
+        self.timeouts: float = 0.0
+        self.errors: float = 0.0
+        self.rejects_edns: bool = False
+        self.updated_at: float = updated_at
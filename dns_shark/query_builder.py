@@ -0,0 +1,97 @@
+from dns_shark.domain_name_handling import DomainNameEncoder
+from collections import OrderedDict
+from typing import Optional, Tuple
+from threading import Lock
+import struct
+
+
+class QueryBuilder:
+    """
+    Builds the packets of dns queries, each asking a single question.
+
+    The packet of a query is the same for every query id, apart from its first two bytes. So the packet of every
+    (domain name, type, class) asked recently is kept, with a query id of zero, in a least recently used cache. Building
+    a query is then a single copy of the cached packet, with the query id packed into the copy.
+
+    A query may advertise the udp payload size its sender is able to receive, with an EDNS0 OPT record (RFC 6891) in
+    its additional section. Without one, dns servers truncate every udp response to 512 bytes.
+
+    The builder is thread safe, so a single builder may serve name resolutions running on many threads.
+
+    Instance Attributes:
+
+        max_entries: the maximum number of packets held by the builder before the least recently used are evicted
+        templates: maps (domain name, type, class, udp payload size) keys to the packets of their queries, with a query
+                   id of zero
+    """
+
+    _query_id: struct.Struct = struct.Struct('!H')
+    _header_fields: struct.Struct = struct.Struct('!HHHHHH')  # query id, flags, and the four counts
+    _question_fields: struct.Struct = struct.Struct('!HH')  # type, class
+    _opt_record_fields: struct.Struct = struct.Struct('!BHHIH')  # root name, type, udp payload size, ttl, rdlength
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries: int = max_entries
+        self.templates: 'OrderedDict[Tuple[str, int, int, Optional[int]], bytes]' = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def build_query(self, domain_name: str, query_id: int, type: int, query_class: int = 1,
+                    udp_payload_size: Optional[int] = None) -> bytearray:
+        """
+        Builds the packet of a dns query.
+
+        :param domain_name: the domain name to be looked up
+        :param query_id: the unique id of this dns query
+        :param type: the type of resource requested (1 for ipv4, 28 for ipv6)
+        :param query_class: the class of the resource requested (1 for Internet)
+        :param udp_payload_size: the udp payload size advertised in an OPT record, or None for a query without EDNS0
+        :return: the packet of the dns query, with no flags set
+        """
+        query: bytearray = bytearray(self.get_template(domain_name, type, query_class, udp_payload_size))
+        QueryBuilder._query_id.pack_into(query, 0, query_id)
+
+        return query
+
+    def get_template(self, domain_name: str, type: int, query_class: int = 1,
+                     udp_payload_size: Optional[int] = None) -> bytes:
+        """
+        Retrieves the packet of a dns query with a query id of zero, encoding it if it is not cached.
+
+        :param domain_name: the domain name to be looked up
+        :param type: the type of resource requested
+        :param query_class: the class of the resource requested
+        :param udp_payload_size: the udp payload size advertised in an OPT record, or None for a query without EDNS0
+        :return: the packet of the dns query, with a query id of zero
+        """
+        key: Tuple[str, int, int, Optional[int]] = (domain_name, type, query_class, udp_payload_size)
+
+        with self._lock:
+            template: Optional[bytes] = self.templates.get(key)
+
+            if template is not None:
+                self.templates.move_to_end(key)
+                return template
+
+        template = QueryBuilder._header_fields.pack(0, 0, 1, 0, 0, 0 if udp_payload_size is None else 1) + \
+            DomainNameEncoder.encode_domain_name(domain_name) + \
+            QueryBuilder._question_fields.pack(type, query_class)
+
+        if udp_payload_size is not None:
+            template = template + QueryBuilder._opt_record_fields.pack(0, 41, udp_payload_size, 0, 0)
+
+        with self._lock:
+            self.templates[key] = template
+
+            while len(self.templates) > self.max_entries:
+                self.templates.popitem(last=False)
+
+        return template
+
+    def clear(self) -> None:
+        """
+        Removes every packet from the builder.
+
+        :return: None
+        """
+        with self._lock:
+            self.templates.clear()
@@ -0,0 +1,160 @@
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.resolution_result import ResolutionResult
+from dns_shark.resolver_core_base import ResolverCoreBase
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.errors.dns_format_error import DNSFormatError
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_not_implemented_error import DNSNotImplementedError
+from dns_shark.errors.dns_refused_error import DNSRefusedError
+from dns_shark.errors.dns_no_matching_resource_record_error import DNSNoMatchingResourceRecordError
+from abc import ABC, abstractmethod
+from io import StringIO
+from typing import BinaryIO, Dict, List, Optional, Type
+import csv
+import json
+
+
+class RecordWriter(ABC):
+    """
+    Writes the results of name resolutions to a binary stream, in one of the output formats of dns shark.
+
+    Every result is serialized and written with a single call to the write method of the stream, so a buffered stream,
+    e.g. sys.stdout.buffer, only makes a system call whenever its buffer fills up. Call flush once every result has been
+    written.
+
+    Instance Attributes:
+
+        stream: the binary stream the results are written to
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream: BinaryIO = stream
+
+    @abstractmethod
+    def write_result(self, result: ResolutionResult) -> None:
+        """
+        Writes the result of a name resolution.
+
+        :param result: the result to write
+        :return: None
+        """
+
+    def flush(self) -> None:
+        """
+        Flushes the results written so far to the stream.
+
+        :return: None
+        """
+        self.stream.flush()
+
+    @staticmethod
+    def create(output_format: str, stream: BinaryIO) -> 'RecordWriter':
+        """
+        Factory method to create the record writer of an output format.
+
+        :param output_format: one of text, json, csv or binary
+        :param stream: the binary stream the results are to be written to
+        :raises: ValueError if the output format does not exist
+        :return: the record writer
+        """
+        writer_class: Optional[Type[RecordWriter]] = _record_writers.get(output_format)
+
+        if writer_class is None:
+            raise ValueError('Unknown output format: ' + output_format + '.')
+
+        return writer_class(stream)
+
+
+class TextRecordWriter(RecordWriter):
+    """
+    Writes every result as the human readable answers that dns shark prints for a single domain name. A failed name
+    resolution is written as its domain name followed by the error message.
+    """
+
+    def write_result(self, result: ResolutionResult) -> None:
+        if result.answers is not None:
+            text: str = ResolverCoreBase.format_answers(result.domain_name, result.answers)
+        else:
+            text = '\n' + result.domain_name + ': ' + str(result.error) + '\n'
+
+        self.stream.write(text.encode())
+
+
+class JSONLinesRecordWriter(RecordWriter):
+    """
+    Writes every result as a line of JSON, see ResolutionResult.to_dict.
+    """
+
+    def write_result(self, result: ResolutionResult) -> None:
+        self.stream.write(json.dumps(result.to_dict()).encode() + b'\n')
+
+
+class CSVRecordWriter(RecordWriter):
+    """
+    Writes every answer record as a row of CSV, preceded by a header row. A failed name resolution is written as a
+    single row without a record, holding the error message.
+
+    Instance Attributes:
+
+        rows: the text buffer the rows of a result are formatted into before they are written to the stream
+        csv_writer: the csv writer formatting rows into the text buffer
+    """
+
+    header: List[str] = ['domain_name', 'type', 'name', 'ttl', 'record_type', 'rdata', 'error']
+
+    def __init__(self, stream: BinaryIO):
+        super().__init__(stream)
+        self.rows: StringIO = StringIO()
+        self.csv_writer = csv.writer(self.rows, lineterminator='\n')
+        self.stream.write(','.join(CSVRecordWriter.header).encode() + b'\n')
+
+    def write_result(self, result: ResolutionResult) -> None:
+        resolved_type: str = ResourceRecord.parse_type(result.type)
+
+        if result.answers is not None:
+            self.csv_writer.writerows([result.domain_name, resolved_type, answer.name, answer.ttl,
+                                       ResourceRecord.parse_type(answer.type), answer.rdata, '']
+                                      for answer in result.answers)
+        else:
+            self.csv_writer.writerow([result.domain_name, resolved_type, '', '', '', '', str(result.error)])
+
+        self.stream.write(self.rows.getvalue().encode())
+        self.rows.seek(0)
+        self.rows.truncate()
+
+
+class BinaryRecordWriter(RecordWriter):
+    """
+    Writes every result as a dns response message preceded by its length as a 2 byte integer, i.e. framed as dns
+    messages are over tcp, so the output can be read back with DNSMessage.decode_dns_message.
+
+    The response holds the domain name and type that were resolved as its question. A successful name resolution is
+    answered with its answer records, and a failed one with the rcode of its error. Errors that carry no rcode of their
+    own, e.g. timeouts, are written as server failures.
+
+        see https://tools.ietf.org/rfc/rfc1035.txt section 4.2.2 for the framing
+    """
+
+    _rcodes: Dict[type, int] = {DNSFormatError: 1,
+                                DNSNameError: 3,
+                                DNSNotImplementedError: 4,
+                                DNSRefusedError: 5,
+                                DNSNoMatchingResourceRecordError: 0}
+
+    def write_result(self, result: ResolutionResult) -> None:
+        answers: List[ResourceRecord] = result.answers if result.answers is not None else []
+        rcode: int = BinaryRecordWriter._rcodes.get(type(result.error), 2) if result.error is not None else 0
+
+        message: bytes = DNSMessage(0, True, 0, False, False, True, True, rcode, 1, len(answers), 0, 0,
+                                    [DNSQuestion(result.domain_name, result.type, 1)], answers, [], []).encode()
+
+        self.stream.write(len(message).to_bytes(2, 'big') + message)
+
+
+_record_writers: Dict[str, Type[RecordWriter]] = {'text': TextRecordWriter,
+                                                  'json': JSONLinesRecordWriter,
+                                                  'csv': CSVRecordWriter,
+                                                  'binary': BinaryRecordWriter}
+
+OUTPUT_FORMATS: List[str] = list(_record_writers)
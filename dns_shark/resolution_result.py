@@ -0,0 +1,61 @@
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.errors.dns_shark_error import DNSSharkError
+from typing import Any, Dict, List, Optional
+
+
+class ResolutionResult:
+    """
+    The outcome of resolving a single domain name as part of a batch of name resolutions.
+
+    Exactly one of answers and error is set.
+
+    Instance Attributes:
+
+        domain_name: the domain name that was resolved
+        type: the resource record type the domain name was resolved to
+        answers: the resource records the domain name resolved to, if the name resolution succeeded
+        error: the dns shark error raised by the name resolution, if it failed
+    """
+
+    def __init__(self, domain_name: str,
+                 type: int,
+                 answers: Optional[List[ResourceRecord]] = None,
+                 error: Optional[DNSSharkError] = None):
+        self.domain_name: str = domain_name
+        self.type: int = type
+        self.answers: Optional[List[ResourceRecord]] = answers
+        self.error: Optional[DNSSharkError] = error
+
+    def __eq__(self, other: object):
+        if not isinstance(other, ResolutionResult):
+            return False
+        else:
+            return self.domain_name == other.domain_name and \
+                   self.type == other.type and \
+                   self.answers == other.answers and \
+                   type(self.error) == type(other.error) and \
+                   str(self.error) == str(other.error)
+
+    def __repr__(self):
+        return 'ResolutionResult(domain_name: ' + str(self.domain_name) + ', type: ' + str(self.type) + \
+               ', answers: ' + str(self.answers) + ', error: ' + repr(self.error) + ')'
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        :return: true if the name resolution succeeded, false otherwise
+        """
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: the result as a dictionary of plain values, e.g. to be serialized as JSON. A failed name resolution
+                 has no answers, and a successful one no error.
+        """
+        return {'domain_name': self.domain_name,
+                'type': ResourceRecord.parse_type(self.type),
+                'answers': [{'name': answer.name,
+                             'ttl': answer.ttl,
+                             'type': ResourceRecord.parse_type(answer.type),
+                             'rdata': answer.rdata} for answer in self.answers] if self.answers is not None else None,
+                'error': str(self.error) if self.error is not None else None}
@@ -0,0 +1,46 @@
+from dns_shark.resolution_task import ResolutionTask
+from dns_shark.resource_record import ResourceRecord
+from typing import List, Optional
+
+
+class ResolutionState:
+    """
+    The progress of a single name resolution, advanced one dns response at a time by a resolver core.
+
+    A name resolution is a stack of resolution tasks. The bottom task resolves the requested domain name, and a task is
+    pushed on top of it whenever the address of a name server has to be resolved first. Only the top task ever awaits a
+    dns response.
+
+    Since the state holds all of the progress of the name resolution, the name resolution may be suspended between dns
+    responses and resumed by any driver, whether it blocks on a socket, runs on a thread or awaits an event loop:
+
+        state = resolver_core.begin_resolution(domain_name, dns_server_ip, type)
+        while not state.done:
+            task = state.current_task
+            dns_response = ...  # send a dns query for task.domain_name and task.type to one of task.dns_server_ips
+            resolver_core.continue_resolution(state, dns_response)
+        return state.answers
+
+    Instance Attributes:
+
+        tasks: the stack of resolution tasks in progress, the current task last
+        answers: the answer records of the requested domain name, once the name resolution is done
+    """
+
+    def __init__(self, task: ResolutionTask):
+        self.tasks: List[ResolutionTask] = [task]
+        self.answers: Optional[List[ResourceRecord]] = None
+
+    @property
+    def done(self) -> bool:
+        """
+        :return: true if the requested domain name has been resolved, false otherwise
+        """
+        return self.answers is not None
+
+    @property
+    def current_task(self) -> ResolutionTask:
+        """
+        :return: the resolution task awaiting the next dns response
+        """
+        return self.tasks[-1]
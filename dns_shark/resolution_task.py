@@ -0,0 +1,40 @@
+from dns_shark.resource_record import ResourceRecord
+from typing import List, Optional, Tuple
+
+
+class ResolutionTask:
+    """
+    A single domain name being resolved as part of a name resolution, e.g. the requested domain name itself or the
+    domain name of a name server whose address was not included in a referral.
+
+    Instance Attributes:
+
+        domain_name: the domain name currently being resolved. Changes whenever a cname record is followed.
+        type: the resource record type the domain name is being resolved to
+        dns_server_ips: the dns servers that the next dns query for the domain name is sent to, in the order they are
+                        tried. None if the task begins at the closest dns servers known.
+        zone: the zone cut of the dns servers the next dns query is sent to, i.e. the deepest zone they are known to be
+              authoritative for, or the empty string for the root. Only referrals to zones strictly below it are
+              cached, since the dns servers have no authority over any other zone.
+        aliases: the (domain name, cname record) pairs followed to arrive at the current domain name, in order
+    """
+
+    def __init__(self, domain_name: str, type: int, dns_server_ips: Optional[List[str]] = None):
+        self.domain_name: str = domain_name
+        self.type: int = type
+        self.dns_server_ips: Optional[List[str]] = dns_server_ips
+        self.zone: str = ''
+        self.aliases: List[Tuple[str, ResourceRecord]] = []
+
+    def follow_cname(self, cname_record: ResourceRecord) -> None:
+        """
+        Continues the task with the canonical name of the domain name currently being resolved, beginning once again
+        at the closest dns servers known.
+
+        :param cname_record: the cname record of the domain name currently being resolved
+        :return: None
+        """
+        self.aliases.append((self.domain_name, cname_record))
+        self.domain_name = cname_record.rdata
+        self.dns_server_ips = None
+        self.zone = ''
@@ -1,249 +1,301 @@
 from dns_shark.dns_message_utilities import DNSMessageUtilities
 from dns_shark.dns_message import DNSMessage
 from dns_shark.resource_record import ResourceRecord
-from io import BytesIO
-from typing import List, Optional
+from dns_shark.dns_cache import DNSCache
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.resolver_core_base import ResolverCoreBase
+from dns_shark.resolution_state import ResolutionState
+from dns_shark.resolution_task import ResolutionTask
+from dns_shark.errors.dns_shark_error import DNSSharkError
+from dns_shark.tcp_connection_pool import TCPConnectionPool
+from dns_shark.tracer import Tracer
+from dns_shark.metrics import MetricsRegistry
+from typing import Dict, Hashable, List, Mapping, Optional, Tuple
 from random import Random
-from dns_shark.errors.dns_format_error import DNSFormatError
-from dns_shark.errors.dns_name_error import DNSNameError
-from dns_shark.errors.dns_not_implemented_error import DNSNotImplementedError
-from dns_shark.errors.dns_server_failure_error import DNSServerFailureError
-from dns_shark.errors.dns_refused_error import DNSRefusedError
-from dns_shark.errors.dns_no_matching_resource_record_error import DNSNoMatchingResourceRecordError
-from dns_shark.errors.dns_zero_counter_error import DNSZeroCounterError
+import socket
+import struct
+import time
 
 
-class ResolverCore:
+class ResolverCore(ResolverCoreBase):
     """
-    Top-level class in charge of resolving domain names.
+    Top-level class in charge of resolving domain names, blocking on a udp socket for every dns query.
 
     Instance Attributes:
 
         udp_socket: the socket used for communication with the dns servers
-        verbose: a boolean flag indicating whether verbose output is desired
-        starting_dns_server: the dns server that the name resolution search begins with
-        counter: the maximum number of requests allowed for a single domain name resolution.
-                 Used to exit from infinite loops.
-        random: a random number generator used for choosing query ids
+        receive_buffer: the buffer every udp response is received into, large enough for the udp payload size
+        tcp_connections: the pool of tcp connections used to retry dns queries whose udp response was truncated. May
+                         be shared between resolvers.
+
+        see ResolverCoreBase for the remaining instance attributes
     """
 
-    def __init__(self, sock, verbose: bool, starting_dns_server: str, random: Random, counter: int = 30):
+    def __init__(self, sock, verbose: bool, starting_dns_server: str, random: Random, counter: int = 30,
+                 cache: Optional[DNSCache] = None, timeout: float = 2.0, retries: int = 2, hedge: bool = False,
+                 round_trip_times: Optional[RoundTripTimeEstimator] = None,
+                 infrastructure_cache: Optional[InfrastructureCache] = None,
+                 tcp_connections: Optional[TCPConnectionPool] = None,
+                 udp_payload_size: Optional[int] = 1232,
+                 receive_buffer: Optional[bytearray] = None,
+                 tracer: Optional[Tracer] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        super().__init__(verbose, starting_dns_server, random, counter, cache, timeout, retries, hedge,
+                         round_trip_times, infrastructure_cache, udp_payload_size, tracer, metrics)
         self.udp_socket = sock
-        self.verbose: bool = verbose
-        self.starting_dns_server: str = starting_dns_server
-        self.counter: int = counter
-        self.random: Random = random
+        self.receive_buffer: bytearray = receive_buffer if receive_buffer is not None \
+            else bytearray(ResolverCore.get_receive_buffer_size(udp_payload_size))
+        self.tcp_connections: TCPConnectionPool = tcp_connections if tcp_connections is not None \
+            else TCPConnectionPool()
 
     def resolve_domain_name(self, requested_domain_name: str,
                             next_dns_server_ip: str,
                             requested_type: int) -> List[ResourceRecord]:
         """
         Resolves a requested domain name of the requested type. Begins the name resolution process via sending a dns
-        query to the next_dns_server_ip.
+        query to the next_dns_server_ip, unless unexpired answer records for the domain name are already cached.
+
+        Domain names cached as not existing, or as having no records of the requested type, fail without sending any dns
+        query.
+
+        If the next_dns_server_ip is the starting dns server, the name resolution instead begins at the name servers of
+        the deepest cached zone cut enclosing the requested domain name.
 
         :param requested_domain_name: the domain name we wish to resolve.
         :param next_dns_server_ip: the starting dns server which we use in the name resolution process.
         :param requested_type: the desired resource record type we seek to resolve the domain name to.
         :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError,
-                 DNSZeroCounterError, DNSNoMatchingResourceRecordError
+                 DNSZeroCounterError, DNSNoMatchingResourceRecordError, DNSTimeoutError
         :return: a list of the answer records that match the desired domain name and type, if present.
         """
+        started: float = time.monotonic()
+
+        try:
+            state: ResolutionState = self.begin_resolution(requested_domain_name, next_dns_server_ip, requested_type)
 
-        self._check_counter()
+            while not state.done:
+                task: ResolutionTask = state.current_task
+                assert task.dns_server_ips is not None
 
-        dns_response: DNSMessage = self._request_domain_name(requested_domain_name, next_dns_server_ip, requested_type)
+                dns_response: DNSMessage = self._request_domain_name(task.domain_name, task.dns_server_ips, task.type)
+                self.continue_resolution(state, dns_response)
 
-        ResolverCore._check_rcode(dns_response.rcode)
-        self._handle_tracing_for_dns_response(dns_response)
+            assert state.answers is not None
 
-        if dns_response.authoritative:
-            # If the response is from a DNS server that is authoritative,
-            # it will either have a CNAME or A entry for the fqdn.
-            return self._handle_authoritative_response(dns_response, requested_domain_name, requested_type)
+        except DNSSharkError as error:
+            self._observe_resolution(requested_domain_name, started, error)
+            raise
 
-        else:
-            # not an authoritative response. Therefore, look for a name server to send the next request to.
-            return self._handle_non_authoritative_response(dns_response, requested_domain_name, requested_type)
+        if self.tracer is not None or self.metrics is not None:
+            self._observe_resolution(requested_domain_name, started, None)
 
-    def _handle_authoritative_response(self, dns_response: DNSMessage,
-                                       requested_domain_name: str,
-                                       requested_type: int) -> List[ResourceRecord]:
+        return state.answers
+
+    def _request_domain_name(self,
+                             requested_domain_name: str,
+                             next_dns_server_ips: List[str],
+                             requested_type: int) -> DNSMessage:
         """
-        If an authoritative response is received from the domain name server, then first look for any matching
-        answer records. If there is one or more answer records, return them.
+        Creates a dns query to send to the next dns servers for resource records pertaining to the
+        requested_domain_name of the requested_type.
+
+        The dns query is sent to each of the next dns servers in turn, waiting up to the resolver's timeout for a
+        response before moving on to the next one. When hedging, the resolver moves on to the next dns server once the
+        hedge delay elapses instead. Once every dns server has been tried, another round of retransmissions begins with
+        the timeout doubled, until the resolver's retries are exhausted. The first response to any of the transmissions
+        wins.
+
+        The round trip time of the winning transmission, and every transmission whose full timeout elapsed without a
+        response, are recorded in the infrastructure cache. A dns server that merely responds later than its hedge delay
+        is not recorded as timing out.
 
-        If there are no such records, then find a cname record and resolve the domain using its cname value.
+        A truncated response is not used. The dns query is retried over tcp to the dns server that sent it instead, and
+        if that fails too, the dns server is treated as one that did not respond. A dns server that rejects the EDNS0
+        OPT record of the dns query is asked again without EDNS0 first.
+
+        Decrements the resolver counter by 1, however many times the dns query is transmitted.
 
-        :param dns_response: the most recently received dns response in the name resolution process.
         :param requested_domain_name: the domain name we wish to resolve.
+        :param next_dns_server_ips: the dns servers we wish to send the next dns query to, in the order they are tried.
         :param requested_type: the type of address we wish to resolve the domain name to.
-        :raises: DNSNoMatchingResourceRecordError
-        :return: a list of the answer records that match the desired domain name and type, if present.
+        :raises: DNSTimeoutError
+        :return: the first dns response received from any of the next_dns_server_ips.
         """
+        self.counter = self.counter - 1  # decrement the counter by one, since we are about to send a request
 
-        answer_resource_records = dns_response.get_matching_answer_records(dns_response.answer_records,
-                                                                          requested_domain_name,
-                                                                          requested_type)
-        cname_resource_records = dns_response.get_matching_answer_records(dns_response.answer_records,
-                                                                         requested_domain_name, 5)
+        sent: Dict[int, Tuple[str, float]] = {}  # the dns server and send time of every transmission, by query id
+        unanswered: Dict[Hashable, str] = {}  # the dns server of every transmission whose timeout is yet to be recorded
+        timeout: float = self.timeout
 
-        if answer_resource_records:
-            return answer_resource_records
+        for round_index in range(self.retries + 1):
+            for index, next_dns_server_ip in enumerate(next_dns_server_ips):
+                random_query_id: int = self.random.randint(0, 65535)
 
-        elif cname_resource_records:
-            cname_domain_name: str = cname_resource_records[0].rdata
-            return self.resolve_domain_name(cname_domain_name, self.starting_dns_server, requested_type)
+                domain_name_query: bytearray = DNSMessageUtilities.create_query(
+                    requested_domain_name, random_query_id, requested_type,
+                    self._get_udp_payload_size(next_dns_server_ip))
+                self.udp_socket.sendto(domain_name_query, (next_dns_server_ip, 53))
 
-        else:
-            raise DNSNoMatchingResourceRecordError("No matching resource record error: an authoritative response was returned for a desired domain name. However, the authoritative response did not contain any resource records that matched the desired type.")
+                sent[random_query_id] = (next_dns_server_ip, time.monotonic())
+                unanswered[random_query_id] = next_dns_server_ip
 
-    def _handle_non_authoritative_response(self,
-                                           dns_response: DNSMessage,
-                                           requested_domain_name: str,
-                                           requested_type: int) -> List[ResourceRecord]:
-        """
-        Attempts to find a name server address to send the next name resolution request to.
+                if self.tracer is not None or self.metrics is not None:
+                    self._observe_query_sent(requested_domain_name, requested_type, random_query_id,
+                                             next_dns_server_ip, retransmission=round_index > 0 or index > 0)
 
-        If the name server ip is included in the additional resource records, then use it for next dns query.
+                wait: float = self._get_response_wait(next_dns_server_ip, index, len(next_dns_server_ips), timeout)
+                dns_response: Optional[DNSMessage] = self._receive_dns_message(sent, wait)
 
-        If name server ip is not present, first resolve the name server domain name to an ipv4 address and send the
-        next dns query there.
+                if dns_response is not None:
+                    responder_ip, sent_at = sent.pop(dns_response.query_id)
+                    unanswered.pop(dns_response.query_id, None)
+                    self._record_response(responder_ip, dns_response, time.monotonic() - sent_at)
 
-        :param dns_response: the most recently received dns response in the name resolution process.
-        :param requested_domain_name: the domain name we wish to resolve.
-        :param requested_type: the type of address we wish to resolve the domain name to.
-        :return: a list of the answer records that match the desired domain name and type, if present.
-        """
-        name_server_ip: Optional[str] = dns_response.get_name_server_ip_address(dns_response.name_server_records,
-                                                                                dns_response.additional_records)
+                    if self._rejects_edns(dns_response):
+                        dns_response = self._request_without_edns(requested_domain_name, responder_ip, requested_type,
+                                                                  timeout)
 
-        if name_server_ip:  # Response contains an address for one of the name servers, send packet to that server.
-            return self.resolve_domain_name(requested_domain_name, name_server_ip, requested_type)
+                        if dns_response is None:
+                            continue
 
-        else:
-            # Name server ip address could not be found. Thus, resolve the name server domain name. When found,
-            # use the resolved ip address to continue search for originally desired domain name.
-            name_server_records: List[ResourceRecord] = self.resolve_domain_name(dns_response.name_server_records[0].rdata,
-                                                                                 self.starting_dns_server, 1)
-            name_server_ip = name_server_records[0].rdata
-            return self.resolve_domain_name(requested_domain_name, name_server_ip, requested_type)
+                    if not dns_response.is_truncated:
+                        return dns_response
 
-    def _request_domain_name(self,
-                             requested_domain_name: str,
-                             next_dns_server_ip: str,
-                             requested_type: int) -> DNSMessage:
-        """
-        Creates a dns query to send to the starting_dns_server resource records pertaining to the requested_domain_name
-        of the requested_type.
+                    dns_response = self._request_over_tcp(requested_domain_name, responder_ip, requested_type, timeout)
+
+                    if dns_response is not None:
+                        return dns_response
+
+                    self.infrastructure_cache.add_error(responder_ip)
+                    continue
+
+                if wait >= timeout:
+                    self._record_timeouts(unanswered, timeout)
+
+            timeout = timeout * 2
 
-        Decrements the resolver counter by 1, since we sent a dns query.
+        raise self._timeout_error(requested_domain_name, next_dns_server_ips)
+
+    def _request_without_edns(self,
+                              requested_domain_name: str,
+                              dns_server_ip: str,
+                              requested_type: int,
+                              timeout: float) -> Optional[DNSMessage]:
+        """
+        Retries a dns query without EDNS0 to a dns server that rejected its OPT record, and receives its response. The
+        dns server is remembered in the infrastructure cache, so that later dns queries to it are sent without EDNS0.
 
         :param requested_domain_name: the domain name we wish to resolve.
-        :param next_dns_server_ip: the dns server we wish to send the next dns query to.
+        :param dns_server_ip: the dns server we wish to send the dns query to.
         :param requested_type: the type of address we wish to resolve the domain name to.
-        :return: the dns response from the next_dns_server_ip.
+        :param timeout: the number of seconds to wait for the dns response.
+        :return: the dns response, or None if the dns server did not respond in time.
         """
+        self.infrastructure_cache.add_edns_rejection(dns_server_ip)
         random_query_id: int = self.random.randint(0, 65535)
 
-        domain_name_query: BytesIO = DNSMessageUtilities.create_domain_name_query(requested_domain_name,
-                                                                                  random_query_id,
-                                                                                  requested_type)
-        self.udp_socket.sendto(domain_name_query.getvalue(), (next_dns_server_ip, 53))
+        domain_name_query: bytearray = DNSMessageUtilities.create_query(requested_domain_name, random_query_id,
+                                                                       requested_type, None)
+        self.udp_socket.sendto(domain_name_query, (dns_server_ip, 53))
+        sent_at: float = time.monotonic()
 
-        self.counter = self.counter - 1 # decrement the counter by one, since we have just sent a request
-        self._handle_tracing_for_dns_query(domain_name_query, next_dns_server_ip)
+        if self.tracer is not None or self.metrics is not None:
+            self._observe_query_sent(requested_domain_name, requested_type, random_query_id, dns_server_ip, True)
 
-        return self._receive_dns_message(random_query_id)
+        dns_response: Optional[DNSMessage] = self._receive_dns_message({random_query_id: (dns_server_ip, sent_at)},
+                                                                       timeout)
 
-    def _receive_dns_message(self, expected_query_id: int) -> DNSMessage:
-        """
-        Receives and decodes a dns message from a dns server.
+        if dns_response is not None:
+            self._record_response(dns_server_ip, dns_response, time.monotonic() - sent_at)
 
-        If the received dns message does not have the expected query_id or is not a response, then simply wait for the
-        next message received.
+        return dns_response
 
-        :param expected_query_id: the query id we expect the incoming dns response to possess.
-        :return: the dns response that has been received, successfully decoded, and has the correct query_id and is_
-        response value.
+    def _request_over_tcp(self,
+                          requested_domain_name: str,
+                          dns_server_ip: str,
+                          requested_type: int,
+                          timeout: float) -> Optional[DNSMessage]:
         """
-        received_data: bytes = self.udp_socket.recv(1024)
-        received_dns_message: DNSMessage = DNSMessage.decode_dns_message(BytesIO(received_data))
+        Sends a dns query to a dns server over tcp, reusing an open connection to the dns server if there is one, and
+        receives its response.
 
-        if (received_dns_message.query_id != expected_query_id) or not received_dns_message.is_response:
-            received_dns_message = self._receive_dns_message(expected_query_id)
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param dns_server_ip: the dns server we wish to send the dns query to.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :param timeout: the number of seconds to wait for the connection, and then for the dns response.
+        :return: the dns response, or None if no well formed response to the dns query was received.
+        """
+        random_query_id: int = self.random.randint(0, 65535)
 
-        return received_dns_message
+        domain_name_query: bytearray = DNSMessageUtilities.create_query(requested_domain_name, random_query_id,
+                                                                       requested_type,
+                                                                       self._get_udp_payload_size(dns_server_ip))
+        sent_at: float = time.monotonic()
 
-    def _handle_tracing_for_dns_response(self, dns_response: DNSMessage) -> None:
-        """
-        If the resolver is set to verbose, then print tracing information for the dns response.
+        if self.tracer is not None or self.metrics is not None:
+            self._observe_query_sent(requested_domain_name, requested_type, random_query_id, dns_server_ip, True)
 
-        :param dns_response: the dns response we wish to provide tracing information of.
-        :return: None.
-        """
-        if self.verbose:
-            dns_response.print_dns_response()
+        try:
+            dns_response: DNSMessage = DNSMessage.decode_dns_message(
+                self.tcp_connections.query(dns_server_ip, domain_name_query, timeout))
+            dns_response.decode_sections()
+        except (OSError, IndexError, ValueError, struct.error):
+            return None
 
-    def _handle_tracing_for_dns_query(self, domain_name_query: BytesIO, next_dns_server_ip: str) -> None:
-        """
-        If the resolver is set to verbose, then print tracing information for the dns query.
+        if dns_response.query_id != random_query_id or not dns_response.is_response:
+            return None
 
-        :param domain_name_query: the domain name query that is sent to the next_dns_server_ip.
-        :param next_dns_server_ip: the dns server we send the domain name query to.
-        :return: None
-        """
-        if self.verbose:
-            print('')
-            print('')
-            domain_name_query.seek(0)  # need to ensure we are at the start of the writer
-                                       # to be able to correctly decode into a DNS Question
-            DNSMessage.decode_dns_message(domain_name_query).print_dns_query(next_dns_server_ip)
+        self._observe_response(dns_server_ip, dns_response, time.monotonic() - sent_at)
 
-    @staticmethod
-    def print_answers(requested_domain_name: str, answer_records: List[ResourceRecord]) -> None:
-        """
-        Prints all answer records that the name resolution of the domain name produced.
+        return dns_response
 
-        :param requested_domain_name: the domain name we resolved.
-        :param answer_records: the answer records received from the name resolution process.
-        :return: None
+    def _receive_dns_message(self, sent: Mapping[int, Tuple[str, float]], timeout: float) -> Optional[DNSMessage]:
         """
-        print('')
-        print("Answers:")
-        for answer in answer_records:
-            answer.print_record_with_supplied_domain_name(requested_domain_name)
+        Receives and decodes a dns message from a dns server.
 
-    def _check_counter(self) -> None:
-        """
-        If the resolver's counter is zero, then raise a DNSZeroCounterError
+        If the received dns message does not have one of the expected query ids, was not sent by the dns server that
+        the dns query with its query id was sent to, or is not a response, then simply wait for the next message
+        received, for as long as the timeout has not elapsed. Such messages include late responses to the transmissions
+        of earlier dns queries on the same socket, which are discarded, and spoofed responses from other hosts.
 
-        :raises: DNSZeroCounterError
-        :return: None
-        """
-        if self.counter == 0:
-            raise DNSZeroCounterError('Too many queries error: there appears to be '
-                                      'a loop in resolving this domain name.')
+        Every dns message is received into the receive buffer, which is allocated once rather than for every dns
+        message. Only the header of a received dns message is decoded here, so a discarded dns message costs next to
+        nothing. Its sections are decoded once the name resolution accesses them.
 
-    @staticmethod
-    def _check_rcode(rcode: int) -> None:
+        :param sent: maps the query ids we expect the incoming dns response to possess to the dns server each dns query
+                     was sent to, and when.
+        :param timeout: the number of seconds to wait for the dns response.
+        :return: the dns response that has been received, successfully decoded, and has an expected query_id, sender and
+        is_response value. If no such response arrives before the timeout elapses, return None.
         """
-        If rcode is non-zero, then raise the appropriate error.
+        deadline: float = time.monotonic() + timeout
 
-        :param rcode: the rcode the most recent dns response possessed
+        while True:
+            remaining: float = deadline - time.monotonic()
 
-        :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError
-        :return: None
-        """
-        if rcode == 1:
-            raise DNSFormatError("Format error: the name server was unable to interpret the query.")
-        elif rcode == 2:
-            raise DNSServerFailureError("Server failure: The name server was unable to process this query due to a problem with the name server.")
-        elif rcode == 3:
-            raise DNSNameError("Name Error: the domain name you are attempt to resolve does not exist.")
-        elif rcode == 4:
-            raise DNSNotImplementedError("Not Implemented: The name server does not support the requested kind of query.")
-        elif rcode == 5:
-            raise DNSRefusedError("Refused - The name server refuses to perform the specified operation for policy reasons.")
+            if remaining <= 0:
+                return None
+
+            self.udp_socket.settimeout(remaining)
+
+            try:
+                received_size, address = self.udp_socket.recvfrom_into(self.receive_buffer)
+            except socket.timeout:
+                return None
 
+            received_dns_message: DNSMessage = DNSMessage.decode_dns_message(
+                memoryview(self.receive_buffer)[:received_size])
+            transmission: Optional[Tuple[str, float]] = sent.get(received_dns_message.query_id)
 
+            if transmission is not None and (address[0], address[1]) == (transmission[0], 53) and \
+                    received_dns_message.is_response:
+                return received_dns_message
 
+    @staticmethod
+    def get_receive_buffer_size(udp_payload_size: Optional[int]) -> int:
+        """
+        :param udp_payload_size: the udp payload size advertised in dns queries, or None for dns queries without EDNS0
+        :return: the size of a receive buffer that holds any udp response to the dns queries
+        """
+        return max(udp_payload_size, 512) if udp_payload_size is not None else 512
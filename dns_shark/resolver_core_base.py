@@ -0,0 +1,572 @@
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.dns_cache import DNSCache
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.resolution_state import ResolutionState
+from dns_shark.resolution_task import ResolutionTask
+from dns_shark.tracer import PrintingTracer, Tracer
+from dns_shark.metrics import MetricsRegistry
+from typing import Dict, Hashable, List, NoReturn, Optional, Tuple
+from random import Random
+import sys
+import time
+from dns_shark.errors.dns_shark_error import DNSSharkError
+from dns_shark.errors.dns_format_error import DNSFormatError
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_not_implemented_error import DNSNotImplementedError
+from dns_shark.errors.dns_server_failure_error import DNSServerFailureError
+from dns_shark.errors.dns_refused_error import DNSRefusedError
+from dns_shark.errors.dns_no_matching_resource_record_error import DNSNoMatchingResourceRecordError
+from dns_shark.errors.dns_zero_counter_error import DNSZeroCounterError
+from dns_shark.errors.dns_timeout_error import DNSTimeoutError
+
+
+class ResolverCoreBase:
+    """
+    Contains the name resolution logic shared by the blocking and the asyncio resolver cores, i.e. everything that does
+    not involve communicating with the dns servers.
+
+    A name resolution is an explicit ResolutionState that is advanced one dns response at a time, so the resolver cores
+    merely drive a loop that sends the dns query of the current task and hands its response back.
+
+    Instance Attributes:
+
+        verbose: a boolean flag indicating whether verbose output is desired
+        starting_dns_server: the dns server that the name resolution search begins with
+        counter: the maximum number of requests allowed for a single domain name resolution.
+                 Used to exit from infinite loops.
+        random: a random number generator used for choosing query ids
+        cache: the cache of resource records consulted before any dns query is sent. May be shared between resolvers.
+        timeout: the number of seconds to wait for a response to the first transmission of a dns query
+        retries: the number of times a dns query is retransmitted to every candidate dns server after the first round
+                 of transmissions. The timeout doubles with every round.
+        hedge: a boolean flag indicating whether a dns query is also sent to the next candidate dns server once the
+               hedge delay elapses, instead of only once the timeout elapses
+        round_trip_times: the estimate of dns server round trip times that determines the hedge delay of dns servers
+                          whose own round trip time is unknown. May be shared between resolvers.
+        infrastructure_cache: the cache of name server round trip times, timeouts and errors, used to query the
+                              fastest name servers first. May be shared between resolvers.
+        udp_payload_size: the largest udp response the resolver is able to receive, advertised in the EDNS0 OPT record
+                          of every dns query. None for dns queries without EDNS0, whose responses are limited to 512
+                          bytes.
+        tracer: the tracer that receives the events of the name resolution, if any. A verbose resolver without a
+                tracer of its own prints its trace with a PrintingTracer.
+        metrics: the metrics registry that counts the dns queries, dns responses, cache lookups and errors of the name
+                 resolution, if any. May be shared between resolvers.
+    """
+
+    def __init__(self, verbose: bool, starting_dns_server: str, random: Random, counter: int = 30,
+                 cache: Optional[DNSCache] = None, timeout: float = 2.0, retries: int = 2, hedge: bool = False,
+                 round_trip_times: Optional[RoundTripTimeEstimator] = None,
+                 infrastructure_cache: Optional[InfrastructureCache] = None,
+                 udp_payload_size: Optional[int] = 1232,
+                 tracer: Optional[Tracer] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.verbose: bool = verbose
+        self.starting_dns_server: str = starting_dns_server
+        self.counter: int = counter
+        self.random: Random = random
+        self.cache: DNSCache = cache if cache is not None else DNSCache()
+        self.timeout: float = timeout
+        self.retries: int = retries
+        self.hedge: bool = hedge
+        self.round_trip_times: RoundTripTimeEstimator = round_trip_times if round_trip_times is not None \
+            else RoundTripTimeEstimator()
+        # exploring only pays off for an infrastructure cache that outlives many name resolutions
+        self.infrastructure_cache: InfrastructureCache = infrastructure_cache if infrastructure_cache is not None \
+            else InfrastructureCache(exploration=0.0)
+        self.udp_payload_size: Optional[int] = udp_payload_size
+        self.tracer: Optional[Tracer] = tracer if tracer is not None or not verbose else PrintingTracer()
+        self.metrics: Optional[MetricsRegistry] = metrics
+
+    def begin_resolution(self, requested_domain_name: str,
+                         next_dns_server_ip: str,
+                         requested_type: int) -> ResolutionState:
+        """
+        Begins the name resolution of a requested domain name of the requested type.
+
+        If the next_dns_server_ip is the starting dns server, the name resolution instead begins at the name servers of
+        the deepest cached zone cut enclosing the requested domain name.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param next_dns_server_ip: the starting dns server which we use in the name resolution process.
+        :param requested_type: the desired resource record type we seek to resolve the domain name to.
+        :raises: DNSNameError, DNSZeroCounterError, DNSNoMatchingResourceRecordError
+        :return: the state of the name resolution, already done if the answer was cached.
+        """
+        dns_server_ips: Optional[List[str]] = None if next_dns_server_ip == self.starting_dns_server \
+            else [next_dns_server_ip]
+
+        state: ResolutionState = ResolutionState(ResolutionTask(requested_domain_name, requested_type, dns_server_ips))
+        self._advance_resolution(state)
+
+        return state
+
+    def continue_resolution(self, state: ResolutionState, dns_response: DNSMessage) -> None:
+        """
+        Advances a name resolution with the dns response to the dns query of its current task.
+
+        An authoritative response either completes the current task with its answer records or makes it follow a cname
+        record. A referral moves the current task on to the name servers of the referral, first pushing a task that
+        resolves the address of a name server if the referral included none.
+
+        :param state: the state of the name resolution.
+        :param dns_response: the dns response received for the current task.
+        :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError,
+                 DNSZeroCounterError, DNSNoMatchingResourceRecordError
+        :return: None
+        """
+        task: ResolutionTask = state.current_task
+
+        self._check_dns_response(dns_response, task.domain_name)
+
+        if dns_response.authoritative:
+            # If the response is from a DNS server that is authoritative,
+            # it will either have a CNAME or A entry for the fqdn.
+            answer_resource_records = dns_response.get_matching_answer_records(dns_response.answer_records,
+                                                                              task.domain_name,
+                                                                              task.type)
+            cname_resource_records = dns_response.get_matching_answer_records(dns_response.answer_records,
+                                                                             task.domain_name, 5)
+
+            if answer_resource_records:
+                self.cache.add_answers(task.domain_name, task.type, answer_resource_records)
+                self._complete_task(state, answer_resource_records)
+
+            elif cname_resource_records:
+                if self.tracer is not None:
+                    self.tracer.cname_followed(time.time(), task.domain_name, cname_resource_records[0])
+
+                task.follow_cname(cname_resource_records[0])
+
+            else:
+                self._handle_no_matching_resource_records(dns_response, task.domain_name, task.type)
+
+        else:
+            # not an authoritative response. Therefore, look for a name server to send the next request to.
+            self._cache_delegation(dns_response, task)
+
+            name_server_ips: List[str] = self._find_name_server_ips(dns_response)
+
+            if self.tracer is not None:
+                self.tracer.referral_followed(time.time(), task.domain_name, dns_response, name_server_ips)
+
+            if name_server_ips:  # Response contains addresses for the name servers, send packet to those servers.
+                task.dns_server_ips = name_server_ips
+
+            else:
+                # Name server ip address could not be found. Thus, resolve the name server domain name first. When
+                # found, the resolved ip addresses are used to continue the search for the current domain name.
+                state.tasks.append(ResolutionTask(dns_response.name_server_records[0].rdata, 1))
+
+        self._advance_resolution(state)
+
+    def _advance_resolution(self, state: ResolutionState) -> None:
+        """
+        Advances a name resolution as far as possible without a dns response, i.e. until its current task needs a dns
+        query to be sent or the name resolution is done.
+
+        Unexpired answer records are taken from the cache instead of sending a dns query. Domain names cached as not
+        existing, or as having no records of the requested type, fail without sending any dns query.
+
+        :param state: the state of the name resolution.
+        :raises: DNSNameError, DNSZeroCounterError, DNSNoMatchingResourceRecordError
+        :return: None
+        """
+        while not state.done:
+            task: ResolutionTask = state.current_task
+            cached_answers: Optional[List[ResourceRecord]] = self._find_cached_answers(task.domain_name, task.type)
+
+            if cached_answers is not None:
+                self._complete_task(state, cached_answers)
+                continue
+
+            if task.dns_server_ips is None:
+                task.zone, task.dns_server_ips = self._find_closest_dns_servers(task.domain_name)
+
+            self._check_counter()
+            return
+
+    def _complete_task(self, state: ResolutionState, answers: List[ResourceRecord]) -> None:
+        """
+        Completes the current task of a name resolution with the answer records found for it.
+
+        The answers are also cached under every domain name whose cname record the task followed. If the task resolved
+        the address of a name server, the task below it continues with that name server.
+
+        :param state: the state of the name resolution.
+        :param answers: the answer records found for the current domain name of the task.
+        :return: None
+        """
+        task: ResolutionTask = state.tasks.pop()
+
+        for alias, cname_resource_record in reversed(task.aliases):
+            self._cache_cname_answers(alias, task.type, cname_resource_record, answers)
+
+        if state.tasks:
+            state.current_task.dns_server_ips = self.infrastructure_cache.sort_name_servers(
+                [answer.rdata for answer in answers])
+        else:
+            state.answers = answers
+
+    def _find_cached_answers(self, requested_domain_name: str, requested_type: int) -> Optional[List[ResourceRecord]]:
+        """
+        Looks up the requested domain name in the cache.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :raises: DNSNameError, DNSNoMatchingResourceRecordError
+        :return: the cached answer records, if present. Otherwise, return None.
+        """
+        cached_answers: Optional[List[ResourceRecord]] = self.cache.get_answers(requested_domain_name, requested_type)
+
+        if cached_answers is None:
+            try:
+                self._check_negative_cache(requested_domain_name, requested_type)
+            except DNSSharkError:
+                if self.metrics is not None:
+                    self.metrics.cache_hits.inc()
+                raise
+
+            if self.metrics is not None:
+                self.metrics.cache_misses.inc()
+
+        elif self.metrics is not None:
+            self.metrics.cache_hits.inc()
+
+        return cached_answers
+
+    def _check_dns_response(self, dns_response: DNSMessage, requested_domain_name: str) -> None:
+        """
+        Checks the rcode of a dns response, caching it first if it indicates the requested domain name does not exist.
+
+        :param dns_response: the most recently received dns response in the name resolution process.
+        :param requested_domain_name: the domain name we wish to resolve.
+        :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError
+        :return: None
+        """
+        if dns_response.rcode == 3:
+            self.cache.add_name_error(requested_domain_name, dns_response.name_server_records)
+
+        ResolverCoreBase._check_rcode(dns_response.rcode)
+
+    def _cache_cname_answers(self, requested_domain_name: str,
+                             requested_type: int,
+                             cname_resource_record: ResourceRecord,
+                             cname_answers: List[ResourceRecord]) -> None:
+        """
+        Caches the answers found by following a cname record under the requested domain name, for no longer than the
+        cname record itself may be cached.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :param cname_resource_record: the cname record that was followed.
+        :param cname_answers: the answer records found for the cname value.
+        :return: None
+        """
+        if cname_answers:
+            ttl: int = min([cname_resource_record.ttl] + [answer.ttl for answer in cname_answers])
+            self.cache.add_answers(requested_domain_name, requested_type, cname_answers, ttl=ttl)
+
+    def _handle_no_matching_resource_records(self, dns_response: DNSMessage,
+                                             requested_domain_name: str,
+                                             requested_type: int) -> NoReturn:
+        """
+        Caches the absence of records of the requested type and raises a DNSNoMatchingResourceRecordError.
+
+        :param dns_response: the authoritative response that lacked matching records.
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :raises: DNSNoMatchingResourceRecordError
+        """
+        self.cache.add_no_data(requested_domain_name, requested_type, dns_response.name_server_records)
+        raise ResolverCoreBase._no_matching_resource_record_error()
+
+    def _cache_delegation(self, dns_response: DNSMessage, task: ResolutionTask) -> None:
+        """
+        Caches the delegation contained in a referral, and moves the zone cut of the task down to the delegated zone.
+
+        Only delegations to a zone that encloses the domain name of the task, and lies strictly below the zone cut of
+        the dns servers that sent the referral, are cached, since those dns servers have no business providing name
+        servers for any other zone. Thus a delegation is never replaced by one learned from a dns server outside the
+        bailiwick of the delegated zone, e.g. the delegation of com by the name servers of evil.com.
+
+        :param dns_response: the referral received in the name resolution process.
+        :param task: the task the referral was received for.
+        :return: None
+        """
+        if not dns_response.name_server_records:
+            return
+
+        zone: str = dns_response.name_server_records[0].name.lower()
+        domain_name: str = task.domain_name.lower()
+
+        if not DNSCache.is_in_zone(domain_name, zone) or zone == task.zone or not DNSCache.is_in_zone(zone, task.zone):
+            return
+
+        self.cache.add_delegation(zone, dns_response.name_server_records, dns_response.additional_records)
+        task.zone = zone
+
+    def _find_closest_dns_servers(self, requested_domain_name: str) -> Tuple[str, List[str]]:
+        """
+        Finds the dns servers to begin the name resolution of a domain name with, in the order they should be tried.
+
+        :param requested_domain_name: the domain name about to be resolved.
+        :return: the deepest cached zone cut enclosing the domain name, or the empty string for the root, and its name
+        servers, fastest first, followed by the starting dns server as a last resort.
+        """
+        zone_cut: Optional[Tuple[str, List[str]]] = self.cache.get_closest_zone_cut(requested_domain_name)
+        zone, addresses = zone_cut if zone_cut is not None else ('', [])
+        addresses = self.infrastructure_cache.sort_name_servers(addresses)
+
+        if self.starting_dns_server not in addresses:
+            addresses.append(self.starting_dns_server)
+
+        return zone, addresses
+
+    def _find_name_server_ips(self, dns_response: DNSMessage) -> List[str]:
+        """
+        Finds the addresses of every name server of a referral whose glue records were included.
+
+        :param dns_response: the referral received in the name resolution process.
+        :return: the name server ip addresses, fastest first.
+        """
+        return self.infrastructure_cache.sort_name_servers(
+            dns_response.get_name_server_ip_addresses(dns_response.name_server_records,
+                                                      dns_response.additional_records))
+
+    def _get_response_wait(self, dns_server_ip: str,
+                           transmission_index: int,
+                           transmission_count: int,
+                           timeout: float) -> float:
+        """
+        Determines how long to wait for a response to a transmission of a dns query before sending the next one.
+
+        :param dns_server_ip: the dns server the transmission was sent to.
+        :param transmission_index: the position of the transmission within its round of transmissions.
+        :param transmission_count: the number of transmissions in a round, one per candidate dns server.
+        :param timeout: the timeout of the current round of transmissions.
+        :return: the hedge delay of the dns server if hedging and another dns server remains in the round. Otherwise,
+        return the timeout.
+        """
+        if self.hedge and transmission_index + 1 < transmission_count:
+            hedge_delay: Optional[float] = self.infrastructure_cache.get_hedge_delay(dns_server_ip)
+
+            if hedge_delay is None:
+                hedge_delay = self.round_trip_times.hedge_delay()
+
+            return min(hedge_delay, timeout)
+
+        return timeout
+
+    def _record_timeouts(self, unanswered: Dict[Hashable, str], timeout: float) -> None:
+        """
+        Records a timeout for every transmission of a dns query still awaiting a response once a full timeout elapsed,
+        and forgets them.
+
+        Only called when a wait for the full timeout ends without a response, since a wait for a mere hedge delay does
+        not mean that a dns server failed to respond in time. As the last wait of every round is for the full timeout,
+        every transmission of the round has then waited at least its own timeout.
+
+        :param unanswered: maps every transmission whose timeout is yet to be recorded, and that has not been answered,
+                           to the dns server it was sent to.
+        :param timeout: the timeout of the transmissions.
+        :return: None
+        """
+        for dns_server_ip in unanswered.values():
+            self.infrastructure_cache.add_timeout(dns_server_ip, timeout)
+
+        unanswered.clear()
+
+    def _get_udp_payload_size(self, dns_server_ip: str) -> Optional[int]:
+        """
+        :param dns_server_ip: the dns server a dns query is about to be sent to.
+        :return: the udp payload size advertised in the dns query, or None to send it without EDNS0, if the resolver
+        sends no EDNS0 or the dns server rejected it before.
+        """
+        if self.udp_payload_size is None or not self.infrastructure_cache.supports_edns(dns_server_ip):
+            return None
+
+        return self.udp_payload_size
+
+    def _rejects_edns(self, dns_response: DNSMessage) -> bool:
+        """
+        Determines whether a dns response rejected the EDNS0 OPT record of its dns query, i.e. whether it is a format
+        error or not implemented error without an OPT record of its own. Such a dns query is retried once without EDNS0,
+        see https://tools.ietf.org/rfc/rfc6891.txt section 7.
+
+        :param dns_response: the dns response received.
+        :return: true if the dns query may have carried an OPT record that the dns response rejected, false otherwise.
+        """
+        return self.udp_payload_size is not None and dns_response.rcode in (1, 4) and dns_response.opt_record is None
+
+    def _record_response(self, dns_server_ip: str, dns_response: DNSMessage, round_trip_time: float) -> None:
+        """
+        Records how long a dns server took to respond, or that it responded with a server-side error, and traces and
+        counts the dns response.
+
+        :param dns_server_ip: the dns server that responded.
+        :param dns_response: the dns response received.
+        :param round_trip_time: the number of seconds between sending the dns query and receiving the dns response.
+        :return: None
+        """
+        self.round_trip_times.add_sample(round_trip_time)
+
+        if dns_response.rcode in (1, 2, 4, 5):
+            self.infrastructure_cache.add_error(dns_server_ip)
+        else:
+            self.infrastructure_cache.add_round_trip_time(dns_server_ip, round_trip_time)
+
+        self._observe_response(dns_server_ip, dns_response, round_trip_time)
+
+    def _observe_response(self, dns_server_ip: str, dns_response: DNSMessage, round_trip_time: float) -> None:
+        """
+        Traces and counts a dns response, over udp or tcp, if the resolver has a tracer or metrics.
+
+        :param dns_server_ip: the dns server that responded.
+        :param dns_response: the dns response received.
+        :param round_trip_time: the number of seconds between sending the dns query and receiving the dns response.
+        :return: None
+        """
+        if self.tracer is not None:
+            self.tracer.response_received(time.time(), dns_response, dns_server_ip, round_trip_time)
+
+        if self.metrics is not None:
+            self.metrics.responses.inc(str(dns_response.rcode))
+            self.metrics.hop_latency.observe(round_trip_time)
+
+    def _timeout_error(self, requested_domain_name: str, dns_server_ips: List[str]) -> DNSTimeoutError:
+        """
+        Creates the error raised when no dns server responded to a dns query.
+
+        :param requested_domain_name: the domain name the dns query was sent for.
+        :param dns_server_ips: the dns servers the dns query was sent to.
+        :return: a DNSTimeoutError
+        """
+        return DNSTimeoutError('Timeout error: none of the dns servers ' + ', '.join(dns_server_ips) +
+                               ' responded to the query for ' + requested_domain_name + ' after ' +
+                               str(self.retries + 1) + ' attempts each.')
+
+    def _observe_query_sent(self, requested_domain_name: str, requested_type: int, query_id: int, dns_server_ip: str,
+                            over_tcp: bool = False, retransmission: bool = False) -> None:
+        """
+        Traces and counts a dns query sent to a dns server. Only called when the resolver has a tracer or metrics.
+
+        :param requested_domain_name: the domain name of the dns query.
+        :param requested_type: the resource record type of the dns query.
+        :param query_id: the query id of the dns query.
+        :param dns_server_ip: the dns server the dns query was sent to.
+        :param over_tcp: a boolean flag indicating whether the dns query was sent over tcp.
+        :param retransmission: a boolean flag indicating whether the dns query was sent before, to any dns server.
+        :return: None
+        """
+        if self.tracer is not None:
+            self.tracer.query_sent(time.time(), DNSQuestion(requested_domain_name, requested_type, 1), query_id,
+                                   dns_server_ip, over_tcp)
+
+        if self.metrics is not None:
+            self.metrics.queries_sent.inc(dns_server_ip, 'tcp' if over_tcp else 'udp')
+
+            if retransmission:
+                self.metrics.retransmissions.inc()
+
+    def _observe_resolution(self, requested_domain_name: str, started: float, error: Optional[DNSSharkError]) -> None:
+        """
+        Traces the error a name resolution failed with, and counts the name resolution, if the resolver has a tracer or
+        metrics.
+
+        :param requested_domain_name: the domain name that was resolved.
+        :param started: the time the name resolution began at, as returned by time.monotonic.
+        :param error: the error raised, or None if the name resolution succeeded.
+        :return: None
+        """
+        if self.tracer is not None and error is not None:
+            self.tracer.error_raised(time.time(), requested_domain_name, error)
+
+        if self.metrics is not None:
+            self.metrics.resolution_latency.observe(time.monotonic() - started)
+
+            if error is not None:
+                self.metrics.errors.inc(type(error).__name__)
+
+    @staticmethod
+    def print_answers(requested_domain_name: str, answer_records: List[ResourceRecord]) -> None:
+        """
+        Prints all answer records that the name resolution of the domain name produced.
+
+        :param requested_domain_name: the domain name we resolved.
+        :param answer_records: the answer records received from the name resolution process.
+        :return: None
+        """
+        sys.stdout.write(ResolverCoreBase.format_answers(requested_domain_name, answer_records))
+
+    @staticmethod
+    def format_answers(requested_domain_name: str, answer_records: List[ResourceRecord]) -> str:
+        """
+        Formats all answer records that the name resolution of the domain name produced, as print_answers prints them.
+
+        :param requested_domain_name: the domain name we resolved.
+        :param answer_records: the answer records received from the name resolution process.
+        :return: the formatted answer records, one per line
+        """
+        return '\nAnswers:\n' + ''.join(answer.format_record_with_supplied_domain_name(requested_domain_name) + '\n'
+                                         for answer in answer_records)
+
+    def _check_negative_cache(self, requested_domain_name: str, requested_type: int) -> None:
+        """
+        If the requested domain name is cached as not existing, or as having no records of the requested type, then
+        raise the same error that the original response raised.
+
+        :param requested_domain_name: the domain name we wish to resolve.
+        :param requested_type: the type of address we wish to resolve the domain name to.
+        :raises: DNSNameError, DNSNoMatchingResourceRecordError
+        :return: None
+        """
+        if self.cache.get_name_error(requested_domain_name) is not None:
+            ResolverCoreBase._check_rcode(3)
+
+        if self.cache.get_no_data(requested_domain_name, requested_type) is not None:
+            raise ResolverCoreBase._no_matching_resource_record_error()
+
+    @staticmethod
+    def _no_matching_resource_record_error() -> DNSNoMatchingResourceRecordError:
+        """
+        Creates the error raised when an authoritative response contains no records of the requested type.
+
+        :return: a DNSNoMatchingResourceRecordError
+        """
+        return DNSNoMatchingResourceRecordError("No matching resource record error: an authoritative response was returned for a desired domain name. However, the authoritative response did not contain any resource records that matched the desired type.")
+
+    def _check_counter(self) -> None:
+        """
+        If the resolver's counter is zero, then raise a DNSZeroCounterError
+
+        :raises: DNSZeroCounterError
+        :return: None
+        """
+        if self.counter == 0:
+            raise DNSZeroCounterError('Too many queries error: there appears to be '
+                                      'a loop in resolving this domain name.')
+
+    @staticmethod
+    def _check_rcode(rcode: int) -> None:
+        """
+        If rcode is non-zero, then raise the appropriate error.
+
+        :param rcode: the rcode the most recent dns response possessed
+
+        :raises: DNSFormatError, DNSServerFailureError, DNSNameError, DNSNotImplementedError, DNSRefusedError
+        :return: None
+        """
+        if rcode == 1:
+            raise DNSFormatError("Format error: the name server was unable to interpret the query.")
+        elif rcode == 2:
+            raise DNSServerFailureError("Server failure: The name server was unable to process this query due to a problem with the name server.")
+        elif rcode == 3:
+            raise DNSNameError("Name Error: the domain name you are attempt to resolve does not exist.")
+        elif rcode == 4:
+            raise DNSNotImplementedError("Not Implemented: The name server does not support the requested kind of query.")
+        elif rcode == 5:
+            raise DNSRefusedError("Refused - The name server refuses to perform the specified operation for policy reasons.")
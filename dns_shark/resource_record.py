@@ -1,6 +1,10 @@
-from dns_shark.domain_name_handling import DomainNameDecoder
+from dns_shark.domain_name_handling import DomainNameDecoder, DomainNameEncoder, WireData
 from io import BytesIO
-from socket import inet_ntop, AF_INET, AF_INET6
+from socket import inet_ntop, inet_pton, AF_INET, AF_INET6
+from ipaddress import IPv4Address, IPv6Address, ip_address
+from typing import Dict, List, Optional, Tuple, Union
+import struct
+import sys
 
 
 class ResourceRecord:
@@ -14,18 +18,109 @@ class ResourceRecord:
         response_class: the class field of the resource record
         ttl: the ttl field of the resource record
         rdlength: the rdlength field of the resource record
-        rdata: the rdata field of the resource record
+        rdata: the rdata field of the resource record, in its master file representation. The rdata of a type that
+               dns shark does not support is represented as in https://tools.ietf.org/rfc/rfc3597.txt
+        raw_rdata: the rdata field of the resource record as it was received, which is empty for a resource record that
+                   was not decoded. Domain names in the raw rdata of NS, CNAME and SOA records may be compressed, i.e.
+                   point into the dns message. Those of the other types whose domain names may be compressed are
+                   decompressed, so that their raw rdata means the same in any dns message.
+
+    The rdata of A, AAAA and unsupported resource records is only converted to a string when it is first read, since
+    most of the glue records of a referral are never read.
 
         see https://tools.ietf.org/rfc/rfc1035.txt for more description on the meaning of these fields
     """
 
-    def __init__(self, name: str, type: int, response_class: int, ttl: int, rdlength: int, rdata: str):
+    # resource records are held by the million in caches, so they have no instance __dict__
+    __slots__ = ('name', 'type', 'response_class', 'ttl', 'rdlength', 'raw_rdata', '_rdata', '_ip_address')
+
+    _fixed_fields: struct.Struct = struct.Struct('!HHIH')  # type, class, ttl, rdlength
+    _soa_fields: struct.Struct = struct.Struct('!IIIII')  # serial, refresh, retry, expire, minimum
+
+    # the layouts of the rdata of the types besides NS, CNAME and SOA whose domain names may be compressed, see
+    # https://tools.ietf.org/rfc/rfc3597.txt section 4. A number is that many bytes of fixed length fields, 'name' a
+    # domain name and 'string' a character string. Any rdata past the layout is kept as it is.
+    _compressible_rdata: Dict[int, Tuple[Union[int, str], ...]] = {
+        3: ('name',),  # MD
+        4: ('name',),  # MF
+        7: ('name',),  # MB
+        8: ('name',),  # MG
+        9: ('name',),  # MR
+        12: ('name',),  # PTR
+        14: ('name', 'name'),  # MINFO
+        15: (2, 'name'),  # MX
+        17: ('name', 'name'),  # RP
+        18: (2, 'name'),  # AFSDB
+        21: (2, 'name'),  # RT
+        24: (18, 'name'),  # SIG
+        26: (2, 'name', 'name'),  # PX
+        30: ('name',),  # NXT
+        33: (6, 'name'),  # SRV
+        35: (4, 'string', 'string', 'string', 'name'),  # NAPTR
+    }
+
+    def __init__(self, name: str, type: int, response_class: int, ttl: int, rdlength: int,
+                 rdata: Optional[str] = None, raw_rdata: bytes = b''):
         self.name: str = name
         self.type: int = type
         self.response_class: int = response_class
         self.ttl: int = ttl
         self.rdlength: int = rdlength
-        self.rdata: str = rdata
+        self.raw_rdata: bytes = raw_rdata
+        self._rdata: Optional[str] = rdata  # None until the raw rdata is first converted to a string
+        self._ip_address: Optional[Union[IPv4Address, IPv6Address]] = None
+
+    @property
+    def rdata(self) -> str:
+        if self._rdata is None:
+            self._rdata = ResourceRecord._decode_rdata(self.raw_rdata, 0, len(self.raw_rdata), self.type)
+
+        return self._rdata
+
+    @rdata.setter
+    def rdata(self, rdata: str) -> None:
+        self._rdata = rdata
+        self._ip_address = None
+
+    @property
+    def packed_address(self) -> bytes:
+        """
+        :raises: ValueError if the resource record is neither an A nor an AAAA record
+        :return: the ipv4 or ipv6 address held by the rdata of an A or AAAA record, in network byte order
+        """
+        if self.type == 1:
+            family, length = AF_INET, 4
+        elif self.type == 28:
+            family, length = AF_INET6, 16
+        else:
+            raise ValueError('A resource record of type ' + ResourceRecord.parse_type(self.type) + ' has no address.')
+
+        if len(self.raw_rdata) == length:
+            return self.raw_rdata
+
+        return inet_pton(family, self.rdata)
+
+    @property
+    def ip_address(self) -> Union[IPv4Address, IPv6Address]:
+        """
+        :raises: ValueError if the resource record is neither an A nor an AAAA record
+        :return: the ipv4 or ipv6 address held by the rdata of an A or AAAA record
+        """
+        if self._ip_address is None:
+            self._ip_address = ip_address(self.packed_address)
+
+        return self._ip_address
+
+    @property
+    def target(self) -> str:
+        """
+        :raises: ValueError if the resource record is neither an NS nor a CNAME record
+        :return: the domain name held by the rdata of an NS or CNAME record
+        """
+        if self.type not in (2, 5):
+            raise ValueError('A resource record of type ' + ResourceRecord.parse_type(self.type) + ' has no target.')
+
+        return self.rdata
 
     def __eq__(self, other: object):
         if not isinstance(other, ResourceRecord):
@@ -42,64 +137,246 @@ class ResourceRecord:
         return 'ResourceRecord(name: ' + str(self.name) + ', type: ' + str(self.type) + ', class: ' + str(self.response_class) + \
                ', ttl: ' + str(self.ttl) + ', rdlength: ' + str(self.rdlength) + ', rdata: ' + str(self.rdata) + ')'
 
+    def copy_with_ttl(self, ttl: int) -> 'ResourceRecord':
+        """
+        Creates a copy of this resource record with a different ttl.
+
+        :param ttl: the ttl of the copied resource record
+        :return: a new resource record identical to this one, except for its ttl
+        """
+        return ResourceRecord(self.name, self.type, self.response_class, ttl, self.rdlength, self._rdata,
+                              self.raw_rdata)
+
+    def copy_with_name(self, name: str) -> 'ResourceRecord':
+        """
+        Creates a copy of this resource record with a different name.
+
+        :param name: the name of the copied resource record
+        :return: a new resource record identical to this one, except for its name
+        """
+        return ResourceRecord(name, self.type, self.response_class, self.ttl, self.rdlength, self._rdata,
+                              self.raw_rdata)
+
+    def encode_into(self, message: bytearray, suffixes: Dict[str, int]) -> None:
+        """
+        Encode the resource record at the end of a dns message, compressing the domain names it holds.
+
+        The rdlength field is that of the encoded rdata, which differs from the rdlength of a decoded resource record
+        whenever its domain names are compressed differently.
+
+        :param message: the dns message encoded so far, which the resource record is appended to
+        :param suffixes: the domain name suffixes already written out in the dns message, see
+                         DomainNameEncoder.encode_domain_name_into
+        :raises: ValueError if the rdata cannot be encoded
+        :return: None
+        """
+        DomainNameEncoder.encode_domain_name_into(self.name, message, suffixes)
+
+        fixed_fields: int = len(message)
+        message.extend(bytes(ResourceRecord._fixed_fields.size))
+
+        self._encode_rdata_into(message, suffixes)
+
+        rdlength: int = len(message) - fixed_fields - ResourceRecord._fixed_fields.size
+        ResourceRecord._fixed_fields.pack_into(message, fixed_fields, self.type, self.response_class, self.ttl, rdlength)
+
+    def _encode_rdata_into(self, message: bytearray, suffixes: Dict[str, int]) -> None:
+        """
+        Encode the rdata field at the end of a dns message.
+
+        :param message: the dns message encoded so far, which the rdata is appended to
+        :param suffixes: the domain name suffixes already written out in the dns message
+        :raises: ValueError if the rdata cannot be encoded
+        :return: None
+        """
+        if self.type == 1 or self.type == 28:
+            message.extend(self.packed_address)
+        elif self.type == 2 or self.type == 5:
+            DomainNameEncoder.encode_domain_name_into(self.rdata, message, suffixes)
+        elif self.type == 6:
+            fields: List[str] = self.rdata.split(' ')
+            DomainNameEncoder.encode_domain_name_into(fields[0], message, suffixes)
+            DomainNameEncoder.encode_domain_name_into(fields[1], message, suffixes)
+            message.extend(ResourceRecord._soa_fields.pack(*[int(field) for field in fields[2:]]))
+        elif self.raw_rdata or self._rdata is None:
+            # the domain names of any other type were decompressed when decoded, so its raw rdata fits any dns message
+            message.extend(self.raw_rdata)
+        else:
+            fields = self.rdata.split(' ')
+
+            if fields[0] != '\\#':
+                raise ValueError('Cannot encode the rdata of a resource record of type ' + str(self.type) + '.')
+
+            message.extend(bytes.fromhex(''.join(fields[2:])))
+
     @staticmethod
     def decode_resource_record(data: BytesIO, copy_of_message: BytesIO) -> 'ResourceRecord':
         """
         Factory method to decode a resource record from the provided data.
 
-        :param data: the data to be decoded into a resource record.
-        :param copy_of_message: a copy of the entire dns message to be decoded. Used for pointer handling.
+        :param data: the entire dns message, positioned at the start of the resource record to be decoded.
+        :param copy_of_message: a copy of the entire dns message. Unused, since the data already holds the entire dns
+                                message; kept for backwards compatibility.
         :return: a newly built resource record object, with fields decoded from the data.
         """
-        name: str = DomainNameDecoder.decode_domain_name(data, copy_of_message)
-        type: int = int.from_bytes(data.read(2), 'big')
-        response_class: int = int.from_bytes(data.read(2), 'big')
-        ttl: int = int.from_bytes(data.read(4), 'big')
-        rdlength: int = int.from_bytes(data.read(2), 'big')
-        rdata: str = ResourceRecord._decode_rdata(BytesIO(data.read(rdlength)), copy_of_message, type)
+        with data.getbuffer() as message:
+            resource_record, offset = ResourceRecord.decode_resource_record_at(message, data.tell())
 
-        return ResourceRecord(name, type, response_class, ttl, rdlength, rdata)
+        data.seek(offset)
+
+        return resource_record
+
+    @staticmethod
+    def decode_resource_record_at(message: WireData, offset: int,
+                                  suffixes: Optional[Dict[int, str]] = None) -> Tuple['ResourceRecord', int]:
+        """
+        Factory method to decode the resource record at an offset of a dns message.
+
+        :param message: the entire dns message, used for handling pointers in domain names.
+        :param offset: the offset of the start of the resource record within the dns message.
+        :param suffixes: the domain name suffixes already decoded from the dns message, see
+                         DomainNameDecoder.decode_domain_name_at.
+        :return: a newly built resource record object, with fields decoded from the message, and the offset just past
+        the resource record.
+        """
+        name, offset = DomainNameDecoder.decode_domain_name_at(message, offset, suffixes)
+        type, response_class, ttl, rdlength = ResourceRecord._fixed_fields.unpack_from(message, offset)
+        offset = offset + ResourceRecord._fixed_fields.size
+        layout: Optional[Tuple[Union[int, str], ...]] = ResourceRecord._compressible_rdata.get(type)
+
+        if layout is None:
+            raw_rdata: bytes = bytes(message[offset:offset + rdlength])
+        else:
+            raw_rdata = ResourceRecord._decompress_rdata(message, offset, rdlength, layout, suffixes)
+
+        # domain names in the rdata may point elsewhere in the dns message, so they are decoded while it is at hand
+        rdata: Optional[str] = None
+        if type in (2, 5, 6):
+            rdata = ResourceRecord._decode_rdata(message, offset, rdlength, type, suffixes)
+
+        return ResourceRecord(name, type, response_class, ttl, rdlength, rdata, raw_rdata), offset + rdlength
 
     @staticmethod
-    def _decode_rdata(rdata: BytesIO, copy_of_message: BytesIO, record_type: int) -> str:
+    def _decompress_rdata(message: WireData, offset: int, rdlength: int, layout: Tuple[Union[int, str], ...],
+                          suffixes: Optional[Dict[int, str]] = None) -> bytes:
+        """
+        Copy the rdata field out of a dns message, decompressing the domain names it holds.
+
+        :param message: the entire dns message, used for handling pointers in domain names.
+        :param offset: the offset of the start of the rdata within the dns message.
+        :param rdlength: the length of the rdata.
+        :param layout: the layout of the rdata, see _compressible_rdata.
+        :param suffixes: the domain name suffixes already decoded from the dns message.
+        :raises: ValueError if the fields of the layout do not fit in the rdata
+        :return: the rdata, with every domain name written out in full
+        """
+        end: int = offset + rdlength
+        rdata: bytearray = bytearray()
+
+        for field in layout:
+            if field == 'name':
+                name, offset = DomainNameDecoder.decode_domain_name_at(message, offset, suffixes)
+                DomainNameEncoder.encode_domain_name_into(name, rdata, {})
+            else:
+                length: int = 1 + message[offset] if field == 'string' else int(field)
+                rdata.extend(message[offset:offset + length])
+                offset = offset + length
+
+        if offset > end:
+            raise ValueError('The fields of the rdata of a resource record overrun its rdlength.')
+
+        rdata.extend(message[offset:end])
+
+        return bytes(rdata)
+
+    @staticmethod
+    def _decode_rdata(message: WireData, offset: int, rdlength: int, record_type: int,
+                      suffixes: Optional[Dict[int, str]] = None) -> str:
         """
         Decode the rdata field to a string.
 
-        :param rdata: the rdata of the resource record
-        :param copy_of_message: a copy of the entire data of the dns message, used for handling pointers in domain names.
+        :param message: the entire dns message, used for handling pointers in domain names.
+        :param offset: the offset of the start of the rdata within the dns message.
+        :param rdlength: the length of the rdata.
         :param record_type: the type of the resource record.
+        :param suffixes: the domain name suffixes already decoded from the dns message.
         :return: the decoded rdata field as a string
         """
         if record_type == 1:
-            return ResourceRecord._decode_ipv4_address(rdata)
+            return ResourceRecord._decode_ipv4_address(message, offset)
         elif record_type == 2:
-            return DomainNameDecoder.decode_domain_name(rdata, copy_of_message)
+            return DomainNameDecoder.decode_domain_name_at(message, offset, suffixes)[0]
         elif record_type == 5:
-            return DomainNameDecoder.decode_domain_name(rdata, copy_of_message)
+            return DomainNameDecoder.decode_domain_name_at(message, offset, suffixes)[0]
+        elif record_type == 6:
+            return ResourceRecord._decode_start_of_authority(message, offset, suffixes)
         elif record_type == 28:
-            return ResourceRecord._decode_ipv6_address(rdata)
+            return ResourceRecord._decode_ipv6_address(message, offset)
         else:
-            return 'UNSUPPORTED RESOURCE RECORD TYPE'
+            return ResourceRecord._format_unknown_rdata(message[offset:offset + rdlength])
 
     @staticmethod
-    def _decode_ipv4_address(rdata: BytesIO) -> str:
+    def _format_unknown_rdata(rdata: WireData) -> str:
         """
-        Decode the rdata field to an ipv4 address.
+        Format the rdata field of a resource record of a type that is not supported, without losing any of it.
+
+        See https://tools.ietf.org/rfc/rfc3597.txt for more info.
 
         :param rdata: the rdata of the resource record
+        :return: the rdata as a string of the form '\\# rdlength hex'
+        """
+        if len(rdata) == 0:
+            return '\\# 0'
+
+        return '\\# ' + str(len(rdata)) + ' ' + bytes(rdata).hex()
+
+    @staticmethod
+    def _decode_ipv4_address(message: WireData, offset: int) -> str:
+        """
+        Decode the rdata field to an ipv4 address.
+
+        :param message: the dns message containing the rdata of the resource record
+        :param offset: the offset of the rdata within the dns message
         :return: the rdata as an ipv4 address string
         """
-        return inet_ntop(AF_INET, rdata.read(4))
+        return inet_ntop(AF_INET, message[offset:offset + 4])
 
     @staticmethod
-    def _decode_ipv6_address(rdata: BytesIO) -> str:
+    def _decode_ipv6_address(message: WireData, offset: int) -> str:
         """
         Decode the rdata field to an ipv6 address.
 
-        :param rdata: the redata of the resource record
+        :param message: the dns message containing the rdata of the resource record
+        :param offset: the offset of the rdata within the dns message
         :return: the rdata as an ipv6 address string
         """
-        return inet_ntop(AF_INET6, rdata.read(16))
+        return inet_ntop(AF_INET6, message[offset:offset + 16])
+
+    @staticmethod
+    def _decode_start_of_authority(message: WireData, offset: int, suffixes: Optional[Dict[int, str]] = None) -> str:
+        """
+        Decode the rdata field of an SOA record to its master file representation.
+
+        :param message: the entire dns message, used for handling pointers in domain names.
+        :param offset: the offset of the rdata within the dns message
+        :param suffixes: the domain name suffixes already decoded from the dns message.
+        :return: the rdata as a string of the form 'mname rname serial refresh retry expire minimum'
+        """
+        mname, offset = DomainNameDecoder.decode_domain_name_at(message, offset, suffixes)
+        rname, offset = DomainNameDecoder.decode_domain_name_at(message, offset, suffixes)
+        numbers: List[str] = [str(number) for number in ResourceRecord._soa_fields.unpack_from(message, offset)]
+
+        return ' '.join([mname, rname] + numbers)
+
+    def get_soa_minimum(self) -> int:
+        """
+        Retrieves the minimum field of an SOA record, which bounds how long negative answers may be cached.
+
+        See https://tools.ietf.org/rfc/rfc2308.txt for more info.
+
+        :return: the minimum field of the SOA record
+        """
+        return int(self.rdata.split(' ')[-1])
 
     def print_record_for_trace(self) -> None:
         """
@@ -109,7 +386,7 @@ class ResourceRecord:
 
         :return: None
         """
-        print("      %-30s %-10d %-4s %s" % (self.name, self.ttl, ResourceRecord.parse_type(self.type), self.rdata))
+        sys.stdout.write(self.format_record_for_trace() + '\n')
 
     def print_record_with_supplied_domain_name(self, domain_name: str) -> None:
         """
@@ -120,7 +397,22 @@ class ResourceRecord:
         :param domain_name: the domain name to be printed
         :return: None
         """
-        print("  %s %d   %s %s" % (domain_name, self.ttl, ResourceRecord.parse_type(self.type), self.rdata))
+        sys.stdout.write(self.format_record_with_supplied_domain_name(domain_name) + '\n')
+
+    def format_record_for_trace(self) -> str:
+        """
+        :return: the line that print_record_for_trace prints, without its line break
+        """
+        return '      ' + self.name.ljust(30) + ' ' + str(self.ttl).ljust(10) + ' ' + \
+               ResourceRecord.parse_type(self.type).ljust(4) + ' ' + self.rdata
+
+    def format_record_with_supplied_domain_name(self, domain_name: str) -> str:
+        """
+        :param domain_name: the domain name the line starts with
+        :return: the line that print_record_with_supplied_domain_name prints, without its line break
+        """
+        return '  ' + domain_name + ' ' + str(self.ttl) + '   ' + ResourceRecord.parse_type(self.type) + ' ' + \
+               self.rdata
 
     @staticmethod
     def parse_type(given_type: int) -> str:
@@ -136,7 +428,11 @@ class ResourceRecord:
             return 'NS'
         elif given_type == 5:
             return 'CN'
+        elif given_type == 6:
+            return 'SOA'
         elif given_type == 28:
             return 'AAAA'
+        elif given_type == 41:
+            return 'OPT'
         else:
             return str(given_type)
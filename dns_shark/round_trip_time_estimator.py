@@ -0,0 +1,65 @@
+from threading import Lock
+from typing import Optional
+
+
+class RoundTripTimeEstimator:
+    """
+    Estimates how long dns servers take to respond to dns queries, from the round trip times of past dns queries.
+
+    The estimate is kept as a smoothed round trip time and a round trip time variation, in the same way TCP estimates
+    its retransmission timeout. See https://tools.ietf.org/rfc/rfc6298.txt for more info. The estimator is thread safe,
+    so a single estimator may be shared by name resolutions running on many threads.
+
+    Instance Attributes:
+
+        smoothed_round_trip_time: the smoothed round trip time in seconds, or None before the first sample
+        round_trip_time_variation: the smoothed mean deviation of the round trip time in seconds
+        initial_delay: the hedge delay used before any round trip time has been sampled
+        min_delay: the smallest hedge delay ever used
+        alpha: the weight of a new sample in the smoothed round trip time
+        beta: the weight of a new sample in the round trip time variation
+    """
+
+    def __init__(self, initial_delay: float = 0.4,
+                 min_delay: float = 0.05,
+                 alpha: float = 0.125,
+                 beta: float = 0.25):
+        self.smoothed_round_trip_time: Optional[float] = None
+        self.round_trip_time_variation: float = 0.0
+        self.initial_delay: float = initial_delay
+        self.min_delay: float = min_delay
+        self.alpha: float = alpha
+        self.beta: float = beta
+        self._lock: Lock = Lock()
+
+    def add_sample(self, round_trip_time: float) -> None:
+        """
+        Updates the estimate with the round trip time of a dns query that was answered.
+
+        :param round_trip_time: the number of seconds between sending the dns query and receiving its response
+        :return: None
+        """
+        with self._lock:
+            if self.smoothed_round_trip_time is None:
+                self.smoothed_round_trip_time = round_trip_time
+                self.round_trip_time_variation = round_trip_time / 2
+            else:
+                self.round_trip_time_variation = (1 - self.beta) * self.round_trip_time_variation + \
+                                                 self.beta * abs(self.smoothed_round_trip_time - round_trip_time)
+                self.smoothed_round_trip_time = (1 - self.alpha) * self.smoothed_round_trip_time + \
+                                                self.alpha * round_trip_time
+
+    def hedge_delay(self) -> float:
+        """
+        Computes how long to wait for a response before also sending the dns query to another dns server.
+
+        A response taking longer than the smoothed round trip time plus four times its variation is unusually slow,
+        so it is worth hedging against.
+
+        :return: the hedge delay in seconds
+        """
+        with self._lock:
+            if self.smoothed_round_trip_time is None:
+                return self.initial_delay
+
+            return max(self.smoothed_round_trip_time + 4 * self.round_trip_time_variation, self.min_delay)
@@ -0,0 +1,108 @@
+import socket
+from threading import Lock
+from typing import Callable, List, MutableMapping, Optional
+from contextlib import contextmanager
+from weakref import WeakKeyDictionary
+
+
+class SocketPool:
+    """
+    A pool of reusable udp sockets, so that sockets are not created and destroyed for every name resolution.
+
+    A socket is acquired for the duration of a single name resolution and released back into the pool afterwards.
+    Acquiring and releasing sockets is thread safe.
+
+    Every socket comes with a receive buffer that is allocated once and reused for every datagram the socket receives,
+    see receive_buffer.
+
+    Instance Attributes:
+
+        max_idle_sockets: the maximum number of idle sockets kept open by the pool
+        socket_factory: a function creating a new socket whenever no idle socket is available
+        idle_sockets: the sockets that are open and not currently in use
+        closed: a boolean flag indicating whether the pool has been closed
+    """
+
+    def __init__(self, max_idle_sockets: int = 8,
+                 socket_factory: Callable[[], socket.socket] = lambda: socket.socket(socket.AF_INET,
+                                                                                      socket.SOCK_DGRAM)):
+        self.max_idle_sockets: int = max_idle_sockets
+        self.socket_factory: Callable[[], socket.socket] = socket_factory
+        self.idle_sockets: List[socket.socket] = []
+        self.closed: bool = False
+        self._receive_buffers: MutableMapping[socket.socket, bytearray] = WeakKeyDictionary()
+        self._lock: Lock = Lock()
+
+    def acquire(self) -> socket.socket:
+        """
+        Retrieves an idle socket from the pool, or creates a new one if none are idle.
+
+        :raises: ValueError if the pool has been closed
+        :return: a socket for the exclusive use of the caller until it is released
+        """
+        with self._lock:
+            if self.closed:
+                raise ValueError('Cannot acquire a socket from a closed socket pool.')
+
+            if self.idle_sockets:
+                return self.idle_sockets.pop()
+
+        return self.socket_factory()
+
+    def release(self, sock: socket.socket) -> None:
+        """
+        Returns a socket to the pool. The socket is closed instead if the pool is closed or already full.
+
+        :param sock: a socket previously acquired from the pool
+        :return: None
+        """
+        with self._lock:
+            if not self.closed and len(self.idle_sockets) < self.max_idle_sockets:
+                self.idle_sockets.append(sock)
+                return
+
+        sock.close()
+
+    def receive_buffer(self, sock: socket.socket, size: int) -> bytearray:
+        """
+        Retrieves the receive buffer of a socket, allocating it if the socket has none yet or only a smaller one.
+
+        :param sock: a socket acquired from the pool, which is the only user of its receive buffer until it is released
+        :param size: the minimum size of the receive buffer, in bytes
+        :return: the receive buffer of the socket
+        """
+        with self._lock:
+            buffer: Optional[bytearray] = self._receive_buffers.get(sock)
+
+            if buffer is None or len(buffer) < size:
+                buffer = bytearray(size)
+                self._receive_buffers[sock] = buffer
+
+            return buffer
+
+    @contextmanager
+    def socket(self):
+        """
+        Acquires a socket for the duration of a with statement.
+
+        :return: a context manager providing the acquired socket
+        """
+        sock: socket.socket = self.acquire()
+        try:
+            yield sock
+        finally:
+            self.release(sock)
+
+    def close(self) -> None:
+        """
+        Closes every idle socket. Sockets still in use are closed once they are released.
+
+        :return: None
+        """
+        with self._lock:
+            self.closed = True
+            idle_sockets: List[socket.socket] = self.idle_sockets
+            self.idle_sockets = []
+
+        for sock in idle_sockets:
+            sock.close()
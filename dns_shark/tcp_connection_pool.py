@@ -0,0 +1,162 @@
+import socket
+import struct
+from threading import Lock
+from typing import Callable, Dict, List, Tuple
+from dns_shark.domain_name_handling import WireData
+
+
+class TCPConnectionPool:
+    """
+    A pool of open tcp connections to dns servers, so that a dns query retried over tcp does not pay for a tcp handshake
+    whenever an earlier dns query to the same dns server already did.
+
+    A connection carries a single dns query at a time. Dns messages sent over a connection are prefixed with their
+    length as a 2 byte integer, as per RFC 1035 section 4.2.2. Querying through the pool is thread safe.
+
+    Instance Attributes:
+
+        max_idle_connections: the maximum number of idle connections kept open per dns server
+        port: the port dns servers accept tcp connections on
+        connection_factory: a function opening a new connection to an (ip address, port), given a timeout in seconds
+        idle_connections: the connections that are open and not currently in use, by dns server ip address
+        closed: a boolean flag indicating whether the pool has been closed
+    """
+
+    _length: struct.Struct = struct.Struct('!H')  # the length prefix of a dns message sent over tcp
+
+    def __init__(self, max_idle_connections: int = 2,
+                 port: int = 53,
+                 connection_factory: Callable[[Tuple[str, int], float], socket.socket] = socket.create_connection):
+        self.max_idle_connections: int = max_idle_connections
+        self.port: int = port
+        self.connection_factory: Callable[[Tuple[str, int], float], socket.socket] = connection_factory
+        self.idle_connections: Dict[str, List[socket.socket]] = {}
+        self.closed: bool = False
+        self._lock: Lock = Lock()
+
+    def query(self, dns_server_ip: str, dns_query: WireData, timeout: float) -> bytes:
+        """
+        Sends a dns query to a dns server over tcp and receives its response.
+
+        An idle connection is reused if there is one. Dns servers close connections that have been idle for a while, so
+        if a reused connection turns out to be closed, the dns query is sent once more over a new connection.
+
+        :param dns_server_ip: the ip address of the dns server
+        :param dns_query: the encoded dns query
+        :param timeout: the number of seconds to wait for the connection, and then for the dns response
+        :raises: OSError (including socket.timeout and ConnectionError) if no response could be received
+        :return: the encoded dns response
+        """
+        connection, reused = self._acquire(dns_server_ip, timeout)
+
+        try:
+            response: bytes = self._exchange(connection, dns_query, timeout)
+        except OSError as error:
+            connection.close()
+
+            if not reused or not isinstance(error, ConnectionError):
+                raise
+
+            connection = self.connection_factory((dns_server_ip, self.port), timeout)
+
+            try:
+                response = self._exchange(connection, dns_query, timeout)
+            except OSError:
+                connection.close()
+                raise
+
+        self._release(dns_server_ip, connection)
+        return response
+
+    def close(self) -> None:
+        """
+        Closes every idle connection. Connections still in use are closed once their dns query completes.
+
+        :return: None
+        """
+        with self._lock:
+            self.closed = True
+            idle_connections: Dict[str, List[socket.socket]] = self.idle_connections
+            self.idle_connections = {}
+
+        for connections in idle_connections.values():
+            for connection in connections:
+                connection.close()
+
+    def _acquire(self, dns_server_ip: str, timeout: float) -> Tuple[socket.socket, bool]:
+        """
+        Retrieves an idle connection to a dns server, or opens a new one if none are idle.
+
+        :param dns_server_ip: the ip address of the dns server
+        :param timeout: the number of seconds to wait for a new connection to be established
+        :raises: ValueError if the pool has been closed, OSError if no connection could be established
+        :return: the connection, and whether it is an idle connection that is being reused
+        """
+        with self._lock:
+            if self.closed:
+                raise ValueError('Cannot acquire a connection from a closed tcp connection pool.')
+
+            connections: List[socket.socket] = self.idle_connections.get(dns_server_ip, [])
+
+            if connections:
+                return connections.pop(), True
+
+        return self.connection_factory((dns_server_ip, self.port), timeout), False
+
+    def _release(self, dns_server_ip: str, connection: socket.socket) -> None:
+        """
+        Returns a connection to the pool. The connection is closed instead if the pool is closed or already full.
+
+        :param dns_server_ip: the ip address of the dns server the connection is open to
+        :param connection: a connection previously acquired from the pool
+        :return: None
+        """
+        with self._lock:
+            connections: List[socket.socket] = self.idle_connections.setdefault(dns_server_ip, [])
+
+            if not self.closed and len(connections) < self.max_idle_connections:
+                connections.append(connection)
+                return
+
+        connection.close()
+
+    @staticmethod
+    def _exchange(connection: socket.socket, dns_query: WireData, timeout: float) -> bytes:
+        """
+        Sends a length prefixed dns query over a connection and receives the length prefixed dns response.
+
+        :param connection: the connection to the dns server
+        :param dns_query: the encoded dns query
+        :param timeout: the number of seconds to wait for every read of the dns response
+        :raises: OSError if the connection fails or times out, ConnectionError if it is closed by the dns server
+        :return: the encoded dns response
+        """
+        connection.settimeout(timeout)
+        connection.sendall(TCPConnectionPool._length.pack(len(dns_query)) + bytes(dns_query))
+
+        prefix: bytes = TCPConnectionPool._receive_exactly(connection, TCPConnectionPool._length.size)
+        return TCPConnectionPool._receive_exactly(connection, TCPConnectionPool._length.unpack(prefix)[0])
+
+    @staticmethod
+    def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+        """
+        Receives exactly size bytes from a connection.
+
+        :param connection: the connection to receive from
+        :param size: the number of bytes to receive
+        :raises: ConnectionError if the connection is closed before size bytes were received
+        :return: the received bytes
+        """
+        data: bytearray = bytearray(size)
+        view: memoryview = memoryview(data)
+        received: int = 0
+
+        while received < size:
+            count: int = connection.recv_into(view[received:], size - received)
+
+            if count == 0:
+                raise ConnectionError('The dns server closed the tcp connection.')
+
+            received = received + count
+
+        return bytes(data)
@@ -0,0 +1,92 @@
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.errors.dns_shark_error import DNSSharkError
+from typing import List
+import sys
+
+
+class Tracer:
+    """
+    Receives the events of name resolutions as they happen, e.g. to log them or to collect statistics about them.
+
+    Every method of this class ignores its event, so a tracer only overrides the events it is interested in. Every event
+    carries its timestamp, in seconds since the epoch as returned by time.time, and the objects the resolver already
+    decoded for its own use, so tracing never decodes anything twice.
+
+    Resolvers only create the timestamps and objects of an event when a tracer is attached to them, so name resolutions
+    without a tracer pay nothing for tracing.
+    """
+
+    def query_sent(self, timestamp: float, dns_question: DNSQuestion, query_id: int, dns_server_ip: str,
+                   over_tcp: bool) -> None:
+        """
+        A dns query was sent, or retransmitted, to a dns server.
+
+        :param timestamp: the time the dns query was sent at
+        :param dns_question: the question of the dns query
+        :param query_id: the query id of the dns query
+        :param dns_server_ip: the dns server the dns query was sent to
+        :param over_tcp: a boolean flag indicating whether the dns query was sent over tcp rather than udp
+        :return: None
+        """
+
+    def response_received(self, timestamp: float, dns_response: DNSMessage, dns_server_ip: str,
+                          round_trip_time: float) -> None:
+        """
+        A dns response was received from a dns server, including truncated responses and responses with an error rcode.
+
+        :param timestamp: the time the dns response was received at
+        :param dns_response: the dns response
+        :param dns_server_ip: the dns server the dns response was received from
+        :param round_trip_time: the number of seconds between sending the dns query and receiving its response
+        :return: None
+        """
+
+    def referral_followed(self, timestamp: float, domain_name: str, dns_response: DNSMessage,
+                          name_server_ips: List[str]) -> None:
+        """
+        A name resolution moved on to the name servers of a referral.
+
+        :param timestamp: the time the referral was followed at
+        :param domain_name: the domain name the referral was received for
+        :param dns_response: the referral
+        :param name_server_ips: the addresses of the name servers included in the referral. Empty if the referral
+                                included none, in which case the address of a name server is resolved first.
+        :return: None
+        """
+
+    def cname_followed(self, timestamp: float, domain_name: str, cname_resource_record: ResourceRecord) -> None:
+        """
+        A name resolution followed a cname record to its canonical name.
+
+        :param timestamp: the time the cname record was followed at
+        :param domain_name: the alias the cname record was received for
+        :param cname_resource_record: the cname record
+        :return: None
+        """
+
+    def error_raised(self, timestamp: float, domain_name: str, error: DNSSharkError) -> None:
+        """
+        A name resolution failed.
+
+        :param timestamp: the time the name resolution failed at
+        :param domain_name: the domain name whose name resolution failed
+        :param error: the error the name resolution raised
+        :return: None
+        """
+
+
+class PrintingTracer(Tracer):
+    """
+    Prints a trace of every dns query and dns response to stdout. This is the verbose output of dns shark.
+    """
+
+    def query_sent(self, timestamp: float, dns_question: DNSQuestion, query_id: int, dns_server_ip: str,
+                   over_tcp: bool) -> None:
+        sys.stdout.write('\n\nQuery ID:    ' + str(query_id) + ' ' + dns_question.name + '  ' +
+                         ResourceRecord.parse_type(dns_question.type) + ' --> ' + dns_server_ip + '\n')
+
+    def response_received(self, timestamp: float, dns_response: DNSMessage, dns_server_ip: str,
+                          round_trip_time: float) -> None:
+        dns_response.print_dns_response()
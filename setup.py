@@ -1,5 +1,5 @@
 import pathlib
-from setuptools import setup
+from setuptools import find_packages, setup
 
 HERE = pathlib.Path(__file__).parent
 
@@ -25,7 +25,7 @@ setup(
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
     ],
-    packages=["dns_shark"],
+    packages=find_packages(exclude=["test", "test.*"]),
     include_package_data=True,
     install_requires=[],
     entry_points={"console_scripts": [
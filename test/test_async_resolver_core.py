@@ -0,0 +1,353 @@
+from unittest.mock import Mock
+import asyncio
+import unittest
+from dns_shark.async_resolver import AsyncResolver
+from dns_shark.async_resolver_core import AsyncResolverCore
+from dns_shark.dns_client_protocol import DNSClientProtocol
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_stream_client_protocol import DNSStreamClientProtocol
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_timeout_error import DNSTimeoutError
+from test.test_resolver_core.test_tracer import RecordingTracer
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeTransport:
+    """
+    A datagram transport that answers every query with the canned response registered for its question, from the
+    address the query was sent to. Responses are delivered on the next iteration of the event loop, unless a delay is
+    registered for them. Queries without a registered response are lost.
+    """
+
+    def __init__(self, protocol: DNSClientProtocol, responses: Dict[Tuple[int, str], bytes],
+                 delays: Optional[Dict[Tuple[int, str], float]] = None):
+        self.protocol: DNSClientProtocol = protocol
+        self.responses: Dict[Tuple[int, str], bytes] = responses
+        self.delays: Dict[Tuple[int, str], float] = delays if delays is not None else {}
+        self.sent: List[Tuple[bytes, Tuple[str, int]]] = []
+
+    def sendto(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.sent.append((data, addr))
+        key: Tuple[int, str] = (int.from_bytes(data[:2], 'big'), addr[0])
+        response: Optional[bytes] = self.responses.get(key)
+
+        if response is not None:
+            asyncio.get_event_loop().call_later(self.delays.get(key, 0), self.protocol.datagram_received, response,
+                                                addr)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeTCPConnections:
+    """
+    Tcp connections to dns servers that answer every query with the canned response registered for its query id, on the
+    next iteration of the event loop.
+    """
+
+    def __init__(self, responses: Dict[int, bytes]):
+        self.responses: Dict[int, bytes] = responses
+        self.sent: List[Tuple[bytes, str]] = []
+        self.protocols: Dict[str, DNSStreamClientProtocol] = {}
+
+    async def connection(self, dns_server_ip: str, timeout: float) -> DNSStreamClientProtocol:
+        if dns_server_ip not in self.protocols:
+            protocol: DNSStreamClientProtocol = DNSStreamClientProtocol()
+            protocol.connection_made(Mock(**{'is_closing.return_value': False,
+                                             'write.side_effect': lambda data: self._write(protocol, data,
+                                                                                           dns_server_ip)}))
+            self.protocols[dns_server_ip] = protocol
+
+        return self.protocols[dns_server_ip]
+
+    def _write(self, protocol: DNSStreamClientProtocol, data: bytes, dns_server_ip: str) -> None:
+        self.sent.append((data[2:], dns_server_ip))
+        response: Optional[bytes] = self.responses.get(int.from_bytes(data[2:4], 'big'))
+
+        if response is not None:
+            asyncio.get_event_loop().call_soon(protocol.data_received, len(response).to_bytes(2, 'big') + response)
+
+
+class AsyncResolverCoreTests(unittest.TestCase):
+    """
+    Unit testing for async_resolver_core.py and async_resolver.py
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+        cls.referral: bytes = bytes.fromhex('64eb800000010000000400080377777706676f6f676c6503636f6d0000010001c010000200'
+                                            '010002a3000006036e7332c010c010000200010002a3000006036e7331c010c01000020001'
+                                            '0002a3000006036e7333c010c010000200010002a3000006036e7334c010c02c001c000100'
+                                            '02a30000102001486048020034000000000000000ac02c000100010002a3000004d8ef220a'
+                                            'c03e001c00010002a30000102001486048020032000000000000000ac03e00010001000'
+                                            '2a3000004d8ef200ac050001c00010002a30000102001486048020036000000000000000a'
+                                            'c050000100010002a3000004d8ef240ac062001c00010002a3000010200148604802003800'
+                                            '0000000000000ac062000100010002a3000004d8ef260a')
+
+        cls.authoritative_response: bytes = bytes.fromhex('0a7b840000010001000000000377777706676f6f676c6503636f6d000'
+                                                          '0010001c00c000100010000012c0004acd90ec4')
+
+        cls.other_authoritative_response: bytes = bytes.fromhex('19b684000001000100030003037777770263730375626302'
+                                                                '63610000010001c00c0001000100000e1000048e670605c0'
+                                                                '100002000100000e100006036e7331c010c01000020001000'
+                                                                '00e10000a0774656d70313230c010c0100002000100000e10'
+                                                                '00150366733105756772616402637303756263026361'
+                                                                '00c0630001000100000e100004c6a22301c03b0001000100'
+                                                                '000e1000048e670606c04d0001000100000e10000489523d78')
+
+        cls.name_error_response: bytes = bytes.fromhex('123484030001000000010000046e6f7065037562630263610000010001c011'
+                                                       '0006000100000e100027036e7331c0110a686f73746d6173746572c01100'
+                                                       '00000100001c2000000e1000093a800000012c')
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.protocol: DNSClientProtocol = DNSClientProtocol()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_referral_then_authoritative_response(self):
+        """
+        Test case for a referral followed by an authoritative response, sent to the name server of the referral.
+        """
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x64eb, '1.2.3.4'): self.referral,
+                                                                 (0x0a7b, '216.239.34.10'): self.authoritative_response})
+        self.protocol.connection_made(transport)
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4",
+                                                        Mock(**{'randint.side_effect': [0x64eb, 0x0a7b]}))
+
+        answers: List[ResourceRecord] = self.loop.run_until_complete(resolver.resolve_domain_name("www.google.com",
+                                                                                                  "1.2.3.4", 1))
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual([addr for _, addr in transport.sent], [('1.2.3.4', 53), ('216.239.34.10', 53)])
+
+    def test_unresponsive_name_server_falls_back_to_next(self):
+        """
+        Test case for a referral whose first name server never responds. The query must be sent to the next name server
+        of the referral once the timeout elapses.
+        """
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x64eb, '1.2.3.4'): self.referral,
+                                                                 (0x0a7b, '216.239.32.10'): self.authoritative_response})
+        self.protocol.connection_made(transport)
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4",
+                                                        Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b]}),
+                                                        timeout=0.01)
+
+        answers: List[ResourceRecord] = self.loop.run_until_complete(resolver.resolve_domain_name("www.google.com",
+                                                                                                  "1.2.3.4", 1))
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual([addr for _, addr in transport.sent],
+                         [('1.2.3.4', 53), ('216.239.34.10', 53), ('216.239.32.10', 53)])
+        self.assertEqual(self.protocol.pending, {})
+
+    def test_hedged_query_to_next_name_server(self):
+        """
+        Test case for hedging against a name server that never responds. The query must be sent to the next name server
+        of the referral after the hedge delay, long before the timeout elapses.
+        """
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x64eb, '1.2.3.4'): self.referral,
+                                                                 (0x0a7b, '216.239.32.10'): self.authoritative_response})
+        self.protocol.connection_made(transport)
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4",
+                                                        Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b]}),
+                                                        timeout=30.0, hedge=True,
+                                                        round_trip_times=RoundTripTimeEstimator(initial_delay=0.01))
+
+        answers: List[ResourceRecord] = self.loop.run_until_complete(
+            asyncio.wait_for(resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1), 5.0))
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual(transport.sent[-1][1], ('216.239.32.10', 53))
+        self.assertEqual(self.protocol.pending, {})
+
+    def test_late_response_after_hedge_delay_is_not_a_timeout(self):
+        """
+        Test case for a name server that responds later than its hedge delay, but long before its timeout. Its response
+        must win, and neither it nor the name servers hedged to must be recorded as having timed out.
+        """
+        late_response: bytes = bytes.fromhex('1111') + self.authoritative_response[2:]
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x64eb, '1.2.3.4'): self.referral,
+                                                                 (0x1111, '216.239.34.10'): late_response},
+                                                 {(0x1111, '216.239.34.10'): 0.2})
+        self.protocol.connection_made(transport)
+        infrastructure_cache: InfrastructureCache = InfrastructureCache(exploration=0.0)
+
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b, 0x2222, 0x3333]})
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4", mock_random,
+                                                        timeout=30.0, hedge=True,
+                                                        round_trip_times=RoundTripTimeEstimator(initial_delay=0.01),
+                                                        infrastructure_cache=infrastructure_cache)
+
+        answers: List[ResourceRecord] = self.loop.run_until_complete(
+            asyncio.wait_for(resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1), 5.0))
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual(transport.sent[2][1], ('216.239.32.10', 53))  # hedged after the minimum hedge delay
+        self.assertEqual([statistics.timeouts for statistics in infrastructure_cache.servers.values()], [0, 0])
+        self.assertEqual(list(infrastructure_cache.servers), ['1.2.3.4', '216.239.34.10'])
+
+    def test_truncated_response_retried_over_tcp(self):
+        """
+        Test case for a truncated udp response. The query must be retried over tcp to the same dns server, and the tcp
+        response used instead.
+        """
+        truncated_response: bytes = bytes.fromhex('1111860000010000000000000377777706676f6f676c6503636f6d0000010001')
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x1111, '1.2.3.4'): truncated_response})
+        self.protocol.connection_made(transport)
+        tcp_connections: FakeTCPConnections = FakeTCPConnections({0x0a7b: self.authoritative_response})
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4",
+                                                        Mock(**{'randint.side_effect': [0x1111, 0x0a7b]}),
+                                                        tcp_connections=tcp_connections)  # type: ignore
+
+        answers: List[ResourceRecord] = self.loop.run_until_complete(resolver.resolve_domain_name("www.google.com",
+                                                                                                  "1.2.3.4", 1))
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual(len(transport.sent), 1)
+        self.assertEqual([dns_server_ip for _, dns_server_ip in tcp_connections.sent], ['1.2.3.4'])
+        self.assertEqual(self.protocol.pending, {})
+
+    def test_malformed_tcp_response_treated_as_no_response(self):
+        """
+        Test case for a truncated udp response whose tcp retry is answered with a response whose answer section is cut
+        short. The dns server must be treated as one that did not respond, so the query is retransmitted over udp.
+        """
+        truncated_response: bytes = bytes.fromhex('1111860000010000000000000377777706676f6f676c6503636f6d0000010001')
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x1111, '1.2.3.4'): truncated_response,
+                                                                 (0x0a7b, '1.2.3.4'): self.authoritative_response})
+        self.protocol.connection_made(transport)
+        tcp_connections: FakeTCPConnections = FakeTCPConnections({0x2222: b'\x22\x22' +
+                                                                  self.authoritative_response[2:-6]})
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4",
+                                                        Mock(**{'randint.side_effect': [0x1111, 0x2222, 0x0a7b]}),
+                                                        tcp_connections=tcp_connections)  # type: ignore
+
+        answers: List[ResourceRecord] = self.loop.run_until_complete(resolver.resolve_domain_name("www.google.com",
+                                                                                                  "1.2.3.4", 1))
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual(len(tcp_connections.sent), 1)
+        self.assertEqual(len(transport.sent), 2)
+
+    def test_format_error_retried_without_edns(self):
+        """
+        Test case for a name server that answers a query with an OPT record with a format error, without an OPT record
+        of its own. The query must be retried once without EDNS0 to the same name server, and its response used.
+        """
+        format_error: bytes = bytes.fromhex('1111810100010000000000000377777706676f6f676c6503636f6d0000010001')
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x1111, '1.2.3.4'): format_error,
+                                                                 (0x0a7b, '1.2.3.4'): self.authoritative_response})
+        self.protocol.connection_made(transport)
+        infrastructure_cache: InfrastructureCache = InfrastructureCache(exploration=0.0)
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4",
+                                                        Mock(**{'randint.side_effect': [0x1111, 0x0a7b]}),
+                                                        infrastructure_cache=infrastructure_cache)
+
+        answers: List[ResourceRecord] = self.loop.run_until_complete(resolver.resolve_domain_name("www.google.com",
+                                                                                                  "1.2.3.4", 1))
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual([DNSMessage.decode_dns_message(query).udp_payload_size for query, _ in transport.sent],
+                         [1232, None])
+        self.assertFalse(infrastructure_cache.supports_edns('1.2.3.4'))
+
+    def test_timeout_error(self):
+        """
+        Test case for a dns server that never responds, neither to the query nor to its retransmission.
+        """
+        transport: FakeTransport = FakeTransport(self.protocol, {})
+        self.protocol.connection_made(transport)
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4",
+                                                        Mock(**{'randint.side_effect': [0x1111, 0x2222]}),
+                                                        timeout=0.01, retries=1)
+
+        with self.assertRaises(DNSTimeoutError):
+            self.loop.run_until_complete(resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1))
+
+        self.assertEqual(len(transport.sent), 2)
+        self.assertEqual(self.protocol.pending, {})
+
+    def test_tracer(self):
+        """
+        Test case for a truncated udp response retried over tcp, whose queries and responses must all be traced.
+        """
+        truncated_response: bytes = bytes.fromhex('1111860000010000000000000377777706676f6f676c6503636f6d0000010001')
+        self.protocol.connection_made(FakeTransport(self.protocol, {(0x1111, '1.2.3.4'): truncated_response}))
+        tracer: RecordingTracer = RecordingTracer()
+
+        resolver: AsyncResolverCore = AsyncResolverCore(self.protocol, False, "1.2.3.4",
+                                                        Mock(**{'randint.side_effect': [0x1111, 0x0a7b]}),
+                                                        tcp_connections=FakeTCPConnections(  # type: ignore
+                                                            {0x0a7b: self.authoritative_response}),
+                                                        tracer=tracer)
+
+        self.loop.run_until_complete(resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1))
+
+        self.assertEqual(tracer.events, [('query_sent', 'www.google.com', 1, 0x1111, '1.2.3.4', False),
+                                         ('response_received', 0x1111, '1.2.3.4'),
+                                         ('query_sent', 'www.google.com', 1, 0x0a7b, '1.2.3.4', True),
+                                         ('response_received', 0x0a7b, '1.2.3.4')])
+
+    def test_concurrent_resolutions(self):
+        """
+        Test case for three resolutions in progress at once over the same protocol, including one that fails.
+        """
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x0a7b, '1.2.3.4'): self.authoritative_response,
+                                                                 (0x19b6, '1.2.3.4'): self.other_authoritative_response,
+                                                                 (0x1234, '1.2.3.4'): self.name_error_response})
+        self.protocol.connection_made(transport)
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x0a7b, 0x19b6, 0x1234]})
+
+        async def resolve_all():
+            return await asyncio.gather(
+                AsyncResolverCore(self.protocol, False, "1.2.3.4", mock_random).resolve_domain_name("www.google.com",
+                                                                                                  "1.2.3.4", 1),
+                AsyncResolverCore(self.protocol, False, "1.2.3.4", mock_random).resolve_domain_name("www.cs.ubc.ca",
+                                                                                                  "1.2.3.4", 1),
+                AsyncResolverCore(self.protocol, False, "1.2.3.4", mock_random).resolve_domain_name("nope.ubc.ca",
+                                                                                                  "1.2.3.4", 1),
+                return_exceptions=True)
+
+        results: list = self.loop.run_until_complete(resolve_all())
+
+        self.assertEqual(results[0], [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual(results[1], [ResourceRecord('www.cs.ubc.ca', 1, 1, 3600, 4, '142.103.6.5')])
+        self.assertIsInstance(results[2], DNSNameError)
+
+    def test_async_resolver_ask(self):
+        """
+        Test case for asking an async resolver twice for the same domain name, the second answer coming from its cache.
+        """
+        transport: FakeTransport = FakeTransport(self.protocol, {(0x0a7b, '1.2.3.4'): self.authoritative_response})
+        self.protocol.connection_made(transport)
+
+        resolver: AsyncResolver = AsyncResolver("1.2.3.4", random=Mock(**{'randint.side_effect': [0x0a7b]}))
+        resolver.protocol = self.protocol
+
+        async def ask_twice():
+            await resolver.ask("www.google.com")
+            return await resolver.ask("www.google.com")
+
+        answers: List[ResourceRecord] = self.loop.run_until_complete(ask_twice())
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual(len(transport.sent), 1)
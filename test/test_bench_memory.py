@@ -0,0 +1,23 @@
+import unittest
+from dns_shark.bench.memory import _DictResourceRecord, measure_bytes_per_object
+from dns_shark.resource_record import ResourceRecord
+
+
+class MemoryBenchmarkTests(unittest.TestCase):
+    """
+    Unit testing for bench/memory.py
+    """
+
+    def test_resource_record_is_smaller_than_baseline(self):
+        """
+        Test case to check that a resource record holds less memory than the same resource record with an instance
+        __dict__.
+        """
+        name: str = 'www.cs.ubc.ca'
+        rdata: str = '142.103.6.5'
+
+        baseline: float = measure_bytes_per_object(lambda: _DictResourceRecord(name, 1, 1, 3600, 4, rdata), 1000)
+        slotted: float = measure_bytes_per_object(lambda: ResourceRecord(name, 1, 1, 3600, 4, rdata), 1000)
+
+        self.assertGreater(slotted, 0)
+        self.assertLess(slotted, baseline)
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Any, Dict
+from dns_shark.bench.suite import BENCHMARKS, compare, create_hierarchy, create_pointer_chain, create_resolver, main, \
+    referral_response, run_benchmarks
+from dns_shark.dns_cache import DNSCache
+from dns_shark.domain_name_handling import DomainNameDecoder
+from test.utilities import Utilities
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    """
+    Unit testing for bench/suite.py
+    """
+
+    def test_referral_response(self):
+        """
+        Test case to check that the referral benchmarked is the referral of the tests.
+        """
+        self.assertEqual(referral_response, Utilities.dns_message_encoded)
+
+    def test_pointer_chain(self):
+        """
+        Test case for a chain of domain names, each pointing at the previous one.
+        """
+        message, offset = create_pointer_chain(3)
+
+        self.assertEqual(DomainNameDecoder.decode_domain_name_at(message, offset),
+                         ('label2.label1.label0.example.com', len(message)))
+
+    def test_simulated_hierarchy(self):
+        """
+        Test case for a name resolution through the simulated hierarchy, which must follow both referrals and the cname
+        record.
+        """
+        resolver = create_resolver(create_hierarchy(), DNSCache())
+
+        answers = resolver.resolve_domain_name('www.bench', '198.41.0.4', 1)
+
+        self.assertEqual([(answer.name, answer.type, answer.rdata) for answer in answers],
+                         [('host.bench', 1, '192.0.2.80')])
+
+    def test_run_benchmarks(self):
+        """
+        Test case for running every benchmark once.
+        """
+        results: Dict[str, Any] = run_benchmarks([name for name, _ in BENCHMARKS], 1, 1)
+
+        self.assertEqual(list(results['benchmarks']), [name for name, _ in BENCHMARKS])
+
+        for result in results['benchmarks'].values():
+            self.assertEqual(result['number'], 1)
+            self.assertGreater(result['best'], 0)
+            self.assertEqual(result['median'], result['best'])
+
+    def test_compare(self):
+        """
+        Test case for comparing results to a baseline. Only benchmarks slower than the baseline by more than the
+        threshold regress, and benchmarks missing from the baseline are ignored.
+        """
+        baseline: Dict[str, Any] = {'benchmarks': {'decode_referral': {'best': 1.0},
+                                                   'encode_domain_name': {'best': 1.0}}}
+        results: Dict[str, Any] = {'benchmarks': {'decode_referral': {'best': 1.2},
+                                                  'encode_domain_name': {'best': 1.05},
+                                                  'resolve_cached': {'best': 5.0}}}
+
+        self.assertEqual(compare(results, baseline, 0.1), ['decode_referral'])
+
+    def test_main_with_baseline(self):
+        """
+        Test case for saving the results of a run, and comparing a later run to them.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            output: str = os.path.join(directory, 'baseline.json')
+
+            with redirect_stdout(StringIO()):
+                self.assertEqual(main(['--only', 'encode_domain_name', '--repeat', '1', '--number', '10',
+                                       '--output', output]), 0)
+
+            with open(output) as file:
+                baseline: Dict[str, Any] = json.load(file)
+
+            self.assertEqual(list(baseline['benchmarks']), ['encode_domain_name'])
+
+            baseline['benchmarks']['encode_domain_name']['best'] = 1e-12
+
+            with open(output, 'w') as file:
+                json.dump(baseline, file)
+
+            buffer: StringIO = StringIO()
+
+            with redirect_stdout(buffer):
+                self.assertEqual(main(['--only', 'encode_domain_name', '--repeat', '1', '--number', '10',
+                                       '--baseline', output]), 1)
+
+        self.assertIn('vs baseline', buffer.getvalue())
+        self.assertTrue(buffer.getvalue().endswith('regressed by more than 10%: encode_domain_name\n'))
@@ -1,5 +1,5 @@
 import unittest
-from dns_shark.command_line_parsing import create_parser
+from dns_shark.command_line_parsing import create_bulk_parser, create_parser, create_serve_parser
 from contextlib import redirect_stderr
 from io import StringIO
 
@@ -37,6 +37,7 @@ class CommandLineParsingTests(unittest.TestCase):
         self.assertEqual(parsed_args.domain_name, ['www.jeffreymiiller.com'])
         self.assertEqual(parsed_args.verbose, None)
         self.assertEqual(parsed_args.ipv6, None)
+        self.assertEqual(parsed_args.format, 'text')
 
     def test_verbose_true(self):
         """
@@ -82,6 +83,75 @@ class CommandLineParsingTests(unittest.TestCase):
         self.assertEqual(parsed_args.verbose, [True])
         self.assertEqual(parsed_args.ipv6, [True])
 
+    def test_format_given(self):
+        """
+        Test case for when an output format is supplied.
+        """
+        parsed_args = self.parser.parse_args(['127.0.0.1', 'www.jeffreymiiller.com', '--format', 'csv'])
+
+        self.assertEqual(parsed_args.format, 'csv')
+
+    def test_serve_defaults(self):
+        """
+        Test case for the serve command when no arguments are supplied.
+        """
+        parsed_args = create_serve_parser().parse_args([])
+
+        self.assertEqual(parsed_args.address, '127.0.0.1')
+        self.assertEqual(parsed_args.port, 53)
+        self.assertEqual(parsed_args.dns_server_ip, '198.41.0.4')
+        self.assertEqual(parsed_args.no_tcp, False)
+        self.assertEqual(parsed_args.metrics_port, None)
+
+    def test_serve_args_given(self):
+        """
+        Test case for the serve command when every argument is supplied.
+        """
+        parsed_args = create_serve_parser().parse_args(['--address', '0.0.0.0', '--port', '5353',
+                                                        '--dns-server-ip', '199.7.83.42', '--no-tcp',
+                                                        '--metrics-port', '9153'])
+
+        self.assertEqual(parsed_args.address, '0.0.0.0')
+        self.assertEqual(parsed_args.port, 5353)
+        self.assertEqual(parsed_args.dns_server_ip, '199.7.83.42')
+        self.assertEqual(parsed_args.no_tcp, True)
+        self.assertEqual(parsed_args.metrics_port, 9153)
+
+    def test_bulk_args_given(self):
+        """
+        Test case for bulk mode when every argument is supplied.
+        """
+        parsed_args = create_bulk_parser().parse_args(['127.0.0.1', '--input', 'names.txt', '--concurrency', '8',
+                                                       '--ipv6', '--metrics-file', 'dns_shark.prom'])
+
+        self.assertEqual(parsed_args.dns_server_ip, '127.0.0.1')
+        self.assertEqual(parsed_args.input, 'names.txt')
+        self.assertEqual(parsed_args.concurrency, 8)
+        self.assertEqual(parsed_args.ipv6, True)
+        self.assertEqual(parsed_args.format, 'json')
+        self.assertEqual(parsed_args.metrics_file, 'dns_shark.prom')
+
+    def test_bulk_format(self):
+        """
+        Test case for bulk mode with an output format, which must be one of the output formats of a record writer.
+        """
+        parsed_args = create_bulk_parser().parse_args(['127.0.0.1', '--input', '-', '--format', 'binary'])
+
+        self.assertEqual(parsed_args.format, 'binary')
+
+        with redirect_stderr(self.buffer), self.assertRaises(SystemExit):
+            create_bulk_parser().parse_args(['127.0.0.1', '--input', '-', '--format', 'xml'])
+
+    def test_bulk_defaults(self):
+        """
+        Test case for bulk mode when only the required arguments are supplied, reading from stdin.
+        """
+        parsed_args = create_bulk_parser().parse_args(['127.0.0.1', '--input', '-'])
+
+        self.assertEqual(parsed_args.input, '-')
+        self.assertEqual(parsed_args.concurrency, 64)
+        self.assertEqual(parsed_args.ipv6, False)
+
 
 if __name__ == '__main__':
     unittest.main()
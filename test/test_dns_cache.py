@@ -0,0 +1,282 @@
+import unittest
+from collections import OrderedDict
+from dns_shark.dns_cache import DNSCache
+from dns_shark.resource_record import ResourceRecord
+from typing import List, Optional
+
+
+class FakeClock:
+    """
+    A manually advanced clock, used to control the expiry of cache entries.
+    """
+
+    def __init__(self):
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UnscannableOrderedDict(OrderedDict):
+    """
+    An ordered dict that fails any attempt to iterate over its entries, used to check that the cache never scans them.
+    """
+
+    def __iter__(self):
+        raise AssertionError('The cache entries must not be scanned.')
+
+    def items(self):
+        raise AssertionError('The cache entries must not be scanned.')
+
+    def keys(self):
+        raise AssertionError('The cache entries must not be scanned.')
+
+    def values(self):
+        raise AssertionError('The cache entries must not be scanned.')
+
+
+class DNSCacheTests(unittest.TestCase):
+    """
+    Unit testing for dns_cache.py
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.clock: FakeClock = FakeClock()
+        self.cache: DNSCache = DNSCache(clock=self.clock)
+
+        self.soa_records: List[ResourceRecord] = [ResourceRecord("ubc.ca", 6, 1, 3600, 39,
+                                                                 'ns1.ubc.ca hostmaster.ubc.ca 1 7200 3600 604800 300')]
+
+        self.records: List[ResourceRecord] = [ResourceRecord("www.cs.ubc.ca", 1, 1, 300, 4, "1.2.3.4"),
+                                              ResourceRecord("www.cs.ubc.ca", 1, 1, 600, 4, "5.6.7.8")]
+
+    def test_get_answers_not_cached(self):
+        """
+        Test case for looking up answers that were never cached.
+        """
+        self.assertIsNone(self.cache.get_answers("www.cs.ubc.ca", 1))
+
+    def test_get_answers_cached(self):
+        """
+        Test case for looking up answers that were cached, regardless of the case of the domain name.
+        """
+        self.cache.add_answers("www.cs.ubc.ca", 1, self.records)
+
+        self.assertEqual(self.cache.get_answers("WWW.cs.UBC.ca", 1), self.records)
+        self.assertIsNone(self.cache.get_answers("www.cs.ubc.ca", 28))
+
+    def test_get_answers_ttl_aged(self):
+        """
+        Test case for confirming the ttl of returned answers is reduced by the time spent in the cache.
+        """
+        self.cache.add_answers("www.cs.ubc.ca", 1, self.records)
+        self.clock.now += 100
+
+        answers: Optional[List[ResourceRecord]] = self.cache.get_answers("www.cs.ubc.ca", 1)
+
+        self.assertEqual(answers, [ResourceRecord("www.cs.ubc.ca", 1, 1, 200, 4, "1.2.3.4"),
+                                   ResourceRecord("www.cs.ubc.ca", 1, 1, 500, 4, "5.6.7.8")])
+
+        # the cached records themselves must remain untouched
+        self.assertEqual(self.records[0].ttl, 300)
+
+    def test_get_answers_expired(self):
+        """
+        Test case for answers whose smallest ttl has elapsed.
+        """
+        self.cache.add_answers("www.cs.ubc.ca", 1, self.records)
+        self.clock.now += 300
+
+        self.assertIsNone(self.cache.get_answers("www.cs.ubc.ca", 1))
+        self.assertEqual(len(self.cache.answers), 0)
+
+    def test_add_answers_explicit_ttl(self):
+        """
+        Test case for caching answers for less time than their own ttl (e.g. when reached through a cname).
+        """
+        self.cache.add_answers("finance.google.ca", 1, self.records, ttl=10)
+        self.clock.now += 10
+
+        self.assertIsNone(self.cache.get_answers("finance.google.ca", 1))
+
+    def test_add_answers_zero_ttl(self):
+        """
+        Test case for answers with a ttl of zero, which must not be cached.
+        """
+        self.cache.add_answers("www.cs.ubc.ca", 1, [ResourceRecord("www.cs.ubc.ca", 1, 1, 0, 4, "1.2.3.4")])
+
+        self.assertIsNone(self.cache.get_answers("www.cs.ubc.ca", 1))
+
+    def test_max_entries(self):
+        """
+        Test case for evicting the oldest entry once the cache is full.
+        """
+        cache: DNSCache = DNSCache(clock=self.clock, max_entries=2)
+
+        cache.add_answers("a.ubc.ca", 1, self.records)
+        cache.add_answers("b.ubc.ca", 1, self.records)
+        cache.add_answers("c.ubc.ca", 1, self.records)
+
+        self.assertIsNone(cache.get_answers("a.ubc.ca", 1))
+        self.assertIsNotNone(cache.get_answers("b.ubc.ca", 1))
+        self.assertIsNotNone(cache.get_answers("c.ubc.ca", 1))
+
+    def test_max_entries_least_recently_used(self):
+        """
+        Test case for evicting the least recently used entry once the cache is full, rather than the oldest one.
+        """
+        cache: DNSCache = DNSCache(clock=self.clock, max_entries=2)
+
+        cache.add_answers("a.ubc.ca", 1, self.records)
+        cache.add_answers("b.ubc.ca", 1, self.records)
+        cache.get_answers("a.ubc.ca", 1)
+        cache.add_answers("c.ubc.ca", 1, self.records)
+
+        self.assertIsNotNone(cache.get_answers("a.ubc.ca", 1))
+        self.assertIsNone(cache.get_answers("b.ubc.ca", 1))
+        self.assertIsNotNone(cache.get_answers("c.ubc.ca", 1))
+
+    def test_insert_into_full_cache_does_not_scan(self):
+        """
+        Test case for inserting into a full cache holding expired entries, which must evict without scanning every
+        entry for expired ones.
+        """
+        cache: DNSCache = DNSCache(clock=self.clock, max_entries=1000)
+
+        for index in range(1000):
+            cache.add_answers("host" + str(index) + ".ubc.ca", 1, self.records)
+
+        self.clock.now += 3600
+        cache.answers = UnscannableOrderedDict(cache.answers)
+        cache.add_answers("www.cs.ubc.ca", 1, self.records)
+
+        self.assertEqual(len(cache.answers), 1000)
+        self.assertIsNone(cache.get_answers("host0.ubc.ca", 1))
+        self.assertIsNotNone(cache.get_answers("www.cs.ubc.ca", 1))
+
+    def test_clear(self):
+        """
+        Test case for clearing the cache.
+        """
+        self.cache.add_answers("www.cs.ubc.ca", 1, self.records)
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get_answers("www.cs.ubc.ca", 1))
+
+    def test_get_closest_name_server_addresses_not_cached(self):
+        """
+        Test case for looking up the name servers of a domain name with no cached zone cut.
+        """
+        self.assertIsNone(self.cache.get_closest_name_server_addresses("www.cs.ubc.ca"))
+
+    def test_get_closest_name_server_addresses_deepest_zone(self):
+        """
+        Test case for confirming the deepest cached zone cut enclosing the domain name is chosen.
+        """
+        self.cache.add_delegation("ca", [ResourceRecord("ca", 2, 1, 172800, 8, "x.ca-servers.ca")],
+                                  [ResourceRecord("x.ca-servers.ca", 1, 1, 172800, 4, "1.1.1.1")])
+        self.cache.add_delegation("ubc.ca", [ResourceRecord("ubc.ca", 2, 1, 3600, 8, "ns1.ubc.ca"),
+                                             ResourceRecord("ubc.ca", 2, 1, 3600, 8, "ns2.ubc.ca")],
+                                  [ResourceRecord("ns2.ubc.ca", 1, 1, 3600, 4, "2.2.2.2"),
+                                   ResourceRecord("ns1.ubc.ca", 1, 1, 3600, 4, "3.3.3.3"),
+                                   ResourceRecord("ns1.ubc.ca", 28, 1, 3600, 16, "1008:2002::1")])
+
+        self.assertEqual(self.cache.get_closest_name_server_addresses("www.cs.ubc.ca"), ["3.3.3.3", "2.2.2.2"])
+        self.assertEqual(self.cache.get_closest_name_server_addresses("www.sfu.ca"), ["1.1.1.1"])
+        self.assertIsNone(self.cache.get_closest_name_server_addresses("www.google.com"))
+
+    def test_get_closest_name_server_addresses_expired(self):
+        """
+        Test case for a deeper zone cut expiring before its enclosing zone.
+        """
+        self.cache.add_delegation("ca", [ResourceRecord("ca", 2, 1, 172800, 8, "x.ca-servers.ca")],
+                                  [ResourceRecord("x.ca-servers.ca", 1, 1, 172800, 4, "1.1.1.1")])
+        self.cache.add_delegation("ubc.ca", [ResourceRecord("ubc.ca", 2, 1, 3600, 8, "ns1.ubc.ca")],
+                                  [ResourceRecord("ns1.ubc.ca", 1, 1, 3600, 4, "3.3.3.3")])
+        self.clock.now += 3600
+
+        self.assertEqual(self.cache.get_closest_name_server_addresses("www.cs.ubc.ca"), ["1.1.1.1"])
+
+    def test_get_closest_name_server_addresses_glueless(self):
+        """
+        Test case for a zone cut without glue, whose name server address is found amongst the cached answers.
+        """
+        self.cache.add_delegation("ubc.ca", [ResourceRecord("ubc.ca", 2, 1, 3600, 8, "ns1.sfu.ca")], [])
+
+        self.assertIsNone(self.cache.get_closest_name_server_addresses("www.cs.ubc.ca"))
+
+        self.cache.add_answers("ns1.sfu.ca", 1, [ResourceRecord("ns1.sfu.ca", 1, 1, 300, 4, "4.4.4.4")])
+
+        self.assertEqual(self.cache.get_closest_name_server_addresses("www.cs.ubc.ca"), ["4.4.4.4"])
+
+    def test_add_delegation_ignores_glue_outside_zone(self):
+        """
+        Test case for a referral whose glue records include a name server outside the delegated zone, whose address
+        must not be cached.
+        """
+        self.cache.add_delegation("ubc.ca", [ResourceRecord("ubc.ca", 2, 1, 3600, 8, "ns1.ubc.ca"),
+                                             ResourceRecord("ubc.ca", 2, 1, 3600, 8, "ns1.sfu.ca")],
+                                  [ResourceRecord("ns1.ubc.ca", 1, 1, 3600, 4, "3.3.3.3"),
+                                   ResourceRecord("ns1.sfu.ca", 1, 1, 3600, 4, "6.6.6.6")])
+
+        self.assertEqual(self.cache.get_closest_zone_cut("www.cs.ubc.ca"), ("ubc.ca", ["3.3.3.3"]))
+
+    def test_add_delegation_ttl_capped(self):
+        """
+        Test case for a delegation whose records have a ttl above the maximum delegation ttl, which must only be cached
+        for the maximum delegation ttl.
+        """
+        self.cache.add_delegation("ubc.ca", [ResourceRecord("ubc.ca", 2, 1, 999999, 8, "ns1.ubc.ca")],
+                                  [ResourceRecord("ns1.ubc.ca", 1, 1, 999999, 4, "3.3.3.3")])
+        self.clock.now += self.cache.max_delegation_ttl
+
+        self.assertIsNone(self.cache.get_closest_zone_cut("www.cs.ubc.ca"))
+
+    def test_get_name_error(self):
+        """
+        Test case for a cached name error, which also covers every domain name below it.
+        """
+        self.cache.add_name_error("nope.ubc.ca", self.soa_records)
+
+        self.assertIsNotNone(self.cache.get_name_error("nope.ubc.ca"))
+        self.assertIsNotNone(self.cache.get_name_error("www.NOPE.ubc.ca"))
+        self.assertIsNone(self.cache.get_name_error("ubc.ca"))
+        self.assertIsNone(self.cache.get_name_error("yes.ubc.ca"))
+
+    def test_get_name_error_ttl_bounded_by_soa_minimum(self):
+        """
+        Test case for confirming a name error is cached for the soa minimum when it is smaller than the soa ttl.
+        """
+        self.cache.add_name_error("nope.ubc.ca", self.soa_records)
+        self.clock.now += 100
+
+        soa_record: Optional[ResourceRecord] = self.cache.get_name_error("nope.ubc.ca")
+
+        self.assertIsNotNone(soa_record)
+        self.assertEqual(soa_record.ttl if soa_record else None, 200)
+
+        self.clock.now += 200
+
+        self.assertIsNone(self.cache.get_name_error("nope.ubc.ca"))
+
+    def test_add_name_error_without_soa(self):
+        """
+        Test case for a name error without an soa record, which must not be cached.
+        """
+        self.cache.add_name_error("nope.ubc.ca", [ResourceRecord("ubc.ca", 2, 1, 3600, 8, "ns1.ubc.ca")])
+
+        self.assertIsNone(self.cache.get_name_error("nope.ubc.ca"))
+
+    def test_get_no_data(self):
+        """
+        Test case for a domain name cached as having no records of a single type.
+        """
+        self.cache.add_no_data("www.cs.ubc.ca", 28, self.soa_records)
+
+        self.assertIsNotNone(self.cache.get_no_data("www.cs.ubc.ca", 28))
+        self.assertIsNone(self.cache.get_no_data("www.cs.ubc.ca", 1))
+        self.assertIsNone(self.cache.get_no_data("a.www.cs.ubc.ca", 28))
+        self.assertIsNone(self.cache.get_name_error("www.cs.ubc.ca"))
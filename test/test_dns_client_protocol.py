@@ -0,0 +1,82 @@
+from unittest.mock import Mock
+import asyncio
+import unittest
+from dns_shark.dns_client_protocol import DNSClientProtocol
+from dns_shark.dns_message import DNSMessage
+
+
+class DNSClientProtocolTests(unittest.TestCase):
+    """
+    Unit testing for dns_client_protocol.py
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+        cls.response: bytes = bytes.fromhex('0a7b840000010001000000000377777706676f6f676c6503636f6d0000010001c00c00'
+                                            '0100010000012c0004acd90ec4')
+
+        cls.query: bytes = bytes.fromhex('0a7b000000010000000000000377777706676f6f676c6503636f6d0000010001')
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.transport: Mock = Mock()
+        self.protocol: DNSClientProtocol = DNSClientProtocol()
+        self.protocol.connection_made(self.transport)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_response_matched_by_query_id_and_address(self):
+        """
+        Test case for a response arriving after a query. Datagrams that are queries, that come from another address,
+        or that are not decodable must be discarded.
+        """
+        async def query_and_receive():
+            future: asyncio.Future = self.protocol.query(self.query, ('1.2.3.4', 53), 0x0a7b)
+
+            self.protocol.datagram_received(b'\x0a', ('1.2.3.4', 53))
+            self.protocol.datagram_received(self.query, ('1.2.3.4', 53))
+            self.protocol.datagram_received(self.response, ('5.6.7.8', 53))
+            self.assertFalse(future.done())
+
+            self.protocol.datagram_received(self.response, ('1.2.3.4', 53))
+            return await future
+
+        response: DNSMessage = self.loop.run_until_complete(query_and_receive())
+
+        self.assertEqual(response.query_id, 0x0a7b)
+        self.transport.sendto.assert_called_once_with(self.query, ('1.2.3.4', 53))
+        self.assertEqual(self.protocol.pending, {})
+
+    def test_cancelled_query_forgotten(self):
+        """
+        Test case for a query whose future is cancelled before its response arrives.
+        """
+        async def query_and_cancel():
+            future: asyncio.Future = self.protocol.query(self.query, ('1.2.3.4', 53), 0x0a7b)
+            self.assertTrue(self.protocol.is_pending(0x0a7b, ('1.2.3.4', 53)))
+
+            future.cancel()
+            await asyncio.sleep(0)
+
+        self.loop.run_until_complete(query_and_cancel())
+
+        self.assertFalse(self.protocol.is_pending(0x0a7b, ('1.2.3.4', 53)))
+
+    def test_connection_lost(self):
+        """
+        Test case for the socket being closed while a query is outstanding.
+        """
+        async def query_and_lose_connection():
+            future: asyncio.Future = self.protocol.query(self.query, ('1.2.3.4', 53), 0x0a7b)
+            self.protocol.connection_lost(None)
+            await future
+
+        self.assertRaises(ConnectionError, self.loop.run_until_complete, query_and_lose_connection())
+        self.assertRaises(ConnectionError, self.protocol.query, self.query, ('1.2.3.4', 53), 0x0a7b)
@@ -1,6 +1,8 @@
+import struct
 import unittest
 from io import BytesIO
 from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_message_utilities import DNSMessageUtilities
 from test.utilities import Utilities
 from dns_shark.dns_question import DNSQuestion
 from typing import List, Optional
@@ -103,6 +105,185 @@ class DNSMessageTests(unittest.TestCase):
         self.assertEqual(dns_message.additional_records[0].rdlength, 4)
         self.assertEqual(dns_message.additional_records[0].rdata, '199.253.250.68')
 
+    def test_decode_dns_message_from_bytes(self):
+        """
+        Test case to decode an entire dns message straight from its bytes and from a memoryview, which must produce the
+        same dns message as decoding it from a BytesIO.
+        """
+        expected: DNSMessage = DNSMessage.decode_dns_message(BytesIO(self.dns_message_encoded))
+
+        for data in [self.dns_message_encoded, memoryview(self.dns_message_encoded)]:
+            dns_message: DNSMessage = DNSMessage.decode_dns_message(data)
+
+            for attribute in ['query_id', 'is_response', 'opcode', 'authoritative', 'is_truncated', 'recursion_desired',
+                              'recursion_available', 'rcode', 'question_count', 'answer_count', 'nameserver_count',
+                              'additional_count']:
+                self.assertEqual(getattr(dns_message, attribute), getattr(expected, attribute))
+
+            self.assertEqual(dns_message.dns_questions, expected.dns_questions)
+            self.assertEqual(dns_message.answer_records, expected.answer_records)
+            self.assertEqual(dns_message.name_server_records, expected.name_server_records)
+            self.assertEqual(dns_message.additional_records, expected.additional_records)
+
+    def test_decode_dns_message_at_offset(self):
+        """
+        Test case to decode a dns message that begins partway through a buffer, which must also report where the dns
+        message ends.
+        """
+        dns_message, offset = DNSMessage.decode_dns_message_at(b'\xff\xff' + self.dns_message_encoded, 2)
+
+        self.assertEqual(dns_message.query_id, 1)
+        self.assertEqual(dns_message.additional_records[0].rdata, '199.253.250.68')
+        self.assertEqual(offset, len(self.dns_message_encoded) + 2)
+
+    def test_decode_dns_message_lazily(self):
+        """
+        Test case to decode a dns message from its bytes, which must leave every section undecoded until it is first
+        accessed, in any order.
+        """
+        expected: DNSMessage = DNSMessage.decode_dns_message(BytesIO(self.dns_message_encoded))
+        dns_message: DNSMessage = DNSMessage.decode_dns_message(self.dns_message_encoded)
+
+        self.assertIsNone(dns_message._dns_questions)
+        self.assertIsNone(dns_message._answer_records)
+        self.assertIsNone(dns_message._name_server_records)
+        self.assertIsNone(dns_message._additional_records)
+
+        self.assertEqual(dns_message.additional_records, expected.additional_records)
+        self.assertIsNone(dns_message._name_server_records)  # skipped over, but not decoded
+
+        self.assertEqual(dns_message.name_server_records, expected.name_server_records)
+        self.assertEqual(dns_message.answer_records, expected.answer_records)
+        self.assertEqual(dns_message.dns_questions[0].name, expected.dns_questions[0].name)
+
+    def test_decode_dns_message_header_only(self):
+        """
+        Test case to decode a dns message whose sections are cut off, which must still decode its header and only fail
+        once a missing section is accessed.
+        """
+        dns_message: DNSMessage = DNSMessage.decode_dns_message(self.dns_message_encoded[:20])
+
+        self.assertEqual(dns_message.query_id, 1)
+        self.assertTrue(dns_message.is_response)
+
+        with self.assertRaises(IndexError):
+            dns_message.additional_records
+
+    def test_decode_dns_message_from_reused_buffer(self):
+        """
+        Test case to decode a dns message lazily from a memoryview, which must not be affected by later changes to the
+        buffer the memoryview refers to.
+        """
+        buffer: bytearray = bytearray(self.dns_message_encoded)
+        dns_message: DNSMessage = DNSMessage.decode_dns_message(memoryview(buffer))
+
+        buffer[12:] = bytes(len(buffer) - 12)
+
+        self.assertEqual(dns_message.additional_records[0].rdata, '199.253.250.68')
+
+    def test_decode_sections(self):
+        """
+        Test case to decode every section of a lazily decoded dns message up front, which must fail for a dns message
+        cut short.
+        """
+        dns_message: DNSMessage = DNSMessage.decode_dns_message(self.dns_message_encoded)
+        dns_message.decode_sections()
+
+        self.assertEqual(dns_message.additional_records,
+                         DNSMessage.decode_dns_message(self.dns_message_encoded).additional_records)
+
+        with self.assertRaises((IndexError, ValueError, struct.error)):
+            DNSMessage.decode_dns_message(self.dns_message_encoded[:14]).decode_sections()
+
+    def test_encode_dns_message_round_trip(self):
+        """
+        Test case to encode a decoded dns message, which must decode to the same dns message and be no larger than the
+        dns message it was decoded from.
+        """
+        dns_message: DNSMessage = DNSMessage.decode_dns_message(self.dns_message_encoded)
+        encoded: bytes = dns_message.encode()
+        round_trip: DNSMessage = DNSMessage.decode_dns_message(encoded)
+
+        self.assertLessEqual(len(encoded), len(self.dns_message_encoded))
+
+        for attribute in ['query_id', 'is_response', 'opcode', 'authoritative', 'is_truncated', 'recursion_desired',
+                          'recursion_available', 'rcode', 'question_count', 'answer_count', 'nameserver_count',
+                          'additional_count']:
+            self.assertEqual(getattr(round_trip, attribute), getattr(dns_message, attribute))
+
+        self.assertEqual(round_trip.dns_questions, dns_message.dns_questions)
+        self.assertEqual([(record.name, record.type, record.rdata) for record in round_trip.answer_records],
+                         [(record.name, record.type, record.rdata) for record in dns_message.answer_records])
+        self.assertEqual(round_trip.name_server_records, dns_message.name_server_records)
+        self.assertEqual(round_trip.additional_records, dns_message.additional_records)
+
+    def test_encode_dns_message_every_rdata_type(self):
+        """
+        Test case to encode a dns message holding every supported type of rdata, and an unsupported one.
+        """
+        records: List[ResourceRecord] = [ResourceRecord('www.ubc.ca', 5, 1, 300, 9, 'ubc.ca'),
+                                         ResourceRecord('ubc.ca', 1, 1, 300, 4, '142.103.6.5'),
+                                         ResourceRecord('ubc.ca', 28, 1, 300, 16, '2607:f8f0:610::5'),
+                                         ResourceRecord('ubc.ca', 2, 1, 300, 6, 'ns1.ubc.ca'),
+                                         ResourceRecord('ubc.ca', 6, 1, 300, 39,
+                                                        'ns1.ubc.ca hostmaster.ubc.ca 1 7200 3600 604800 300'),
+                                         ResourceRecord('ubc.ca', 16, 1, 300, 3, '\\# 3 026869')]
+        dns_message: DNSMessage = DNSMessage(7, True, 0, True, False, True, False, 0, 1, 6, 0, 0,
+                                             [DNSQuestion('www.ubc.ca', 1, 1)], records, [], [])
+
+        round_trip: DNSMessage = DNSMessage.decode_dns_message(dns_message.encode())
+
+        self.assertEqual(round_trip.query_id, 7)
+        self.assertTrue(round_trip.is_response)
+        self.assertTrue(round_trip.authoritative)
+        self.assertTrue(round_trip.recursion_desired)
+        self.assertEqual(round_trip.dns_questions, [DNSQuestion('www.ubc.ca', 1, 1)])
+
+        # rdlength is that of the encoded rdata, which is smaller than the above wherever a domain name is compressed
+        self.assertEqual([(record.name, record.type, record.ttl, record.rdata) for record in round_trip.answer_records],
+                         [(record.name, record.type, record.ttl, record.rdata) for record in records])
+        self.assertEqual(round_trip.answer_records[0].rdlength, 2)
+
+    def test_encode_dns_message_compressed_rdata(self):
+        """
+        Test case to re-encode a dns message whose MX and PTR rdata were compressed against its question, under a
+        different question. The raw rdata must not point into the dns message it was decoded from.
+        """
+        # question example.com at offset 12, then an MX answer of rdata 10 mail.<pointer to 12> and a PTR answer of
+        # rdata host.<pointer to 12>
+        encoded: bytes = bytes.fromhex('000181800001000200000000') + b'\x07example\x03com\x00\x00\x0f\x00\x01' + \
+            b'\xc0\x0c\x00\x0f\x00\x01\x00\x00\x0e\x10\x00\x09\x00\x0a\x04mail\xc0\x0c' + \
+            b'\xc0\x0c\x00\x0c\x00\x01\x00\x00\x0e\x10\x00\x07\x04host\xc0\x0c'
+        dns_message: DNSMessage = DNSMessage.decode_dns_message(encoded)
+        dns_message.dns_questions = [DNSQuestion('a.longer-name.org', 15, 1)]
+
+        round_trip: DNSMessage = DNSMessage.decode_dns_message(dns_message.encode())
+
+        self.assertEqual([record.raw_rdata for record in round_trip.answer_records],
+                         [b'\x00\x0a\x04mail\x07example\x03com\x00', b'\x04host\x07example\x03com\x00'])
+        self.assertEqual([(record.name, record.type, record.rdata) for record in round_trip.answer_records],
+                         [(record.name, record.type, record.rdata) for record in dns_message.answer_records])
+
+    def test_udp_payload_size(self):
+        """
+        Test case for the udp payload size of dns messages with and without an OPT record, a size below 512 counting as
+        512.
+        """
+        with_edns: DNSMessage = DNSMessage(7, True, 0, False, False, False, False, 0, 1, 0, 0, 2,
+                                           [DNSQuestion('www.ubc.ca', 1, 1)], [], [],
+                                           [ResourceRecord('ns1.ubc.ca', 1, 1, 300, 4, '142.103.6.5'),
+                                            DNSMessageUtilities.create_opt_record(4096)])
+        small_edns: DNSMessage = DNSMessage(7, True, 0, False, False, False, False, 0, 1, 0, 0, 1,
+                                            [DNSQuestion('www.ubc.ca', 1, 1)], [], [],
+                                            [DNSMessageUtilities.create_opt_record(100)])
+        decoded: DNSMessage = DNSMessage.decode_dns_message(with_edns.encode())
+
+        self.assertEqual(decoded.udp_payload_size, 4096)
+        self.assertEqual(decoded.opt_record, DNSMessageUtilities.create_opt_record(4096))
+        self.assertEqual(decoded.additional_records[0].rdata, '142.103.6.5')
+        self.assertEqual(DNSMessage.decode_dns_message(small_edns.encode()).udp_payload_size, 512)
+        self.assertIsNone(DNSMessage.decode_dns_message(Utilities.dns_message_encoded).udp_payload_size)
+
     def test_get_response_value_from_flags_true(self):
         """
         Test case to retrieve the get_response field when set to True in the flags.
@@ -255,9 +436,7 @@ class DNSMessageTests(unittest.TestCase):
         """
         Test case to attempt to decode 0 questions. In other words, decode nothing and return an empty list.
         """
-        dns_questions: List[DNSQuestion] = DNSMessage._read_dns_questions(BytesIO(self.three_consecutive_dns_questions_encoded),
-                                                                          BytesIO(self.three_consecutive_dns_questions_encoded),
-                                                                          0)
+        dns_questions: List[DNSQuestion] = DNSMessage._read_dns_questions(self.three_consecutive_dns_questions_encoded, 0, 0)[0]
 
         self.assertEqual(len(dns_questions), 0)
 
@@ -265,9 +444,7 @@ class DNSMessageTests(unittest.TestCase):
         """
         Test case to decode three consecutive dns questions.
         """
-        dns_questions: List[DNSQuestion] = DNSMessage._read_dns_questions(BytesIO(self.three_consecutive_dns_questions_encoded),
-                                                                          BytesIO(self.three_consecutive_dns_questions_encoded),
-                                                                          3)
+        dns_questions: List[DNSQuestion] = DNSMessage._read_dns_questions(self.three_consecutive_dns_questions_encoded, 0, 3)[0]
 
         # Check that the first question was properly decoded
         self.assertEqual(dns_questions[0].name, 'www.cs.ubc.ca')
@@ -288,9 +465,8 @@ class DNSMessageTests(unittest.TestCase):
         """
         Test case to attempt to decode 0 resource records. In other words, don't decode anything and return an empty list.
         """
-        records: List[ResourceRecord] = DNSMessage._read_resource_records(BytesIO(self.three_consecutive_resource_records_encoded),
-                                                                          BytesIO(self.three_consecutive_resource_records_encoded),
-                                                                          0)
+        records: List[ResourceRecord] = DNSMessage._read_resource_records(self.three_consecutive_resource_records_encoded,
+                                                                          0, 0)[0]
 
         self.assertEqual(len(records), 0)
 
@@ -298,9 +474,8 @@ class DNSMessageTests(unittest.TestCase):
         """
         Test case to decode three consecutive resource records
         """
-        records: List[ResourceRecord] = DNSMessage._read_resource_records(BytesIO(self.three_consecutive_resource_records_encoded),
-                                                                          BytesIO(self.three_consecutive_resource_records_encoded),
-                                                                          3)
+        records: List[ResourceRecord] = DNSMessage._read_resource_records(self.three_consecutive_resource_records_encoded,
+                                                                          0, 3)[0]
 
         # Check that the first name server record was correctly decoded
         self.assertEqual(records[0].name, 'ca')
@@ -1,6 +1,7 @@
 import unittest
 from dns_shark.dns_message_utilities import DNSMessageUtilities
 from dns_shark.dns_message import DNSMessage
+from dns_shark.domain_name_handling import DomainNameEncoder
 from io import BytesIO
 
 
@@ -41,5 +42,23 @@ class DNSMessageUtilitiesTests(unittest.TestCase):
         self.assertEqual(dns_message.dns_questions[0].type, 15)
         self.assertEqual(dns_message.dns_questions[0].response_class, 1)
 
+    def test_encode_query_by_parts(self):
+        """
+        Test case to encode a dns query by its header, domain name, query type and query class, which must be the same dns query
+        as create_query.
+        """
+        query: BytesIO = BytesIO()
+
+        DNSMessageUtilities.encode_header(query, 12345)
+        query.write(DomainNameEncoder.encode_domain_name('www.cs.ubc.ca'))
+        DNSMessageUtilities.encode_query_type(query, 15)
+        DNSMessageUtilities.encode_query_class(query, 1)
 
+        self.assertEqual(query.getvalue(), bytes(DNSMessageUtilities.create_query('www.cs.ubc.ca', 12345, 15)))
 
+    def test_encode_opt_record(self):
+        """
+        Test case to encode an EDNS0 OPT record: the root domain name, type 41, the udp payload size in place of the
+        class, and a zero ttl and rdlength.
+        """
+        self.assertEqual(DNSMessageUtilities.encode_opt_record(4096), b'\x00\x00\x29\x10\x00\x00\x00\x00\x00\x00\x00')
@@ -1,5 +1,6 @@
 from dns_shark.dns_question import DNSQuestion
-from io import BytesIO
+from io import BytesIO, StringIO
+from contextlib import redirect_stdout
 import unittest
 from test.utilities import Utilities
 
@@ -25,4 +26,32 @@ class DNSQuestionTests(unittest.TestCase):
 
         self.assertEqual(dns_question.name, 'www.cs.ubc.ca')
         self.assertEqual(dns_question.type, 1)
-        self.assertEqual(dns_question.response_class, 1)
\ No newline at end of file
+        self.assertEqual(dns_question.response_class, 1)
+    def test_dns_question_print(self):
+        """
+        Test case for printing a dns question using print(), which calls __repr__().
+        """
+        buffer: StringIO = StringIO()
+
+        with redirect_stdout(buffer):
+            print(DNSQuestion('www.cs.ubc.ca', 1, 1))
+
+        self.assertEqual(buffer.getvalue(), "DNSQuestion(name: www.cs.ubc.ca, type: 1, class: 1)\n")
+
+    def test_dns_question_equal(self):
+        """
+        Test case for comparing two equal dns questions, and dns questions that differ in a single field.
+        """
+        question: DNSQuestion = DNSQuestion('www.cs.ubc.ca', 1, 1)
+
+        self.assertTrue(question == DNSQuestion('www.cs.ubc.ca', 1, 1))
+        self.assertTrue(question != DNSQuestion('www.ubc.ca', 1, 1))
+        self.assertTrue(question != DNSQuestion('www.cs.ubc.ca', 28, 1))
+        self.assertTrue(question != DNSQuestion('www.cs.ubc.ca', 1, 3))
+        self.assertTrue(question != 'www.cs.ubc.ca')
+
+    def test_dns_question_has_no_instance_dict(self):
+        """
+        Test case to check that dns questions do not carry the memory overhead of an instance __dict__.
+        """
+        self.assertFalse(hasattr(DNSQuestion('www.cs.ubc.ca', 1, 1), '__dict__'))
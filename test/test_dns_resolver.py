@@ -0,0 +1,165 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.dns_resolver import Resolver
+from dns_shark.socket_pool import SocketPool
+from dns_shark.dns_message import DNSMessage
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.resolution_result import ResolutionResult
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_format_error import DNSFormatError
+from dns_shark.errors.dns_network_error import DNSNetworkError
+from test.utilities import Utilities
+from io import BytesIO
+from typing import Dict, List, Set, Tuple
+
+
+class FakeSocket:
+    """
+    A udp socket that answers every query with the canned response registered for its question's domain name, after
+    rewriting the response's query id to match the query, from the address the query was sent to.
+    """
+
+    def __init__(self, responses: Dict[str, bytes]):
+        self.responses: Dict[str, bytes] = responses
+        self.last_query: bytes = b''
+        self.last_address: Tuple[str, int] = ('', 0)
+
+    def sendto(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.last_query = data
+        self.last_address = addr
+
+    def settimeout(self, timeout: float) -> None:
+        pass
+
+    def recvfrom_into(self, buffer: bytearray, nbytes: int = 0) -> Tuple[int, Tuple[str, int]]:
+        domain_name: str = DNSMessage.decode_dns_message(BytesIO(self.last_query)).dns_questions[0].name
+        response: bytes = self.last_query[:2] + self.responses[domain_name][2:]
+
+        buffer[:len(response)] = response
+        return len(response), self.last_address
+
+    def close(self) -> None:
+        pass
+
+
+class UnreachableSocket(FakeSocket):
+    """
+    A udp socket that fails to send the queries for some domain names, as if their dns server were unreachable, and
+    otherwise answers like a FakeSocket.
+    """
+
+    def __init__(self, responses: Dict[str, bytes], unreachable: Set[str]):
+        super().__init__(responses)
+        self.unreachable: Set[str] = unreachable
+
+    def sendto(self, data: bytes, addr) -> None:
+        if DNSMessage.decode_dns_message(BytesIO(data)).dns_questions[0].name in self.unreachable:
+            raise OSError(101, 'Network is unreachable')
+
+        super().sendto(data, addr)
+
+
+class ResolverTests(unittest.TestCase):
+    """
+    Unit testing for dns_resolver.py
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+        cls.authoritative_response: bytes = bytes.fromhex('19b6840000010001000300030377777702637303756263026361000001'
+                                                          '0001c00c0001000100000e1000048e670605c0100002000100000e1000'
+                                                          '06036e7331c010c0100002000100000e10000a0774656d70313230c010'
+                                                          'c0100002000100000e1000150366733105756772616402637303756263'
+                                                          '02636100c0630001000100000e100004c6a22301c03b0001000100000e'
+                                                          '1000048e670606c04d0001000100000e10000489523d78')
+
+        cls.name_error_response: bytes = bytes.fromhex('123484030001000000010000046e6f7065037562630263610000010001c011'
+                                                       '0006000100000e100027036e7331c0110a686f73746d6173746572c01100'
+                                                       '00000100001c2000000e1000093a800000012c')
+
+        cls.expected_answer: List[ResourceRecord] = [ResourceRecord('www.cs.ubc.ca', 1, 1, 3600, 4, '142.103.6.5')]
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.mock_socket: Mock = Utilities.mock_socket([self.authoritative_response])
+        self.socket_factory: Mock = Mock(return_value=self.mock_socket)
+        self.mock_random: Mock = Mock(**{'randint.side_effect': [0x19b6]})
+
+    def test_state_kept_across_calls(self):
+        """
+        Test case for asking twice for the same domain name. The socket must be created once and the second answer
+        must come from the resolver's cache.
+        """
+        with Resolver("1.2.3.4", socket_pool=SocketPool(socket_factory=self.socket_factory),
+                      random=self.mock_random) as resolver:
+            first_answers: List[ResourceRecord] = resolver.ask("www.cs.ubc.ca")
+            second_answers: List[ResourceRecord] = resolver.ask("www.cs.ubc.ca", "1.2.3.4")
+
+        self.assertEqual(first_answers, self.expected_answer)
+        self.assertEqual(second_answers, self.expected_answer)
+        self.assertEqual(self.socket_factory.call_count, 1)
+        self.assertEqual(self.mock_socket.sendto.call_count, 1)
+        self.mock_socket.close.assert_called_once_with()
+
+    def test_ask_many(self):
+        """
+        Test case for resolving a batch of domain names, one of which does not exist. The name error must be reported
+        without stopping the batch.
+        """
+        responses: Dict[str, bytes] = {'www.cs.ubc.ca': self.authoritative_response,
+                                       'nope.ubc.ca': self.name_error_response}
+
+        with Resolver("1.2.3.4", socket_pool=SocketPool(socket_factory=lambda: FakeSocket(responses))) as resolver:
+            results: List[ResolutionResult] = list(resolver.ask_many(iter(["nope.ubc.ca", "www.cs.ubc.ca"] * 3),
+                                                                     concurrency=2))
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sum(result.succeeded for result in results), 3)
+        self.assertIn(ResolutionResult("www.cs.ubc.ca", 1, answers=self.expected_answer), results)
+
+        for result in results:
+            if not result.succeeded:
+                self.assertEqual(result.domain_name, "nope.ubc.ca")
+                self.assertIsInstance(result.error, DNSNameError)
+
+    def test_ask_many_malformed_response_and_socket_error(self):
+        """
+        Test case for resolving a batch of domain names, one of whose responses cannot be decoded and another of whose
+        queries cannot be sent. Both must be reported as failed results without stopping the batch.
+        """
+        responses: Dict[str, bytes] = {'www.cs.ubc.ca': self.authoritative_response,
+                                       'nope.ubc.ca': self.name_error_response[:-10]}
+
+        with Resolver("1.2.3.4", socket_pool=SocketPool(
+                socket_factory=lambda: UnreachableSocket(responses, {'down.ubc.ca'}))) as resolver:
+            results: List[ResolutionResult] = list(resolver.ask_many(["nope.ubc.ca", "down.ubc.ca", "www.cs.ubc.ca"],
+                                                                     concurrency=1))
+
+        self.assertEqual(len(results), 3)
+        self.assertIn(ResolutionResult("www.cs.ubc.ca", 1, answers=self.expected_answer), results)
+
+        errors: Dict[str, type] = {result.domain_name: type(result.error) for result in results if not result.succeeded}
+        self.assertEqual(errors, {'nope.ubc.ca': DNSFormatError, 'down.ubc.ca': DNSNetworkError})
+
+    def test_ask_many_several_types(self):
+        """
+        Test case for resolving a batch of domain names to several resource record types each.
+        """
+        responses: Dict[str, bytes] = {'www.cs.ubc.ca': self.authoritative_response}
+
+        with Resolver("1.2.3.4", socket_pool=SocketPool(socket_factory=lambda: FakeSocket(responses))) as resolver:
+            results: List[ResolutionResult] = list(resolver.ask_many(["www.cs.ubc.ca"], types=[1, 28]))
+
+        self.assertEqual(sorted((result.type, result.succeeded) for result in results), [(1, True), (28, False)])
+
+    def test_ask_without_dns_server(self):
+        """
+        Test case for asking without supplying a dns server to a resolver that has no default dns server.
+        """
+        with Resolver(socket_pool=SocketPool(socket_factory=self.socket_factory)) as resolver:
+            self.assertRaises(ValueError, resolver.ask, "www.cs.ubc.ca")
@@ -0,0 +1,312 @@
+import asyncio
+import struct
+import unittest
+from dns_shark.dns_server import DNSServer
+from dns_shark.dns_cache import DNSCache
+from dns_shark.dns_client_protocol import DNSClientProtocol
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.query_builder import QueryBuilder
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_timeout_error import DNSTimeoutError
+from typing import List, Optional, Tuple
+
+
+class FakeResolver:
+    """
+    An async resolver that answers every name resolution with the same answers or error, after yielding to the event
+    loop once, and counts its name resolutions.
+    """
+
+    def __init__(self, answers: Optional[List[ResourceRecord]] = None, error: Optional[Exception] = None):
+        self.cache: DNSCache = DNSCache()
+        self.answers: List[ResourceRecord] = answers if answers is not None else []
+        self.error: Optional[Exception] = error
+        self.resolutions: List[Tuple[str, int]] = []
+        self.closed: bool = False
+
+    async def resolve(self, domain_name: str, type: int) -> List[ResourceRecord]:
+        self.resolutions.append((domain_name, type))
+        await asyncio.sleep(0)
+
+        if self.error is not None:
+            raise self.error
+
+        return self.answers
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class DNSServerTests(unittest.TestCase):
+    """
+    Unit testing for dns_server.py
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+        cls.query: bytes = bytes(QueryBuilder().build_query('www.ubc.ca', 4321, 1))
+        cls.answer: ResourceRecord = ResourceRecord('www.ubc.ca', 1, 1, 300, 4, '142.103.6.5')
+        cls.soa_record: ResourceRecord = ResourceRecord('ubc.ca', 6, 1, 3600, 39,
+                                                        'ns1.ubc.ca hostmaster.ubc.ca 1 7200 3600 604800 300')
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def decode_query(self, data: bytes) -> DNSMessage:
+        query: Optional[DNSMessage] = DNSServer.decode_query(data)
+        assert query is not None
+        return query
+
+    def test_answer_from_cache(self):
+        """
+        Test case for a query whose answer is cached, which must be answered without resolving it.
+        """
+        resolver: FakeResolver = FakeResolver()
+        resolver.cache.add_answers('www.ubc.ca', 1, [self.answer])
+        server: DNSServer = DNSServer(resolver)
+
+        response: DNSMessage = DNSMessage.decode_dns_message(server.answer_from_cache(self.decode_query(self.query)))
+
+        self.assertEqual(response.query_id, 4321)
+        self.assertTrue(response.is_response)
+        self.assertTrue(response.recursion_available)
+        self.assertEqual(response.rcode, 0)
+        self.assertEqual(response.dns_questions, [DNSQuestion('www.ubc.ca', 1, 1)])
+        self.assertEqual(response.answer_records, [self.answer])
+        self.assertEqual(resolver.resolutions, [])
+
+    def test_answer_from_cache_name_error(self):
+        """
+        Test case for a query whose domain name is cached as not existing, which must be answered with a name error.
+        """
+        resolver: FakeResolver = FakeResolver()
+        resolver.cache.add_name_error('ubc.ca', [self.soa_record])
+        server: DNSServer = DNSServer(resolver)
+
+        response: DNSMessage = DNSMessage.decode_dns_message(server.answer_from_cache(self.decode_query(self.query)))
+
+        self.assertEqual(response.rcode, 3)
+        self.assertEqual(response.answer_records, [])
+        self.assertEqual(response.name_server_records[0].rdata, self.soa_record.rdata)
+
+    def test_answer_from_cache_miss(self):
+        """
+        Test case for a query whose answer is not cached, which must be left to be resolved.
+        """
+        server: DNSServer = DNSServer(FakeResolver())
+
+        self.assertIsNone(server.answer_from_cache(self.decode_query(self.query)))
+
+    def test_answer_format_error(self):
+        """
+        Test case for a query without a question, which must be answered with a format error.
+        """
+        query: bytes = self.query[:4] + b'\x00\x00' + self.query[6:12]
+        server: DNSServer = DNSServer(FakeResolver())
+
+        response: DNSMessage = DNSMessage.decode_dns_message(server.answer_from_cache(self.decode_query(query)))
+
+        self.assertEqual(response.rcode, 1)
+        self.assertEqual(response.dns_questions, [])
+
+    def test_answer_format_error_of_malformed_sections(self):
+        """
+        Test case for queries whose sections cannot be decoded: a question whose domain name loops through a compression
+        pointer, and an additional section that is cut short. Both must be answered with a format error.
+        """
+        looping_query: bytes = struct.pack('!HHHHHH', 1, 0, 1, 0, 0, 0) + b'\x01x\xc0\x0c\x00\x01\x00\x01'
+        truncated_additional_query: bytes = self.query[:10] + b'\x00\x01' + self.query[12:] + b'\x00\x00\x29'
+        server: DNSServer = DNSServer(FakeResolver())
+
+        for query in (looping_query, truncated_additional_query):
+            response: DNSMessage = DNSMessage.decode_dns_message(server.answer_from_cache(self.decode_query(query)))
+
+            self.assertEqual(response.rcode, 1)
+            self.assertEqual(response.dns_questions, [])
+            self.assertIsNone(response.opt_record)
+
+    def test_answer_not_implemented(self):
+        """
+        Test case for a query that is not a standard query, which must be answered with a not implemented error.
+        """
+        query: bytes = self.query[:2] + b'\x10\x00' + self.query[4:]  # an inverse query
+        server: DNSServer = DNSServer(FakeResolver())
+
+        response: DNSMessage = DNSMessage.decode_dns_message(server.answer_from_cache(self.decode_query(query)))
+
+        self.assertEqual(response.rcode, 4)
+
+    def test_decode_query_ignores_responses(self):
+        """
+        Test case for dns messages that must not be answered at all: responses, and datagrams too short for a header.
+        """
+        self.assertIsNone(DNSServer.decode_query(self.query[:2] + b'\x80\x00' + self.query[4:]))
+        self.assertIsNone(DNSServer.decode_query(self.query[:5]))
+
+    def test_resolve_flattens_aliases(self):
+        """
+        Test case for a query resolved through a CNAME record, whose answers must be returned under the domain name
+        that was asked for.
+        """
+        resolver: FakeResolver = FakeResolver([ResourceRecord('ubc.ca', 1, 1, 300, 4, '142.103.6.5')])
+        server: DNSServer = DNSServer(resolver)
+
+        response: DNSMessage = DNSMessage.decode_dns_message(
+            self.loop.run_until_complete(server.resolve(self.decode_query(self.query))))
+
+        self.assertEqual(response.rcode, 0)
+        self.assertEqual(response.answer_records, [self.answer])
+        self.assertEqual(resolver.resolutions, [('www.ubc.ca', 1)])
+
+    def test_resolve_errors(self):
+        """
+        Test case for queries whose name resolution fails, which must be answered with a name error or a server
+        failure.
+        """
+        name_error: DNSMessage = DNSMessage.decode_dns_message(self.loop.run_until_complete(
+            DNSServer(FakeResolver(error=DNSNameError('Name Error'))).resolve(self.decode_query(self.query))))
+        server_failure: DNSMessage = DNSMessage.decode_dns_message(self.loop.run_until_complete(
+            DNSServer(FakeResolver(error=DNSTimeoutError('Timeout'))).resolve(self.decode_query(self.query))))
+
+        self.assertEqual(name_error.rcode, 3)
+        self.assertEqual(server_failure.rcode, 2)
+
+    def test_resolve_shares_name_resolution(self):
+        """
+        Test case for concurrent queries of the same question, which must share a single name resolution.
+        """
+        resolver: FakeResolver = FakeResolver([self.answer])
+        server: DNSServer = DNSServer(resolver)
+
+        async def resolve_twice():
+            return await asyncio.gather(server.resolve(self.decode_query(self.query)),
+                                        server.resolve(self.decode_query(self.query)))
+
+        responses: List[bytes] = self.loop.run_until_complete(resolve_twice())
+
+        self.assertEqual(responses[0], responses[1])
+        self.assertEqual(resolver.resolutions, [('www.ubc.ca', 1)])
+
+    def test_resolve_compressed_mx_record(self):
+        """
+        Test case for a query resolved through a CNAME record to an MX record, whose exchange was compressed against the
+        rdata of the CNAME record in the upstream response. The client must decode the exchange that the upstream
+        response held, under the domain name that was asked for.
+        """
+        # question www.ubc.ca MX, a CNAME record of rdata example.net at offset 40, then an MX record owned by
+        # <pointer to 40> of rdata 10 mail.<pointer to 40>
+        upstream: DNSMessage = DNSMessage.decode_dns_message(
+            struct.pack('!HHHHHH', 1, 0x8180, 1, 2, 0, 0) + b'\x03www\x03ubc\x02ca\x00\x00\x0f\x00\x01' +
+            b'\xc0\x0c\x00\x05\x00\x01\x00\x00\x01\x2c\x00\x0d\x07example\x03net\x00' +
+            b'\xc0\x28\x00\x0f\x00\x01\x00\x00\x01\x2c\x00\x09\x00\x0a\x04mail\xc0\x28')
+        server: DNSServer = DNSServer(FakeResolver(upstream.answer_records[1:]))
+        query: DNSMessage = self.decode_query(bytes(QueryBuilder().build_query('www.ubc.ca', 4321, 15)))
+
+        response: DNSMessage = DNSMessage.decode_dns_message(self.loop.run_until_complete(server.resolve(query)))
+
+        self.assertEqual(response.rcode, 0)
+        self.assertEqual([(record.name, record.type, record.raw_rdata) for record in response.answer_records],
+                         [('www.ubc.ca', 15, b'\x00\x0a\x04mail\x07example\x03net\x00')])
+
+    def test_resolve_truncates_large_udp_response(self):
+        """
+        Test case for a response that does not fit in a udp datagram, which must be truncated.
+        """
+        answers: List[ResourceRecord] = [ResourceRecord('www.ubc.ca', 1, 1, 300, 4, '10.0.0.' + str(index))
+                                         for index in range(50)]
+        server: DNSServer = DNSServer(FakeResolver(answers))
+
+        response: DNSMessage = DNSMessage.decode_dns_message(
+            self.loop.run_until_complete(server.resolve(self.decode_query(self.query), 512)))
+
+        self.assertTrue(response.is_truncated)
+        self.assertEqual(response.answer_records, [])
+        self.assertEqual(response.dns_questions, [DNSQuestion('www.ubc.ca', 1, 1)])
+
+    def test_resolve_edns_query(self):
+        """
+        Test case for a query advertising a udp payload size with EDNS0. Its response must be allowed up to that size,
+        capped at the server's udp payload size, and carry an OPT record.
+        """
+        answers: List[ResourceRecord] = [ResourceRecord('www.ubc.ca', 1, 1, 300, 4, '10.0.0.' + str(index))
+                                         for index in range(50)]
+        server: DNSServer = DNSServer(FakeResolver(answers), udp_payload_size=1232)
+        query: DNSMessage = self.decode_query(bytes(QueryBuilder().build_query('www.ubc.ca', 4321, 1,
+                                                                               udp_payload_size=4096)))
+
+        response: DNSMessage = DNSMessage.decode_dns_message(
+            self.loop.run_until_complete(server.resolve(query, server.get_max_udp_size(query))))
+
+        self.assertEqual(server.get_max_udp_size(query), 1232)
+        self.assertEqual(server.get_max_udp_size(self.decode_query(self.query)), 512)
+        self.assertFalse(response.is_truncated)
+        self.assertEqual(len(response.answer_records), 50)
+        self.assertEqual(response.udp_payload_size, 1232)
+
+    def test_serve_udp_and_tcp(self):
+        """
+        Test case for a server listening on a local port, which must answer queries over both udp and tcp.
+        """
+        resolver: FakeResolver = FakeResolver([self.answer])
+        server: DNSServer = DNSServer(resolver)
+
+        async def query_over_udp_and_tcp():
+            await server.start('127.0.0.1', 0)
+
+            transport, protocol = await asyncio.get_event_loop().create_datagram_endpoint(
+                DNSClientProtocol, local_addr=('127.0.0.1', 0))
+            udp_response = await asyncio.wait_for(protocol.query(self.query, server.address, 4321), 5)
+            transport.close()
+
+            reader, writer = await asyncio.open_connection(*server.address)
+            writer.write(len(self.query).to_bytes(2, 'big') + self.query)
+            length: int = int.from_bytes(await reader.readexactly(2), 'big')
+            tcp_response = DNSMessage.decode_dns_message(await reader.readexactly(length))
+            writer.close()
+            await asyncio.sleep(0.01)  # let the server see the connection close
+
+            server.close()
+            return udp_response, tcp_response
+
+        udp_response, tcp_response = self.loop.run_until_complete(query_over_udp_and_tcp())
+
+        self.assertEqual(udp_response.answer_records, [self.answer])
+        self.assertEqual(tcp_response.answer_records, [self.answer])
+        self.assertTrue(resolver.closed)
+
+    def test_serve_udp_after_malformed_query(self):
+        """
+        Test case for a server receiving a query whose domain name loops through a compression pointer, which must be
+        answered with a format error, and must not keep the server from answering the next query.
+        """
+        looping_query: bytes = struct.pack('!HHHHHH', 1, 0, 1, 0, 0, 0) + b'\x01x\xc0\x0c\x00\x01\x00\x01'
+        server: DNSServer = DNSServer(FakeResolver([self.answer]))
+
+        async def query_over_udp():
+            await server.start('127.0.0.1', 0, tcp=False)
+
+            transport, protocol = await asyncio.get_event_loop().create_datagram_endpoint(
+                DNSClientProtocol, local_addr=('127.0.0.1', 0))
+            malformed_response = await asyncio.wait_for(protocol.query(looping_query, server.address, 1), 5)
+            response = await asyncio.wait_for(protocol.query(self.query, server.address, 4321), 5)
+            transport.close()
+
+            server.close()
+            return malformed_response, response
+
+        malformed_response, response = self.loop.run_until_complete(query_over_udp())
+
+        self.assertEqual(malformed_response.rcode, 1)
+        self.assertEqual(response.rcode, 0)
+        self.assertEqual(response.answer_records, [self.answer])
@@ -0,0 +1,128 @@
+import asyncio
+import asyncio.base_events
+import unittest
+from dns_shark.async_tcp_connection_pool import AsyncTCPConnectionPool
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_stream_client_protocol import DNSStreamClientProtocol
+from dns_shark.query_builder import QueryBuilder
+from typing import List
+
+
+class FakeStreamTransport:
+    """
+    A stream transport that records the data written to it.
+    """
+
+    def __init__(self):
+        self.written: List[bytes] = []
+        self.closed: bool = False
+
+    def write(self, data: bytes) -> None:
+        self.written.append(data)
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class DNSStreamClientProtocolTests(unittest.TestCase):
+    """
+    Unit testing for dns_stream_client_protocol.py and async_tcp_connection_pool.py
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.protocol: DNSStreamClientProtocol = DNSStreamClientProtocol()
+        self.transport: FakeStreamTransport = FakeStreamTransport()
+        self.protocol.connection_made(self.transport)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    @staticmethod
+    def response(query_id: int) -> bytes:
+        response: bytearray = QueryBuilder().build_query('www.ubc.ca', query_id, 1)
+        response[2] = response[2] | 0x80
+        return len(response).to_bytes(2, 'big') + bytes(response)
+
+    def test_pipelined_responses_out_of_order(self):
+        """
+        Test case for two queries outstanding at once, whose responses arrive in the opposite order and split across
+        reads. Every response must be handed to the query with its query id.
+        """
+        first: asyncio.Future = self.protocol.query(b'first', 1)
+        second: asyncio.Future = self.protocol.query(b'second', 2)
+        received: bytes = self.response(2) + self.response(1)
+
+        self.protocol.data_received(received[:5])
+        self.protocol.data_received(received[5:40])
+        self.protocol.data_received(received[40:])
+
+        self.assertEqual(self.transport.written, [b'\x00\x05first', b'\x00\x06second'])
+        self.assertEqual(first.result().query_id, 1)
+        self.assertEqual(second.result().query_id, 2)
+        self.assertEqual(self.protocol.pending, {})
+
+    def test_connection_lost_fails_pending_queries(self):
+        """
+        Test case for a connection closed by the dns server while a query is outstanding, which must fail the query.
+        """
+        future: asyncio.Future = self.protocol.query(b'query', 1)
+
+        self.protocol.connection_lost(None)
+
+        with self.assertRaises(ConnectionError):
+            future.result()
+        self.assertFalse(self.protocol.is_open)
+        with self.assertRaises(ConnectionError):
+            self.protocol.query(b'query', 2)
+
+    def test_pool_reuses_open_connection(self):
+        """
+        Test case for a connection pool, which must share a single connection per dns server, pipeline the queries of
+        concurrent name resolutions over it, and replace it once the dns server closes it.
+        """
+        async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            connections.append(writer)
+            try:
+                while True:
+                    query: bytes = await reader.readexactly(int.from_bytes(await reader.readexactly(2), 'big'))
+                    writer.write(self.response(DNSMessage.decode_dns_message(query).query_id))
+            except asyncio.IncompleteReadError:
+                writer.close()
+
+        connections: List[asyncio.StreamWriter] = []
+
+        async def query_twice(pool: AsyncTCPConnectionPool) -> List[DNSMessage]:
+            first: DNSStreamClientProtocol = await pool.connection('127.0.0.1', 5)
+            second: DNSStreamClientProtocol = await pool.connection('127.0.0.1', 5)
+            self.assertIs(first, second)
+
+            return await asyncio.gather(first.query(bytes(QueryBuilder().build_query('www.ubc.ca', 1, 1)), 1),
+                                        first.query(bytes(QueryBuilder().build_query('www.ubc.ca', 2, 1)), 2))
+
+        async def run() -> List[DNSMessage]:
+            server: asyncio.base_events.Server = await asyncio.start_server(serve, '127.0.0.1', 0)
+            pool: AsyncTCPConnectionPool = AsyncTCPConnectionPool(port=server.sockets[0].getsockname()[1])
+
+            responses: List[DNSMessage] = await query_twice(pool)
+            connections[0].close()
+            await asyncio.sleep(0.01)  # let the client see the connection close
+            responses.extend(await query_twice(pool))
+
+            pool.close()
+            server.close()
+            await asyncio.sleep(0.01)
+            return responses
+
+        responses: List[DNSMessage] = self.loop.run_until_complete(run())
+
+        self.assertEqual([response.query_id for response in responses], [1, 2, 1, 2])
+        self.assertEqual(len(connections), 2)
@@ -1,6 +1,7 @@
 import unittest
 from dns_shark.domain_name_handling import DomainNameEncoder, DomainNameDecoder
 from io import BytesIO
+from typing import Dict
 from test.utilities import Utilities
 
 
@@ -80,3 +81,102 @@ class DomainNameHandlingTests(unittest.TestCase):
         result: str = DomainNameDecoder.decode_domain_name(reader, copy_of_message)
 
         self.assertEqual(result, self.domain_name_with_pointers)
+
+        # the reader must be left just past the pointer that ended the domain name
+        self.assertEqual(reader.tell(), len(self.domain_name_with_pointers_encoded))
+
+    def test_decode_domain_name_at_offset(self):
+        """
+        Test case for decoding a domain name with a pointer, by offset, straight from a memoryview of the message.
+        """
+        result, offset = DomainNameDecoder.decode_domain_name_at(memoryview(self.domain_name_with_pointers_encoded), 15)
+
+        self.assertEqual(result, self.domain_name_with_pointers)
+        self.assertEqual(offset, len(self.domain_name_with_pointers_encoded))
+
+    def test_decode_domain_name_pointer_loop(self):
+        """
+        Test case for a pointer that points to itself, which must be rejected instead of looping forever.
+        """
+        with self.assertRaises(ValueError):
+            DomainNameDecoder.decode_domain_name_at(bytes.fromhex('0377777700c005'), 5)
+
+    def test_decode_domain_name_label_and_pointer_loop(self):
+        """
+        Test case for a label followed by a pointer back to that label, which points below the pointer itself but not
+        below every part of the domain name decoded so far, and must be rejected instead of looping forever.
+        """
+        with self.assertRaises(ValueError):
+            DomainNameDecoder.decode_domain_name_at(bytes(20) + b'\x01x\xc0\x14', 20)
+
+    def test_decode_domain_name_too_long(self):
+        """
+        Test case for a domain name longer than 255 bytes, made of pointers that each point further back, which must be
+        rejected.
+        """
+        message: bytearray = bytearray(b'\x00')
+        previous: int = 0
+
+        for _ in range(64):
+            offset: int = len(message)
+            message.extend(b'\x03abc' + (0xc000 | previous).to_bytes(2, 'big'))
+            previous = offset
+
+        self.assertEqual(DomainNameDecoder.decode_domain_name_at(bytes(message), 6 * 62 + 1)[0], '.'.join(['abc'] * 63))
+
+        with self.assertRaises(ValueError):
+            DomainNameDecoder.decode_domain_name_at(bytes(message), previous)
+
+    def test_decode_domain_name_too_long_with_remembered_suffix(self):
+        """
+        Test case for a domain name that is only longer than 255 bytes together with the remembered suffix it points at.
+        """
+        with self.assertRaises(ValueError):
+            DomainNameDecoder.decode_domain_name_at(b'\x00\x03abc\xc0\x00', 1, {0: 'a' * 252})
+
+    def test_decode_domain_name_remembers_suffixes(self):
+        """
+        Test case for decoding a domain name with a pointer, which must remember the domain name suffix beginning at
+        every label that was decoded.
+        """
+        suffixes: Dict[int, str] = {}
+        message: bytes = self.domain_name_with_pointers_encoded
+
+        self.assertEqual(DomainNameDecoder.decode_domain_name_at(message, 15, suffixes)[0], self.domain_name_with_pointers)
+        self.assertEqual(suffixes, {4: 'cs.ubc.ca', 7: 'ubc.ca', 11: 'ca', 15: 'www.cbu.cs.ubc.ca', 19: 'cbu.cs.ubc.ca'})
+
+    def test_decode_domain_name_uses_remembered_suffixes(self):
+        """
+        Test case for decoding a domain name whose pointer points at a suffix that was already decoded, which must be
+        completed from the remembered suffix instead of decoding the labels behind the pointer again.
+        """
+        suffixes: Dict[int, str] = {4: 'remembered.suffix'}
+
+        result, offset = DomainNameDecoder.decode_domain_name_at(self.domain_name_with_pointers_encoded, 15, suffixes)
+
+        self.assertEqual(result, 'www.cbu.remembered.suffix')
+        self.assertEqual(offset, len(self.domain_name_with_pointers_encoded))
+
+    def test_encode_domain_name_with_compression(self):
+        """
+        Test case for encoding two domain names into the same dns message, where the second must point to the suffix
+        it shares with the first.
+        """
+        message: bytearray = bytearray()
+        suffixes: Dict[str, int] = {}
+
+        DomainNameEncoder.encode_domain_name_into('www.cs.ubc.ca', message, suffixes)
+        DomainNameEncoder.encode_domain_name_into(self.domain_name_with_pointers, message, suffixes)
+
+        self.assertEqual(bytes(message), self.domain_name_with_pointers_encoded)
+        self.assertEqual(DomainNameDecoder.decode_domain_name_at(message, 15)[0], self.domain_name_with_pointers)
+
+    def test_encode_root_domain_name_with_compression(self):
+        """
+        Test case for encoding the root domain name, which has no labels.
+        """
+        message: bytearray = bytearray()
+
+        DomainNameEncoder.encode_domain_name_into('', message, {})
+
+        self.assertEqual(bytes(message), b'\x00')
@@ -0,0 +1,91 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.infrastructure_cache import InfrastructureCache
+from test.test_dns_cache import FakeClock
+
+
+class InfrastructureCacheTests(unittest.TestCase):
+    """
+    Unit testing for infrastructure_cache.py
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.clock: FakeClock = FakeClock()
+        self.cache: InfrastructureCache = InfrastructureCache(clock=self.clock, unknown_round_trip_time=0.4,
+                                                              failure_penalty=1.0, half_life=600.0, exploration=0.0)
+
+    def test_unknown_name_server(self):
+        """
+        Test case for the expected latency of a name server that was never queried.
+        """
+        self.assertEqual(self.cache.get_expected_latency("1.1.1.1"), 0.4)
+        self.assertIsNone(self.cache.get_hedge_delay("1.1.1.1"))
+
+    def test_sort_name_servers_by_round_trip_time(self):
+        """
+        Test case for ordering name servers, which must put the fastest first and unknown name servers in between.
+        """
+        self.cache.add_round_trip_time("1.1.1.1", 0.9)
+        self.cache.add_round_trip_time("2.2.2.2", 0.05)
+
+        self.assertEqual(self.cache.sort_name_servers(["1.1.1.1", "3.3.3.3", "2.2.2.2"]),
+                         ["2.2.2.2", "3.3.3.3", "1.1.1.1"])
+
+    def test_edns_rejection(self):
+        """
+        Test case for a name server that rejected EDNS0, which must be remembered for that name server only.
+        """
+        self.cache.add_edns_rejection("1.1.1.1")
+
+        self.assertFalse(self.cache.supports_edns("1.1.1.1"))
+        self.assertTrue(self.cache.supports_edns("2.2.2.2"))
+
+    def test_timeouts_and_errors_penalized(self):
+        """
+        Test case for name servers that timed out or failed, which must be ordered behind a slower reliable one.
+        """
+        self.cache.add_round_trip_time("1.1.1.1", 0.2)
+        self.cache.add_round_trip_time("2.2.2.2", 0.01)
+        self.cache.add_error("2.2.2.2")
+        self.cache.add_timeout("3.3.3.3", 0.1)
+
+        self.assertAlmostEqual(self.cache.get_expected_latency("2.2.2.2"), 1.01)
+        self.assertAlmostEqual(self.cache.get_expected_latency("3.3.3.3"), 1.1)
+        self.assertEqual(self.cache.sort_name_servers(["3.3.3.3", "2.2.2.2", "1.1.1.1"]),
+                         ["1.1.1.1", "2.2.2.2", "3.3.3.3"])
+
+    def test_statistics_decay(self):
+        """
+        Test case for a name server whose statistics are one half life old, which must count for half as much.
+        """
+        self.cache.add_timeout("1.1.1.1", 2.4)
+        self.clock.now += 600
+
+        self.assertAlmostEqual(self.cache.get_expected_latency("1.1.1.1"), 0.4 + 0.5 * 2.0 + 0.5 * 1.0)
+
+    def test_exploration(self):
+        """
+        Test case for exploring, which must move a name server other than the fastest to the front.
+        """
+        cache: InfrastructureCache = InfrastructureCache(random=Mock(**{'random.return_value': 0.0,
+                                                                        'randint.return_value': 2}),
+                                                         exploration=0.05)
+        cache.add_round_trip_time("1.1.1.1", 0.01)
+
+        self.assertEqual(cache.sort_name_servers(["1.1.1.1", "2.2.2.2", "3.3.3.3"]),
+                         ["3.3.3.3", "1.1.1.1", "2.2.2.2"])
+
+    def test_max_entries(self):
+        """
+        Test case for exceeding the maximum number of name servers, which must evict the least recently updated one.
+        """
+        cache: InfrastructureCache = InfrastructureCache(max_entries=2)
+        cache.add_round_trip_time("1.1.1.1", 0.1)
+        cache.add_round_trip_time("2.2.2.2", 0.1)
+        cache.add_round_trip_time("1.1.1.1", 0.1)
+        cache.add_round_trip_time("3.3.3.3", 0.1)
+
+        self.assertEqual(list(cache.servers), ["1.1.1.1", "3.3.3.3"])
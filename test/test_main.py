@@ -1,8 +1,10 @@
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock, patch
+import os
+import tempfile
 import unittest
-from dns_shark.__main__ import main_helper
+from dns_shark.__main__ import main_helper, read_domain_names, resolve_bulk, write_results
 from contextlib import redirect_stdout
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 from dns_shark.errors.dns_format_error import DNSFormatError
 from dns_shark.errors.dns_name_error import DNSNameError
 from dns_shark.errors.dns_not_implemented_error import DNSNotImplementedError
@@ -11,6 +13,10 @@ from dns_shark.errors.dns_refused_error import DNSRefusedError
 from dns_shark.errors.dns_no_matching_resource_record_error import DNSNoMatchingResourceRecordError
 from dns_shark.errors.dns_zero_counter_error import DNSZeroCounterError
 from dns_shark.resource_record import ResourceRecord
+from dns_shark.resolution_result import ResolutionResult
+from dns_shark.record_writer import JSONLinesRecordWriter
+from typing import Iterator, List
+import json
 
 
 class MainTests(unittest.TestCase):
@@ -134,3 +140,115 @@ class MainTests(unittest.TestCase):
                                                  "\n  www.cs.ubc.ca 600   A 1.2.3.4"
                                                  "\n  www.cs.ubc.ca 2000   AAAA 5.6.7.8\n")
 
+    def test_main_helper_record_writer(self):
+        """
+        Test case for when the answers are written with a record writer, rather than printed
+        """
+        mock_resolver: Mock = Mock(**{'ask.return_value': [ResourceRecord("www.ubc.cs.ca", 28, 1, 600, 16, "::1")]})
+        output: BytesIO = BytesIO()
+
+        with redirect_stdout(self.buffer):
+            main_helper(mock_resolver, "www.cs.ubc.ca", "1.2.3.4", True, False, JSONLinesRecordWriter(output))
+
+        self.assertEqual(self.buffer.getvalue(), "")
+        self.assertEqual(json.loads(output.getvalue()),
+                         {'domain_name': 'www.cs.ubc.ca', 'type': 'AAAA', 'error': None,
+                          'answers': [{'name': 'www.ubc.cs.ca', 'ttl': 600, 'type': 'AAAA', 'rdata': '::1'}]})
+
+    def test_read_domain_names(self):
+        """
+        Test case for reading domain names, one per line, skipping blank lines and comments.
+        """
+        lines: List[str] = ['www.ubc.ca\n', '\n', '# a comment\n', '  www.cs.ubc.ca  # with a comment\n']
+
+        self.assertEqual(list(read_domain_names(lines)), ['www.ubc.ca', 'www.cs.ubc.ca'])
+
+    def test_read_domain_names_lazily(self):
+        """
+        Test case for reading domain names from an endless stream of lines, which must only be read as far as needed.
+        """
+        def endless_lines() -> Iterator[str]:
+            index: int = 0
+            while True:
+                yield 'host' + str(index) + '.example\n'
+                index = index + 1
+
+        domain_names: Iterator[str] = read_domain_names(endless_lines())
+
+        self.assertEqual([next(domain_names) for _ in range(3)], ['host0.example', 'host1.example', 'host2.example'])
+
+    def test_write_results(self):
+        """
+        Test case for writing the results of a bulk run, which must be one line of JSON per name resolution.
+        """
+        results: List[ResolutionResult] = [
+            ResolutionResult('www.ubc.ca', 1, answers=[ResourceRecord('www.ubc.ca', 1, 1, 600, 4, '1.2.3.4')]),
+            ResolutionResult('nope.ubc.ca', 1, error=DNSNameError('Name Error Message'))]
+        mock_resolver: Mock = Mock(**{'ask_many.return_value': iter(results)})
+        output: BytesIO = BytesIO()
+
+        write_results(mock_resolver, iter(['www.ubc.ca', 'nope.ubc.ca']), '1.2.3.4', False, 10,
+                      JSONLinesRecordWriter(output))
+
+        self.assertEqual([json.loads(line) for line in output.getvalue().splitlines()],
+                         [{'domain_name': 'www.ubc.ca', 'type': 'A', 'error': None,
+                           'answers': [{'name': 'www.ubc.ca', 'ttl': 600, 'type': 'A', 'rdata': '1.2.3.4'}]},
+                          {'domain_name': 'nope.ubc.ca', 'type': 'A', 'answers': None, 'error': 'Name Error Message'}])
+        self.assertEqual(mock_resolver.ask_many.call_args[0][1:], ([1], 10, '1.2.3.4'))
+
+    def test_write_results_writes_metrics_periodically(self):
+        """
+        Test case for a bulk run with a metrics file, which must be rewritten every METRICS_WRITE_RESULTS results.
+        """
+        results: List[ResolutionResult] = [ResolutionResult('host' + str(index) + '.example', 1,
+                                                            error=DNSNameError('Name Error Message'))
+                                           for index in range(5)]
+        mock_resolver: Mock = Mock(**{'ask_many.return_value': iter(results)})
+        mock_metrics: Mock = Mock()
+
+        with patch('dns_shark.__main__.METRICS_WRITE_RESULTS', 2):
+            write_results(mock_resolver, iter([result.domain_name for result in results]), '1.2.3.4', False, 10,
+                          JSONLinesRecordWriter(BytesIO()), mock_metrics, 'metrics.prom')
+
+        self.assertEqual(mock_metrics.write.call_count, 2)
+        mock_metrics.write.assert_called_with('metrics.prom')
+
+    def test_write_results_writes_metrics_after_interval(self):
+        """
+        Test case for a bulk run with a metrics file, which must be rewritten once METRICS_WRITE_SECONDS have passed,
+        even before METRICS_WRITE_RESULTS results.
+        """
+        results: List[ResolutionResult] = [ResolutionResult('nope.ubc.ca', 1, error=DNSNameError('Name Error Message'))]
+        mock_resolver: Mock = Mock(**{'ask_many.return_value': iter(results * 3)})
+        mock_metrics: Mock = Mock()
+
+        with patch('dns_shark.__main__.METRICS_WRITE_SECONDS', 0.0):
+            write_results(mock_resolver, iter(['nope.ubc.ca'] * 3), '1.2.3.4', False, 10,
+                          JSONLinesRecordWriter(BytesIO()), mock_metrics, 'metrics.prom')
+
+        self.assertEqual(mock_metrics.write.call_count, 3)
+
+    def test_resolve_bulk_writes_metrics_when_interrupted(self):
+        """
+        Test case for a bulk run with a metrics file that is interrupted, which must still write the metrics file.
+        """
+        def interrupted_results(*args) -> Iterator[ResolutionResult]:
+            yield ResolutionResult('nope.ubc.ca', 1, error=DNSNameError('Name Error Message'))
+            raise KeyboardInterrupt
+
+        mock_resolver: MagicMock = MagicMock()
+        mock_resolver.__enter__.return_value.ask_many.side_effect = interrupted_results
+        output: TextIOWrapper = TextIOWrapper(BytesIO())
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_path: str = os.path.join(directory, 'domain_names.txt')
+            metrics_path: str = os.path.join(directory, 'metrics.prom')
+
+            with open(input_path, 'w') as file:
+                file.write('nope.ubc.ca\nwww.ubc.ca\n')
+
+            with patch('dns_shark.__main__.Resolver', Mock(return_value=mock_resolver)), redirect_stdout(output):
+                with self.assertRaises(KeyboardInterrupt):
+                    resolve_bulk(['1.2.3.4', '--input', input_path, '--metrics-file', metrics_path])
+
+            self.assertTrue(os.path.exists(metrics_path))
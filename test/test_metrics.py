@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from dns_shark.metrics import Counter, Histogram, MetricsRegistry
+from http.server import HTTPServer
+from urllib.request import urlopen
+
+
+class MetricsTests(unittest.TestCase):
+    """
+    Unit testing for metrics.py
+    """
+
+    def test_counter(self):
+        """
+        Test case for a counter with labels, which must count every combination of label values separately.
+        """
+        counter: Counter = Counter('queries_total', 'Queries.', ('server', 'transport'))
+
+        counter.inc('1.2.3.4', 'udp')
+        counter.inc('1.2.3.4', 'udp')
+        counter.inc('5.6.7.8', 'tcp')
+
+        self.assertEqual(counter.get('1.2.3.4', 'udp'), 2)
+        self.assertEqual(counter.get('1.2.3.4', 'tcp'), 0)
+        self.assertEqual(counter.exposition(), ['# HELP queries_total Queries.',
+                                                '# TYPE queries_total counter',
+                                                'queries_total{server="1.2.3.4",transport="udp"} 2',
+                                                'queries_total{server="5.6.7.8",transport="tcp"} 1'])
+
+    def test_counter_label_escaping(self):
+        """
+        Test case for label values holding characters that must be escaped in the Prometheus text format.
+        """
+        counter: Counter = Counter('errors_total', 'Errors.', ('error',))
+
+        counter.inc('a "quoted"\\error\n')
+
+        self.assertEqual(counter.exposition()[2], 'errors_total{error="a \\"quoted\\"\\\\error\\n"} 1')
+
+    def test_histogram(self):
+        """
+        Test case for a histogram, whose buckets must be cumulative in the Prometheus text format. A value equal to the
+        upper bound of a bucket belongs to that bucket.
+        """
+        histogram: Histogram = Histogram('latency_seconds', 'Latency.', (0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.exposition(), ['# HELP latency_seconds Latency.',
+                                                  '# TYPE latency_seconds histogram',
+                                                  'latency_seconds_bucket{le="0.1"} 2',
+                                                  'latency_seconds_bucket{le="1.0"} 3',
+                                                  'latency_seconds_bucket{le="+Inf"} 4',
+                                                  'latency_seconds_sum 2.65',
+                                                  'latency_seconds_count 4'])
+
+    def test_write(self):
+        """
+        Test case for writing the metrics of a registry to a file.
+        """
+        registry: MetricsRegistry = MetricsRegistry()
+        registry.cache_hits.inc()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, 'dns_shark.prom')
+            registry.write(path)
+
+            with open(path) as file:
+                self.assertEqual(file.read(), registry.exposition())
+
+            self.assertEqual(os.listdir(directory), ['dns_shark.prom'])
+
+        self.assertIn('dns_shark_cache_hits_total 1\n', registry.exposition())
+
+    def test_serve(self):
+        """
+        Test case for serving the metrics of a registry over http.
+        """
+        registry: MetricsRegistry = MetricsRegistry()
+        registry.resolution_latency.observe(0.02)
+        server: HTTPServer = registry.serve(port=0)
+
+        try:
+            with urlopen('http://127.0.0.1:' + str(server.server_address[1]) + '/metrics', timeout=5) as response:
+                self.assertEqual(response.headers['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+                self.assertEqual(response.read().decode(), registry.exposition())
+        finally:
+            server.shutdown()
+            server.server_close()
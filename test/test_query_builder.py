@@ -0,0 +1,71 @@
+import unittest
+from dns_shark.query_builder import QueryBuilder
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_message_utilities import DNSMessageUtilities
+
+
+class QueryBuilderTests(unittest.TestCase):
+    """
+    Unit testing for query_builder.py
+    """
+
+    def test_build_query(self):
+        """
+        Test case to build a dns query, which must be identical to the dns query built field by field.
+        """
+        query: bytearray = QueryBuilder().build_query('www.cs.ubc.ca', 12345, 15)
+
+        self.assertEqual(query, DNSMessageUtilities.create_domain_name_query('www.cs.ubc.ca', 12345, 15).getvalue())
+
+        dns_message: DNSMessage = DNSMessage.decode_dns_message(query)
+        self.assertEqual(dns_message.query_id, 12345)
+        self.assertEqual(dns_message.question_count, 1)
+        self.assertEqual(dns_message.dns_questions[0].name, 'www.cs.ubc.ca')
+        self.assertEqual(dns_message.dns_questions[0].type, 15)
+        self.assertEqual(dns_message.dns_questions[0].response_class, 1)
+
+    def test_build_query_reuses_template(self):
+        """
+        Test case to build two dns queries for the same question, which must share a template but not a packet.
+        """
+        builder: QueryBuilder = QueryBuilder()
+
+        first: bytearray = builder.build_query('www.cs.ubc.ca', 1, 1)
+        second: bytearray = builder.build_query('www.cs.ubc.ca', 2, 1)
+
+        self.assertEqual(len(builder.templates), 1)
+        self.assertEqual(first[:2], b'\x00\x01')
+        self.assertEqual(second[:2], b'\x00\x02')
+        self.assertEqual(first[2:], second[2:])
+        self.assertEqual(builder.get_template('www.cs.ubc.ca', 1)[:2], b'\x00\x00')
+
+    def test_build_query_with_edns(self):
+        """
+        Test case to build a dns query advertising a udp payload size, which must end with an OPT record holding it.
+        """
+        query: bytearray = QueryBuilder().build_query('www.cs.ubc.ca', 12345, 1, udp_payload_size=1232)
+
+        self.assertEqual(query[12:], QueryBuilder().build_query('www.cs.ubc.ca', 12345, 1)[12:] +
+                         DNSMessageUtilities.encode_opt_record(1232))
+
+        dns_message: DNSMessage = DNSMessage.decode_dns_message(query)
+        self.assertEqual(dns_message.additional_count, 1)
+        self.assertEqual(dns_message.udp_payload_size, 1232)
+        self.assertEqual(dns_message.dns_questions[0].name, 'www.cs.ubc.ca')
+
+    def test_build_query_evicts_least_recently_used(self):
+        """
+        Test case to build dns queries for more questions than the builder holds, which must evict the template that
+        was used least recently.
+        """
+        builder: QueryBuilder = QueryBuilder(max_entries=2)
+
+        builder.build_query('a.ubc.ca', 1, 1)
+        builder.build_query('b.ubc.ca', 1, 1)
+        builder.build_query('a.ubc.ca', 2, 1)
+        builder.build_query('c.ubc.ca', 3, 1)
+
+        self.assertEqual(list(builder.templates), [('a.ubc.ca', 1, 1, None), ('c.ubc.ca', 1, 1, None)])
+
+        builder.clear()
+        self.assertEqual(len(builder.templates), 0)
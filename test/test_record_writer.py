@@ -0,0 +1,141 @@
+import unittest
+from dns_shark.dns_message import DNSMessage
+from dns_shark.record_writer import BinaryRecordWriter, CSVRecordWriter, JSONLinesRecordWriter, RecordWriter, \
+    TextRecordWriter
+from dns_shark.resolution_result import ResolutionResult
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_timeout_error import DNSTimeoutError
+from io import BytesIO
+from typing import List
+import json
+
+
+class RecordWriterTests(unittest.TestCase):
+    """
+    Unit testing for record_writer.py
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.stream: BytesIO = BytesIO()
+        self.answers: List[ResourceRecord] = [ResourceRecord('www.ubc.ca', 5, 1, 3600, 2, 'ubc.ca'),
+                                              ResourceRecord('ubc.ca', 1, 1, 600, 4, '1.2.3.4')]
+        self.results: List[ResolutionResult] = [ResolutionResult('www.ubc.ca', 1, answers=self.answers),
+                                                ResolutionResult('nope.ubc.ca', 1,
+                                                                 error=DNSNameError('Name Error Message'))]
+
+    def write(self, record_writer: RecordWriter) -> bytes:
+        for result in self.results:
+            record_writer.write_result(result)
+
+        record_writer.flush()
+        return self.stream.getvalue()
+
+    def test_create(self):
+        """
+        Test case for creating the record writer of every output format, and of an output format that does not exist.
+        """
+        self.assertIsInstance(RecordWriter.create('text', self.stream), TextRecordWriter)
+        self.assertIsInstance(RecordWriter.create('json', self.stream), JSONLinesRecordWriter)
+        self.assertIsInstance(RecordWriter.create('csv', self.stream), CSVRecordWriter)
+        self.assertIsInstance(RecordWriter.create('binary', self.stream), BinaryRecordWriter)
+
+        with self.assertRaises(ValueError):
+            RecordWriter.create('xml', self.stream)
+
+    def test_incomplete_record_writer(self):
+        """
+        Test case for a record writer that does not implement write_result, which must not be created.
+        """
+        class IncompleteRecordWriter(RecordWriter):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteRecordWriter(self.stream)  # type: ignore
+
+    def test_text(self):
+        """
+        Test case for the text output format, which must match the answers printed for a single domain name.
+        """
+        self.assertEqual(self.write(TextRecordWriter(self.stream)), b'\nAnswers:'
+                                                                    b'\n  www.ubc.ca 3600   CN ubc.ca'
+                                                                    b'\n  www.ubc.ca 600   A 1.2.3.4'
+                                                                    b'\n'
+                                                                    b'\nnope.ubc.ca: Name Error Message\n')
+
+    def test_json_lines(self):
+        """
+        Test case for the json output format, which must write a line of JSON per result.
+        """
+        lines: List[bytes] = self.write(JSONLinesRecordWriter(self.stream)).splitlines()
+
+        self.assertEqual([json.loads(line) for line in lines], [result.to_dict() for result in self.results])
+
+    def test_csv(self):
+        """
+        Test case for the csv output format, which must write a header row, a row per answer record, and a row per
+        failed name resolution.
+        """
+        self.results.append(ResolutionResult('comma.ubc.ca', 1, error=DNSTimeoutError('Timed out, twice')))
+
+        self.assertEqual(self.write(CSVRecordWriter(self.stream)).decode(),
+                         'domain_name,type,name,ttl,record_type,rdata,error\n'
+                         'www.ubc.ca,A,www.ubc.ca,3600,CN,ubc.ca,\n'
+                         'www.ubc.ca,A,ubc.ca,600,A,1.2.3.4,\n'
+                         'nope.ubc.ca,A,,,,,Name Error Message\n'
+                         'comma.ubc.ca,A,,,,,"Timed out, twice"\n')
+
+    def test_binary(self):
+        """
+        Test case for the binary output format, which must write every result as a length prefixed dns response, whose
+        rcode is that of the error of a failed name resolution.
+        """
+        self.results.append(ResolutionResult('slow.ubc.ca', 28, error=DNSTimeoutError('Timed out')))
+        data: bytes = self.write(BinaryRecordWriter(self.stream))
+
+        responses: List[DNSMessage] = []
+        offset: int = 0
+
+        while offset < len(data):
+            length: int = int.from_bytes(data[offset:offset + 2], 'big')
+            responses.append(DNSMessage.decode_dns_message(data[offset + 2:offset + 2 + length]))
+            offset = offset + 2 + length
+
+        self.assertEqual([response.rcode for response in responses], [0, 3, 2])
+        self.assertEqual([(response.dns_questions[0].name, response.dns_questions[0].type) for response in responses],
+                         [('www.ubc.ca', 1), ('nope.ubc.ca', 1), ('slow.ubc.ca', 28)])
+        self.assertEqual(responses[0].answer_records, self.answers)
+        self.assertEqual(responses[1].answer_records, [])
+
+    def test_compressed_rdata(self):
+        """
+        Test case for MX and PTR records whose rdata was compressed in the response they were decoded from. The binary
+        output must decode back to the same rdata, and the JSON and CSV output must hold it without any pointer.
+        """
+        # question example.com at offset 12, then an MX answer of rdata 10 mail.<pointer to 12> and a PTR answer of
+        # rdata host.<pointer to 12>
+        upstream: DNSMessage = DNSMessage.decode_dns_message(
+            bytes.fromhex('000181800001000200000000') + b'\x07example\x03com\x00\x00\x0f\x00\x01' +
+            b'\xc0\x0c\x00\x0f\x00\x01\x00\x00\x0e\x10\x00\x09\x00\x0a\x04mail\xc0\x0c' +
+            b'\xc0\x0c\x00\x0c\x00\x01\x00\x00\x0e\x10\x00\x07\x04host\xc0\x0c')
+        self.results = [ResolutionResult('a.longer-name.org', 15, answers=upstream.answer_records)]
+        mx_rdata: str = '\\# 20 000a046d61696c076578616d706c6503636f6d00'
+        ptr_rdata: str = '\\# 18 04686f7374076578616d706c6503636f6d00'
+
+        binary: bytes = self.write(BinaryRecordWriter(self.stream))
+        response: DNSMessage = DNSMessage.decode_dns_message(binary[2:])
+
+        self.assertEqual([record.rdata for record in response.answer_records], [mx_rdata, ptr_rdata])
+
+        self.stream = BytesIO()
+        line: bytes = self.write(JSONLinesRecordWriter(self.stream))
+
+        self.assertEqual([answer['rdata'] for answer in json.loads(line)['answers']], [mx_rdata, ptr_rdata])
+
+        self.stream = BytesIO()
+        rows: List[str] = self.write(CSVRecordWriter(self.stream)).decode().splitlines()
+
+        self.assertEqual([row.split(',')[5] for row in rows[1:]], [mx_rdata, ptr_rdata])
@@ -0,0 +1,141 @@
+import inspect
+import sys
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.resolver_core_base import ResolverCoreBase
+from dns_shark.resolution_state import ResolutionState
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_cache import DNSCache
+from dns_shark.resource_record import ResourceRecord
+from test.test_resolver_core import test_name_server_resolution
+from io import BytesIO
+from random import Random
+from typing import List, Tuple
+
+
+class ChainSocket:
+    """
+    A udp socket answering a query for a{i}.example with a cname record pointing to a{i + 1}.example, until the end of
+    the chain, which is answered with an address record.
+    """
+
+    def __init__(self, chain_length: int):
+        self.chain_length: int = chain_length
+        self.last_query: bytes = b''
+        self.last_address: Tuple[str, int] = ('', 0)
+
+    def sendto(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.last_query = data
+        self.last_address = addr
+
+    def settimeout(self, timeout: float) -> None:
+        pass
+
+    def recvfrom_into(self, buffer: bytearray, nbytes: int = 0) -> Tuple[int, Tuple[str, int]]:
+        domain_name: str = DNSMessage.decode_dns_message(BytesIO(self.last_query)).dns_questions[0].name
+        question: bytes = self.last_query[12:12 + len(ChainSocket.encode_domain_name(domain_name)) + 4]
+        index: int = int(domain_name.split('.')[0][1:])
+
+        if index < self.chain_length:
+            rdata: bytes = ChainSocket.encode_domain_name('a' + str(index + 1) + '.example')
+            answer: bytes = bytes.fromhex('c00c000500010000012c') + len(rdata).to_bytes(2, 'big') + rdata
+        else:
+            answer = bytes.fromhex('c00c000100010000012c00040a000001')
+
+        response: bytes = self.last_query[:2] + bytes.fromhex('8400000100010000') + bytes.fromhex('0000') + question + \
+            answer
+
+        buffer[:len(response)] = response
+        return len(response), self.last_address
+
+    @staticmethod
+    def encode_domain_name(domain_name: str) -> bytes:
+        return b''.join(len(label).to_bytes(1, 'big') + label.encode() for label in domain_name.split('.')) + b'\x00'
+
+
+class ResolutionStateTests(unittest.TestCase):
+    """
+    Unit testing for resolution_state.py and the name resolution steps of resolver_core_base.py
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+        fixtures = test_name_server_resolution.NameServerResolutionTest
+        fixtures.setUpClass()
+
+        cls.responses: List[DNSMessage] = [DNSMessage.decode_dns_message(BytesIO(response))
+                                           for response in [fixtures.first_response,
+                                                            fixtures.second_response,
+                                                            fixtures.third_response,
+                                                            fixtures.fourth_response,
+                                                            fixtures.fifth_response,
+                                                            fixtures.sixth_response,
+                                                            fixtures.authoritative_response]]
+
+    def test_suspend_and_resume(self):
+        """
+        Test case for driving a name resolution by hand, which needs the address of a name server to be resolved in
+        between. The name resolution is begun by one resolver core and finished by another sharing its cache.
+        """
+        cache: DNSCache = DNSCache()
+        first_core: ResolverCoreBase = ResolverCoreBase(False, "1.2.3.4", Random(), cache=cache)
+        second_core: ResolverCoreBase = ResolverCoreBase(False, "1.2.3.4", Random(), cache=cache)
+
+        state: ResolutionState = first_core.begin_resolution("www.stanford.edu", "1.2.3.4", 1)
+
+        self.assertEqual(state.current_task.domain_name, "www.stanford.edu")
+        self.assertEqual(state.current_task.dns_server_ips, ["1.2.3.4"])
+
+        for response in self.responses[:3]:
+            first_core.continue_resolution(state, response)
+
+        # the referral lacked glue, so the name server's address is resolved first
+        self.assertEqual(len(state.tasks), 2)
+        self.assertEqual(state.current_task.domain_name, "ns-1234.awsdns-26.org")
+
+        for response in self.responses[3:6]:
+            second_core.continue_resolution(state, response)
+
+        self.assertEqual(len(state.tasks), 1)
+        self.assertEqual(state.current_task.dns_server_ips, ['205.251.196.210'])
+        self.assertFalse(state.done)
+
+        second_core.continue_resolution(state, self.responses[6])
+
+        self.assertTrue(state.done)
+        self.assertEqual(state.answers, [ResourceRecord('www.stanford.edu', 1, 1, 60, 4, '54.218.91.228'),
+                                         ResourceRecord('www.stanford.edu', 1, 1, 60, 4, '52.27.175.139'),
+                                         ResourceRecord('www.stanford.edu', 1, 1, 60, 4, '52.10.247.217')])
+
+    def test_begin_resolution_from_cache(self):
+        """
+        Test case for beginning the name resolution of a cached domain name, which must be done immediately.
+        """
+        core: ResolverCoreBase = ResolverCoreBase(False, "1.2.3.4", Random())
+        records: List[ResourceRecord] = [ResourceRecord('www.stanford.edu', 1, 1, 60, 4, '54.218.91.228')]
+        core.cache.add_answers('www.stanford.edu', 1, records)
+
+        state: ResolutionState = core.begin_resolution("www.stanford.edu", "1.2.3.4", 1)
+
+        self.assertTrue(state.done)
+        self.assertEqual(state.answers, records)
+
+    def test_long_cname_chain_without_recursion(self):
+        """
+        Test case for following a cname chain far longer than the stack depth available to the name resolution.
+        """
+        resolver: ResolverCore = ResolverCore(ChainSocket(300), False, "1.2.3.4", Random(), counter=1000)
+        recursion_limit: int = sys.getrecursionlimit()
+
+        sys.setrecursionlimit(len(inspect.stack()) + 100)
+        try:
+            answers: List[ResourceRecord] = resolver.resolve_domain_name("a0.example", "1.2.3.4", 1)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        self.assertEqual(answers, [ResourceRecord('a300.example', 1, 1, 300, 4, '10.0.0.1')])
+        self.assertEqual(resolver.cache.get_answers('a0.example', 1),
+                         [ResourceRecord('a300.example', 1, 1, 300, 4, '10.0.0.1')])
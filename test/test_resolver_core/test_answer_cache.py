@@ -0,0 +1,83 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.dns_cache import DNSCache
+from test.utilities import Utilities
+from typing import List
+
+
+class AnswerCacheTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+
+        cls.authoritative_response: bytes = bytes.fromhex('19b6840000010001000300030377777702637303756263026361000001'
+                                                          '0001c00c0001000100000e1000048e670605c0100002000100000e1000'
+                                                          '06036e7331c010c0100002000100000e10000a0774656d70313230c010'
+                                                          'c0100002000100000e1000150366733105756772616402637303756263'
+                                                          '02636100c0630001000100000e100004c6a22301c03b0001000100000e'
+                                                          '1000048e670606c04d0001000100000e10000489523d78')
+
+        cls.cname_response: bytes = bytes.fromhex('47e2840000010002000000000766696e616e636506676f6f676c6503636f6d'
+                                                  '0000010001c00c0005000100093a8000090477777733016cc014c03000010001'
+                                                  '0000012c0004d83ac14e')
+
+        cls.cname_authoritative_response: bytes = bytes.fromhex('603c840000010001000000000477777733016c06676f6f676c65'
+                                                                '03636f6d0000010001c00c000100010000012c0004d83ac14e')
+
+    def test_repeated_lookup_answered_from_cache(self):
+        """
+        Test case for resolving the same domain name twice. The second resolution must not send any dns query.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x19b6]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random)
+
+        first_answers: List[ResourceRecord] = resolver.resolve_domain_name("www.cs.ubc.ca", "1.2.3.4", 1)
+        second_answers: List[ResourceRecord] = resolver.resolve_domain_name("www.cs.ubc.ca", "1.2.3.4", 1)
+
+        expected_answer: List[ResourceRecord] = [ResourceRecord('www.cs.ubc.ca', 1, 1, 3600, 4, '142.103.6.5')]
+
+        self.assertEqual(first_answers, expected_answer)
+        self.assertEqual(second_answers, expected_answer)
+        self.assertEqual(mock_socket.sendto.call_count, 1)
+        self.assertEqual(resolver.counter, 29)
+
+    def test_cache_shared_between_resolvers(self):
+        """
+        Test case for a cache that is shared between two resolvers.
+        """
+        cache: DNSCache = DNSCache()
+        mock_socket: Mock = Utilities.mock_socket([self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x19b6]})
+
+        ResolverCore(mock_socket, False, "1.2.3.4", mock_random, cache=cache).resolve_domain_name("www.cs.ubc.ca",
+                                                                                                "1.2.3.4", 1)
+        answers: List[ResourceRecord] = ResolverCore(Mock(), False, "1.2.3.4", Mock(),
+                                                     cache=cache).resolve_domain_name("www.cs.ubc.ca", "1.2.3.4", 1)
+
+        self.assertEqual(answers, [ResourceRecord('www.cs.ubc.ca', 1, 1, 3600, 4, '142.103.6.5')])
+
+    def test_cname_answers_cached_under_requested_name(self):
+        """
+        Test case for confirming answers found by following a cname are cached under the originally requested name,
+        for no longer than the ttl of the cname record.
+        """
+        cache: DNSCache = DNSCache()
+        mock_socket: Mock = Utilities.mock_socket([self.cname_response, self.cname_authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x47e2, 0x603c]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random, cache=cache)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("finance.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(answers, [ResourceRecord('www3.l.google.com', 1, 1, 300, 4, '216.58.193.78')])
+        self.assertEqual(cache.get_answers("finance.google.com", 1), answers)
+        self.assertEqual(cache.get_answers("www3.l.google.com", 1), answers)
@@ -2,6 +2,7 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.resource_record import ResourceRecord
+from test.utilities import Utilities
 from typing import List
 
 
@@ -40,18 +41,18 @@ class CnameAndNameServerResolutionTest(unittest.TestCase):
 
         cls.authoritative_response: bytes = bytes.fromhex('603c840000010001000000000477777733016c06676f6f676c6503636f6d0000010001c00c000100010000012c0004d83ac14e')
 
-        cls.mock_socket: Mock = Mock(**{'recv.side_effect': [cls.first_response,
-                                                             cls.second_response,
-                                                             cls.third_response,
-                                                             cls.fourth_response,
-                                                             cls.fifth_response,
-                                                             cls.sixth_response,
-                                                             cls.seventh_response,
-                                                             cls.eighth_response,
-                                                             cls.ninth_response,
-                                                             cls.tenth_response,
-                                                             cls.eleventh_response,
-                                                             cls.authoritative_response]})
+        cls.mock_socket: Mock = Utilities.mock_socket([cls.first_response,
+                                                       cls.second_response,
+                                                       cls.third_response,
+                                                       cls.fourth_response,
+                                                       cls.fifth_response,
+                                                       cls.sixth_response,
+                                                       cls.seventh_response,
+                                                       cls.eighth_response,
+                                                       cls.ninth_response,
+                                                       cls.tenth_response,
+                                                       cls.eleventh_response,
+                                                       cls.authoritative_response])
 
         cls.mock_random: Mock = Mock(**{'randint.side_effect': [0xef7c, 0xe38a, 0x7d57, 0x7c2f, 0x5aeb, 0x741f, 0x9c5b,
                                                                 0xe78c, 0x47e2, 0x4fa6, 0x599a, 0x603c]})
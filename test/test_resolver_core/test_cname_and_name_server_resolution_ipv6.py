@@ -2,6 +2,7 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.resource_record import ResourceRecord
+from test.utilities import Utilities
 from typing import List
 
 
@@ -40,18 +41,18 @@ class CnameAndNameServerResolutionIpv6Test(unittest.TestCase):
 
         cls.authoritative_response: bytes = bytes.fromhex('5523840000010001000000000477777733016c06676f6f676c6503636f6d00001c0001c00c001c00010000012c00102607f8b0400a0800000000000000200e')
 
-        cls.mock_socket: Mock = Mock(**{'recv.side_effect': [cls.first_response,
-                                                             cls.second_response,
-                                                             cls.third_response,
-                                                             cls.fourth_response,
-                                                             cls.fifth_response,
-                                                             cls.sixth_response,
-                                                             cls.seventh_response,
-                                                             cls.eighth_response,
-                                                             cls.ninth_response,
-                                                             cls.tenth_response,
-                                                             cls.eleventh_response,
-                                                             cls.authoritative_response]})
+        cls.mock_socket: Mock = Utilities.mock_socket([cls.first_response,
+                                                       cls.second_response,
+                                                       cls.third_response,
+                                                       cls.fourth_response,
+                                                       cls.fifth_response,
+                                                       cls.sixth_response,
+                                                       cls.seventh_response,
+                                                       cls.eighth_response,
+                                                       cls.ninth_response,
+                                                       cls.tenth_response,
+                                                       cls.eleventh_response,
+                                                       cls.authoritative_response])
 
         cls.mock_random: Mock = Mock(**{'randint.side_effect': [0x5543, 0x3acc, 0x03dd, 0x721d, 0x119e, 0xe847, 0x0304,
                                                                 0x0566, 0x59bf, 0x55e2, 0xb650, 0x5523]})
@@ -2,6 +2,7 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.resource_record import ResourceRecord
+from test.utilities import Utilities
 from typing import List
 
 
@@ -30,13 +31,13 @@ class CNameResolutionTest(unittest.TestCase):
 
         cls.authoritative_response: bytes = bytes.fromhex('a21c840000010001000400060366747003676e75036f72670000010001c00c000100010000012c0004d076eb14c010000200010000012c0006036e7331c010c010000200010000012c0006036e7332c010c010000200010000012c0006036e7333c010c010000200010000012c0006036e7334c010c039000100010000012c0004d076eba4c039001c00010000012c00102001483001340003000000000000000fc04b000100010000012c00045762fd66c05d000100010000012c00042e2b2546c05d001c00010000012c0010200141c8002002d3000000000000000ac06f000100010000012c0004d0461f7d')
 
-        cls.mock_socket: Mock = Mock(**{'recv.side_effect': [cls.first_response,
-                                                             cls.second_response,
-                                                             cls.third_response,
-                                                             cls.fourth_response,
-                                                             cls.fifth_response,
-                                                             cls.sixth_response,
-                                                             cls.authoritative_response]})
+        cls.mock_socket: Mock = Utilities.mock_socket([cls.first_response,
+                                                       cls.second_response,
+                                                       cls.third_response,
+                                                       cls.fourth_response,
+                                                       cls.fifth_response,
+                                                       cls.sixth_response,
+                                                       cls.authoritative_response])
 
         cls.mock_random: Mock = Mock(**{'randint.side_effect': [0xdc00, 0x990a, 0xb96a, 0x1b4a, 0x7573, 0x3a73, 0xa21c]})
 
@@ -0,0 +1,121 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.dns_cache import DNSCache
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.errors.dns_no_matching_resource_record_error import DNSNoMatchingResourceRecordError
+from test.utilities import Utilities
+from typing import List
+
+
+class DelegationCacheTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+
+        cls.first_response: bytes = bytes.fromhex('0581800000010000000d000e0377777706676f6f676c6503636f6d0000010001c'
+                                                  '017000200010002a300001401610c67746c642d73657276657273036e657400c0'
+                                                  '17000200010002a30000040162c02ec017000200010002a30000040163c02ec01'
+                                                  '7000200010002a30000040164c02ec017000200010002a30000040165c02ec017'
+                                                  '000200010002a30000040166c02ec017000200010002a30000040167c02ec0170'
+                                                  '00200010002a30000040168c02ec017000200010002a30000040169c02ec01700'
+                                                  '0200010002a3000004016ac02ec017000200010002a3000004016bc02ec017000'
+                                                  '200010002a3000004016cc02ec017000200010002a3000004016dc02ec02c0001'
+                                                  '00010002a3000004c005061ec04c000100010002a3000004c0210e1ec05c00010'
+                                                  '0010002a3000004c01a5c1ec06c000100010002a3000004c01f501ec07c000100'
+                                                  '010002a3000004c00c5e1ec08c000100010002a3000004c023331ec09c0001000'
+                                                  '10002a3000004c02a5d1ec0ac000100010002a3000004c036701ec0bc00010001'
+                                                  '0002a3000004c02bac1ec0cc000100010002a3000004c0304f1ec0dc000100010'
+                                                  '002a3000004c034b21ec0ec000100010002a3000004c029a21ec0fc0001000100'
+                                                  '02a3000004c037531ec02c001c00010002a300001020010503a83e00000000000'
+                                                  '000020030')
+
+        cls.second_response: bytes = bytes.fromhex('64eb800000010000000400080377777706676f6f676c6503636f6d0000010001'
+                                                   'c010000200010002a3000006036e7332c010c010000200010002a3000006036e'
+                                                   '7331c010c010000200010002a3000006036e7333c010c010000200010002a300'
+                                                   '0006036e7334c010c02c001c00010002a3000010200148604802003400000000'
+                                                   '0000000ac02c000100010002a3000004d8ef220ac03e001c00010002a3000010'
+                                                   '2001486048020032000000000000000ac03e000100010002a3000004d8ef200a'
+                                                   'c050001c00010002a30000102001486048020036000000000000000ac0500001'
+                                                   '00010002a3000004d8ef240ac062001c00010002a30000102001486048020038'
+                                                   '000000000000000ac062000100010002a3000004d8ef260a')
+
+        cls.authoritative_response: bytes = bytes.fromhex('0a7b840000010001000000000377777706676f6f676c6503636f6d000'
+                                                          '0010001c00c000100010000012c0004acd90ec4')
+
+        cls.authoritative_response_ipv6: bytes = bytes.fromhex('c98f840000010001000000000377777706676f6f676c6503636f'
+                                                               '6d00001c0001c00c001c00010000012c00102607f8b0400a0803'
+                                                               '0000000000002004')
+
+    def test_second_resolution_starts_at_closest_zone_cut(self):
+        """
+        Test case for resolving a second record of a domain name in an already delegated zone. The second resolution
+        must skip the root and com name servers and query a google.com name server directly.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.first_response,
+                                                   self.second_response,
+                                                   self.authoritative_response,
+                                                   self.authoritative_response_ipv6])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x0581, 0x64eb, 0x0a7b, 0xc98f]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random)
+
+        resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 28)
+
+        expected_answer: List[ResourceRecord] = [ResourceRecord('www.google.com', 28, 1, 300, 16,
+                                                                '2607:f8b0:400a:803::2004')]
+
+        self.assertEqual(answers, expected_answer)
+        self.assertEqual(mock_socket.sendto.call_count, 4)
+        self.assertEqual(mock_socket.sendto.call_args[0][1], ('216.239.34.10', 53))
+
+    def test_referral_outside_of_requested_domain_not_cached(self):
+        """
+        Test case for a referral whose zone does not enclose the requested domain name, which must not be cached.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.second_response, self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x0a7b]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random)
+        self.assertRaises(DNSNoMatchingResourceRecordError, resolver.resolve_domain_name, "www.cs.ubc.ca", "1.2.3.4", 1)
+        self.assertEqual(len(resolver.cache.delegations), 0)
+
+    def test_upward_referral_not_cached(self):
+        """
+        Test case for a name server of evil.com answering with a referral to the com zone, which lies above its own
+        zone cut. The referral must not replace the cached delegation of com, so that www.google.com still begins at
+        the com name servers.
+        """
+        cache: DNSCache = DNSCache()
+        cache.add_delegation('com', [ResourceRecord('com', 2, 1, 172800, 0, 'a.servers.com')],
+                             [ResourceRecord('a.servers.com', 1, 1, 172800, 4, '192.5.6.30')])
+        cache.add_delegation('evil.com', [ResourceRecord('evil.com', 2, 1, 3600, 0, 'ns.evil.com')],
+                             [ResourceRecord('ns.evil.com', 1, 1, 3600, 4, '10.0.0.1')])
+
+        upward_referral: bytes = DNSMessage(0x1111, True, 0, False, False, False, False, 0, 1, 0, 1, 1,
+                                            [DNSQuestion('www.evil.com', 1, 1)], [],
+                                            [ResourceRecord('com', 2, 1, 999999, 0, 'ns.evil.com')],
+                                            [ResourceRecord('ns.evil.com', 1, 1, 999999, 4, '6.6.6.6')]).encode()
+        authoritative_response: bytes = DNSMessage(0x2222, True, 0, True, False, False, False, 0, 1, 1, 0, 0,
+                                                   [DNSQuestion('www.evil.com', 1, 1)],
+                                                   [ResourceRecord('www.evil.com', 1, 1, 300, 4, '6.6.6.7')],
+                                                   [], []).encode()
+
+        mock_socket: Mock = Utilities.mock_socket([upward_referral, authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111, 0x2222]})
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "198.41.0.4", mock_random, cache=cache)
+
+        resolver.resolve_domain_name("www.evil.com", "198.41.0.4", 1)
+
+        self.assertEqual(mock_socket.sendto.call_args_list[0][0][1], ('10.0.0.1', 53))
+        self.assertEqual(cache.get_closest_zone_cut("www.google.com"), ('com', ['192.5.6.30']))
+        self.assertEqual(resolver._find_closest_dns_servers("www.google.com"), ('com', ['192.5.6.30', '198.41.0.4']))
@@ -2,6 +2,7 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.errors.dns_refused_error import DNSRefusedError
+from test.utilities import Utilities
 
 
 class DNSRefusedErrorTest(unittest.TestCase):
@@ -21,7 +22,7 @@ class DNSRefusedErrorTest(unittest.TestCase):
                                                           '02636100c0630001000100000e100004c6a22301c03b0001000100000e'
                                                           '1000048e670606c04d0001000100000e10000489523d78')
 
-        cls.mock_socket: Mock = Mock(**{'recv.return_value': cls.response_with_refused_error})
+        cls.mock_socket: Mock = Utilities.mock_socket(cls.response_with_refused_error)
 
         cls.mock_random: Mock = Mock(**{'randint.return_value': 6582})
 
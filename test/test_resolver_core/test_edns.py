@@ -0,0 +1,91 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.resource_record import ResourceRecord
+from test.utilities import Utilities
+from typing import List
+
+
+class EDNSTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+        cls.answers: List[ResourceRecord] = [ResourceRecord('www.google.com', 1, 1, 300, 4, '10.0.' + str(index) + '.1')
+                                             for index in range(100)]
+
+        cls.large_response: bytes = DNSMessage(0x1111, True, 0, True, False, False, False, 0, 1, 100, 0, 0,
+                                               [DNSQuestion('www.google.com', 1, 1)], cls.answers, [], []).encode()
+
+    def test_large_response_received_whole(self):
+        """
+        Test case for a udp response larger than 1024 bytes, to a query advertising a large enough udp payload size.
+        The response must be received whole into the receive buffer.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.large_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random, udp_payload_size=4096)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertGreater(len(self.large_response), 1024)
+        self.assertEqual(answers, self.answers)
+        self.assertEqual(len(resolver.receive_buffer), 4096)
+        self.assertEqual(DNSMessage.decode_dns_message(mock_socket.sendto.call_args[0][0]).udp_payload_size, 4096)
+
+    def test_query_without_edns(self):
+        """
+        Test case for a resolver without a udp payload size, whose queries must carry no OPT record, and whose receive
+        buffer must hold a udp response of 512 bytes.
+        """
+        small_response: bytes = DNSMessage(0x1111, True, 0, True, False, False, False, 0, 1, 2, 0, 0,
+                                           [DNSQuestion('www.google.com', 1, 1)], self.answers[:2], [], []).encode()
+        mock_socket: Mock = Utilities.mock_socket([small_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random, udp_payload_size=None)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        query: DNSMessage = DNSMessage.decode_dns_message(mock_socket.sendto.call_args[0][0])
+
+        self.assertEqual(answers, self.answers[:2])
+        self.assertEqual(len(resolver.receive_buffer), 512)
+        self.assertEqual(query.additional_count, 0)
+        self.assertIsNone(query.udp_payload_size)
+
+    def test_format_error_retried_without_edns(self):
+        """
+        Test case for a name server that answers a query with an OPT record with a format error, without an OPT record
+        of its own. The query must be retried once without EDNS0, and later queries to the name server must be sent
+        without EDNS0 to begin with.
+        """
+        small_response: bytes = DNSMessage(0x2222, True, 0, True, False, False, False, 0, 1, 2, 0, 0,
+                                           [DNSQuestion('www.google.com', 1, 1)], self.answers[:2], [], []).encode()
+        format_error: bytes = DNSMessage(0x1111, True, 0, False, False, False, False, 1, 1, 0, 0, 0,
+                                         [DNSQuestion('www.google.com', 1, 1)], [], [], []).encode()
+        mock_socket: Mock = Utilities.mock_socket([format_error, small_response, small_response[:1] + b'\x33' +
+                                                   small_response[2:]])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111, 0x2222, 0x2233]})
+        infrastructure_cache: InfrastructureCache = InfrastructureCache(exploration=0.0)
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random,
+                                              infrastructure_cache=infrastructure_cache)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        resolver.cache.clear()
+        resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        queries: List[DNSMessage] = [DNSMessage.decode_dns_message(call[0][0])
+                                     for call in mock_socket.sendto.call_args_list]
+
+        self.assertEqual(answers, self.answers[:2])
+        self.assertEqual([query.udp_payload_size for query in queries], [1232, None, None])
+        self.assertFalse(infrastructure_cache.supports_edns("1.2.3.4"))
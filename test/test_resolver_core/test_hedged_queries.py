@@ -0,0 +1,91 @@
+from unittest.mock import Mock
+import socket
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+from test.utilities import Utilities
+from typing import List
+
+
+class HedgedQueriesTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+
+        cls.referral: bytes = bytes.fromhex('64eb800000010000000400080377777706676f6f676c6503636f6d0000010001c010000200'
+                                            '010002a3000006036e7332c010c010000200010002a3000006036e7331c010c01000020001'
+                                            '0002a3000006036e7333c010c010000200010002a3000006036e7334c010c02c001c000100'
+                                            '02a30000102001486048020034000000000000000ac02c000100010002a3000004d8ef220a'
+                                            'c03e001c00010002a30000102001486048020032000000000000000ac03e00010001000'
+                                            '2a3000004d8ef200ac050001c00010002a30000102001486048020036000000000000000a'
+                                            'c050000100010002a3000004d8ef240ac062001c00010002a3000010200148604802003800'
+                                            '0000000000000ac062000100010002a3000004d8ef260a')
+
+        cls.authoritative_response: bytes = bytes.fromhex('0a7b840000010001000000000377777706676f6f676c6503636f6d000'
+                                                          '0010001c00c000100010000012c0004acd90ec4')
+
+    def test_hedge_after_hedge_delay(self):
+        """
+        Test case for a slow name server while hedging. The query must be sent to the next name server of the referral
+        once the hedge delay elapses, well before the timeout, and the winning round trip time must be sampled.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.referral, socket.timeout(), self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b]})
+        round_trip_times: RoundTripTimeEstimator = RoundTripTimeEstimator(initial_delay=0.25)
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random, timeout=2.0, hedge=True,
+                                              round_trip_times=round_trip_times)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        timeouts: List[float] = [call[0][0] for call in mock_socket.settimeout.call_args_list]
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual([call[0][1] for call in mock_socket.sendto.call_args_list],
+                         [('1.2.3.4', 53), ('216.239.34.10', 53), ('216.239.32.10', 53)])
+
+        # only the root server was waited on for the full timeout, since it was the only candidate
+        self.assertTrue(1.0 < timeouts[0] <= 2.0)
+        self.assertTrue(timeouts[1] <= 0.25)
+        self.assertIsNotNone(round_trip_times.smoothed_round_trip_time)
+
+    def test_late_response_after_hedge_delay_is_not_a_timeout(self):
+        """
+        Test case for a name server that responds later than its hedge delay, but before its timeout. Its response must
+        win, and the name server must not be recorded as having timed out, only the round trip time of its response.
+        """
+        late_response: bytes = bytes.fromhex('1111') + self.authoritative_response[2:]
+        mock_socket: Mock = Utilities.mock_socket([self.referral, socket.timeout(), late_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b]})
+        infrastructure_cache: InfrastructureCache = InfrastructureCache(exploration=0.0)
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random, timeout=2.0, hedge=True,
+                                              round_trip_times=RoundTripTimeEstimator(initial_delay=0.25),
+                                              infrastructure_cache=infrastructure_cache)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual(infrastructure_cache.servers['216.239.34.10'].timeouts, 0)
+        self.assertIsNotNone(infrastructure_cache.servers['216.239.34.10'].round_trip_times.smoothed_round_trip_time)
+        self.assertNotIn('216.239.32.10', infrastructure_cache.servers)
+
+    def test_no_hedge_by_default(self):
+        """
+        Test case for a slow name server without hedging, which must be waited on for the full timeout.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.referral, socket.timeout(), self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random, timeout=2.0)
+        resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        timeouts: List[float] = [call[0][0] for call in mock_socket.settimeout.call_args_list]
+
+        self.assertTrue(1.0 < timeouts[1] <= 2.0)
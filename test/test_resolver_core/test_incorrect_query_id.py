@@ -2,7 +2,8 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.resource_record import ResourceRecord
-from typing import List
+from test.utilities import Utilities
+from typing import List, Tuple
 
 
 class IncorrectQueryIdTest(unittest.TestCase):
@@ -33,7 +34,7 @@ class IncorrectQueryIdTest(unittest.TestCase):
                                                           '02636100c0630001000100000e100004c6a22301c03b0001000100000e'
                                                           '1000048e670606c04d0001000100000e10000489523d78')
 
-        cls.mock_socket: Mock = Mock(**{'recv.side_effect': [cls.incorrect_response, cls.authoritative_response]})
+        cls.mock_socket: Mock = Utilities.mock_socket([cls.incorrect_response, cls.authoritative_response])
 
         cls.mock_random: Mock = Mock(**{'randint.side_effect': [0x19b6]})
 
@@ -50,3 +51,26 @@ class IncorrectQueryIdTest(unittest.TestCase):
 
         self.assertEqual(answers, expected_answer)
 
+    def test_correct_query_id_from_other_address(self):
+        """
+        Test case for when a response with the query id of the previously sent message is received from an address the
+        message was not sent to, e.g. spoofed by another host. The resolver must discard it, and wait for the response
+        of the dns server the message was sent to.
+        """
+        spoofed_response: bytes = self.authoritative_response.replace(bytes([142, 103, 6, 5]), bytes([6, 6, 6, 6]))
+        received: List[Tuple[bytes, Tuple[str, int]]] = [(spoofed_response, ('6.6.6.6', 53)),
+                                                         (spoofed_response, ('1.2.3.4', 5353)),
+                                                         (self.authoritative_response, ('1.2.3.4', 53))]
+
+        def recvfrom_into(buffer: bytearray, nbytes: int = 0) -> Tuple[int, Tuple[str, int]]:
+            response, address = received.pop(0)
+            buffer[:len(response)] = response
+            return len(response), address
+
+        mock_socket: Mock = Mock(**{'recvfrom_into.side_effect': recvfrom_into})
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", Mock(**{'randint.side_effect': [0x19b6]}))
+
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.cs.ubc.ca", "1.2.3.4", 1)
+
+        self.assertEqual(answers, [ResourceRecord('www.cs.ubc.ca', 1, 1, 3600, 4, '142.103.6.5')])
+        self.assertEqual(received, [])
@@ -2,6 +2,7 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.resource_record import ResourceRecord
+from test.utilities import Utilities
 from typing import List
 
 
@@ -20,7 +21,7 @@ class MatchingAuthoritativeResponseTest(unittest.TestCase):
                                                           '01c0001c00c001c00010000012c00102607f8b0400a08000000000000'
                                                           '002004')
 
-        cls.mock_socket: Mock = Mock(**{'recv.return_value': cls.authoritative_response})
+        cls.mock_socket: Mock = Utilities.mock_socket(cls.authoritative_response)
 
         cls.mock_random: Mock = Mock(**{'randint.return_value': 0x5c00})
 
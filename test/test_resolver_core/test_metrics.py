@@ -0,0 +1,67 @@
+from unittest.mock import Mock
+import socket
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.metrics import MetricsRegistry
+from dns_shark.dns_cache import DNSCache
+from dns_shark.errors.dns_timeout_error import DNSTimeoutError
+from test.test_resolver_core import test_timeout_and_retransmission
+from test.utilities import Utilities
+
+
+class MetricsTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        test_timeout_and_retransmission.TimeoutAndRetransmissionTest.setUpClass()
+        self.responses = test_timeout_and_retransmission.TimeoutAndRetransmissionTest
+        self.metrics: MetricsRegistry = MetricsRegistry()
+
+    def test_metrics_of_name_resolution(self):
+        """
+        Test case for a name resolution whose second dns query is retransmitted to the next name server, followed by a
+        name resolution answered from the cache. Every query, response and cache lookup must be counted.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.responses.referral, socket.timeout(),
+                                                   self.responses.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b]})
+        cache: DNSCache = DNSCache()
+
+        for _ in range(2):
+            ResolverCore(mock_socket, False, "1.2.3.4", mock_random, cache=cache,
+                         metrics=self.metrics).resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(self.metrics.queries_sent.values, {('1.2.3.4', 'udp'): 1,
+                                                            ('216.239.34.10', 'udp'): 1,
+                                                            ('216.239.32.10', 'udp'): 1})
+        self.assertEqual(self.metrics.retransmissions.get(), 1)
+        self.assertEqual(self.metrics.responses.values, {('0',): 2})
+        self.assertEqual(self.metrics.cache_misses.get(), 2)
+        self.assertEqual(self.metrics.cache_hits.get(), 1)
+        self.assertEqual(self.metrics.hop_latency.count, 2)
+        self.assertEqual(self.metrics.resolution_latency.count, 2)
+        self.assertEqual(self.metrics.errors.values, {})
+
+    def test_metrics_of_failed_name_resolution(self):
+        """
+        Test case for a name resolution that times out, which must be counted by its error.
+        """
+        mock_socket: Mock = Utilities.mock_socket(socket.timeout())
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111, 0x2222, 0x3333]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random, timeout=0.01, retries=2,
+                                              metrics=self.metrics)
+
+        with self.assertRaises(DNSTimeoutError):
+            resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(self.metrics.queries_sent.get('1.2.3.4', 'udp'), 3)
+        self.assertEqual(self.metrics.retransmissions.get(), 2)
+        self.assertEqual(self.metrics.responses.values, {})
+        self.assertEqual(self.metrics.errors.values, {('DNSTimeoutError',): 1})
+        self.assertEqual(self.metrics.resolution_latency.count, 1)
@@ -2,6 +2,7 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.resource_record import ResourceRecord
+from test.utilities import Utilities
 from typing import List
 
 
@@ -30,13 +31,13 @@ class NameServerResolutionTest(unittest.TestCase):
 
         cls.authoritative_response: bytes = bytes.fromhex('54848400000100030004000003777777087374616e666f7264036564750000010001c00c000100010000003c000436da5be4c00c000100010000003c0004341baf8bc00c000100010000003c0004340af7d9c00c000200010002a3000017076e732d3132333409617773646e732d3236036f726700c00c000200010002a3000019076e732d3230323709617773646e732d363102636f02756b00c00c000200010002a3000016066e732d33303909617773646e732d333803636f6d00c00c000200010002a3000016066e732d35313409617773646e732d3030036e657400')
 
-        cls.mock_socket: Mock = Mock(**{'recv.side_effect': [cls.first_response,
-                                                             cls.second_response,
-                                                             cls.third_response,
-                                                             cls.fourth_response,
-                                                             cls.fifth_response,
-                                                             cls.sixth_response,
-                                                             cls.authoritative_response]})
+        cls.mock_socket: Mock = Utilities.mock_socket([cls.first_response,
+                                                       cls.second_response,
+                                                       cls.third_response,
+                                                       cls.fourth_response,
+                                                       cls.fifth_response,
+                                                       cls.sixth_response,
+                                                       cls.authoritative_response])
 
         cls.mock_random: Mock = Mock(**{'randint.side_effect': [0xb21e, 0x094b, 0x5605, 0xa40a, 0xc7e2, 0xf683, 0x5484]})
 
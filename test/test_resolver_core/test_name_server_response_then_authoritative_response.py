@@ -2,6 +2,7 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.resource_record import ResourceRecord
+from test.utilities import Utilities
 from typing import List
 
 
@@ -46,9 +47,9 @@ class NameServerResponseThenAuthoritativeResponseTest(unittest.TestCase):
         cls.authoritative_response: bytes = bytes.fromhex('0a7b840000010001000000000377777706676f6f676c6503636f6d000'
                                                           '0010001c00c000100010000012c0004acd90ec4')
 
-        cls.mock_socket: Mock = Mock(**{'recv.side_effect': [cls.first_response,
-                                                             cls.second_response,
-                                                             cls.authoritative_response]})
+        cls.mock_socket: Mock = Utilities.mock_socket([cls.first_response,
+                                                       cls.second_response,
+                                                       cls.authoritative_response])
 
         cls.mock_random: Mock = Mock(**{'randint.side_effect': [0x0581, 0x64eb, 0x0a7b]})
 
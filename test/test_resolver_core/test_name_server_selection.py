@@ -0,0 +1,72 @@
+from unittest.mock import Mock
+import socket
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.infrastructure_cache import InfrastructureCache
+from dns_shark.resource_record import ResourceRecord
+from test.utilities import Utilities
+from typing import List
+
+
+class NameServerSelectionTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+
+        cls.referral: bytes = bytes.fromhex('64eb800000010000000400080377777706676f6f676c6503636f6d0000010001c010000200'
+                                            '010002a3000006036e7332c010c010000200010002a3000006036e7331c010c01000020001'
+                                            '0002a3000006036e7333c010c010000200010002a3000006036e7334c010c02c001c000100'
+                                            '02a30000102001486048020034000000000000000ac02c000100010002a3000004d8ef220a'
+                                            'c03e001c00010002a30000102001486048020032000000000000000ac03e00010001000'
+                                            '2a3000004d8ef200ac050001c00010002a30000102001486048020036000000000000000a'
+                                            'c050000100010002a3000004d8ef240ac062001c00010002a3000010200148604802003800'
+                                            '0000000000000ac062000100010002a3000004d8ef260a')
+
+        cls.authoritative_response: bytes = bytes.fromhex('0a7b840000010001000000000377777706676f6f676c6503636f6d000'
+                                                          '0010001c00c000100010000012c0004acd90ec4')
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.infrastructure_cache: InfrastructureCache = InfrastructureCache(exploration=0.0)
+
+    def test_fastest_name_server_queried_first(self):
+        """
+        Test case for a referral whose last listed name server is known to be the fastest, which must be queried first.
+        """
+        self.infrastructure_cache.add_round_trip_time('216.239.38.10', 0.01)
+
+        mock_socket: Mock = Utilities.mock_socket([self.referral, self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x0a7b]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random,
+                                              infrastructure_cache=self.infrastructure_cache)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(answers, [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')])
+        self.assertEqual(mock_socket.sendto.call_args[0][1], ('216.239.38.10', 53))
+
+    def test_round_trip_times_and_timeouts_recorded(self):
+        """
+        Test case for a name resolution in which a name server timed out, which must be recorded along with the round
+        trip times of the name servers that responded.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.referral, socket.timeout(), self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random,
+                                              infrastructure_cache=self.infrastructure_cache)
+        resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(self.infrastructure_cache.servers['216.239.34.10'].timeouts, 1)
+        self.assertIsNotNone(self.infrastructure_cache.servers['1.2.3.4'].round_trip_times.smoothed_round_trip_time)
+        self.assertEqual(self.infrastructure_cache.servers['216.239.32.10'].timeouts, 0)
+        self.assertTrue(self.infrastructure_cache.get_expected_latency('216.239.32.10') <
+                        self.infrastructure_cache.get_expected_latency('216.239.34.10'))
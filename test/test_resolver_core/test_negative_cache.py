@@ -0,0 +1,54 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_no_matching_resource_record_error import DNSNoMatchingResourceRecordError
+from test.utilities import Utilities
+
+
+class NegativeCacheTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+        cls.name_error_response: bytes = bytes.fromhex('123484030001000000010000046e6f7065037562630263610000010001c011'
+                                                       '0006000100000e100027036e7331c0110a686f73746d6173746572c01100'
+                                                       '00000100001c2000000e1000093a800000012c')
+
+        cls.no_data_response: bytes = bytes.fromhex('123484000001000000010000046e6f70650375626302636100001c0001c011'
+                                                    '0006000100000e100027036e7331c0110a686f73746d6173746572c01100'
+                                                    '00000100001c2000000e1000093a800000012c')
+
+    def test_name_error_cached(self):
+        """
+        Test case for resolving a domain name that does not exist twice, as well as a domain name below it. Only the
+        first resolution may send a dns query.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.name_error_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1234]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random)
+
+        self.assertRaises(DNSNameError, resolver.resolve_domain_name, "nope.ubc.ca", "1.2.3.4", 1)
+        self.assertRaises(DNSNameError, resolver.resolve_domain_name, "nope.ubc.ca", "1.2.3.4", 28)
+        self.assertRaises(DNSNameError, resolver.resolve_domain_name, "www.nope.ubc.ca", "1.2.3.4", 1)
+        self.assertEqual(mock_socket.sendto.call_count, 1)
+
+    def test_no_data_cached(self):
+        """
+        Test case for resolving a domain name without records of the requested type twice. Only the first resolution
+        may send a dns query.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.no_data_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1234]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random)
+
+        self.assertRaises(DNSNoMatchingResourceRecordError, resolver.resolve_domain_name, "nope.ubc.ca", "1.2.3.4", 28)
+        self.assertRaises(DNSNoMatchingResourceRecordError, resolver.resolve_domain_name, "nope.ubc.ca", "1.2.3.4", 28)
+        self.assertEqual(mock_socket.sendto.call_count, 1)
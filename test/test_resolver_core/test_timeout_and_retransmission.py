@@ -0,0 +1,85 @@
+from unittest.mock import Mock
+import socket
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.errors.dns_timeout_error import DNSTimeoutError
+from test.utilities import Utilities
+from typing import List
+
+
+class TimeoutAndRetransmissionTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+
+        cls.referral: bytes = bytes.fromhex('64eb800000010000000400080377777706676f6f676c6503636f6d0000010001c010000200'
+                                            '010002a3000006036e7332c010c010000200010002a3000006036e7331c010c01000020001'
+                                            '0002a3000006036e7333c010c010000200010002a3000006036e7334c010c02c001c000100'
+                                            '02a30000102001486048020034000000000000000ac02c000100010002a3000004d8ef220a'
+                                            'c03e001c00010002a30000102001486048020032000000000000000ac03e00010001000'
+                                            '2a3000004d8ef200ac050001c00010002a30000102001486048020036000000000000000a'
+                                            'c050000100010002a3000004d8ef240ac062001c00010002a3000010200148604802003800'
+                                            '0000000000000ac062000100010002a3000004d8ef260a')
+
+        cls.authoritative_response: bytes = bytes.fromhex('0a7b840000010001000000000377777706676f6f676c6503636f6d000'
+                                                          '0010001c00c000100010000012c0004acd90ec4')
+
+        cls.expected_answers: List[ResourceRecord] = [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')]
+
+    def test_fallback_to_next_name_server(self):
+        """
+        Test case for a referral whose first name server does not respond. The query must be sent to the next name
+        server of the referral, and count only once against the resolver's counter.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.referral, socket.timeout(), self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x1111, 0x0a7b]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(answers, self.expected_answers)
+        self.assertEqual([call[0][1] for call in mock_socket.sendto.call_args_list],
+                         [('1.2.3.4', 53), ('216.239.34.10', 53), ('216.239.32.10', 53)])
+        self.assertEqual(resolver.counter, 28)
+
+    def test_late_response_to_earlier_transmission_accepted(self):
+        """
+        Test case for a response from the first name server that arrives only after the query was sent to the next name
+        server. The late response must be accepted.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.referral, socket.timeout(), self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x64eb, 0x0a7b, 0x1111]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random)
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(answers, self.expected_answers)
+        self.assertEqual(mock_socket.sendto.call_count, 3)
+
+    def test_exponential_backoff_then_timeout_error(self):
+        """
+        Test case for a dns server that never responds. The query must be retransmitted with a doubling timeout until
+        the retries are exhausted, and then fail.
+        """
+        mock_socket: Mock = Utilities.mock_socket(socket.timeout())
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111, 0x2222, 0x3333]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random, timeout=1.0, retries=2)
+
+        with self.assertRaises(DNSTimeoutError):
+            resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        timeouts: List[float] = [call[0][0] for call in mock_socket.settimeout.call_args_list]
+
+        self.assertEqual(mock_socket.sendto.call_count, 3)
+        self.assertEqual(len(timeouts), 3)
+        self.assertTrue(0.5 < timeouts[0] <= 1.0)
+        self.assertTrue(1.0 < timeouts[1] <= 2.0)
+        self.assertTrue(2.0 < timeouts[2] <= 4.0)
@@ -0,0 +1,122 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.dns_message import DNSMessage
+from dns_shark.dns_question import DNSQuestion
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.tracer import Tracer
+from dns_shark.errors.dns_name_error import DNSNameError
+from dns_shark.errors.dns_shark_error import DNSSharkError
+from test.test_resolver_core import test_cname_resolution
+from test.utilities import Utilities
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Any, List, Tuple
+
+
+class RecordingTracer(Tracer):
+    """
+    A tracer that records the name and arguments of every event, and the timestamps of the events separately.
+    """
+
+    def __init__(self):
+        self.events: List[Tuple[Any, ...]] = []
+        self.timestamps: List[float] = []
+
+    def query_sent(self, timestamp: float, dns_question: DNSQuestion, query_id: int, dns_server_ip: str,
+                   over_tcp: bool) -> None:
+        self.timestamps.append(timestamp)
+        self.events.append(('query_sent', dns_question.name, dns_question.type, query_id, dns_server_ip, over_tcp))
+
+    def response_received(self, timestamp: float, dns_response: DNSMessage, dns_server_ip: str,
+                          round_trip_time: float) -> None:
+        self.timestamps.append(timestamp)
+        self.events.append(('response_received', dns_response.query_id, dns_server_ip))
+
+    def referral_followed(self, timestamp: float, domain_name: str, dns_response: DNSMessage,
+                          name_server_ips: List[str]) -> None:
+        self.timestamps.append(timestamp)
+        self.events.append(('referral_followed', domain_name, len(name_server_ips)))
+
+    def cname_followed(self, timestamp: float, domain_name: str, cname_resource_record: ResourceRecord) -> None:
+        self.timestamps.append(timestamp)
+        self.events.append(('cname_followed', domain_name, cname_resource_record.rdata))
+
+    def error_raised(self, timestamp: float, domain_name: str, error: DNSSharkError) -> None:
+        self.timestamps.append(timestamp)
+        self.events.append(('error_raised', domain_name, type(error)))
+
+
+class TracerTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        test_cname_resolution.CNameResolutionTest.setUpClass()
+        self.cname_resolution = test_cname_resolution.CNameResolutionTest
+        self.tracer: RecordingTracer = RecordingTracer()
+
+    def test_events_of_cname_resolution(self):
+        """
+        Test case for a name resolution that follows referrals and a cname record. Every event must reach the tracer, in
+        the order it happened.
+        """
+        resolver: ResolverCore = ResolverCore(self.cname_resolution.mock_socket, False, "1.2.3.4",
+                                              self.cname_resolution.mock_random, tracer=self.tracer)
+
+        resolver.resolve_domain_name("prep.ai.mit.edu", "1.2.3.4", 1)
+
+        self.assertEqual(self.tracer.events[:3], [('query_sent', 'prep.ai.mit.edu', 1, 0xdc00, '1.2.3.4', False),
+                                                  ('response_received', 0xdc00, '1.2.3.4'),
+                                                  ('referral_followed', 'prep.ai.mit.edu', 6)])
+        self.assertEqual(self.tracer.events[10:13], [('response_received', 0x1b4a, '128.30.2.123'),
+                                                     ('cname_followed', 'prep.ai.mit.edu', 'ftp.gnu.org'),
+                                                     ('query_sent', 'ftp.gnu.org', 1, 0x7573, '1.2.3.4', False)])
+        self.assertEqual([event[0] for event in self.tracer.events].count('query_sent'), 7)
+        self.assertEqual([event[0] for event in self.tracer.events].count('referral_followed'), 5)
+        self.assertEqual(self.tracer.events[-1], ('response_received', 0xa21c, '208.118.235.164'))
+        self.assertEqual(self.tracer.timestamps, sorted(self.tracer.timestamps))
+
+    def test_error_event(self):
+        """
+        Test case for a name resolution that fails, whose error must reach the tracer before it is raised.
+        """
+        response_with_name_error: bytes = bytes.fromhex('19b684030001000000000000037777770263730375626302636100'
+                                                        '00010001')
+        resolver: ResolverCore = ResolverCore(Utilities.mock_socket([response_with_name_error]), False, "1.2.3.4",
+                                              Mock(**{'randint.return_value': 0x19b6}), tracer=self.tracer)
+
+        with self.assertRaises(DNSNameError):
+            resolver.resolve_domain_name("www.cs.ubc.ca", "1.2.3.4", 1)
+
+        self.assertEqual(self.tracer.events, [('query_sent', 'www.cs.ubc.ca', 1, 0x19b6, '1.2.3.4', False),
+                                              ('response_received', 0x19b6, '1.2.3.4'),
+                                              ('error_raised', 'www.cs.ubc.ca', DNSNameError)])
+
+    def test_verbose_resolver_with_tracer(self):
+        """
+        Test case for a verbose resolver given a tracer of its own, which must trace with that tracer instead of
+        printing.
+        """
+        resolver: ResolverCore = ResolverCore(self.cname_resolution.mock_socket, True, "1.2.3.4",
+                                              self.cname_resolution.mock_random, tracer=self.tracer)
+        buffer: StringIO = StringIO()
+
+        with redirect_stdout(buffer):
+            resolver.resolve_domain_name("prep.ai.mit.edu", "1.2.3.4", 1)
+
+        self.assertEqual(buffer.getvalue(), '')
+        self.assertEqual(len(self.tracer.events), 20)
+
+    def test_no_tracer(self):
+        """
+        Test case for a resolver that is not verbose and has no tracer.
+        """
+        resolver: ResolverCore = ResolverCore(self.cname_resolution.mock_socket, False, "1.2.3.4",
+                                              self.cname_resolution.mock_random)
+
+        self.assertIsNone(resolver.tracer)
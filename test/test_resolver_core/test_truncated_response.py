@@ -0,0 +1,115 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.resolver_core import ResolverCore
+from dns_shark.resource_record import ResourceRecord
+from dns_shark.tcp_connection_pool import TCPConnectionPool
+from test.utilities import Utilities
+from test.test_tcp_connection_pool import FakeConnection
+from typing import List, Tuple
+
+
+class TruncatedResponseTest(unittest.TestCase):
+    """
+    Unit testing for resolver_core.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initialize test values used in the tests.
+        """
+        cls.truncated_response: bytes = bytes.fromhex('1111860000010000000000000377777706676f6f676c6503636f6d0000010001')
+
+        cls.authoritative_response: bytes = bytes.fromhex('0a7b840000010001000000000377777706676f6f676c6503636f6d000'
+                                                          '0010001c00c000100010000012c0004acd90ec4')
+
+        cls.expected_answers: List[ResourceRecord] = [ResourceRecord('www.google.com', 1, 1, 300, 4, '172.217.14.196')]
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.tcp_response: bytes = bytes.fromhex('2222840000010001000000000377777706676f6f676c6503636f6d000'
+                                                 '0010001c00c000100010000012c0004acd90ec4')
+        self.connections: List[FakeConnection] = []
+        self.addresses: List[Tuple[str, int]] = []
+
+    def connect(self, address: Tuple[str, int], timeout: float) -> FakeConnection:
+        self.addresses.append(address)
+        connection: FakeConnection = FakeConnection([self.tcp_response])
+        self.connections.append(connection)
+        return connection
+
+    def test_truncated_response_retried_over_tcp(self):
+        """
+        Test case for a truncated udp response. The query must be retried over tcp to the same dns server, and the tcp
+        response used instead.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.truncated_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111, 0x2222]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random,
+                                              tcp_connections=TCPConnectionPool(connection_factory=self.connect))
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(answers, self.expected_answers)
+        self.assertEqual(self.addresses, [('1.2.3.4', 53)])
+        self.assertEqual(self.connections[0].sent[0][4:], mock_socket.sendto.call_args[0][0][2:])
+        self.assertEqual(resolver.counter, 29)
+
+    def test_tcp_connection_reused(self):
+        """
+        Test case for two name resolutions whose udp responses are truncated, sharing a pool of tcp connections. The
+        second name resolution must reuse the tcp connection of the first.
+        """
+        tcp_connections: TCPConnectionPool = TCPConnectionPool(connection_factory=self.connect)
+
+        for query_id in (0x1111, 0x3333):
+            truncated_response: bytes = query_id.to_bytes(2, 'big') + self.truncated_response[2:]
+            mock_socket: Mock = Utilities.mock_socket([truncated_response])
+            mock_random: Mock = Mock(**{'randint.side_effect': [query_id, 0x2222]})
+
+            answers: List[ResourceRecord] = ResolverCore(mock_socket, False, "1.2.3.4", mock_random,
+                                                         tcp_connections=tcp_connections).resolve_domain_name(
+                "www.google.com", "1.2.3.4", 1)
+
+            self.assertEqual(answers, self.expected_answers)
+            self.connections[0].responses.append(self.tcp_response)
+
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(len(self.connections[0].sent), 2)
+
+    def test_tcp_failure_treated_as_no_response(self):
+        """
+        Test case for a truncated udp response whose tcp retry fails. The dns server must be treated as one that did
+        not respond, so the query is retransmitted over udp.
+        """
+        mock_socket: Mock = Utilities.mock_socket([self.truncated_response, self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111, 0x2222, 0x0a7b]})
+
+        def refuse(address: Tuple[str, int], timeout: float) -> FakeConnection:
+            raise ConnectionRefusedError()
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random,
+                                              tcp_connections=TCPConnectionPool(connection_factory=refuse))
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(answers, self.expected_answers)
+        self.assertEqual(mock_socket.sendto.call_count, 2)
+
+    def test_malformed_tcp_response_treated_as_no_response(self):
+        """
+        Test case for a truncated udp response whose tcp retry is answered with a response whose answer section is cut
+        short. The dns server must be treated as one that did not respond, so the query is retransmitted over udp.
+        """
+        self.tcp_response = self.tcp_response[:-6]
+        mock_socket: Mock = Utilities.mock_socket([self.truncated_response, self.authoritative_response])
+        mock_random: Mock = Mock(**{'randint.side_effect': [0x1111, 0x2222, 0x0a7b]})
+
+        resolver: ResolverCore = ResolverCore(mock_socket, False, "1.2.3.4", mock_random,
+                                              tcp_connections=TCPConnectionPool(connection_factory=self.connect))
+        answers: List[ResourceRecord] = resolver.resolve_domain_name("www.google.com", "1.2.3.4", 1)
+
+        self.assertEqual(answers, self.expected_answers)
+        self.assertEqual(len(self.connections[0].sent), 1)
+        self.assertEqual(mock_socket.sendto.call_count, 2)
@@ -2,6 +2,7 @@ from unittest.mock import Mock
 import unittest
 from dns_shark.resolver_core import ResolverCore
 from dns_shark.errors.dns_zero_counter_error import DNSZeroCounterError
+from test.utilities import Utilities
 
 
 class DNSZeroCounterErrorTest(unittest.TestCase):
@@ -45,9 +46,9 @@ class DNSZeroCounterErrorTest(unittest.TestCase):
                                                           '001c0001c00c001c00010000012c00102607f8b0400a080300000000'
                                                           '00002004')
 
-        cls.mock_socket: Mock = Mock(**{'recv.side_effect': [cls.first_response,
-                                                             cls.second_response,
-                                                             cls.third_response]})
+        cls.mock_socket: Mock = Utilities.mock_socket([cls.first_response,
+                                                       cls.second_response,
+                                                       cls.third_response])
 
         cls.mock_random: Mock = Mock(**{'randint.side_effect': [0x150e, 0xe13b, 0xc98f]})
 
@@ -3,6 +3,7 @@ from dns_shark.resource_record import ResourceRecord
 from io import BytesIO, StringIO
 from test.utilities import Utilities
 from contextlib import redirect_stdout
+from ipaddress import IPv4Address, IPv6Address
 
 
 class DNSMessageTests(unittest.TestCase):
@@ -18,6 +19,7 @@ class DNSMessageTests(unittest.TestCase):
         cls.a_type: int = 1
         cls.ns_type: int = 2
         cls.cn_type: int = 5
+        cls.soa_type: int = 6
         cls.aaaa_type: int = 28
         cls.unsupported_type: int = 3
 
@@ -25,6 +27,7 @@ class DNSMessageTests(unittest.TestCase):
         cls.ipv6_address_data: bytes = Utilities().ipv6_address_data
 
         cls.resource_record_encoded: bytes = Utilities().resource_record_encoded
+        cls.soa_rdata_encoded: bytes = Utilities().soa_rdata_encoded
 
         cls.simple_domain_name: bytes = Utilities().simple_domain_name
         cls.simple_domain_name_encoded: bytes = Utilities().simple_domain_name_encoded
@@ -67,6 +70,14 @@ class DNSMessageTests(unittest.TestCase):
         a_type: str = ResourceRecord.parse_type(self.cn_type)
         self.assertEqual(a_type, 'CN')
 
+    def test_parse_type_soa_type(self):
+        """
+        Test case to parse a type of value 6 (SOA type).
+        """
+
+        soa_type: str = ResourceRecord.parse_type(self.soa_type)
+        self.assertEqual(soa_type, 'SOA')
+
     def test_parse_type_aaaa_type(self):
         """
         Test case to parse a type of value 28 (AAAA type).
@@ -87,60 +98,161 @@ class DNSMessageTests(unittest.TestCase):
         """
         Test case to decode an ipv4 address to its string representation.
         """
-        ipv4_address: str = ResourceRecord._decode_ipv4_address(BytesIO(self.ipv4_address_data))
+        ipv4_address: str = ResourceRecord._decode_ipv4_address(self.ipv4_address_data, 0)
         self.assertEqual(ipv4_address, '16.8.32.2')
 
     def test_decode_ipv6_address(self):
         """
         Test case to decode an ipv6 address to its string representation
         """
-        ipv6_address: str = ResourceRecord._decode_ipv6_address(BytesIO(self.ipv6_address_data))
+        ipv6_address: str = ResourceRecord._decode_ipv6_address(self.ipv6_address_data, 0)
         self.assertEqual(ipv6_address, '1008:2002:1008:2002:1008:2002:1008:2002')
 
     def test_decode_rdata_a_type(self):
         """
         Test case to decode rdata of type a (ipv4).
         """
-        rdata: BytesIO = BytesIO(self.ipv4_address_data)
-        copy: BytesIO = BytesIO(self.ipv4_address_data)
-        ipv4_address: str = ResourceRecord._decode_rdata(rdata, copy, self.a_type)
+        rdata: bytes = self.ipv4_address_data
+        ipv4_address: str = ResourceRecord._decode_rdata(rdata, 0, len(rdata), self.a_type)
         self.assertEqual(ipv4_address, '16.8.32.2')
 
     def test_decode_rdata_ns_type(self):
         """
         Test case to decode rdata of type ns (name server).
         """
-        rdata: BytesIO = BytesIO(self.simple_domain_name_encoded)
-        copy: BytesIO = BytesIO(self.simple_domain_name_encoded)
-        decoded_domain_name: str = ResourceRecord._decode_rdata(rdata, copy, self.ns_type)
+        rdata: bytes = self.simple_domain_name_encoded
+        decoded_domain_name: str = ResourceRecord._decode_rdata(rdata, 0, len(rdata), self.ns_type)
         self.assertEqual(decoded_domain_name, self.simple_domain_name)
 
     def test_decode_rdata_cn_type(self):
         """
         Test case to decode rdata of type cn (name server).
         """
-        rdata: BytesIO = BytesIO(self.simple_domain_name_encoded)
-        copy: BytesIO = BytesIO(self.simple_domain_name_encoded)
-        decoded_domain_name: str = ResourceRecord._decode_rdata(rdata, copy, self.cn_type)
+        rdata: bytes = self.simple_domain_name_encoded
+        decoded_domain_name: str = ResourceRecord._decode_rdata(rdata, 0, len(rdata), self.cn_type)
         self.assertEqual(decoded_domain_name, self.simple_domain_name)
 
+    def test_decode_rdata_soa_type(self):
+        """
+        Test case to decode rdata of type soa (start of authority).
+        """
+        rdata: bytes = self.soa_rdata_encoded
+        start_of_authority: str = ResourceRecord._decode_rdata(rdata, 0, len(rdata), self.soa_type)
+        self.assertEqual(start_of_authority, 'ns1.ubc.ca hostmaster.ubc.ca 1 7200 3600 604800 300')
+
+    def test_get_soa_minimum(self):
+        """
+        Test case to retrieve the minimum field of an SOA record.
+        """
+        record: ResourceRecord = ResourceRecord("ubc.ca", 6, 1, 3600, 39,
+                                                'ns1.ubc.ca hostmaster.ubc.ca 1 7200 3600 604800 300')
+        self.assertEqual(record.get_soa_minimum(), 300)
+
     def test_decode_rdata_aaaa_type(self):
         """
         Test case to decode rdata of type aaaa (ipv6).
         """
-        rdata: BytesIO = BytesIO(self.ipv6_address_data)
-        copy: BytesIO = BytesIO(self.ipv6_address_data)
-        ipv6_address: str = ResourceRecord._decode_rdata(rdata, copy, self.aaaa_type)
+        rdata: bytes = self.ipv6_address_data
+        ipv6_address: str = ResourceRecord._decode_rdata(rdata, 0, len(rdata), self.aaaa_type)
         self.assertEqual(ipv6_address, '1008:2002:1008:2002:1008:2002:1008:2002')
 
     def test_decode_rdata_unsupported_type(self):
         """
         Test case to decode rdata of an unsupported type.
         """
-        rdata: BytesIO = BytesIO(self.ipv6_address_data)
-        copy: BytesIO = BytesIO(self.ipv6_address_data)
-        ipv6_address: str = ResourceRecord._decode_rdata(rdata, copy, self.unsupported_type)
-        self.assertEqual(ipv6_address, 'UNSUPPORTED RESOURCE RECORD TYPE')
+        rdata: bytes = self.ipv6_address_data
+        unknown_rdata: str = ResourceRecord._decode_rdata(rdata, 0, len(rdata), self.unsupported_type)
+        self.assertEqual(unknown_rdata, '\\# 16 10082002100820021008200210082002')
+
+    def test_decode_rdata_unsupported_type_empty(self):
+        """
+        Test case to decode empty rdata of an unsupported type.
+        """
+        self.assertEqual(ResourceRecord._decode_rdata(b'', 0, 0, self.unsupported_type), '\\# 0')
+
+    def test_decode_resource_record_keeps_raw_rdata(self):
+        """
+        Test case to decode an A record, whose rdata must only be converted to a string once it is read.
+        """
+        encoded: bytes = b'\x00\x00\x01\x00\x01\x00\x00\x0e\x10\x00\x04' + self.ipv4_address_data
+        resource_record, offset = ResourceRecord.decode_resource_record_at(memoryview(encoded), 0)
+
+        self.assertEqual(offset, len(encoded))
+        self.assertEqual(resource_record.raw_rdata, self.ipv4_address_data)
+        self.assertIsNone(resource_record._rdata)
+
+        self.assertEqual(resource_record.rdata, '16.8.32.2')
+        self.assertEqual(resource_record, ResourceRecord('', 1, 1, 3600, 4, '16.8.32.2'))
+
+    def test_decode_resource_record_unsupported_type(self):
+        """
+        Test case to decode a resource record of an unsupported type, whose rdata must be passed through unchanged.
+        """
+        encoded: bytes = b'\x00\x00\x10\x00\x01\x00\x00\x0e\x10\x00\x03\x02hi'
+        resource_record: ResourceRecord = ResourceRecord.decode_resource_record_at(encoded, 0)[0]
+
+        self.assertEqual(resource_record.raw_rdata, b'\x02hi')
+        self.assertEqual(resource_record.rdata, '\\# 3 026869')
+
+    def test_decode_resource_record_decompresses_rdata(self):
+        """
+        Test case to decode an MX and a PTR record whose rdata point at an earlier domain name of the dns message. Their
+        raw rdata must hold the domain names written out in full, and so decode alike anywhere.
+        """
+        # example.com at offset 0, then an MX record of rdata 10 mail.<pointer to 0>, then a PTR record of rdata
+        # host.<pointer to the mail label of the MX record>
+        message: bytes = b'\x07example\x03com\x00' + \
+            b'\xc0\x00\x00\x0f\x00\x01\x00\x00\x0e\x10\x00\x09\x00\x0a\x04mail\xc0\x00' + \
+            b'\xc0\x00\x00\x0c\x00\x01\x00\x00\x0e\x10\x00\x07\x04host\xc0\x1b'
+
+        mx_record, offset = ResourceRecord.decode_resource_record_at(message, 13)
+        ptr_record, offset = ResourceRecord.decode_resource_record_at(message, offset)
+
+        self.assertEqual(offset, len(message))
+        self.assertEqual(mx_record.raw_rdata, b'\x00\x0a\x04mail\x07example\x03com\x00')
+        self.assertEqual(mx_record.rdata, '\\# 20 000a046d61696c076578616d706c6503636f6d00')
+        self.assertEqual(ptr_record.raw_rdata, b'\x04host\x04mail\x07example\x03com\x00')
+
+        # the raw rdata decodes alike on its own, with nothing left to point at
+        self.assertEqual(ResourceRecord._decompress_rdata(ptr_record.raw_rdata, 0, len(ptr_record.raw_rdata),
+                                                          ResourceRecord._compressible_rdata[12]),
+                         ptr_record.raw_rdata)
+
+    def test_decode_resource_record_rdata_overrun(self):
+        """
+        Test case to decode an MX record whose domain name runs past its rdlength, which must be rejected.
+        """
+        encoded: bytes = b'\x00\x00\x0f\x00\x01\x00\x00\x0e\x10\x00\x03\x00\x0a\x04mail\x00'
+
+        with self.assertRaises(ValueError):
+            ResourceRecord.decode_resource_record_at(encoded, 0)
+
+    def test_ip_address(self):
+        """
+        Test case for the typed address of A and AAAA records, whether decoded or built from their string rdata.
+        """
+        decoded: ResourceRecord = ResourceRecord('name', 28, 1, 600, 16, raw_rdata=self.ipv6_address_data)
+        built: ResourceRecord = ResourceRecord('name', 1, 1, 600, 4, '16.8.32.2')
+
+        self.assertEqual(decoded.packed_address, self.ipv6_address_data)
+        self.assertEqual(decoded.ip_address, IPv6Address('1008:2002:1008:2002:1008:2002:1008:2002'))
+        self.assertIs(decoded.ip_address, decoded.ip_address)
+
+        self.assertEqual(built.packed_address, self.ipv4_address_data)
+        self.assertEqual(built.ip_address, IPv4Address('16.8.32.2'))
+
+        with self.assertRaises(ValueError):
+            ResourceRecord('name', 2, 1, 600, 4, 'ns.ubc.ca').ip_address
+
+    def test_target(self):
+        """
+        Test case for the domain name held by NS and CNAME records.
+        """
+        self.assertEqual(ResourceRecord('name', 2, 1, 600, 4, 'ns.ubc.ca').target, 'ns.ubc.ca')
+        self.assertEqual(ResourceRecord('name', 5, 1, 600, 4, 'www.ubc.ca').target, 'www.ubc.ca')
+
+        with self.assertRaises(ValueError):
+            ResourceRecord('name', 1, 1, 600, 4, '16.8.32.2').target
 
     def test_print_record_for_trace(self):
         """
@@ -268,3 +380,12 @@ class DNSMessageTests(unittest.TestCase):
 
 
 
+
+    def test_resource_record_has_no_instance_dict(self):
+        """
+        Test case to check that resource records do not carry the memory overhead of an instance __dict__.
+        """
+
+        record: ResourceRecord = ResourceRecord("record", 1, 1, 600, 4, "1.2.3.4")
+
+        self.assertFalse(hasattr(record, '__dict__'))
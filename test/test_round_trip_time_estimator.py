@@ -0,0 +1,50 @@
+import unittest
+from dns_shark.round_trip_time_estimator import RoundTripTimeEstimator
+
+
+class RoundTripTimeEstimatorTests(unittest.TestCase):
+    """
+    Unit testing for round_trip_time_estimator.py
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.estimator: RoundTripTimeEstimator = RoundTripTimeEstimator(initial_delay=0.4, min_delay=0.05)
+
+    def test_hedge_delay_without_samples(self):
+        """
+        Test case for the hedge delay before any round trip time was sampled, which must be the initial delay.
+        """
+        self.assertIsNone(self.estimator.smoothed_round_trip_time)
+        self.assertEqual(self.estimator.hedge_delay(), 0.4)
+
+    def test_first_sample(self):
+        """
+        Test case for the first sample, which sets the smoothed round trip time and half of it as its variation.
+        """
+        self.estimator.add_sample(0.1)
+
+        self.assertEqual(self.estimator.smoothed_round_trip_time, 0.1)
+        self.assertEqual(self.estimator.round_trip_time_variation, 0.05)
+        self.assertAlmostEqual(self.estimator.hedge_delay(), 0.3)
+
+    def test_later_samples_smoothed(self):
+        """
+        Test case for a sample after the first, which only moves the estimate by the weight of the sample.
+        """
+        self.estimator.add_sample(0.1)
+        self.estimator.add_sample(0.9)
+
+        self.assertAlmostEqual(self.estimator.smoothed_round_trip_time, 0.2)
+        self.assertAlmostEqual(self.estimator.round_trip_time_variation, 0.2375)
+
+    def test_hedge_delay_bounded_below(self):
+        """
+        Test case for a very fast dns server, whose hedge delay must not drop below the minimum delay.
+        """
+        for _ in range(100):
+            self.estimator.add_sample(0.001)
+
+        self.assertEqual(self.estimator.hedge_delay(), 0.05)
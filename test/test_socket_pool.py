@@ -0,0 +1,74 @@
+from unittest.mock import Mock
+import unittest
+from dns_shark.socket_pool import SocketPool
+
+
+class SocketPoolTests(unittest.TestCase):
+    """
+    Unit testing for socket_pool.py
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.socket_factory: Mock = Mock(side_effect=lambda: Mock())
+        self.pool: SocketPool = SocketPool(max_idle_sockets=1, socket_factory=self.socket_factory)
+
+    def test_released_socket_reused(self):
+        """
+        Test case for acquiring a socket after a previous one was released, which must reuse the released socket.
+        """
+        with self.pool.socket() as first_socket:
+            pass
+
+        with self.pool.socket() as second_socket:
+            pass
+
+        self.assertIs(first_socket, second_socket)
+        self.assertEqual(self.socket_factory.call_count, 1)
+
+    def test_concurrent_sockets(self):
+        """
+        Test case for acquiring two sockets at once. Only one of them may be kept idle once released.
+        """
+        first_socket: Mock = self.pool.acquire()
+        second_socket: Mock = self.pool.acquire()
+
+        self.assertIsNot(first_socket, second_socket)
+
+        self.pool.release(first_socket)
+        self.pool.release(second_socket)
+
+        self.assertEqual(self.pool.idle_sockets, [first_socket])
+        second_socket.close.assert_called_once_with()
+
+    def test_receive_buffer(self):
+        """
+        Test case for the receive buffer of a socket, which must be reused for the same socket unless a larger one is
+        needed, and not be shared with another socket.
+        """
+        first_socket: Mock = self.pool.acquire()
+        second_socket: Mock = self.pool.acquire()
+        buffer: bytearray = self.pool.receive_buffer(first_socket, 1232)
+
+        self.assertEqual(len(buffer), 1232)
+        self.assertIs(self.pool.receive_buffer(first_socket, 512), buffer)
+        self.assertIsNot(self.pool.receive_buffer(second_socket, 1232), buffer)
+        self.assertEqual(len(self.pool.receive_buffer(first_socket, 4096)), 4096)
+
+    def test_close(self):
+        """
+        Test case for closing the pool, which closes idle sockets and sockets released afterwards.
+        """
+        idle_socket: Mock = self.pool.acquire()
+        busy_socket: Mock = self.pool.acquire()
+        self.pool.release(idle_socket)
+
+        self.pool.close()
+        idle_socket.close.assert_called_once_with()
+
+        self.pool.release(busy_socket)
+        busy_socket.close.assert_called_once_with()
+
+        self.assertRaises(ValueError, self.pool.acquire)
@@ -0,0 +1,137 @@
+import socket
+import unittest
+from dns_shark.tcp_connection_pool import TCPConnectionPool
+from typing import List, Tuple
+
+
+class FakeConnection:
+    """
+    A tcp connection to a dns server that answers every query with the next of its canned responses, length prefixed.
+    A connection without responses left behaves as though the dns server closed it.
+    """
+
+    def __init__(self, responses: List[bytes]):
+        self.responses: List[bytes] = responses
+        self.sent: List[bytes] = []
+        self.closed: bool = False
+        self._received: bytes = b''
+
+    def settimeout(self, timeout: float) -> None:
+        pass
+
+    def sendall(self, data: bytes) -> None:
+        self.sent.append(data)
+
+        if self.responses:
+            response: bytes = self.responses.pop(0)
+            self._received = self._received + len(response).to_bytes(2, 'big') + response
+
+    def recv_into(self, buffer: memoryview, size: int) -> int:
+        count: int = min(size, len(self._received), 3)  # deliver the data in small pieces
+        buffer[:count] = self._received[:count]
+        self._received = self._received[count:]
+        return count
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TCPConnectionPoolTests(unittest.TestCase):
+    """
+    Unit testing for tcp_connection_pool.py
+    """
+
+    def setUp(self):
+        """
+        Initialize test values used in the tests.
+        """
+        self.connections: List[FakeConnection] = []
+        self.addresses: List[Tuple[str, int]] = []
+
+    def connection_factory(self, responses: List[bytes]):
+        def connect(address: Tuple[str, int], timeout: float) -> FakeConnection:
+            self.addresses.append(address)
+            connection: FakeConnection = FakeConnection(list(responses))
+            self.connections.append(connection)
+            return connection
+
+        return connect
+
+    def test_query_length_prefixed(self):
+        """
+        Test case for a single query, which must be sent and received with a 2 byte length prefix.
+        """
+        pool: TCPConnectionPool = TCPConnectionPool(connection_factory=self.connection_factory([b'response']))
+
+        self.assertEqual(pool.query('1.2.3.4', bytearray(b'query'), 1.0), b'response')
+        self.assertEqual(self.connections[0].sent, [b'\x00\x05query'])
+        self.assertEqual(self.addresses, [('1.2.3.4', 53)])
+
+    def test_connection_reused(self):
+        """
+        Test case for two queries to the same dns server, which must share a single connection, and a query to another
+        dns server, which must not.
+        """
+        pool: TCPConnectionPool = TCPConnectionPool(connection_factory=self.connection_factory([b'first', b'second']))
+
+        self.assertEqual(pool.query('1.2.3.4', b'query', 1.0), b'first')
+        self.assertEqual(pool.query('1.2.3.4', b'query', 1.0), b'second')
+        self.assertEqual(pool.query('5.6.7.8', b'query', 1.0), b'first')
+        self.assertEqual(self.addresses, [('1.2.3.4', 53), ('5.6.7.8', 53)])
+
+    def test_closed_connection_replaced(self):
+        """
+        Test case for a reused connection that the dns server has closed in the meantime. The query must be sent again
+        over a new connection.
+        """
+        pool: TCPConnectionPool = TCPConnectionPool(connection_factory=self.connection_factory([b'response']))
+
+        pool.query('1.2.3.4', b'query', 1.0)
+
+        self.assertEqual(pool.query('1.2.3.4', b'query', 1.0), b'response')
+        self.assertEqual(len(self.connections), 2)
+        self.assertTrue(self.connections[0].closed)
+        self.assertFalse(self.connections[1].closed)
+
+    def test_new_connection_failure_raised(self):
+        """
+        Test case for a new connection that the dns server closes without responding, which must fail the query.
+        """
+        pool: TCPConnectionPool = TCPConnectionPool(connection_factory=self.connection_factory([]))
+
+        with self.assertRaises(ConnectionError):
+            pool.query('1.2.3.4', b'query', 1.0)
+
+        self.assertEqual(len(self.connections), 1)
+        self.assertTrue(self.connections[0].closed)
+
+    def test_timeout_not_retried(self):
+        """
+        Test case for a reused connection whose dns server does not respond in time, which must fail the query without
+        opening another connection.
+        """
+        pool: TCPConnectionPool = TCPConnectionPool(connection_factory=self.connection_factory([b'response']))
+        pool.query('1.2.3.4', b'query', 1.0)
+
+        def time_out(buffer: memoryview, size: int) -> int:
+            raise socket.timeout()
+
+        self.connections[0].recv_into = time_out  # type: ignore
+
+        with self.assertRaises(socket.timeout):
+            pool.query('1.2.3.4', b'query', 1.0)
+
+        self.assertEqual(len(self.connections), 1)
+
+    def test_close(self):
+        """
+        Test case for closing the pool, which must close its idle connections and refuse further queries.
+        """
+        pool: TCPConnectionPool = TCPConnectionPool(connection_factory=self.connection_factory([b'response']))
+        pool.query('1.2.3.4', b'query', 1.0)
+
+        pool.close()
+
+        self.assertTrue(self.connections[0].closed)
+        with self.assertRaises(ValueError):
+            pool.query('1.2.3.4', b'query', 1.0)
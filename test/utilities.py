@@ -1,3 +1,8 @@
+from unittest.mock import Mock
+from itertools import repeat
+from typing import Iterator, List, Tuple, Union
+
+
 class Utilities:
     """
     This class contains commonly used testing data and functions.
@@ -42,3 +47,49 @@ class Utilities:
 
     ipv4_address_data: bytes = b'\x10\x08\x20\x02'
     ipv6_address_data: bytes = b'\x10\x08\x20\x02\x10\x08\x20\x02\x10\x08\x20\x02\x10\x08\x20\x02'
+
+    soa_rdata_encoded: bytes = b'\x03ns1\x03ubc\x02ca\x00\x0ahostmaster\x03ubc\x02ca\x00' \
+                               b'\x00\x00\x00\x01\x00\x00\x1c\x20\x00\x00\x0e\x10\x00\x09\x3a\x80\x00\x00\x01\x2c'
+
+    @staticmethod
+    def mock_socket(responses: Union[bytes, BaseException, List[Union[bytes, BaseException]]]) -> Mock:
+        """
+        Creates a mock udp socket that receives the responses into the buffer passed to recvfrom_into, one response per
+        call. A response that is an exception is raised instead, e.g. socket.timeout(). A single response, rather than
+        a list of them, is received on every call.
+
+        Every response is received from the address of the latest query sent with its query id, as though the dns
+        server the query was sent to responded.
+
+        :param responses: the responses received by the socket
+        :return: the mock socket
+        """
+        received: Iterator[Union[bytes, BaseException]] = iter(responses) if isinstance(responses, list) \
+            else repeat(responses)
+        mock_socket: Mock = Mock()
+
+        def recvfrom_into(buffer: bytearray, nbytes: int = 0) -> Tuple[int, Tuple[str, int]]:
+            response: Union[bytes, BaseException] = next(received)
+
+            if isinstance(response, BaseException):
+                raise response
+
+            buffer[:len(response)] = response
+            return len(response), Utilities.query_address(mock_socket, response)
+
+        mock_socket.recvfrom_into.side_effect = recvfrom_into
+        return mock_socket
+
+    @staticmethod
+    def query_address(mock_socket: Mock, response: bytes) -> Tuple[str, int]:
+        """
+        :param mock_socket: a mock udp socket
+        :param response: a response received by the socket
+        :return: the address of the latest query sent on the socket with the query id of the response, or of the latest
+                 query sent if there is none
+        """
+        for call in reversed(mock_socket.sendto.call_args_list):
+            if bytes(call[0][0][:2]) == response[:2]:
+                return call[0][1]
+
+        return mock_socket.sendto.call_args[0][1]